@@ -8,7 +8,7 @@ until successful execution.
 
 import json
 import re
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
 from pathlib import Path
 
@@ -19,14 +19,27 @@ from agent_framework._types import ChatMessage
 
 from ira_builder.tools.code_executor_tools import (
     execute_python_code,
-    validate_python_syntax,
     extract_code_from_markdown,
-    preview_dataframe,
-    validate_output_dataframe,
-    analyze_execution_error,
-    get_dataframe_summary
+    get_interpreter_pool,
 )
-from ira_builder.tools.csv_tools import analyze_csv_structure, get_csv_summary
+from ira_builder.tools.async_tools import (
+    run_blocking,
+    validate_python_syntax_async,
+    preview_dataframe_async,
+    validate_output_dataframe_async,
+    analyze_execution_error_async,
+    get_dataframe_summary_async,
+    check_merge_cardinality_async,
+    check_code_performance_async,
+)
+from ira_builder.tools.csv_tools import (
+    analyze_csv_structure,
+    discover_join_keys,
+    estimate_join_cardinality,
+    get_csv_summary,
+)
+from ira_builder.tools.execution_scheduler import DEFAULT_TENANT
+from ira_builder.tools.read_options import format_read_call
 from ira_builder.utils.logger import get_logger
 from ira_builder.utils.config import get_config
 
@@ -194,6 +207,7 @@ print(f"✓ SUCCESS: Saved results to {output_file_path}")
 
 **Column Categorization Guide:**
 - **DATE_COLS**: All date/datetime columns → use `ira.convert_date_column()`
+  - If CSV FILE INFORMATION lists a date format for the column with confidence of 90% or more, parse it with that fixed format instead (much faster): `df[col] = pd.to_datetime(df[col], format='%d-%m-%Y', errors='coerce')`
 - **SAME_COLS**: IDs, codes, reference numbers → preserve original case
 - **UPPER_COLS**: Status, priority, country codes → uppercase for consistency
 - **LOWER_COLS**: Emails, websites, URLs → lowercase
@@ -210,6 +224,10 @@ print(f"✓ SUCCESS: Saved results to {output_file_path}")
 
 **Data Loading:**
 - ✅ Always use `low_memory=False` in pd.read_csv()
+- ✅ If CSV FILE INFORMATION gives a recommended `pd.read_csv(...)` call for a file, load the file with exactly those options (compact dtypes, roughly half the memory):
+  - `category` columns: use `observed=True` in groupby/pivot_table, and `.astype(str)` a column before assigning values it doesn't already contain or passing it to IRA string cleaning
+  - Columns in `parse_dates` are already datetime: leave them out of DATE_COLS
+  - Columns missing from `usecols` are entirely empty
 - ✅ Print confirmation messages with :, format for row counts
 - ✅ Use descriptive DataFrame names matching the file: df_fbl3n, df_vendor_master
 - ✅ NO unnecessary try-except blocks - keep code clean and production-ready
@@ -330,6 +348,15 @@ class CoderMemory(ContextProvider):
         self.csv_metadata: List[Dict[str, Any]] = []
         self.output_path: Optional[str] = None
         self.workflow_name: Optional[str] = None
+        self.join_estimates: List[Dict[str, Any]] = []
+
+        # Merges already flagged as exploding; if regenerated code keeps one,
+        # it is run anyway (the estimate may be wrong)
+        self.flagged_merges: set = set()
+
+        # Performance findings already sent back, as (rule, line of code); if
+        # regenerated code keeps one, it is run anyway
+        self.flagged_perf_findings: set = set()
 
         # Code generation history
         self.code_attempts: List[Dict[str, Any]] = []
@@ -363,6 +390,20 @@ class CoderMemory(ContextProvider):
             except Exception as e:
                 logger.error(f"Error analyzing CSV {filepath}: {str(e)}")
 
+        # Likely join keys with their estimated output size
+        self.join_estimates = []
+        if len(csv_filepaths) > 1:
+            paths = {Path(fp).name: fp for fp in csv_filepaths}
+            try:
+                for candidate in discover_join_keys(csv_filepaths, max_results=5):
+                    estimate = estimate_join_cardinality(
+                        paths[candidate["from_file"]], candidate["from_column"],
+                        paths[candidate["to_file"]], candidate["to_column"],
+                    )
+                    self.join_estimates.append({**candidate, **estimate})
+            except Exception as e:
+                logger.warning(f"Could not estimate join keys: {str(e)}")
+
     def add_code_attempt(self, code: str, execution_result: Dict[str, Any]):
         """Record a code generation attempt and its result."""
         self.iteration_count += 1
@@ -431,9 +472,47 @@ class CoderMemory(ContextProvider):
             context_parts.append(f"- Rows: {metadata['row_count']:,}")
             context_parts.append(f"- Columns ({len(metadata['columns'])}): {', '.join(metadata['columns'])}")
             context_parts.append(f"- Data Types: {json.dumps(metadata['dtypes'], indent=2)}")
+            numeric_formats = metadata.get("numeric_formats", {})
+            if numeric_formats:
+                context_parts.append("- Numbers Stored as Text (load as object):")
+                for col, number_format in numeric_formats.items():
+                    context_parts.append(
+                        f"  - {col}: stored as text: {number_format['description']} - parse before arithmetic"
+                    )
+            read_options = metadata.get("read_options")
+            if read_options and (read_options["dtype"] or read_options["parse_dates"] or read_options["usecols"]):
+                path_variable = re.sub(r"\W+", "_", Path(metadata["filename"]).stem).lower() + "_path"
+                context_parts.append(
+                    f"- Recommended load: `{format_read_call(path_variable, read_options)}`"
+                )
+            date_formats = metadata.get("date_formats", {})
+            if date_formats:
+                context_parts.append("- Date Formats (inferred from a sample):")
+                for col, date_format in date_formats.items():
+                    note = ", day/month order is a guess" if date_format["ambiguous"] else ""
+                    context_parts.append(
+                        f"  - {col}: '{date_format['format']}' "
+                        f"(confidence {date_format['confidence']:.0%}{note})"
+                    )
 
         context_parts.append("")
 
+        if self.join_estimates:
+            context_parts.append("=" * 80)
+            context_parts.append("JOIN KEY CANDIDATES (estimated from value sketches)")
+            context_parts.append("=" * 80)
+            for estimate in self.join_estimates:
+                context_parts.append(
+                    f"- {estimate['from_file']}['{estimate['from_column']}'] → "
+                    f"{estimate['to_file']}['{estimate['to_column']}']: "
+                    f"{estimate['containment']:.0%} of values match, {estimate['relationship']}, "
+                    f"~{estimate['estimated_rows']:,} rows after merge ({estimate['expansion']}x)"
+                )
+            context_parts.append(
+                "Merges estimated above 1x multiply rows: deduplicate or aggregate one side first."
+            )
+            context_parts.append("")
+
         # Add output path
         context_parts.append("=" * 80)
         context_parts.append("OUTPUT CONFIGURATION")
@@ -466,6 +545,8 @@ class CoderMemory(ContextProvider):
         self.current_code = None
         self.execution_results = []
         self.iteration_count = 0
+        self.flagged_merges = set()
+        self.flagged_perf_findings = set()
         logger.info("Coder memory reset")
 
 
@@ -492,7 +573,8 @@ class CoderAgent:
         model: str = "gpt-4o",
         temperature: float = 0.3,
         max_iterations: int = 5,
-        execution_timeout: int = 120
+        execution_timeout: int = 120,
+        output_callback: Optional[Callable[[str, str], Any]] = None
     ):
         """
         Initialize Coder Agent.
@@ -502,6 +584,8 @@ class CoderAgent:
             temperature: Temperature for code generation (default: 0.3 - more deterministic)
             max_iterations: Maximum code generation attempts (default: 5)
             execution_timeout: Timeout for code execution in seconds (default: 120)
+            output_callback: Called with the stream ("stdout" or "stderr") and each
+                line of output while generated code runs (sync or async)
         """
         self.model = model
         self.temperature = temperature
@@ -526,7 +610,8 @@ class CoderAgent:
             instructions=CODER_INSTRUCTIONS,
             tools=[
                 # Code validation and execution tools
-                validate_python_syntax,
+                validate_python_syntax_async,
+                check_code_performance_async,
                 # Note: We don't give the agent direct access to execute_python_code
                 # We control execution in the workflow
             ],
@@ -540,6 +625,12 @@ class CoderAgent:
         self.workflow_name: Optional[str] = None
         self.work_dir: Optional[Path] = None
 
+        # Receives each line of output of running code: (stream, line)
+        self.output_callback = output_callback
+
+        # Warm interpreters import pandas while the first code is generated
+        get_interpreter_pool()
+
         logger.info(f"Coder Agent initialized with model: {model}")
 
     async def initialize_workflow(
@@ -572,8 +663,9 @@ class CoderAgent:
         # Set output path
         output_path = str(self.work_dir / output_filename)
 
-        # Initialize memory
-        self.memory.set_business_logic_plan(
+        # Initialize memory (profiles the inputs for join estimates)
+        await run_blocking(
+            self.memory.set_business_logic_plan,
             business_logic_plan=business_logic_plan,
             csv_filepaths=csv_filepaths,
             output_path=output_path,
@@ -599,7 +691,8 @@ class CoderAgent:
 
         This is the main workflow:
         1. Generate code
-        2. Validate syntax
+        2. Validate syntax, check merges for exploding joins and check for
+           pandas performance anti-patterns
         3. Execute code
         4. Check output
         5. If errors, analyze and retry (up to max_iterations)
@@ -629,7 +722,7 @@ class CoderAgent:
             generated_code = code_result['code']
 
             # Step 2: Validate syntax
-            syntax_check = validate_python_syntax(generated_code)
+            syntax_check = await validate_python_syntax_async(generated_code)
 
             if not syntax_check['valid']:
                 logger.warning(f"Syntax validation failed: {syntax_check['error']}")
@@ -640,6 +733,20 @@ class CoderAgent:
 
             logger.info("✓ Syntax validation passed")
 
+            # Step 2b: Flag merges whose output would explode
+            merge_check = await self._check_merges(generated_code)
+            if merge_check is not None:
+                logger.warning(f"Merge check failed: {merge_check['issues']}")
+                await self._request_merge_fix(merge_check, generated_code)
+                continue
+
+            # Step 2c: Flag pandas anti-patterns that would run for minutes
+            perf_check = await self._check_performance(generated_code)
+            if perf_check is not None:
+                logger.warning(f"Performance check failed: {perf_check['issues']}")
+                await self._request_performance_fix(perf_check, generated_code)
+                continue
+
             # Step 3: Execute code
             exec_result = await self._execute_code(generated_code)
 
@@ -651,14 +758,14 @@ class CoderAgent:
                 logger.info("✓ Code executed successfully!")
 
                 # Validate output file
-                output_validation = validate_output_dataframe(self.memory.output_path)
+                output_validation = await validate_output_dataframe_async(self.memory.output_path)
 
                 if output_validation['valid']:
                     logger.info(f"✓ Output file validated: {output_validation['row_count']} rows")
 
                     # Get preview and summary
-                    preview = preview_dataframe(self.memory.output_path, rows=10)
-                    summary = get_dataframe_summary(self.memory.output_path)
+                    preview = await preview_dataframe_async(self.memory.output_path, rows=10)
+                    summary = await get_dataframe_summary_async(self.memory.output_path)
 
                     # Replace csv_files and output_path with absolute paths in final code
                     final_code = self._replace_paths_in_code(generated_code)
@@ -772,8 +879,11 @@ Provide the COMPLETE corrected code (not just a snippet).
 
         return modified_code
 
-    async def _execute_code(self, code: str) -> Dict[str, Any]:
-        """Execute the generated code."""
+    async def _execute_code(self, code: str, interactive: bool = False, profile: bool = False) -> Dict[str, Any]:
+        """
+        Execute the generated code; ``interactive`` for refinements a user waits for, ``profile`` to
+        collect its hot spots (see execute_python_code).
+        """
         logger.info(f"Executing code in work directory: {self.work_dir}")
 
         try:
@@ -784,7 +894,13 @@ Provide the COMPLETE corrected code (not just a snippet).
             result = await execute_python_code(
                 code=modified_code,
                 work_dir=str(self.work_dir),
-                timeout=self.execution_timeout
+                timeout=self.execution_timeout,
+                input_files=self.memory.csv_filepaths,
+                output_file=str(Path(self.memory.output_path).resolve()),
+                output_callback=self.output_callback,
+                tenant=self.workflow_name or DEFAULT_TENANT,
+                interactive=interactive,
+                profile=profile
             )
 
             return result
@@ -798,6 +914,83 @@ Provide the COMPLETE corrected code (not just a snippet).
                 "error_message": f"Execution exception: {str(e)}"
             }
 
+    async def _check_merges(self, code: str) -> Optional[Dict[str, Any]]:
+        """Return the merge check result if it flags merges not flagged before, else None."""
+        if not get_config().join_check_enabled:
+            return None
+
+        try:
+            merge_check = await check_merge_cardinality_async(code, self.memory.csv_filepaths)
+        except Exception as e:
+            logger.warning(f"Merge check skipped: {str(e)}")
+            return None
+
+        flagged = {
+            (m["left_file"], m["left_column"], m["right_file"], m["right_column"])
+            for m in merge_check["merges"] if m["flagged"]
+        }
+        if merge_check["valid"] or flagged <= self.memory.flagged_merges:
+            return None
+
+        self.memory.flagged_merges |= flagged
+        return merge_check
+
+    async def _request_merge_fix(self, merge_check: Dict[str, Any], code: str):
+        """Ask agent to avoid merges estimated to explode."""
+        issues = "\n".join(f"- {issue}" for issue in merge_check["issues"])
+        error_msg = f"""
+⚠️ EXPLODING MERGE DETECTED (code was not executed)
+
+Estimates from the input profiles show these merges multiply rows and would
+likely exceed the time or memory limit:
+
+{issues}
+
+Merge on a key that is unique on one side, or deduplicate / aggregate one side
+before merging. If the merge is intended as written, keep it and it will run.
+
+Please provide the COMPLETE corrected code.
+"""
+
+        await self.agent.run(error_msg, thread=self.thread)
+
+    async def _check_performance(self, code: str) -> Optional[Dict[str, Any]]:
+        """Return the performance check result if it has blocking findings not sent back before, else None."""
+        if not get_config().perf_lint_enabled:
+            return None
+
+        try:
+            perf_check = await check_code_performance_async(code)
+        except Exception as e:
+            logger.warning(f"Performance check skipped: {str(e)}")
+            return None
+
+        blocking = {(f["rule"], f["code"]) for f in perf_check["findings"] if f["blocking"]}
+        if perf_check["valid"] or blocking <= self.memory.flagged_perf_findings:
+            return None
+
+        self.memory.flagged_perf_findings |= blocking
+        return perf_check
+
+    async def _request_performance_fix(self, perf_check: Dict[str, Any], code: str):
+        """Ask agent to replace slow pandas patterns."""
+        issues = "\n".join(f"- {issue}" for issue in perf_check["issues"])
+        error_msg = f"""
+⚠️ SLOW PANDAS CODE DETECTED (code was not executed)
+
+The input files have hundreds of thousands of rows. These patterns would take
+minutes and likely exceed the execution timeout:
+
+{issues}
+
+Rewrite these steps with vectorized pandas operations. If a pattern is
+required as written, keep it and the code will run.
+
+Please provide the COMPLETE corrected code.
+"""
+
+        await self.agent.run(error_msg, thread=self.thread)
+
     async def _request_syntax_fix(self, syntax_check: Dict[str, Any], code: str):
         """Ask agent to fix syntax errors."""
         error_msg = f"""
@@ -817,7 +1010,7 @@ Please fix the syntax error and provide the COMPLETE corrected code.
     async def _request_execution_fix(self, exec_result: Dict[str, Any], code: str):
         """Ask agent to fix execution errors."""
         # Analyze the error
-        error_analysis = analyze_execution_error(exec_result['output'], code)
+        error_analysis = await analyze_execution_error_async(exec_result['output'], code)
 
         error_msg = f"""
 ❌ EXECUTION ERROR
@@ -893,7 +1086,8 @@ def create_coder_agent(
     model: str = "gpt-4o",
     temperature: float = 0.3,
     max_iterations: int = 5,
-    execution_timeout: int = 120
+    execution_timeout: int = 120,
+    output_callback: Optional[Callable[[str, str], Any]] = None
 ) -> CoderAgent:
     """
     Create and configure a Coder Agent.
@@ -903,6 +1097,7 @@ def create_coder_agent(
         temperature: Temperature for code generation (default: 0.3)
         max_iterations: Maximum code generation attempts (default: 5)
         execution_timeout: Code execution timeout in seconds (default: 120)
+        output_callback: Called with the stream and each line of output of running code
 
     Returns:
         Configured CoderAgent instance
@@ -920,5 +1115,6 @@ def create_coder_agent(
         model=model,
         temperature=temperature,
         max_iterations=max_iterations,
-        execution_timeout=execution_timeout
+        execution_timeout=execution_timeout,
+        output_callback=output_callback
     )
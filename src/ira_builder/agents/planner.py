@@ -8,7 +8,8 @@ The Planner Agent is responsible for:
 4. Iterating based on user feedback
 """
 
-from typing import List, Dict, Any, Optional, Literal
+import asyncio
+from typing import Callable, List, Dict, Any, Optional, Literal
 from enum import Enum
 from agent_framework import ChatAgent
 from agent_framework.openai import OpenAIChatClient
@@ -16,13 +17,15 @@ from agent_framework.azure import AzureOpenAIChatClient
 from agent_framework._memory import ContextProvider, Context
 from agent_framework._types import ChatMessage
 
-from ira_builder.tools.csv_tools import (
-    analyze_csv_structure,
-    get_csv_summary,
-    validate_column_references,
-    get_column_data_preview,
-    compare_csv_schemas,
-    detect_data_quality_issues,
+from ira_builder.tools.async_tools import (
+    analyze_csv_structure_async,
+    get_csv_summary_async,
+    summarize_csv_samples_async,
+    summarize_csv_files_async,
+    validate_column_references_async,
+    get_column_data_preview_async,
+    compare_csv_schemas_async,
+    detect_data_quality_issues_async,
 )
 from ira_builder.tools.validation_tools import (
     validate_business_logic,
@@ -244,7 +247,7 @@ You have access to these tools - use them proactively:
 2. **get_csv_summary(filepaths)** - Get formatted summary
 3. **get_column_data_preview(filepath, column_name, num_samples)** - Show sample data
 4. **validate_column_references(column_names, available_columns)** - Check columns exist
-5. **compare_csv_schemas(filepaths)** - Compare multiple files
+5. **compare_csv_schemas(filepaths)** - Compare multiple files, including join key candidates found from overlapping values (e.g. "Supplier" ↔ "Vendor No")
 6. **detect_data_quality_issues(filepath)** - Find data problems
 
 Use these tools to understand the data structure, but remember: NEVER ask about data preprocessing or format conversions.
@@ -289,6 +292,7 @@ class PlannerResponseType(str, Enum):
     BUSINESS_LOGIC_PLAN = "business_logic_plan"
     ACKNOWLEDGMENT = "acknowledgment"
     ERROR = "error"
+    PROGRESS = "progress"
 
 
 class PlannerResponse:
@@ -363,17 +367,21 @@ class CSVAnalysisMemory(ContextProvider):
     def __init__(self):
         """Initialize the CSV analysis memory."""
         self.csv_analysis: Optional[str] = None
+        self.csv_analysis_approximate: bool = False
         self.workflow_context: Optional[str] = None
 
-    def set_csv_analysis(self, analysis: str):
+    def set_csv_analysis(self, analysis: str, approximate: bool = False):
         """
         Store CSV analysis results in memory.
 
         Args:
             analysis: The CSV analysis summary to store
+            approximate: Whether the analysis was built from a sample and will
+                be replaced by the exact profile later
         """
         self.csv_analysis = analysis
-        logger.info("Stored CSV analysis in memory")
+        self.csv_analysis_approximate = approximate
+        logger.info(f"Stored {'approximate' if approximate else 'exact'} CSV analysis in memory")
 
     def set_workflow_context(self, workflow_name: str, workflow_description: str, csv_files: List[str]):
         """
@@ -416,6 +424,11 @@ class CSVAnalysisMemory(ContextProvider):
             if self.csv_analysis:
                 context_parts.append("\n**CSV Data Structure (ALREADY ANALYZED - IN YOUR MEMORY):**\n")
                 context_parts.append(self.csv_analysis)
+                if self.csv_analysis_approximate:
+                    context_parts.append(
+                        "\nNOTE: Row counts and statistics above are estimated from a sample. "
+                        "Column names and types are reliable; the exact profile will replace this automatically."
+                    )
                 context_parts.append("\n**IMPORTANT:** This CSV analysis is ALREADY COMPLETE and stored in your memory.")
                 context_parts.append("DO NOT call analyze_csv_structure() or get_csv_summary() again.")
                 context_parts.append("Simply reference these columns directly when formulating questions.")
@@ -507,12 +520,12 @@ class PlannerAgent:
             chat_client=chat_client,
             instructions=PLANNER_INSTRUCTIONS,
             tools=[
-                analyze_csv_structure,
-                get_csv_summary,
-                validate_column_references,
-                get_column_data_preview,
-                compare_csv_schemas,
-                detect_data_quality_issues,
+                analyze_csv_structure_async,
+                get_csv_summary_async,
+                validate_column_references_async,
+                get_column_data_preview_async,
+                compare_csv_schemas_async,
+                detect_data_quality_issues_async,
                 validate_business_logic,
                 check_analysis_feasibility,
             ],
@@ -527,6 +540,8 @@ class PlannerAgent:
         self.conversation_history: List[Dict[str, Any]] = []
         self.thread = None  # Will be initialized when workflow starts
         self.current_business_logic_plan: Optional[str] = None  # Stores the latest plan
+        self._csv_upgrade_task: Optional[asyncio.Task] = None  # Background exact profiling
+        self._csv_progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
 
         logger.info(f"Planner Agent initialized with model: {model}")
 
@@ -630,6 +645,7 @@ class PlannerAgent:
         workflow_name: str,
         workflow_description: str,
         csv_filepaths: List[str],
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> PlannerResponse:
         """
         Initialize a new workflow with context.
@@ -638,6 +654,8 @@ class PlannerAgent:
             workflow_name: Name of the workflow
             workflow_description: Description of analysis goals
             csv_filepaths: List of CSV file paths to analyze
+            progress_callback: Called on the event loop as each CSV file is
+                profiled (see summarize_csv_files for the payload)
 
         Returns:
             PlannerResponse object containing the initial message and metadata
@@ -659,6 +677,7 @@ class PlannerAgent:
         self.csv_filepaths = csv_filepaths
         self.questions_asked = 0
         self.conversation_history = []
+        self._csv_progress_callback = progress_callback
 
         # Store workflow context in memory
         self.csv_memory.set_workflow_context(workflow_name, workflow_description, csv_filepaths)
@@ -714,8 +733,18 @@ Let's begin by analyzing the CSV files!
             # Pre-analyze CSV files and store in memory BEFORE first agent interaction
             logger.info("Pre-analyzing CSV files...")
             try:
-                csv_summary = get_csv_summary(csv_filepaths)
-                self.csv_memory.set_csv_analysis(csv_summary)
+                config = get_config()
+                if config.planner_fast_profile:
+                    csv_summary, approximate = await summarize_csv_samples_async(csv_filepaths)
+                    self.csv_memory.set_csv_analysis(csv_summary, approximate=approximate)
+                    if approximate and config.planner_background_profile:
+                        self._start_csv_analysis_upgrade(csv_filepaths)
+                else:
+                    csv_summary = await summarize_csv_files_async(
+                        csv_filepaths,
+                        progress_callback=self._loop_progress_callback(),
+                    )
+                    self.csv_memory.set_csv_analysis(csv_summary)
                 logger.info("CSV analysis stored in memory")
             except Exception as csv_error:
                 logger.warning(f"Could not pre-analyze CSV files: {str(csv_error)}")
@@ -744,6 +773,55 @@ Let's begin by analyzing the CSV files!
             logger.error(f"Error initializing workflow: {str(e)}")
             raise AgentException(f"Failed to initialize workflow: {str(e)}")
 
+    def _start_csv_analysis_upgrade(self, csv_filepaths: List[str]):
+        """
+        Compute the exact CSV profile in the background.
+
+        Once ready, the exact summary replaces the sampled one in CSV memory,
+        so later agent turns see exact numbers without blocking the first one.
+
+        Args:
+            csv_filepaths: CSV files of the current workflow
+        """
+        self._cancel_csv_analysis_upgrade()
+        self._csv_upgrade_task = asyncio.create_task(
+            self._upgrade_csv_analysis(list(csv_filepaths))
+        )
+
+    def _loop_progress_callback(self) -> Optional[Callable[[Dict[str, Any]], None]]:
+        """Wrap the progress callback so a tool worker thread reports it on the event loop."""
+        if self._csv_progress_callback is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        callback = self._csv_progress_callback
+
+        def progress_callback(progress: Dict[str, Any]) -> None:
+            loop.call_soon_threadsafe(callback, progress)
+
+        return progress_callback
+
+    async def _upgrade_csv_analysis(self, csv_filepaths: List[str]):
+        try:
+            csv_summary = await summarize_csv_files_async(
+                csv_filepaths, progress_callback=self._loop_progress_callback()
+            )
+        except Exception as e:
+            logger.warning(f"Background CSV profiling failed, keeping sampled analysis: {str(e)}")
+            return
+
+        # The workflow may have been reset or restarted in the meantime
+        if self.csv_filepaths != csv_filepaths:
+            return
+
+        self.csv_memory.set_csv_analysis(csv_summary)
+        logger.info("Replaced sampled CSV analysis with exact profile")
+
+    def _cancel_csv_analysis_upgrade(self):
+        if self._csv_upgrade_task is not None and not self._csv_upgrade_task.done():
+            self._csv_upgrade_task.cancel()
+        self._csv_upgrade_task = None
+
     async def ask_question(self, user_response: str) -> str:
         """
         Process user's response and ask next question or generate business logic.
@@ -1003,9 +1081,12 @@ Provide the complete updated document.
         self.questions_asked = 0
         self.conversation_history = []
         self.thread = None  # Clear the thread
+        self._cancel_csv_analysis_upgrade()
+        self._csv_progress_callback = None
 
         # Clear CSV memory
         self.csv_memory.csv_analysis = None
+        self.csv_memory.csv_analysis_approximate = False
         self.csv_memory.workflow_context = None
         logger.info("Cleared CSV memory")
 
@@ -3,7 +3,7 @@ import re
 from dataclasses import dataclass
 from pathlib import Path
 from textwrap import dedent, indent
-from typing import Any, Callable, Optional, Sequence, Set, TypeVar, Union
+from typing import Any, Callable, Dict, Optional, Sequence, Set, TypeVar, Union
 
 from .base import CodeResult
 from .func_with_reqs import Alias, FunctionWithRequirements, FunctionWithRequirementsStr, Import
@@ -15,6 +15,12 @@ class CommandLineCodeResult(CodeResult):
     """A code result class for command line code executor."""
 
     code_file: Optional[str]
+    # Full output, when it exceeded what ``output`` retains
+    log_file: Optional[str] = None
+    # wall_seconds, cpu_seconds, peak_rss_mb, read_bytes, write_bytes
+    resource_usage: Optional[Dict[str, Any]] = None
+    # Hot spots of the last Python block, when run with profiling
+    profile: Optional[Dict[str, Any]] = None
 
 
 T = TypeVar("T")
@@ -3,16 +3,27 @@
 # Simplified for workflow executor usage
 
 import asyncio
+import codecs
+import inspect
+import json
 import logging
 import os
+import re
+import signal
+import subprocess
 import sys
+import threading
+import time
 import warnings
+from collections import deque
+from datetime import datetime
 from hashlib import sha256
 from pathlib import Path
 from string import Template
 from types import SimpleNamespace
-from typing import Any, Callable, ClassVar, List, Optional, Sequence, Union
+from typing import Any, Callable, ClassVar, Deque, Dict, List, Optional, Sequence, Tuple, Union
 
+from . import sidecar_harness
 from .core.base import CodeExecutor, CodeBlock
 from .core.func_with_reqs import FunctionWithRequirements, FunctionWithRequirementsStr
 from .core.cancellation import CancellationToken
@@ -25,6 +36,24 @@ from .core.common import (
     silence_pip,
     to_stub,
 )
+from .interpreter_pool import InterpreterPool, checkpoint_split
+from .process_resources import (
+    REAP_SUPPORTED,
+    SAMPLE_INTERVAL,
+    ResourceMonitor,
+    add_usage,
+    kill_process_group,
+    reap,
+    resource_limits,
+)
+from .setup_cache import SetupCache
+from .sidecar_harness import (
+    EXEC_ARG,
+    LIMITS_ENV_VAR,
+    MANIFESTS_ENV_VAR,
+    OVERRIDES_ENV_VAR,
+    PROFILE_ENV_VAR,
+)
 from typing_extensions import ParamSpec
 
 __all__ = ("PythonScriptExecutor",)
@@ -32,6 +61,151 @@ __all__ = ("PythonScriptExecutor",)
 A = ParamSpec("A")
 
 
+# Bytes read from a process's stdout or stderr at a time
+_READ_CHUNK_BYTES = 64 * 1024
+
+# Longest unterminated output held back; beyond it the text is passed on as is
+_MAX_LINE_BYTES = 64 * 1024
+
+# Line breaks in output; a carriage return (progress bars) ends a line too
+_LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+
+
+class _OutputBuffer:
+    """
+    Retains the tail of a code block's output within a character budget.
+
+    Lines are kept in arrival order. Once the budget is exceeded the oldest
+    lines are dropped, and a single line longer than the budget keeps only
+    its end; if a spill path is set, the full output is written there from
+    that point on (starting with everything retained so far).
+    """
+
+    def __init__(self, max_chars: int, spill_path: Optional[Path] = None):
+        self.max_chars = max_chars
+        self.spill_path = spill_path
+        self.dropped = 0
+        self.truncated = 0
+        self._lines: Deque[Tuple[str, str]] = deque()
+        self._chars = 0
+        self._spill = None
+
+    def add(self, stream: str, line: str) -> None:
+        if self._spill is not None:
+            self._spill.write(line)
+        self._lines.append((stream, line))
+        self._chars += len(line)
+        while self._chars > self.max_chars:
+            if self._spill is None and self.spill_path is not None:
+                self._open_spill()
+            if len(self._lines) > 1:
+                _, dropped = self._lines.popleft()
+                self._chars -= len(dropped)
+                self.dropped += 1
+            else:
+                kept_stream, kept = self._lines[0]
+                self._lines[0] = (kept_stream, kept[len(kept) - self.max_chars:])
+                self.truncated += len(kept) - self.max_chars
+                self._chars = self.max_chars
+
+    def _open_spill(self) -> None:
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = self.spill_path.open("w", encoding="utf-8")
+            self._spill.writelines(line for _, line in self._lines)
+        except OSError as e:
+            logging.warning(f"Cannot write execution log {self.spill_path}: {e}")
+            self.spill_path = None
+
+    @property
+    def log_file(self) -> Optional[str]:
+        return str(self.spill_path) if self._spill is not None else None
+
+    def text(self) -> str:
+        """Retained output: stderr before stdout, as ``communicate`` results were joined."""
+        text = "".join(line for stream, line in self._lines if stream == "stderr")
+        text += "".join(line for stream, line in self._lines if stream == "stdout")
+        omitted = []
+        if self.dropped:
+            omitted.append(f"{self.dropped} earlier output lines")
+        if self.truncated:
+            omitted.append(f"the first {self.truncated} characters of a long line")
+        if omitted:
+            where = f"; full output: {self.log_file}" if self.log_file else ""
+            text = f"[... {' and '.join(omitted)} omitted{where}]\n" + text
+        return text
+
+    def close(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+
+
+class _SpawnedProcess:
+    """
+    A code block's process started with ``subprocess.Popen`` and reaped with ``wait4``.
+
+    Offers the subset of ``asyncio.subprocess.Process`` used by
+    PythonScriptExecutor (``pid``, ``returncode``, ``stdout``, ``stderr``,
+    ``wait()`` and ``kill()``), plus ``usage``: the exact CPU time, peak
+    memory and I/O of the process once it exited (see ``reap``). A thread
+    per process waits for the exit, as asyncio's child watcher does.
+    """
+
+    def __init__(self, popen: subprocess.Popen, stdout: asyncio.StreamReader, stderr: asyncio.StreamReader):
+        self.pid = popen.pid
+        self.returncode: Optional[int] = None
+        self.usage: Optional[Dict[str, Any]] = None
+        self.stdout = stdout
+        self.stderr = stderr
+        self._popen = popen
+        loop = asyncio.get_running_loop()
+        self._exited = loop.create_future()
+        threading.Thread(target=self._reap, args=(loop,), name=f"reap-{self.pid}", daemon=True).start()
+
+    @classmethod
+    async def start(cls, program: str, args: List[str], cwd: Path, env: Dict[str, str]) -> "_SpawnedProcess":
+        """Start ``program`` with its output on pipes, leading a new session."""
+        popen = subprocess.Popen(
+            [program, *args], cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            start_new_session=True, bufsize=0,
+        )
+        loop = asyncio.get_running_loop()
+        readers = []
+        for pipe in (popen.stdout, popen.stderr):
+            reader = asyncio.StreamReader()
+            await loop.connect_read_pipe(lambda reader=reader: asyncio.StreamReaderProtocol(reader), pipe)
+            readers.append(reader)
+        return cls(popen, *readers)
+
+    def _reap(self, loop: asyncio.AbstractEventLoop) -> None:
+        returncode, usage = reap(self.pid)
+        # The pid may be reused now; Popen must not wait for it again
+        self._popen.returncode = returncode
+        try:
+            loop.call_soon_threadsafe(self._exit, returncode, usage)
+        except RuntimeError:
+            # The event loop is closed
+            pass
+
+    def _exit(self, returncode: int, usage: Dict[str, Any]) -> None:
+        self.returncode = returncode
+        self.usage = usage
+        if not self._exited.done():
+            self._exited.set_result(returncode)
+
+    async def wait(self) -> int:
+        """Wait for the process to exit and return its exit code."""
+        return await asyncio.shield(self._exited)
+
+    def kill(self) -> None:
+        """Kill the process (SIGKILL)."""
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
 class PythonScriptExecutor(CodeExecutor):
     """A code executor class that executes Python scripts through a local command line
     environment.
@@ -69,6 +243,36 @@ class PythonScriptExecutor(CodeExecutor):
         functions (List[Union[FunctionWithRequirements[Any, A], Callable[..., Any]]]): A list of functions that are available to the code executor. Default is an empty list.
         functions_module (str, optional): The name of the module that will be created to store the functions. Defaults to "functions".
         virtual_env_context (Optional[SimpleNamespace], optional): The virtual environment context. Defaults to None.
+        auto_cleanup (bool, optional): Whether to delete the written code files after execution. Defaults to True.
+        read_overrides (Optional[Dict[str, Dict[str, Any]]], optional): Input CSVs that Python code blocks should
+            read from columnar sidecars, as produced by ``ColumnarCache.read_overrides``. Defaults to None.
+        output_manifests (Optional[Sequence[str]], optional): Output CSVs for which Python code blocks write a
+            result manifest when saving them with ``to_csv``. Defaults to None.
+        interpreter_pool (Optional[InterpreterPool], optional): Pool of pre-warmed interpreters that Python code
+            blocks are forked from when a worker is idle; otherwise a new interpreter is started. Ignored with a
+            virtual environment. Defaults to None.
+        output_callback (Optional[Callable[[str, str], Any]], optional): Called with the stream name ("stdout" or
+            "stderr") and each line of output as it is produced; may be a coroutine function. Defaults to None.
+        max_output_chars (int, optional): Output retained per code block in the result; beyond it the oldest
+            lines are dropped. Defaults to 200000.
+        log_dir (Optional[Union[Path, str]], optional): Directory where the full output of a code block is written
+            when it exceeds ``max_output_chars``; the result's ``log_file`` points to it. Defaults to None.
+        checkpoint_key (Optional[str], optional): Identifies the inputs of the code blocks (e.g. their fingerprints).
+            When set, pooled Python blocks with a PART 3 marker run checkpointed: the state after PART 1-2 is kept
+            and reused while that part, the working directory and the inputs are unchanged. Defaults to None.
+        memory_limit_mb (Optional[int], optional): Address space limit of each code block's process (RLIMIT_AS).
+            Defaults to None (no limit).
+        cpu_limit_seconds (Optional[int], optional): CPU time limit of each code block's process (RLIMIT_CPU).
+            Defaults to None (no limit).
+        setup_cache (Optional[SetupCache], optional): Records completed function setups, so executors with the
+            same functions, requirements and interpreter skip the pip install and import check. Defaults to None.
+        profile (bool, optional): Run Python code blocks under cProfile, a line tracer and tracemalloc; the
+            result's ``profile`` holds the top functions, the timings and peak allocations of the block's own
+            lines, and the largest allocations still held at the end. Profiled blocks never resume from a
+            checkpoint. Defaults to False.
+
+    Each code block runs in its own process group, which is killed as a whole on timeout or cancellation and
+    once the block's process exits. The result reports the resources the blocks used.
 
     Example:
 
@@ -119,9 +323,32 @@ $functions"""
         ] = [],
         functions_module: str = "functions",
         virtual_env_context: Optional[SimpleNamespace] = None,
-        auto_cleanup: bool = True
+        auto_cleanup: bool = True,
+        read_overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+        output_manifests: Optional[Sequence[str]] = None,
+        interpreter_pool: Optional[InterpreterPool] = None,
+        checkpoint_key: Optional[str] = None,
+        output_callback: Optional[Callable[[str, str], Any]] = None,
+        max_output_chars: int = 200_000,
+        log_dir: Optional[Union[Path, str]] = None,
+        memory_limit_mb: Optional[int] = None,
+        cpu_limit_seconds: Optional[int] = None,
+        setup_cache: Optional[SetupCache] = None,
+        profile: bool = False
     ):
         self._auto_cleanup = auto_cleanup
+        # CSV path -> columnar sidecar served to pd.read_csv by the launcher
+        self._read_overrides = read_overrides or {}
+        # Output CSVs the launcher writes a result manifest for
+        self._output_manifests = [os.path.abspath(path) for path in output_manifests or []]
+        self._interpreter_pool = interpreter_pool
+        self._checkpoint_key = checkpoint_key
+        self._output_callback = output_callback
+        self._max_output_chars = max_output_chars
+        self._log_dir = Path(log_dir) if log_dir is not None else None
+        self._limits = resource_limits(memory_limit_mb, cpu_limit_seconds)
+        self._setup_cache = setup_cache
+        self._profile = profile
         if timeout < 1:
             raise ValueError("Timeout must be greater than or equal to 1.")
 
@@ -195,17 +422,25 @@ $functions"""
         lists_of_packages = [x.python_packages for x in self._functions if isinstance(x, FunctionWithRequirements)]
         flattened_packages = [item for sublist in lists_of_packages for item in sublist]
         required_packages = list(set(flattened_packages))
+
+        py_executable = self._virtual_env_context.env_exe if self._virtual_env_context else sys.executable
+        setup_key = install_key = None
+        if self._setup_cache is not None:
+            setup_key = SetupCache.setup_key(func_file_content, required_packages, py_executable)
+            install_key = SetupCache.install_key(required_packages, py_executable)
+            if self._setup_cache.has(setup_key):
+                logging.debug("Functions setup found in the setup cache.")
+                self._setup_functions_complete = True
+                return
+            if required_packages and self._setup_cache.has(install_key):
+                required_packages = []
+
         if len(required_packages) > 0:
             logging.info("Ensuring packages are installed in executor.")
 
             cmd_args = ["-m", "pip", "install"]
             cmd_args.extend(required_packages)
 
-            if self._virtual_env_context:
-                py_executable = self._virtual_env_context.env_exe
-            else:
-                py_executable = sys.executable
-
             task = asyncio.create_task(
                 asyncio.create_subprocess_exec(
                     py_executable,
@@ -229,6 +464,8 @@ $functions"""
 
             if proc.returncode is not None and proc.returncode != 0:
                 raise ValueError(f"Pip install failed. {stdout.decode()}, {stderr.decode()}")
+            if install_key is not None:
+                self._setup_cache.record(install_key, {"packages": sorted(required_packages)})
 
         # Attempt to load the function file to check for syntax errors, imports etc.
         exec_result = await self._execute_code_dont_check_setup(
@@ -238,6 +475,8 @@ $functions"""
         if exec_result.exit_code != 0:
             raise ValueError(f"Functions failed to load: {exec_result.output}")
 
+        if setup_key is not None:
+            self._setup_cache.record(setup_key, {"module": self._functions_module})
         self._setup_functions_complete = True
 
     async def execute_code_blocks(
@@ -268,6 +507,9 @@ $functions"""
         logs_all: str = ""
         file_names: List[Path] = []
         exitcode = 0
+        log_file: Optional[str] = None
+        resource_usage: Optional[Dict[str, Any]] = None
+        profile: Optional[Dict[str, Any]] = None
         
         try:
             for code_block in code_blocks:
@@ -324,60 +566,213 @@ $functions"""
                         os.path.abspath(self._virtual_env_context.env_exe) if self._virtual_env_context else sys.executable
                     )
                     extra_args = [str(written_file.absolute())]
+                    if self._read_overrides:
+                        env[OVERRIDES_ENV_VAR] = json.dumps(self._read_overrides)
+                    if self._output_manifests:
+                        env[MANIFESTS_ENV_VAR] = json.dumps(self._output_manifests)
+                    if self._profile:
+                        profile_file = written_file.with_name(f"{written_file.stem}.profile.json")
+                        env[PROFILE_ENV_VAR] = str(profile_file)
+                    if self._read_overrides or self._output_manifests or self._profile:
+                        extra_args.insert(0, str(Path(sidecar_harness.__file__).resolve()))
                 else:
                     # Get the appropriate command for the language
                     program = lang_to_cmd(lang)
                     # Shell commands (bash, sh, etc.)
                     extra_args = [str(written_file.absolute())]
 
-                # Create a subprocess and run
-                task = asyncio.create_task(
-                    asyncio.create_subprocess_exec(
-                        program,
-                        *extra_args,
-                        cwd=self._work_dir,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        env=env,
-                    )
-                )
+                # Fork from a warm interpreter when one is idle, else create a subprocess
+                task = asyncio.create_task(self._start_process(lang, code, program, extra_args, env))
                 
                 if cancellation_token:
                     cancellation_token.link_future(task)
 
+                spill_path = None
+                if self._log_dir is not None:
+                    spill_path = self._log_dir / f"{written_file.stem}_{datetime.now():%Y%m%d_%H%M%S_%f}.log"
+                output = _OutputBuffer(self._max_output_chars, spill_path)
+                monitor = ResourceMonitor()
+                proc = None
+                stream = None
+
+                started = time.monotonic()
                 try:
+                    # Starting counts against the timeout: a pool worker may load inputs first
                     proc = await task
-                    stdout, stderr = await asyncio.wait_for(proc.communicate(), self._timeout)
+                    stream = asyncio.ensure_future(self._stream_output(proc, output, monitor))
+                    remaining = self._timeout - (time.monotonic() - started)
+                    await asyncio.wait_for(asyncio.shield(stream), max(remaining, 0))
                     exitcode = proc.returncode or 0
                 except asyncio.TimeoutError:
-                    # Try to kill the process
-                    try:
-                        proc.kill()
-                        await proc.wait()
-                    except:
-                        pass
+                    # Kill the process tree; its output is read to the end
+                    if proc is not None:
+                        try:
+                            self._kill(proc)
+                            await asyncio.wait_for(stream, 5)
+                        except:
+                            stream.cancel()
+                    logs_all += output.text()
                     logs_all += "\nTimeout"
                     exitcode = 124
                     break
                 except asyncio.CancelledError:
+                    if proc is not None:
+                        self._kill(proc)
+                    if stream is not None:
+                        stream.cancel()
+                    logs_all += output.text()
                     logs_all += "\nCancelled"
                     exitcode = 125
                     break
+                finally:
+                    output.close()
+                    log_file = log_file or output.log_file
+                    if proc is not None:
+                        monitor.finish(getattr(proc, "usage", None))
+                        resource_usage = add_usage(resource_usage, monitor.usage())
+                    if self._profile and PROFILE_ENV_VAR in env:
+                        profile = self._read_profile(Path(env[PROFILE_ENV_VAR])) or profile
 
-                logs_all += stderr.decode()
-                logs_all += stdout.decode()
+                logs_all += output.text()
 
                 if exitcode != 0:
                     break
 
             code_file = str(file_names[0]) if file_names else None
-            return CommandLineCodeResult(exit_code=exitcode, output=logs_all, code_file=code_file)
+            return CommandLineCodeResult(
+                exit_code=exitcode,
+                output=logs_all,
+                code_file=code_file,
+                log_file=log_file,
+                resource_usage=resource_usage,
+                profile=profile,
+            )
         
         finally:
             if self._auto_cleanup:
                 await self._cleanup_temp_files(file_names)
             
 
+    @staticmethod
+    def _read_profile(path: Path) -> Optional[Dict[str, Any]]:
+        """Load and remove the profile a block's launcher wrote, if any."""
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+        finally:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _kill(proc: Any) -> None:
+        """Kill a code block's process and everything in its process group."""
+        if not kill_process_group(proc.pid) and proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _stream_output(self, proc: Any, output: _OutputBuffer, monitor: ResourceMonitor) -> None:
+        """Read a process's stdout and stderr line by line until it exits, sampling its resources."""
+
+        async def pump(reader: asyncio.StreamReader, stream: str) -> None:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            pending = b""
+            while True:
+                chunk = await reader.read(_READ_CHUNK_BYTES)
+                data = pending + chunk
+                start = 0
+                for match in _LINE_BREAK.finditer(data):
+                    if chunk and match.end() == len(data) and match.group() == b"\r":
+                        # May be the first half of a \r\n split across reads
+                        break
+                    await emit(stream, decoder.decode(data[start:match.start()]) + "\n")
+                    start = match.end()
+                pending = data[start:]
+                if not chunk:
+                    break
+                # Output without line breaks (one huge print) is passed on in pieces
+                while len(pending) >= _MAX_LINE_BYTES:
+                    piece, pending = pending[:_MAX_LINE_BYTES], pending[_MAX_LINE_BYTES:]
+                    await emit(stream, decoder.decode(piece))
+            text = decoder.decode(pending, final=True)
+            if text:
+                await emit(stream, text)
+
+        async def emit(stream: str, line: str) -> None:
+            output.add(stream, line)
+            if self._output_callback is not None:
+                try:
+                    result = self._output_callback(stream, line)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logging.warning(f"Output callback failed: {e}")
+
+        async def watch() -> None:
+            while proc.returncode is None:
+                await asyncio.to_thread(monitor.sample, proc.pid)
+                await asyncio.sleep(SAMPLE_INTERVAL)
+            # Processes the script left behind would keep its output open
+            kill_process_group(proc.pid)
+
+        watcher = asyncio.ensure_future(watch())
+        try:
+            await asyncio.gather(pump(proc.stdout, "stdout"), pump(proc.stderr, "stderr"))
+            await asyncio.to_thread(monitor.sample, proc.pid)
+            await proc.wait()
+        finally:
+            watcher.cancel()
+
+    def _checkpoint_for(self, code: str, env: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Checkpoint of a Python block: where PART 3 starts and a key of everything before it."""
+        if self._checkpoint_key is None or self._profile:
+            return None
+        line = checkpoint_split(code)
+        if line is None:
+            return None
+
+        prefix = "".join(code.splitlines(keepends=True)[:line])
+        launcher_env = sorted((name, value) for name, value in env.items() if name.startswith("IRA_"))
+        key = json.dumps([self._checkpoint_key, prefix, str(self._work_dir), launcher_env, self._limits])
+        return {"key": sha256(key.encode()).hexdigest(), "line": line}
+
+    async def _start_process(self, lang: str, code: str, program: str, extra_args: List[str],
+                             env: Dict[str, str]) -> Any:
+        """Start a code block's process, from the interpreter pool when possible."""
+        harness = str(Path(sidecar_harness.__file__).resolve())
+        if lang == "python" and self._interpreter_pool is not None and not self._virtual_env_context:
+            script_args = extra_args[1:] if extra_args[0] == harness else extra_args
+            proc = await self._interpreter_pool.start(
+                script_args, cwd=self._work_dir, env=env, checkpoint=self._checkpoint_for(code, env),
+                limits=self._limits, timeout=self._timeout,
+            )
+            if proc is not None:
+                return proc
+
+        if self._limits:
+            # The launcher takes the limits before the script (or shell) runs
+            env = {**env, LIMITS_ENV_VAR: json.dumps(self._limits)}
+            if lang != "python":
+                program, extra_args = sys.executable, [harness, EXEC_ARG, program, *extra_args]
+            elif extra_args[0] != harness:
+                extra_args = [harness, *extra_args]
+
+        if REAP_SUPPORTED:
+            return await _SpawnedProcess.start(program, extra_args, cwd=self._work_dir, env=env)
+
+        proc = await asyncio.create_subprocess_exec(
+            program,
+            *extra_args,
+            cwd=self._work_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            start_new_session=True,
+        )
+        return proc
+
     async def _cleanup_temp_files(self, file_names: List[Path]) -> None:
         """Clean up temporary files created during execution."""
         for file_path in file_names:
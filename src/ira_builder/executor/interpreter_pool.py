@@ -0,0 +1,479 @@
+"""
+Pool of pre-warmed Python interpreters for PythonScriptExecutor.
+
+Starting ``python`` and importing pandas takes a second or more, and every
+code attempt and refinement of a workflow pays it again. The pool keeps
+worker interpreters (see ``warm_worker``) that have already imported the
+heavy libraries; a run forks its script process from an idle worker
+instead of starting an interpreter.
+
+Each run still gets its own process: the handle returned by
+``InterpreterPool.start`` mimics ``asyncio.subprocess.Process``
+(``communicate``, ``wait``, ``kill``, ``returncode``), so timeouts and
+results are handled exactly as for a spawned interpreter. Like those, each
+run leads its own process group. Workers are
+replaced after ``max_runs`` runs and when they crash; after
+``max_failures`` consecutive workers fail to start, the pool stops handing
+out workers and callers start interpreters themselves.
+
+With ``input_cache_mb`` set, workers also keep input DataFrames (see
+``warm_worker``): the pool announces the reads of a working directory's
+last run with its next run, and the worker loads them before forking it -
+preferably the worker that ran there last and already holds them - so a
+retry reading the same inputs with the same arguments gets them without
+parsing.
+
+Runs can also be checkpointed: a generated script is split at its PART 3
+marker (``checkpoint_split``), and a worker keeps the state after PART 1-2
+in a checkpoint process. A later run with the same checkpoint key - same
+PART 1-2 text and inputs - is sent to the worker holding it and only runs
+PART 3. With ``checkpoint_mb`` set, checkpoints holding more memory than
+that are not kept.
+
+Each worker therefore keeps up to ``input_cache_mb + checkpoint_mb`` on top
+of its interpreter (see ``memory_footprint_mb``); the execution scheduler
+leaves that out of its budget.
+
+Requires ``os.fork`` and ``socket.send_fds`` (Linux, macOS).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+POOL_SUPPORTED = hasattr(os, "fork") and hasattr(socket, "send_fds")
+
+# Modules imported by workers before they serve runs
+DEFAULT_PRELOAD = ("numpy", "pandas")
+
+# Seconds a worker may take to import its modules
+READY_TIMEOUT = 60.0
+
+# Working directories whose last reads are announced to the input caches
+ANNOUNCED_DIRS = 64
+
+# Run as a script, next to sidecar_harness which it imports
+WORKER_SCRIPT = Path(__file__).resolve().with_name("warm_worker.py")
+
+# Resident memory of a worker that has imported numpy and pandas
+WORKER_BASELINE_MB = 80
+
+# Banner line opening the business logic section of generated code
+_PART3_MARKER = re.compile(r"^#\s*PART 3\b", re.MULTILINE)
+
+
+def memory_footprint_mb(size: int, input_cache_mb: float = 0, checkpoint_mb: float = 0) -> float:
+    """Most memory ``size`` workers keep between runs: interpreters, input caches and checkpoints."""
+    return size * (WORKER_BASELINE_MB + input_cache_mb + checkpoint_mb)
+
+
+def checkpoint_split(code: str) -> Optional[int]:
+    """
+    Find where a generated script's PART 3 starts.
+
+    Args:
+        code: Script source
+
+    Returns:
+        Index of the first line of PART 3 (its banner), or None if the
+        script has no PART 3 marker or the code above it doesn't compile on
+        its own
+    """
+    match = _PART3_MARKER.search(code)
+    if match is None:
+        return None
+    lines = code[:match.start()].splitlines(keepends=True)
+    # Start the split at the separator line above the marker, if any
+    if lines and lines[-1].startswith("# ==="):
+        lines.pop()
+    try:
+        compile("".join(lines), "<checkpoint>", "exec")
+    except (SyntaxError, ValueError):
+        return None
+    return len(lines) if lines else None
+
+
+class _Worker:
+    """A warm worker process and its control socket."""
+
+    def __init__(self, preload: Sequence[str], input_cache_mb: float = 0, checkpoint_mb: float = 0):
+        # File where runs log their reads for the worker's input cache
+        self.read_log = None
+        if input_cache_mb > 0:
+            fd, self.read_log = tempfile.mkstemp(prefix="ira-reads-", suffix=".jsonl")
+            os.close(fd)
+
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, str(WORKER_SCRIPT), str(child_sock.fileno()), ",".join(preload),
+                 str(input_cache_mb), self.read_log or "", str(checkpoint_mb)],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=[child_sock.fileno()],
+            )
+        finally:
+            child_sock.close()
+        parent_sock.setblocking(False)
+        self.sock = parent_sock
+        self.runs = 0
+        self.ready = False
+        # Key of the checkpoint this worker holds
+        self.checkpoint_key: Optional[str] = None
+        # Working directory of its last run, whose inputs its cache holds
+        self.cwd: Optional[str] = None
+        self._buffer = b""
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    async def receive(self) -> Dict[str, Any]:
+        """Read the next control message; raises ConnectionError if the worker is gone."""
+        loop = asyncio.get_running_loop()
+        while b"\n" not in self._buffer:
+            chunk = await loop.sock_recv(self.sock, 4096)
+            if not chunk:
+                raise ConnectionError("worker interpreter exited")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def close(self) -> None:
+        """Stop the worker. It holds no state, so it is simply killed."""
+        self.sock.close()
+        if self.alive():
+            self.process.kill()
+            self.process.wait()
+        if self.read_log:
+            try:
+                os.remove(self.read_log)
+            except OSError:
+                pass
+
+
+class PooledProcess:
+    """
+    A script process forked from a pool worker.
+
+    Offers the subset of ``asyncio.subprocess.Process`` used by
+    PythonScriptExecutor: ``pid``, ``returncode``, ``communicate()``,
+    ``wait()`` and ``kill()``.
+    """
+
+    def __init__(self, pool: "InterpreterPool", worker: _Worker, pid: int,
+                 stdout: asyncio.StreamReader, stderr: asyncio.StreamReader,
+                 transports: List[asyncio.BaseTransport]):
+        self.pid = pid
+        self.returncode: Optional[int] = None
+        # Whether only PART 3 ran, from a checkpoint
+        self.resumed = False
+        # CPU time and peak memory from wait4, once exited
+        self.usage: Optional[Dict[str, Any]] = None
+        self.stdout = stdout
+        self.stderr = stderr
+        self._pool = pool
+        self._worker = worker
+        self._transports = transports
+        # Follow the worker's messages from the start: a checkpointed run
+        # moves to a new process for PART 3, which kill() must target
+        self._waiter = asyncio.ensure_future(self._wait_exit())
+
+    async def _wait_exit(self) -> int:
+        try:
+            message = await self._worker.receive()
+            while "exit" not in message:
+                self.pid = message["pid"]
+                message = await self._worker.receive()
+        except ConnectionError:
+            # The worker died; make sure its orphaned run goes too
+            self.kill()
+            self.returncode = -signal.SIGKILL
+            self._pool._discard(self._worker)
+            return self.returncode
+        except asyncio.CancelledError:
+            # The event loop is going away before the worker reported
+            self.kill()
+            self._pool._discard(self._worker)
+            raise
+
+        self.returncode = message["exit"]
+        self.resumed = message.get("resumed", False)
+        self._pool._record_reads(self._worker.cwd, message.get("reads"))
+        self.usage = message.get("usage")
+        self._worker.checkpoint_key = message.get("checkpoint")
+        self._pool._release(self._worker, resumed=self.resumed)
+        return self.returncode
+
+    async def wait(self) -> int:
+        """Wait for the process to exit and return its exit code."""
+        return await asyncio.shield(self._waiter)
+
+    async def communicate(self) -> Tuple[bytes, bytes]:
+        """Read stdout and stderr until the process exits."""
+        try:
+            stdout, stderr = await asyncio.gather(self.stdout.read(), self.stderr.read())
+        except asyncio.CancelledError:
+            # Timed out or cancelled: stop the run, its worker is released once reaped
+            self.kill()
+            raise
+        finally:
+            for transport in self._transports:
+                transport.close()
+        await self.wait()
+        return stdout, stderr
+
+    def kill(self) -> None:
+        """Kill the process and its process group (SIGKILL)."""
+        if self.returncode is None:
+            try:
+                os.killpg(self.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                # Not yet the leader of its group
+                try:
+                    os.kill(self.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+
+class InterpreterPool:
+    """
+    Keeps warm worker interpreters and forks script processes from them.
+
+    Attributes:
+        size: Number of worker interpreters kept
+        max_runs: Runs served by a worker before it is replaced
+        max_failures: Consecutive worker start failures before the pool gives up
+        preload: Modules imported by workers up front
+        input_cache_mb: Memory each worker may use to cache input DataFrames (0 disables)
+        checkpoint_mb: Largest PART 1-2 state a worker keeps as a checkpoint (0: no limit)
+
+    Example:
+        >>> pool = InterpreterPool(size=2)
+        >>> proc = await pool.start(["script.py"], cwd="/tmp/run", env=dict(os.environ))
+        >>> if proc is None:
+        ...     ...  # every worker is busy: start an interpreter instead
+        >>> stdout, stderr = await asyncio.wait_for(proc.communicate(), 60)
+    """
+
+    def __init__(self, size: int = 2, max_runs: int = 20, max_failures: int = 3,
+                 preload: Sequence[str] = DEFAULT_PRELOAD, input_cache_mb: float = 0, checkpoint_mb: float = 0):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if max_runs < 1:
+            raise ValueError("max_runs must be at least 1")
+
+        self.size = size
+        self.max_runs = max_runs
+        self.max_failures = max_failures
+        self.preload = tuple(preload)
+        self.input_cache_mb = input_cache_mb
+        self.checkpoint_mb = checkpoint_mb
+
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._busy = 0
+        self._failures = 0
+        self._closed = False
+        self._stats = {"runs": 0, "resumed": 0, "recycled": 0, "replaced": 0, "fallbacks": 0}
+        # Working directory -> reads of its last run, announced with the next
+        self._reads: "OrderedDict[str, List[Any]]" = OrderedDict()
+
+        for _ in range(size):
+            self._spawn()
+
+    @property
+    def available(self) -> bool:
+        """Whether the pool still hands out workers."""
+        return not self._closed and self._failures < self.max_failures
+
+    def _spawn(self) -> None:
+        """Start a worker to take a free slot (called with the lock held or during init)."""
+        if not self.available:
+            return
+        try:
+            self._idle.append(_Worker(self.preload, self.input_cache_mb, self.checkpoint_mb))
+        except OSError as e:
+            self._failures += 1
+            logging.warning(f"Failed to start worker interpreter: {e}")
+
+    def _discard(self, worker: _Worker) -> None:
+        """Replace a worker that crashed or is in an unknown state."""
+        worker.close()
+        with self._lock:
+            self._busy -= 1
+            self._stats["replaced"] += 1
+            self._spawn()
+
+    def _release(self, worker: _Worker, resumed: bool = False) -> None:
+        """Return a worker after a run, replacing it once it served max_runs."""
+        with self._lock:
+            self._busy -= 1
+            self._stats["resumed"] += int(resumed)
+            if worker.runs < self.max_runs and worker.alive() and not self._closed:
+                self._idle.append(worker)
+                return
+            self._stats["recycled"] += 1
+        worker.close()
+        with self._lock:
+            self._spawn()
+
+    def _record_reads(self, cwd: Optional[str], reads: Optional[List[Any]]) -> None:
+        """Remember the reads a run logged, to announce them with the next run in its directory."""
+        if not cwd or not reads:
+            return
+        with self._lock:
+            self._reads[cwd] = reads
+            self._reads.move_to_end(cwd)
+            while len(self._reads) > ANNOUNCED_DIRS:
+                self._reads.popitem(last=False)
+
+    async def _acquire(self, checkpoint_key: Optional[str] = None, cwd: Optional[str] = None) -> Optional[_Worker]:
+        """Take an idle worker that is ready, preferring the one holding the checkpoint, then the inputs."""
+        while True:
+            with self._lock:
+                if not self._idle or not self.available:
+                    return None
+                index = next(
+                    (i for i, w in enumerate(self._idle) if checkpoint_key and w.checkpoint_key == checkpoint_key),
+                    next((i for i, w in enumerate(self._idle) if cwd and w.cwd == cwd), 0),
+                )
+                worker = self._idle.pop(index)
+                self._busy += 1
+
+            if worker.alive():
+                if worker.ready:
+                    return worker
+                try:
+                    message = await asyncio.wait_for(worker.receive(), READY_TIMEOUT)
+                    if "ready" in message:
+                        worker.ready = True
+                        with self._lock:
+                            self._failures = 0
+                        return worker
+                except (ConnectionError, asyncio.TimeoutError, ValueError):
+                    pass
+                except asyncio.CancelledError:
+                    self._discard(worker)
+                    raise
+
+            # The worker died or never became ready
+            logging.warning("Worker interpreter failed; replacing it")
+            with self._lock:
+                self._failures += 1
+            self._discard(worker)
+
+    async def start(self, args: List[str], cwd: os.PathLike, env: Dict[str, str],
+                    checkpoint: Optional[Dict[str, Any]] = None,
+                    limits: Optional[Dict[str, List[int]]] = None,
+                    timeout: Optional[float] = None) -> Optional[PooledProcess]:
+        """
+        Run a script in a process forked from an idle worker.
+
+        The script is run through ``sidecar_harness``, which honours the read
+        override and output manifest variables in ``env``.
+
+        Args:
+            args: Script path followed by its arguments
+            cwd: Working directory of the run
+            env: Complete environment of the run
+            checkpoint: ``{"key", "line"}`` to run the script checkpointed:
+                ``line`` from ``checkpoint_split``, and a ``key`` that changes
+                whenever anything PART 1-2 depends on changes
+            limits: rlimits of the run, from ``process_resources.resource_limits``
+            timeout: Seconds to wait for the worker to fork the run, which
+                includes loading the announced inputs (default: no limit)
+
+        Returns:
+            PooledProcess handle, or None if no worker is idle
+
+        Raises:
+            asyncio.TimeoutError: If the run wasn't forked within ``timeout``;
+                the worker is replaced
+        """
+        cwd = os.fspath(cwd)
+        worker = await self._acquire(checkpoint["key"] if checkpoint else None, cwd)
+        if worker is None:
+            with self._lock:
+                self._stats["fallbacks"] += 1
+            return None
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            reads = self._reads.get(cwd, []) if self.input_cache_mb > 0 else []
+        job = json.dumps({
+            "args": list(args), "cwd": cwd, "env": dict(env), "checkpoint": checkpoint,
+            "limits": limits or {}, "reads": reads,
+        }).encode() + b"\n"
+        (stdout_read, stdout_write), (stderr_read, stderr_write) = os.pipe(), os.pipe()
+        readers, transports = [], []
+        try:
+            try:
+                worker.sock.setblocking(True)
+                socket.send_fds(worker.sock, [job], [stdout_write, stderr_write])
+            finally:
+                worker.sock.setblocking(False)
+                os.close(stdout_write)
+                os.close(stderr_write)
+            worker.runs += 1
+            worker.cwd = cwd
+
+            for read_fd in (stdout_read, stderr_read):
+                reader = asyncio.StreamReader()
+                transport, _ = await loop.connect_read_pipe(
+                    lambda reader=reader: asyncio.StreamReaderProtocol(reader),
+                    os.fdopen(read_fd, "rb", 0),
+                )
+                readers.append(reader)
+                transports.append(transport)
+
+            message = await asyncio.wait_for(worker.receive(), timeout)
+        except (OSError, ConnectionError, ValueError, asyncio.TimeoutError, asyncio.CancelledError) as e:
+            for transport in transports:
+                transport.close()
+            for read_fd in (stdout_read, stderr_read)[len(transports):]:
+                os.close(read_fd)
+            self._discard(worker)
+            if isinstance(e, (asyncio.TimeoutError, asyncio.CancelledError)):
+                raise
+            logging.warning(f"Worker interpreter failed to start a run: {e}")
+            return None
+
+        with self._lock:
+            self._stats["runs"] += 1
+        return PooledProcess(self, worker, message["pid"], readers[0], readers[1], transports)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with idle, busy, runs, resumed (runs from a checkpoint),
+            recycled, replaced, fallbacks and available
+        """
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "busy": self._busy,
+                **self._stats,
+                "available": self.available,
+            }
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; busy ones stop when their run ends."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
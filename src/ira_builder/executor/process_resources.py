@@ -0,0 +1,252 @@
+"""
+Resource limits and usage accounting for script processes.
+
+Every script runs as the leader of its own process group, so whatever it
+starts is stopped with it (``kill_process_group``), and can be capped with
+``RLIMIT_AS`` / ``RLIMIT_CPU`` (``resource_limits``).
+
+``ResourceMonitor`` samples the CPU time, resident memory and I/O of a
+run's process tree from ``/proc`` while it runs. Processes are reaped with
+``wait4`` (``reap`` here, or the pool worker for pooled runs), and the
+exact figures reported with their exit replace the sampled ones. Without
+``/proc`` and ``wait4`` only the wall time is known.
+"""
+
+import os
+import signal
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROC_SUPPORTED = os.path.isdir("/proc/self")
+REAP_SUPPORTED = hasattr(os, "wait4")
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+MB = 1024 * 1024
+
+# Seconds between samples of a running process tree
+SAMPLE_INTERVAL = 0.25
+
+
+def resource_limits(memory_mb: Optional[int] = None,
+                    cpu_seconds: Optional[int] = None) -> Dict[str, List[int]]:
+    """
+    Build the rlimits of a script process.
+
+    Args:
+        memory_mb: Address space limit (RLIMIT_AS); allocations beyond it
+            fail with MemoryError. None or 0 for no limit
+        cpu_seconds: CPU time limit (RLIMIT_CPU); the process gets SIGXCPU
+            when it is reached. None or 0 for no limit
+
+    Returns:
+        ``{rlimit name: [soft, hard]}``, JSON-serializable for pool workers
+    """
+    limits = {}
+    if resource is None:
+        return limits
+    if memory_mb:
+        limits["RLIMIT_AS"] = [memory_mb * MB, memory_mb * MB]
+    if cpu_seconds:
+        # The hard limit (SIGKILL) a second later lets SIGXCPU arrive first
+        limits["RLIMIT_CPU"] = [cpu_seconds, cpu_seconds + 1]
+    return limits
+
+
+def kill_process_group(pgid: int) -> bool:
+    """Kill every process in a group (SIGKILL); returns whether the group existed."""
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+def _read_io(pid: int) -> Tuple[int, int]:
+    """Bytes a process read and wrote (files and pipes alike), 0 where unknown."""
+    read = written = 0
+    try:
+        with open(f"/proc/{pid}/io", "rb") as f:
+            for line in f:
+                name, _, value = line.partition(b":")
+                if name == b"rchar":
+                    read = int(value)
+                elif name == b"wchar":
+                    written = int(value)
+    except (OSError, ValueError):
+        pass
+    return read, written
+
+
+def reap(pid: int) -> Tuple[int, Dict[str, Any]]:
+    """
+    Wait for a child process to exit and reap it (blocking).
+
+    Args:
+        pid: Child process id
+
+    Returns:
+        Tuple of (exit code, negative for a signal; usage with cpu_seconds
+        and max_rss_bytes from ``wait4``, covering the descendants it
+        reaped, and read_bytes and write_bytes where ``/proc`` is available)
+    """
+    usage: Dict[str, Any] = {}
+    if PROC_SUPPORTED and hasattr(os, "waitid"):
+        # Its I/O counters stay readable until it is reaped
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        usage["read_bytes"], usage["write_bytes"] = _read_io(pid)
+    _, status, rusage = os.wait4(pid, 0)
+    # ru_maxrss is in kilobytes, except on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    usage["cpu_seconds"] = rusage.ru_utime + rusage.ru_stime
+    usage["max_rss_bytes"] = rusage.ru_maxrss * scale
+    return os.waitstatus_to_exitcode(status), usage
+
+
+def _process_tree(pid: int) -> List[int]:
+    """A process and its live descendants, from ``/proc/<pid>/task/*/children``."""
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        try:
+            tasks = os.listdir(f"/proc/{current}/task")
+        except OSError:
+            continue
+        for task in tasks:
+            try:
+                with open(f"/proc/{current}/task/{task}/children", "rb") as f:
+                    pending.extend(int(child) for child in f.read().split())
+            except (OSError, ValueError):
+                pass
+    return tree
+
+
+def _read_process(pid: int) -> Optional[Tuple[float, int, int, int]]:
+    """CPU seconds (own and reaped children's), peak RSS bytes, bytes read and written."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            fields = f.read().rsplit(b")", 1)[1].split()
+        cpu = sum(int(value) for value in fields[11:15]) / _CLOCK_TICKS
+        rss = int(fields[21]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+    try:
+        with open(f"/proc/{pid}/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    rss = max(rss, int(line.split()[1]) * 1024)
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+
+    read, written = _read_io(pid)
+    return cpu, rss, read, written
+
+
+class ResourceMonitor:
+    """
+    Accounts the resources used by one code block's process.
+
+    Call ``sample`` with the process while it runs - off the event loop, it
+    reads ``/proc`` - and ``finish`` once it exited. Exited processes' CPU
+    time and I/O roll up into the parent that reaps them, so each tree's
+    figures are the largest sums seen over its live processes. A
+    checkpointed pool run moves to a new process for PART 3; the trees are
+    added up.
+    """
+
+    def __init__(self):
+        self._started = time.monotonic()
+        self._finished: Optional[float] = None
+        # root pid -> [cpu seconds, bytes read, bytes written]
+        self._trees: Dict[int, List[float]] = {}
+        self._peak_rss = 0
+        self._exact: Optional[Dict[str, Any]] = None
+
+    def sample(self, pid: int) -> None:
+        """Add a sample of ``pid`` and its descendants."""
+        if not PROC_SUPPORTED:
+            return
+        totals = [0.0, 0, 0, 0]
+        found = False
+        for member in _process_tree(pid):
+            values = _read_process(member)
+            if values is not None:
+                found = True
+                totals = [total + value for total, value in zip(totals, values)]
+        if not found:
+            return
+
+        cpu, rss, read, written = totals
+        tree = self._trees.setdefault(pid, [0.0, 0, 0])
+        tree[0] = max(tree[0], cpu)
+        tree[1] = max(tree[1], read)
+        tree[2] = max(tree[2], written)
+        self._peak_rss = max(self._peak_rss, rss)
+
+    def finish(self, exact: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Stop the wall clock.
+
+        Args:
+            exact: ``{"cpu_seconds", "max_rss_bytes"}`` from ``wait4``, if the
+                process was reaped with it, with ``read_bytes`` and
+                ``write_bytes`` read before it was reaped
+        """
+        self._finished = time.monotonic()
+        self._exact = exact
+
+    def usage(self) -> Dict[str, Any]:
+        """
+        Get the resources used.
+
+        Returns:
+            Dictionary with wall_seconds, cpu_seconds, peak_rss_mb, read_bytes
+            and write_bytes (bytes passed through read/write calls, files and
+            pipes alike); figures that couldn't be measured are None
+        """
+        end = self._finished if self._finished is not None else time.monotonic()
+        cpu = peak = read = written = None
+        if self._trees:
+            cpu = sum(tree[0] for tree in self._trees.values())
+            peak = self._peak_rss
+            read = int(sum(tree[1] for tree in self._trees.values()))
+            written = int(sum(tree[2] for tree in self._trees.values()))
+        if self._exact:
+            cpu = self._exact["cpu_seconds"]
+            peak = max(peak or 0, self._exact["max_rss_bytes"])
+            read = self._exact.get("read_bytes", read)
+            written = self._exact.get("write_bytes", written)
+
+        return {
+            "wall_seconds": round(end - self._started, 3),
+            "cpu_seconds": round(cpu, 3) if cpu is not None else None,
+            "peak_rss_mb": round(peak / MB, 1) if peak is not None else None,
+            "read_bytes": read,
+            "write_bytes": written,
+        }
+
+
+def add_usage(total: Optional[Dict[str, Any]], usage: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine the usage of consecutive code blocks: sums, and the largest peak memory."""
+    if total is None:
+        return dict(usage)
+    combined = {}
+    for name, value in usage.items():
+        previous = total.get(name)
+        if value is None or previous is None:
+            combined[name] = value if previous is None else previous
+        elif name == "peak_rss_mb":
+            combined[name] = max(previous, value)
+        else:
+            combined[name] = round(previous + value, 3)
+    return combined
@@ -0,0 +1,97 @@
+"""
+On-disk cache of PythonScriptExecutor function setups.
+
+Before running its first code block, an executor with functions writes the
+functions module, pip-installs the functions' requirements and runs the
+module once to check that it imports. Executors are created per execution,
+so an identical setup was repeated for every run.
+
+The cache records completed setups under keys derived from what they
+depend on:
+
+- installs: the requirement set and the interpreter
+- setups: the functions module's source, the requirement set and the
+  interpreter
+
+The interpreter is identified by its path and modification time, so a
+recreated virtual environment invalidates its entries.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+
+def interpreter_id(executable: str) -> list:
+    """Identify an interpreter by its absolute path and modification time."""
+    path = os.path.abspath(executable)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return [path, mtime_ns]
+
+
+class SetupCache:
+    """
+    Records completed pip installs and function setups on disk.
+
+    Attributes:
+        cache_dir: Directory holding one JSON marker per completed step
+
+    Example:
+        >>> cache = SetupCache("./storage/setup_cache")
+        >>> executor = PythonScriptExecutor(functions=[load_ledger], setup_cache=cache)
+    """
+
+    def __init__(self, cache_dir: Union[Path, str]):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def install_key(packages: Iterable[str], executable: Optional[str] = None) -> str:
+        """Key of installing ``packages`` into ``executable`` (default: this interpreter)."""
+        payload = ["install", sorted(set(packages)), interpreter_id(executable or sys.executable)]
+        return sha256(json.dumps(payload).encode()).hexdigest()
+
+    @staticmethod
+    def setup_key(functions_source: str, packages: Iterable[str], executable: Optional[str] = None) -> str:
+        """Key of a checked functions module with its requirements."""
+        payload = [
+            "setup", functions_source, sorted(set(packages)), interpreter_id(executable or sys.executable),
+        ]
+        return sha256(json.dumps(payload).encode()).hexdigest()
+
+    def _marker(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def has(self, key: str) -> bool:
+        """Whether the step with this key completed before."""
+        return self._marker(key).exists()
+
+    def record(self, key: str, details: Optional[Dict[str, Any]] = None) -> None:
+        """Record a completed step; failures to write only lose the cache entry."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"recorded_at": time.time(), **(details or {})}, f)
+            os.replace(tmp_path, self._marker(key))
+        except OSError as e:
+            logging.warning(f"Cannot record setup in {self.cache_dir}: {e}")
+
+    def clear(self) -> int:
+        """Remove all recorded steps; returns how many were removed."""
+        removed = 0
+        for marker in self.cache_dir.glob("*.json"):
+            try:
+                marker.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
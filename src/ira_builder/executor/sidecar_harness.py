@@ -0,0 +1,572 @@
+"""
+Script launcher that serves input CSVs from columnar sidecars.
+
+Run as ``python sidecar_harness.py script.py [args...]``. Before executing
+the script this patches ``pandas.read_csv`` so that reading one of the CSVs
+listed in the ``IRA_READ_OVERRIDES`` environment variable (JSON mapping of
+absolute CSV path to ``{"path", "format", "columns"}``) loads its typed
+sidecar instead of parsing the text. The compact read options recommended
+in the coder context (``dtype`` with category or narrower integer types,
+``parse_dates`` with ``date_format``) are applied to the loaded columns;
+calls using options a sidecar can't honour (nrows, converters, a dtype the
+sidecar column can't be converted to exactly, ...) go to the real
+``read_csv``.
+
+It also patches ``DataFrame.to_csv``: when the script writes one of the
+output CSVs listed in ``IRA_OUTPUT_MANIFESTS`` (JSON list of absolute
+paths), a JSON manifest describing the DataFrame - row and column counts,
+dtypes, null counts, numeric summary and first rows - is written next to it
+while the data is still in memory, so the output validators don't have to
+parse the CSV again (see ``read_manifest``).
+
+When forked from a warm worker (see ``warm_worker``), ``read_csv`` calls
+are first looked up in ``READ_CACHE``: input DataFrames the worker loaded
+after earlier runs, keyed by file fingerprint and read arguments, and
+shared with the script copy-on-write by the fork. Every cacheable call is
+logged to ``IRA_READ_LOG`` so the worker can load it for the next run.
+
+With ``IRA_LIMITS`` set (JSON ``{rlimit name: [soft, hard]}``), the
+launcher takes those rlimits before anything else runs, so a script started
+as a new process is limited from its first instruction, as one forked from
+a warm worker is. Run as ``python sidecar_harness.py --exec program
+[args...]`` it only takes the limits and then execs ``program`` (shell code
+blocks).
+
+With ``IRA_PROFILE`` set to a file path, the script runs under cProfile,
+a line tracer for the script's own lines and tracemalloc, and a JSON
+profile of its hot spots is written there when it ends (see
+``_ScriptProfiler``).
+
+The script runs as ``__main__`` with its own line numbers, and tracebacks
+are printed without the launcher's frames, so error output looks exactly
+as if the script had been run directly.
+
+Only the standard library and pandas may be imported here: this file runs
+in the execution subprocess, outside the ira_builder package.
+"""
+
+import collections
+import cProfile
+import json
+import linecache
+import os
+import pstats
+import runpy
+import sys
+import time
+import tracemalloc
+import traceback
+import types
+
+OVERRIDES_ENV_VAR = "IRA_READ_OVERRIDES"
+MANIFESTS_ENV_VAR = "IRA_OUTPUT_MANIFESTS"
+READ_LOG_ENV_VAR = "IRA_READ_LOG"
+PROFILE_ENV_VAR = "IRA_PROFILE"
+LIMITS_ENV_VAR = "IRA_LIMITS"
+
+# First argument to exec another program after taking the limits
+EXEC_ARG = "--exec"
+
+# Input DataFrames held by a warm worker and inherited by the scripts it
+# forks: read_cache_key -> DataFrame, least recently used first
+READ_CACHE = collections.OrderedDict()
+
+# Output manifests are named <output path><MANIFEST_SUFFIX>
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Rows of the output kept in its manifest for previews
+MANIFEST_PREVIEW_ROWS = 20
+
+# Entries kept in each ranking of a profile
+PROFILE_TOP = 20
+
+# to_csv keyword arguments whose output the manifest describes exactly
+_MANIFEST_KWARGS = {"index", "encoding"}
+
+# read_csv keyword arguments that a sidecar load reproduces exactly
+_SUPPORTED_KWARGS = {"low_memory", "usecols", "dtype", "parse_dates", "date_format"}
+
+_INT_DTYPES = {"int8", "int16", "int32", "int64"}
+
+
+def _apply_read_options(pd, df, dtype=None, parse_dates=None, date_format=None):
+    """
+    Convert sidecar columns the way ``read_csv`` would with these options.
+
+    Returns the converted DataFrame, or None if the result could differ from
+    ``read_csv`` (the caller then parses the CSV).
+    """
+    import numpy as np
+
+    if dtype is not None:
+        if not isinstance(dtype, dict):
+            return None
+        for col, target in dtype.items():
+            if col not in df.columns:
+                continue
+            target, current = str(target), df[col].dtype
+            if target == str(current):
+                continue
+            if target == "category" and current == object:
+                converted = df[col].astype("category")
+                # read_csv builds categories from the raw strings
+                if not all(isinstance(value, str) for value in converted.cat.categories):
+                    return None
+                df[col] = converted
+            elif target in _INT_DTYPES and pd.api.types.is_integer_dtype(current):
+                info = np.iinfo(target)
+                if len(df) and (df[col].min() < info.min or df[col].max() > info.max):
+                    return None
+                df[col] = df[col].astype(target)
+            else:
+                return None
+
+    if parse_dates:
+        if not isinstance(parse_dates, (list, tuple)) or not all(isinstance(col, str) for col in parse_dates):
+            return None
+        formats = date_format if isinstance(date_format, dict) else dict.fromkeys(parse_dates, date_format)
+        for col in parse_dates:
+            if col not in df.columns or not isinstance(formats.get(col), str) or df[col].dtype != object:
+                return None
+            try:
+                df[col] = pd.to_datetime(df[col], format=formats[col])
+            except (ValueError, TypeError):
+                # read_csv would leave the column as text
+                return None
+    elif date_format is not None:
+        return None
+
+    return df
+
+
+def _sidecar_reader(read_csv, overrides):
+    """Wrap ``read_csv`` so registered CSVs load from their sidecars."""
+    import pandas as pd
+
+    def read_csv_with_sidecars(filepath_or_buffer, *args, **kwargs):
+        entry = None
+        if not args and set(kwargs) <= _SUPPORTED_KWARGS and isinstance(filepath_or_buffer, (str, os.PathLike)):
+            entry = overrides.get(os.path.abspath(os.fspath(filepath_or_buffer)))
+
+        usecols = kwargs.get("usecols")
+        if entry is not None and usecols is not None:
+            usecols = list(usecols)
+            if not all(isinstance(col, str) and col in entry["columns"] for col in usecols):
+                entry = None
+
+        if entry is not None:
+            try:
+                if entry["format"] == "parquet":
+                    df = pd.read_parquet(entry["path"], columns=usecols)
+                else:
+                    df = pd.read_pickle(entry["path"])
+                if usecols is not None:
+                    wanted = set(usecols)
+                    df = df[[col for col in entry["columns"] if col in wanted]]
+                df = _apply_read_options(
+                    pd, df.copy() if usecols is not None else df,
+                    dtype=kwargs.get("dtype"),
+                    parse_dates=kwargs.get("parse_dates"),
+                    date_format=kwargs.get("date_format"),
+                )
+                if df is not None:
+                    return df
+            except Exception:
+                pass
+
+        return read_csv(filepath_or_buffer, *args, **kwargs)
+
+    return read_csv_with_sidecars
+
+
+def read_cache_key(path, kwargs):
+    """
+    Cache key of a ``read_csv(path, **kwargs)`` call on the file as it is now.
+
+    Returns None for files that can't be read or arguments that aren't
+    plain JSON values (those calls are never cached).
+    """
+    try:
+        stat = os.stat(path)
+        return json.dumps(
+            [os.path.abspath(path), stat.st_size, stat.st_mtime_ns, kwargs], sort_keys=True
+        )
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _cached_reader(read_csv, log_path):
+    """Wrap ``read_csv`` so calls are served from READ_CACHE and logged for the worker."""
+    handed_out = set()
+
+    def read_csv_cached(filepath_or_buffer, *args, **kwargs):
+        key = None
+        if not args and isinstance(filepath_or_buffer, (str, os.PathLike)):
+            path = os.path.abspath(os.fspath(filepath_or_buffer))
+            key = read_cache_key(path, kwargs)
+        if key is None:
+            return read_csv(filepath_or_buffer, *args, **kwargs)
+
+        try:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps([path, kwargs], sort_keys=True) + "\n")
+        except OSError:
+            pass
+
+        df = READ_CACHE.get(key)
+        if df is None:
+            return read_csv(filepath_or_buffer, **kwargs)
+        # The fork already gives this process its own copy of the cached
+        # frame; a second read of the same input must not share it
+        if key in handed_out:
+            return df.copy()
+        handed_out.add(key)
+        return df
+
+    return read_csv_cached
+
+
+def manifest_path(output_path):
+    """Path of the manifest describing an output CSV."""
+    return os.fspath(output_path) + MANIFEST_SUFFIX
+
+
+def read_manifest(output_path):
+    """
+    Load the manifest of an output CSV, if it describes the file as it is now.
+
+    Returns None if there is no manifest, or the CSV was written again
+    without one (size or modification time differ).
+    """
+    try:
+        with open(manifest_path(output_path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        stat = os.stat(output_path)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("size") != stat.st_size or manifest.get("mtime_ns") != stat.st_mtime_ns:
+        return None
+    return manifest
+
+
+def _remove_manifest(output_path):
+    try:
+        os.remove(manifest_path(output_path))
+    except OSError:
+        pass
+
+
+def _write_manifest(df, output_path):
+    """Describe a DataFrame just written to ``output_path``."""
+    stat = os.stat(output_path)
+    numeric = df.select_dtypes(include=["number"])
+    head = df.head(MANIFEST_PREVIEW_ROWS)
+    manifest = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "row_count": len(df),
+        "column_count": len(df.columns),
+        "columns": [str(col) for col in df.columns],
+        "dtypes": {str(col): str(dtype) for col, dtype in df.dtypes.items()},
+        "missing_values": {
+            str(col): int(count) for col, count in df.isnull().sum().items() if count > 0
+        },
+        "numerical_summary": (
+            numeric.describe().rename(columns=str).to_dict() if len(numeric.columns) else None
+        ),
+        # Missing values as NaN, as they read back from the CSV
+        "head": head.astype(object).where(head.notna(), float("nan")).values.tolist(),
+    }
+
+    path = manifest_path(output_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, default=str)
+    os.replace(tmp_path, path)
+
+
+def _manifest_writer(to_csv, outputs):
+    """Wrap ``DataFrame.to_csv`` so writing a registered output also writes its manifest."""
+
+    def to_csv_with_manifest(self, path_or_buf=None, *args, **kwargs):
+        target = None
+        if isinstance(path_or_buf, (str, os.PathLike)):
+            target = os.path.abspath(os.fspath(path_or_buf))
+            if target not in outputs:
+                target = None
+            else:
+                _remove_manifest(target)
+
+        result = to_csv(self, path_or_buf, *args, **kwargs)
+
+        if (
+            target is not None and not args and set(kwargs) <= _MANIFEST_KWARGS
+            and kwargs.get("index", True) is False and self.columns.is_unique
+        ):
+            try:
+                _write_manifest(self, target)
+            except Exception:
+                _remove_manifest(target)
+        return result
+
+    return to_csv_with_manifest
+
+
+def _install_overrides():
+    overrides = json.loads(os.environ.pop(OVERRIDES_ENV_VAR, "") or "{}")
+    if not overrides:
+        return
+
+    import pandas as pd
+
+    pd.read_csv = _sidecar_reader(pd.read_csv, overrides)
+
+
+def _install_read_cache():
+    log_path = os.environ.pop(READ_LOG_ENV_VAR, "")
+    if not log_path:
+        return
+
+    import pandas as pd
+
+    pd.read_csv = _cached_reader(pd.read_csv, log_path)
+
+
+def _install_manifests():
+    outputs = set(json.loads(os.environ.pop(MANIFESTS_ENV_VAR, "") or "[]"))
+    if not outputs:
+        return
+
+    import pandas as pd
+
+    pd.DataFrame.to_csv = _manifest_writer(pd.DataFrame.to_csv, outputs)
+
+
+def _apply_limits():
+    limits = json.loads(os.environ.pop(LIMITS_ENV_VAR, "") or "{}")
+    if not limits:
+        return
+
+    import resource
+
+    for name, (soft, hard) in limits.items():
+        resource.setrlimit(getattr(resource, name), (soft, hard))
+
+
+def _print_script_traceback(exc):
+    """Print a traceback without the launcher's own frames."""
+    frames = [
+        frame for frame in traceback.extract_tb(exc.__traceback__)
+        if frame.filename != __file__
+        and os.path.basename(frame.filename) not in ("runpy.py", "<frozen runpy>")
+    ]
+    sys.stderr.write("Traceback (most recent call last):\n")
+    sys.stderr.write("".join(traceback.format_list(frames)))
+    sys.stderr.write("".join(traceback.format_exception_only(type(exc), exc)))
+
+
+class _ScriptProfiler:
+    """
+    Profiles a script run: functions with cProfile, the script's own lines
+    with a trace function, and memory with tracemalloc.
+
+    Each line of the script is timed including the calls it makes, per
+    frame, so a line calling a function of the script includes that
+    function's lines. Its peak allocation is the most traced memory above
+    what was allocated when the line started, observed while it ran.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        # lineno -> [hits, seconds, peak bytes]
+        self.lines = {}
+        # frame -> [lineno, start time, traced memory at start, peak bytes]
+        self._open = {}
+        self._peak = 0
+        self._profiler = cProfile.Profile()
+        self._started = None
+
+    def _update_peaks(self):
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self._peak = max(self._peak, peak)
+        for entry in self._open.values():
+            entry[3] = max(entry[3], peak - entry[2])
+        return current
+
+    def _close(self, frame, now):
+        entry = self._open.pop(frame, None)
+        if entry is not None:
+            line = self.lines.setdefault(entry[0], [0, 0.0, 0])
+            line[0] += 1
+            line[1] += now - entry[1]
+            line[2] = max(line[2], entry[3])
+
+    def _trace(self, frame, event, arg):
+        if frame.f_code.co_filename != self.script:
+            return None
+        return self._trace_line
+
+    def _trace_line(self, frame, event, arg):
+        now = time.perf_counter()
+        current = self._update_peaks()
+        if event == "line":
+            self._close(frame, now)
+            self._open[frame] = [frame.f_lineno, now, current, 0]
+        elif event == "return":
+            self._close(frame, now)
+        return self._trace_line
+
+    def start(self):
+        tracemalloc.start()
+        self._started = time.perf_counter()
+        sys.settrace(self._trace)
+        self._profiler.enable()
+
+    def stop(self):
+        self._profiler.disable()
+        sys.settrace(None)
+        now = time.perf_counter()
+        self._update_peaks()
+        for frame in list(self._open):
+            self._close(frame, now)
+        wall = now - self._started
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        return wall, snapshot
+
+    def report(self, wall, snapshot):
+        """The profile: top functions, script lines, and memory."""
+        mb = 1024 * 1024
+        stats = pstats.Stats(self._profiler).stats
+        functions = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:PROFILE_TOP]
+        lines = [
+            {
+                "line": lineno,
+                "code": linecache.getline(self.script, lineno).strip(),
+                "hits": hits,
+                "seconds": round(seconds, 4),
+                "peak_alloc_mb": round(peak / mb, 2),
+            }
+            for lineno, (hits, seconds, peak) in self.lines.items()
+        ]
+        retained = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]).statistics("lineno")[:PROFILE_TOP]
+        return {
+            "wall_seconds": round(wall, 4),
+            "functions": [
+                {
+                    "function": name,
+                    "file": filename,
+                    "line": lineno,
+                    "calls": calls,
+                    "self_seconds": round(self_time, 4),
+                    "cumulative_seconds": round(cumulative, 4),
+                }
+                for (filename, lineno, name), (_, calls, self_time, cumulative, _) in functions
+            ],
+            "lines": sorted(lines, key=lambda line: line["seconds"], reverse=True)[:PROFILE_TOP],
+            "memory": {
+                "peak_mb": round(self._peak / mb, 2),
+                "peak_lines": sorted(
+                    (line for line in lines if line["peak_alloc_mb"] > 0),
+                    key=lambda line: line["peak_alloc_mb"], reverse=True,
+                )[:PROFILE_TOP],
+                "retained": [
+                    {
+                        "file": stat.traceback[0].filename,
+                        "line": stat.traceback[0].lineno,
+                        "size_mb": round(stat.size / mb, 2),
+                        "blocks": stat.count,
+                    }
+                    for stat in retained
+                ],
+            },
+        }
+
+
+def _run_profiled(script, profile_path):
+    """Run the script under ``_ScriptProfiler`` and write its profile, also if it fails."""
+    profiler = _ScriptProfiler(script)
+    profiler.start()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        wall, snapshot = profiler.stop()
+        try:
+            with open(profile_path, "w", encoding="utf-8") as f:
+                json.dump(profiler.report(wall, snapshot), f)
+        except Exception as exc:
+            sys.stderr.write(f"Profile not written: {exc}\n")
+
+
+def prepare(argv):
+    """Set up the interpreter to run ``argv[1]`` as the script; returns its path."""
+    script = os.path.abspath(argv[1])
+    sys.argv = argv[1:]
+    sys.path[0] = os.path.dirname(script)
+
+    _install_overrides()
+    _install_read_cache()
+    _install_manifests()
+    return script
+
+
+def main_module(script):
+    """Install and return a fresh ``__main__`` module for running script code with ``run_code``."""
+    module = types.ModuleType("__main__")
+    module.__file__ = script
+    sys.modules["__main__"] = module
+    return module
+
+
+def run_code(code, namespace):
+    """
+    Run compiled script code the way the interpreter runs a script.
+
+    Returns the exit code: 0, the code of a SystemExit, or 1 after printing
+    the traceback of an uncaught exception.
+    """
+    try:
+        exec(code, namespace)
+    except SystemExit as exc:
+        if exc.code is None:
+            return 0
+        if isinstance(exc.code, int):
+            return exc.code
+        sys.stderr.write(f"{exc.code}\n")
+        return 1
+    except BaseException as exc:
+        _print_script_traceback(exc)
+        return 1
+    return 0
+
+
+def main():
+    if len(sys.argv) < 2 or (sys.argv[1] == EXEC_ARG and len(sys.argv) < 3):
+        sys.stderr.write(f"usage: sidecar_harness.py [{EXEC_ARG} program] script.py [args...]\n")
+        sys.exit(2)
+
+    _apply_limits()
+    if sys.argv[1] == EXEC_ARG:
+        os.execvp(sys.argv[2], sys.argv[2:])
+
+    script = prepare(sys.argv)
+    profile_path = os.environ.get(PROFILE_ENV_VAR)
+
+    try:
+        if profile_path:
+            _run_profiled(script, profile_path)
+        else:
+            runpy.run_path(script, run_name="__main__")
+    except SystemExit:
+        raise
+    except BaseException as exc:
+        _print_script_traceback(exc)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
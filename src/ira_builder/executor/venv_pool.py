@@ -0,0 +1,148 @@
+"""
+Pre-provisioned virtual environments for PythonScriptExecutor.
+
+Creating a virtual environment and installing packages into it takes far
+longer than running a script, so executors that need an isolated
+environment lease one from a pool provisioned ahead of time. A leased
+environment is passed to the executor as its ``virtual_env_context``.
+
+Environments live under the pool's root directory and are reused across
+restarts: an environment is only created (and its packages installed) when
+its directory doesn't hold one provisioned with the same packages.
+"""
+
+import json
+import logging
+import subprocess
+import threading
+import venv
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from .setup_cache import SetupCache
+
+# Written into each environment once it is provisioned
+_MARKER = "ira-provisioned.json"
+
+
+class VirtualEnvPool:
+    """
+    A fixed set of virtual environments leased to one executor at a time.
+
+    Attributes:
+        root_dir: Directory holding the environments
+        size: Number of environments
+        packages: Packages installed into every environment
+        system_site_packages: Whether the environments see this interpreter's packages
+
+    Example:
+        >>> pool = VirtualEnvPool("./storage/venvs", size=2, packages=["openpyxl"])
+        >>> pool.provision()
+        >>> with pool.lease() as env:
+        ...     executor = PythonScriptExecutor(virtual_env_context=env)
+        ...     result = await executor.execute_code_blocks(blocks)
+    """
+
+    def __init__(self, root_dir: Union[Path, str], size: int = 2, packages: Sequence[str] = (),
+                 system_site_packages: bool = True, setup_cache: Optional[SetupCache] = None):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self.root_dir = Path(root_dir)
+        self.size = size
+        self.packages = sorted(set(packages))
+        self.system_site_packages = system_site_packages
+        self.setup_cache = setup_cache
+
+        self._lock = threading.Lock()
+        self._idle: List[SimpleNamespace] = []
+        self._leased = 0
+        self._provisioned = False
+        self._stats = {"leases": 0, "misses": 0}
+
+    def _builder(self) -> venv.EnvBuilder:
+        return venv.EnvBuilder(system_site_packages=self.system_site_packages, with_pip=bool(self.packages))
+
+    def _provision_env(self, env_dir: Path) -> SimpleNamespace:
+        """Create one environment, or reuse it if it was provisioned with the same packages."""
+        builder = self._builder()
+        marker = env_dir / _MARKER
+        try:
+            provisioned = json.loads(marker.read_text())
+        except (OSError, ValueError):
+            provisioned = None
+
+        expected = {"packages": self.packages, "system_site_packages": self.system_site_packages}
+        if provisioned != expected:
+            logging.info(f"Creating virtual environment {env_dir}")
+            builder.clear = True
+            builder.create(str(env_dir))
+            builder.clear = False
+            if self.packages:
+                subprocess.run(
+                    [str(builder.ensure_directories(env_dir).env_exe), "-m", "pip", "install", "--quiet",
+                     *self.packages],
+                    check=True,
+                    capture_output=True,
+                )
+            marker.write_text(json.dumps(expected))
+
+        context = builder.ensure_directories(env_dir)
+        if self.setup_cache is not None and self.packages:
+            # Executors in this environment needn't install these again
+            self.setup_cache.record(SetupCache.install_key(self.packages, context.env_exe),
+                                    {"packages": self.packages})
+        return context
+
+    def provision(self) -> None:
+        """
+        Create the environments that don't exist yet. Idempotent.
+
+        Raises:
+            subprocess.CalledProcessError: If installing the packages fails
+        """
+        with self._lock:
+            if self._provisioned:
+                return
+            contexts = [self._provision_env(self.root_dir / f"env-{i}") for i in range(self.size)]
+            self._idle.extend(contexts)
+            self._provisioned = True
+
+    def acquire(self) -> Optional[SimpleNamespace]:
+        """Take an idle environment, or None if all are leased."""
+        self.provision()
+        with self._lock:
+            if not self._idle:
+                self._stats["misses"] += 1
+                return None
+            self._leased += 1
+            self._stats["leases"] += 1
+            return self._idle.pop()
+
+    def release(self, context: SimpleNamespace) -> None:
+        """Return a leased environment."""
+        with self._lock:
+            self._leased -= 1
+            self._idle.append(context)
+
+    @contextmanager
+    def lease(self) -> Iterator[Optional[SimpleNamespace]]:
+        """Lease an environment for the duration of the block; yields None if all are leased."""
+        context = self.acquire()
+        try:
+            yield context
+        finally:
+            if context is not None:
+                self.release(context)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with idle, leased, leases and misses (no environment idle)
+        """
+        with self._lock:
+            return {"idle": len(self._idle), "leased": self._leased, **self._stats}
@@ -0,0 +1,434 @@
+"""
+Pre-warmed interpreter for running generated scripts.
+
+Started by ``InterpreterPool`` as::
+
+    python warm_worker.py <control fd> <module,module,...> [<input cache MB> <read log> [<checkpoint MB>]]
+
+The worker imports the given modules once (numpy, pandas), reports ready on
+the control socket and then serves jobs one at a time. For each job it
+forks: the child takes the job's stdout/stderr pipes, working directory,
+environment and arguments, and runs the script through
+``sidecar_harness.main`` - exactly as ``python sidecar_harness.py script.py``
+would, minus interpreter startup and imports. The worker itself never runs
+user code, so every job starts from the same clean state.
+
+With an input cache, the worker also keeps input DataFrames for its jobs.
+A job's ``read_csv`` calls are logged to the read log file and reported
+with its exit; the pool announces them with the next job of the same
+working directory as ``"reads"`` (``[[path, kwargs], ...]``). Before
+forking that job the worker loads the announced reads it doesn't hold into
+``sidecar_harness.READ_CACHE`` (least recently used entries are evicted
+beyond the cache size), so the job's identical reads are served from memory
+it shares with the worker copy-on-write. An input is thus parsed at most
+once per job, always before that job's fork and never after a job ends.
+
+Protocol (JSON lines over a Unix stream socket):
+
+- worker -> pool: ``{"ready": pid}`` once the modules are imported
+- pool -> worker: the job ``{"args", "cwd", "env"}``, with the stdout and
+  stderr pipe write ends attached as ancillary data
+- worker -> pool: ``{"pid": child}`` after forking, then
+  ``{"exit": returncode, "usage": {...}, "reads": [...]}`` when the child
+  ends (returncode negative for a signal; usage from ``wait4``:
+  cpu_seconds, max_rss_bytes, and read_bytes and write_bytes where
+  ``/proc`` is available; reads as logged by the job, with an input cache)
+
+Each script process leads its own process group and takes the job's
+``"limits"`` (``{rlimit name: [soft, hard]}``) before running.
+
+Checkpoints: a job with ``"checkpoint": {"key", "line"}`` is split at
+``line`` (the PART 3 marker of a generated script). The worker forks a
+checkpoint process that runs the lines above it - PART 1 and 2, loading and
+preprocessing the inputs - with its output captured, and then stays alive.
+The job's PART 3 runs in a process forked from the checkpoint, which
+replays the captured output first. A later job with the same key skips
+straight to that fork, so only PART 3 runs again. The worker keeps one
+checkpoint, relays the checkpoint process's ``{"pid"}`` and ``{"exit"}``
+messages, and adds ``"checkpoint"`` (the key kept, or None) and
+``"resumed"`` to the exit message. A failing PART 1-2 ends the checkpoint
+process with the script's exit code. With a checkpoint size, a checkpoint
+whose private memory (from ``/proc/<pid>/smaps_rollup``) exceeds it is not
+kept, so a worker never holds more than that in PART 1-2 state; where the
+memory can't be measured, no checkpoint is kept.
+
+Only the standard library may be imported here besides the preloaded
+modules: this file runs outside the ira_builder package.
+"""
+
+import gc
+import importlib
+import json
+import os
+import resource
+import socket
+import sys
+import tempfile
+
+import sidecar_harness
+
+# Largest job message read with the pipes attached
+_RECV_BYTES = 64 * 1024
+
+# Memory of each cached input DataFrame: read_cache_key -> bytes
+_cache_bytes = {}
+
+# The worker's checkpoint process: {"key", "pid", "sock", "reader"}, or None
+_checkpoint = None
+
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _receive_job(sock):
+    """Read the next job and its pipes, or None when the pool closed the socket."""
+    data, fds, _, _ = socket.recv_fds(sock, _RECV_BYTES, 2)
+    if not data:
+        return None, []
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(_RECV_BYTES)
+        if not chunk:
+            return None, fds
+        data += chunk
+    return json.loads(data), fds
+
+
+def _logged_reads(log_path):
+    """The distinct ``[path, kwargs]`` reads a job logged, removing the log."""
+    if not log_path:
+        return []
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            reads = list(dict.fromkeys(f.read().splitlines()))
+        os.remove(log_path)
+    except OSError:
+        return []
+    return [json.loads(read) for read in reads]
+
+
+def _load_reads(reads, max_bytes):
+    """Cache the announced reads, evicting the least recently used beyond max_bytes."""
+    import pandas as pd
+
+    cache = sidecar_harness.READ_CACHE
+    changed = False
+    for path, kwargs in reads or []:
+        key = sidecar_harness.read_cache_key(path, kwargs)
+        if key is None:
+            continue
+        if key in cache:
+            cache.move_to_end(key)
+            continue
+
+        if not changed:
+            # Let the collector reach the cached objects again, so evicted
+            # frames in reference cycles are freed
+            gc.unfreeze()
+            changed = True
+
+        # Earlier versions of the file are no longer read
+        fingerprint = json.loads(key)[:3]
+        for old in [k for k in cache if json.loads(k)[0] == path and json.loads(k)[:3] != fingerprint]:
+            del cache[old]
+            del _cache_bytes[old]
+
+        try:
+            df = pd.read_csv(path, **kwargs)
+        except Exception:
+            continue
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > max_bytes or sidecar_harness.read_cache_key(path, kwargs) != key:
+            continue
+
+        cache[key] = df
+        _cache_bytes[key] = nbytes
+        while sum(_cache_bytes.values()) > max_bytes:
+            evicted, _ = cache.popitem(last=False)
+            del _cache_bytes[evicted]
+
+    if changed:
+        # Keep the collector in forked jobs from touching (and copying) the cached objects
+        gc.collect()
+        gc.freeze()
+
+
+def _redirect_output(fds):
+    """Make fds[0] and fds[1] this process's stdout and stderr."""
+    os.dup2(fds[0], 1)
+    os.dup2(fds[1], 2)
+    for fd in fds:
+        os.close(fd)
+
+
+def _reseed():
+    # A fresh interpreter seeds numpy's global generator from the OS
+    numpy = sys.modules.get("numpy")
+    if numpy is not None:
+        numpy.random.seed()
+
+
+def _usage(rusage):
+    """CPU time and peak memory of a wait4/getrusage result."""
+    # ru_maxrss is in kilobytes, except on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {"cpu_seconds": rusage.ru_utime + rusage.ru_stime, "max_rss_bytes": rusage.ru_maxrss * scale}
+
+
+def _io_usage(pid):
+    """Bytes a process read and wrote (files and pipes alike), from /proc."""
+    usage = {}
+    try:
+        with open(f"/proc/{pid}/io", "rb") as f:
+            for line in f:
+                name, _, value = line.partition(b":")
+                if name == b"rchar":
+                    usage["read_bytes"] = int(value)
+                elif name == b"wchar":
+                    usage["write_bytes"] = int(value)
+    except (OSError, ValueError):
+        pass
+    return usage
+
+
+def _wait(pid):
+    """Reap a child: its exit message, with the resources it used."""
+    # Its I/O counters stay readable until it is reaped
+    os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+    io = _io_usage(pid)
+    _, status, rusage = os.wait4(pid, 0)
+    return {"exit": os.waitstatus_to_exitcode(status), "usage": {**_usage(rusage), **io}}
+
+
+def _enter_job(job, log_path):
+    """Take the job's process group, limits, working directory and environment."""
+    os.setpgid(0, 0)
+    for name, (soft, hard) in (job.get("limits") or {}).items():
+        resource.setrlimit(getattr(resource, name), (soft, hard))
+    os.chdir(job["cwd"])
+    os.environ.clear()
+    os.environ.update(job["env"])
+    if log_path:
+        os.environ[sidecar_harness.READ_LOG_ENV_VAR] = log_path
+    _reseed()
+
+
+def _run_child(sock, job, fds, log_path):
+    """Turn the forked child into the job's script process."""
+    sock.close()
+    _redirect_output(fds)
+    _enter_job(job, log_path)
+
+    sys.argv = [sidecar_harness.__file__] + job["args"]
+    sidecar_harness.main()
+
+
+def _write_all(fd, data):
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _split_script(script, line):
+    """Compile a script's lines before and from ``line`` separately."""
+    with open(script, "rb") as f:
+        lines = f.read().decode("utf-8").splitlines(keepends=True)
+    prefix = compile("".join(lines[:line]), script, "exec")
+    # PART 3 keeps its line numbers in tracebacks
+    suffix = compile("\n" * line + "".join(lines[line:]), script, "exec")
+    return prefix, suffix
+
+
+def _serve_checkpoint(sock, job, fds, log_path):
+    """
+    Run in the checkpoint process: run PART 1-2, then fork a PART 3 run per job.
+
+    Never returns: the process exits when the worker closes ``sock``, or
+    with the script's exit code when PART 1-2 fails.
+    """
+    _enter_job(job, log_path)
+    script = sidecar_harness.prepare([sidecar_harness.__file__] + job["args"])
+    prefix, _ = _split_script(script, job["checkpoint"]["line"])
+    module = sidecar_harness.main_module(script)
+
+    captures = [tempfile.TemporaryFile(), tempfile.TemporaryFile()]
+    os.dup2(captures[0].fileno(), 1)
+    os.dup2(captures[1].fileno(), 2)
+    code = sidecar_harness.run_code(prefix, module.__dict__)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # Counted in the first PART 3 run's usage
+    prefix_usage = {**_usage(resource.getrusage(resource.RUSAGE_SELF)), **_io_usage("self")}
+    captured = []
+    for capture in captures:
+        capture.seek(0)
+        captured.append(capture.read())
+        capture.close()
+
+    if code != 0:
+        for fd, data in zip(fds, captured):
+            _write_all(fd, data)
+        raise SystemExit(code)
+
+    while True:
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            os.setpgid(0, 0)
+            _redirect_output(fds)
+            for fd, data in zip((1, 2), captured):
+                _write_all(fd, data)
+            _reseed()
+
+            # Each job brings its own script; only PART 1-2 is shared
+            script = os.path.abspath(job["args"][0])
+            sys.argv = list(job["args"])
+            module.__file__ = script
+            _, suffix = _split_script(script, job["checkpoint"]["line"])
+            raise SystemExit(sidecar_harness.run_code(suffix, module.__dict__))
+
+        for fd in fds:
+            os.close(fd)
+        _send(sock, {"pid": pid})
+        message = _wait(pid)
+        if prefix_usage is not None:
+            usage = message["usage"]
+            usage["cpu_seconds"] += prefix_usage["cpu_seconds"]
+            usage["max_rss_bytes"] = max(usage["max_rss_bytes"], prefix_usage["max_rss_bytes"])
+            for name in ("read_bytes", "write_bytes"):
+                if name in usage and name in prefix_usage:
+                    usage[name] += prefix_usage[name]
+            prefix_usage = None
+        _send(sock, message)
+
+        job, fds = _receive_job(sock)
+        if job is None:
+            os._exit(0)
+
+
+def _private_bytes(pid):
+    """Memory a process doesn't share with its parent (copy-on-write pages it wrote), or None."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return sum(int(fields[name].split()[0]) * 1024 for name in ("Private_Clean", "Private_Dirty"))
+    except (OSError, KeyError, ValueError, IndexError):
+        return None
+
+
+def _drop_checkpoint():
+    global _checkpoint
+    if _checkpoint is not None:
+        _checkpoint["reader"].close()
+        _checkpoint["sock"].close()
+        os.waitpid(_checkpoint["pid"], 0)
+        _checkpoint = None
+
+
+def _run_checkpointed(sock, job, fds, log_path, cache_bytes=0, max_bytes=0):
+    """Run a job's PART 3 from the matching checkpoint, creating it if needed; keep it within max_bytes."""
+    global _checkpoint
+    key = job["checkpoint"]["key"]
+
+    resumed = False
+    if _checkpoint is not None and _checkpoint["key"] == key:
+        try:
+            socket.send_fds(_checkpoint["sock"], [json.dumps(job).encode() + b"\n"], fds)
+            resumed = True
+        except OSError:
+            pass
+
+    if not resumed:
+        _drop_checkpoint()
+        if log_path:
+            _load_reads(job.get("reads"), cache_bytes)
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            parent_sock.close()
+            _serve_checkpoint(child_sock, job, fds, log_path)
+        child_sock.close()
+        _checkpoint = {"key": key, "pid": pid, "sock": parent_sock, "reader": parent_sock.makefile("rb")}
+        _send(sock, {"pid": pid})
+
+    for fd in fds:
+        os.close(fd)
+
+    while True:
+        line = _checkpoint["reader"].readline()
+        if not line:
+            # PART 1-2 failed, or the checkpoint process was killed
+            pid = _checkpoint["pid"]
+            _checkpoint["reader"].close()
+            _checkpoint["sock"].close()
+            _checkpoint = None
+            message = _wait(pid)
+            break
+        message = json.loads(line)
+        if "exit" in message:
+            break
+        _send(sock, message)
+
+    if _checkpoint is not None and max_bytes > 0:
+        private = _private_bytes(_checkpoint["pid"])
+        if private is None or private > max_bytes:
+            _drop_checkpoint()
+
+    message["checkpoint"] = _checkpoint["key"] if _checkpoint is not None else None
+    message["resumed"] = resumed
+    message["reads"] = _logged_reads(log_path)
+    _send(sock, message)
+
+
+def serve(sock, cache_bytes=0, log_path=None, checkpoint_bytes=0):
+    """Serve jobs until the pool closes the control socket."""
+    if cache_bytes <= 0:
+        log_path = None
+
+    while True:
+        job, fds = _receive_job(sock)
+        if job is None:
+            for fd in fds:
+                os.close(fd)
+            return
+
+        if log_path and os.path.exists(log_path):
+            os.remove(log_path)
+
+        if job.get("checkpoint"):
+            _run_checkpointed(sock, job, fds, log_path, cache_bytes, checkpoint_bytes)
+            continue
+
+        if log_path:
+            _load_reads(job.get("reads"), cache_bytes)
+        pid = os.fork()
+        if pid == 0:
+            # Leave the serve loop; SystemExit from the script ends the child
+            _run_child(sock, job, fds, log_path)
+            return
+
+        for fd in fds:
+            os.close(fd)
+        _send(sock, {"pid": pid})
+        message = _wait(pid)
+        message["reads"] = _logged_reads(log_path)
+        _send(sock, message)
+
+
+def main():
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    for module in filter(None, sys.argv[2].split(",") if len(sys.argv) > 2 else []):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+    cache_mb = float(sys.argv[3]) if len(sys.argv) > 4 else 0
+    checkpoint_mb = float(sys.argv[5]) if len(sys.argv) > 5 else 0
+    _send(sock, {"ready": os.getpid()})
+    serve(sock, cache_bytes=int(cache_mb * 1024 * 1024), log_path=sys.argv[4] if cache_mb else None,
+          checkpoint_bytes=int(checkpoint_mb * 1024 * 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ from ira_builder.agents.planner import (
     PlannerResponseType
 )
 from ira_builder.agents.coder import create_coder_agent, CoderAgent
+from ira_builder.tools.columnar_cache import prepare_sidecars
 from ira_builder.utils.logger import get_logger
 from ira_builder.utils.config import get_config
 
@@ -104,6 +105,10 @@ class WorkflowState:
         self.generated_code: Optional[str] = None
         self.code_execution_iterations = 0
         self.code_execution_result: Optional[Dict[str, Any]] = None
+        # Resources used by the last code execution (see execute_python_code)
+        self.execution_resource_usage: Optional[Dict[str, Any]] = None
+        # Hot spots of the last profiled code execution
+        self.execution_profile: Optional[Dict[str, Any]] = None
         self.output_file_path: Optional[str] = None
 
         # Output review phase
@@ -129,6 +134,8 @@ class WorkflowState:
             "plan_approved": self.plan_approved,
             "generated_code": self.generated_code,
             "code_execution_iterations": self.code_execution_iterations,
+            "execution_resource_usage": self.execution_resource_usage,
+            "execution_profile": self.execution_profile,
             "output_file_path": self.output_file_path,
             "output_approved": self.output_approved,
             "output_refinement_iterations": self.output_refinement_iterations,
@@ -162,6 +169,8 @@ class WorkflowState:
         state.plan_approved = data.get("plan_approved", False)
         state.generated_code = data.get("generated_code")
         state.code_execution_iterations = data.get("code_execution_iterations", 0)
+        state.execution_resource_usage = data.get("execution_resource_usage")
+        state.execution_profile = data.get("execution_profile")
         state.output_file_path = data.get("output_file_path")
         state.output_approved = data.get("output_approved", False)
         state.output_refinement_iterations = data.get("output_refinement_iterations", 0)
@@ -213,7 +222,8 @@ class IRAOrchestrator:
         state_persistence_dir: Optional[str] = None,
         on_phase_change: Optional[Callable[[WorkflowPhase], None]] = None,
         on_planner_response: Optional[Callable[[str, PlannerResponseType], None]] = None,
-        on_coder_progress: Optional[Callable[[int, int], None]] = None
+        on_coder_progress: Optional[Callable[[int, int], None]] = None,
+        on_code_output: Optional[Callable[[str, str], Any]] = None
     ):
         """
         Initialize the IRA Orchestrator.
@@ -229,8 +239,11 @@ class IRAOrchestrator:
             code_execution_timeout: Timeout for code execution in seconds
             state_persistence_dir: Directory to save state (default: ./storage/workflows)
             on_phase_change: Callback when workflow phase changes
-            on_planner_response: Callback for Planner agent responses
+            on_planner_response: Callback for Planner agent responses (also receives
+                CSV profiling progress as PlannerResponseType.PROGRESS messages)
             on_coder_progress: Callback for Coder agent progress updates
+            on_code_output: Callback receiving the stream ("stdout" or "stderr") and
+                each line of output while generated code runs, for live progress
         """
         self.workflow_name = workflow_name
         self.workflow_description = workflow_description
@@ -257,6 +270,7 @@ class IRAOrchestrator:
         self.on_phase_change = on_phase_change
         self.on_planner_response = on_planner_response
         self.on_coder_progress = on_coder_progress
+        self.on_code_output = on_code_output
 
         # Agents (initialized later)
         self.planner: Optional[PlannerAgent] = None
@@ -286,6 +300,10 @@ class IRAOrchestrator:
         self.state.started_at = datetime.now()
         self._change_phase(WorkflowPhase.PLANNING)
 
+        # Convert the uploaded CSVs to columnar sidecars while planning runs,
+        # so the coder's executions load them without parsing text
+        prepare_sidecars(self.csv_filepaths)
+
         try:
             # Create Planner Agent
             self.planner = create_planner_agent(
@@ -300,7 +318,8 @@ class IRAOrchestrator:
             response = await self.planner.initialize_workflow(
                 workflow_name=self.workflow_name,
                 workflow_description=self.workflow_description,
-                csv_filepaths=self.csv_filepaths
+                csv_filepaths=self.csv_filepaths,
+                progress_callback=self._report_csv_progress if self.on_planner_response else None
             )
 
             # Update state
@@ -641,31 +660,33 @@ Provide the COMPLETE updated code.
             logger.info(f"Generated refined code: {len(refined_code)} characters")
 
             # Execute the refined code
-            exec_result = await self.coder._execute_code(refined_code)
+            exec_result = await self.coder._execute_code(refined_code, interactive=True)
 
             if exec_result['status'] == 'success':
                 logger.info("✅ REFINED CODE EXECUTED SUCCESSFULLY!")
 
                 # Validate output
-                from ira_builder.tools.code_executor_tools import (
-                    validate_output_dataframe,
-                    preview_dataframe,
-                    get_dataframe_summary
+                from ira_builder.tools.async_tools import (
+                    validate_output_dataframe_async,
+                    preview_dataframe_async,
+                    get_dataframe_summary_async
                 )
 
-                output_validation = validate_output_dataframe(self.state.output_file_path)
+                output_validation = await validate_output_dataframe_async(self.state.output_file_path)
 
                 if output_validation['valid']:
                     # Update state with refined code
                     self.state.generated_code = refined_code
                     self.state.code_execution_result = exec_result
+                    self.state.execution_resource_usage = exec_result.get("resource_usage")
+                    self.state.execution_profile = exec_result.get("profile") or self.state.execution_profile
 
                     # Save refined code
                     code_filepath = self._save_generated_code(refined_code)
 
                     # Get new preview and summary
-                    preview = preview_dataframe(self.state.output_file_path, rows=10)
-                    summary = get_dataframe_summary(self.state.output_file_path)
+                    preview = await preview_dataframe_async(self.state.output_file_path, rows=10)
+                    summary = await get_dataframe_summary_async(self.state.output_file_path)
 
                     # Transition back to OUTPUT_REVIEW
                     self._change_phase(WorkflowPhase.OUTPUT_REVIEW)
@@ -716,6 +737,50 @@ Provide the COMPLETE updated code.
                 "error": str(e)
             }
 
+    async def profile_generated_code(self) -> Dict[str, Any]:
+        """
+        Re-run the generated code under the profiler and keep its hot spots.
+
+        The code writes the same output again; the phase is unchanged.
+
+        Returns:
+            Dictionary with status and the profile (top functions, slowest
+            lines and peak allocations; see execute_python_code)
+        """
+        if not self.state.generated_code:
+            return {
+                "status": "error",
+                "error": "No generated code to profile"
+            }
+
+        if not self.coder:
+            return {
+                "status": "error",
+                "error": "Coder not initialized"
+            }
+
+        try:
+            logger.info("Profiling generated code...")
+
+            exec_result = await self.coder._execute_code(self.state.generated_code, interactive=True, profile=True)
+            if exec_result.get("profile") is not None:
+                self.state.execution_profile = exec_result["profile"]
+                self._persist_state()
+
+            return {
+                "status": exec_result["status"],
+                "profile": exec_result.get("profile"),
+                "resource_usage": exec_result.get("resource_usage"),
+                "error": exec_result.get("error_message")
+            }
+
+        except Exception as e:
+            logger.error(f"Error profiling generated code: {str(e)}", exc_info=True)
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
     async def approve_plan_and_generate_code(self) -> Dict[str, Any]:
         """
         Approve the business logic plan and proceed to code generation.
@@ -751,7 +816,8 @@ Provide the COMPLETE updated code.
                 model=self.model,
                 temperature=0.3,
                 max_iterations=self.max_coder_iterations,
-                execution_timeout=self.code_execution_timeout
+                execution_timeout=self.code_execution_timeout,
+                output_callback=self.on_code_output
             )
 
             logger.info("Initializing Coder Agent...")
@@ -780,6 +846,8 @@ Provide the COMPLETE updated code.
                 self.state.generated_code = result['code']
                 self.state.code_execution_iterations = result['iterations']
                 self.state.code_execution_result = result
+                self.state.execution_resource_usage = result["execution_result"].get("resource_usage")
+                self.state.execution_profile = result["execution_result"].get("profile") or self.state.execution_profile
 
                 # Save generated code to file
                 code_filepath = self._save_generated_code(result['code'])
@@ -810,6 +878,9 @@ Provide the COMPLETE updated code.
                 self.state.code_execution_iterations = result.get('iterations', 0)
                 self.state.generated_code = result.get('last_code')
                 self.state.code_execution_result = result
+                last_execution = result.get('last_execution_result') or {}
+                self.state.execution_resource_usage = last_execution.get("resource_usage")
+                self.state.execution_profile = last_execution.get("profile") or self.state.execution_profile
                 self._change_phase(WorkflowPhase.FAILED)
 
                 self.state.completed_at = datetime.now()
@@ -836,6 +907,14 @@ Provide the COMPLETE updated code.
                 "error": str(e)
             }
 
+    def _report_csv_progress(self, progress: Dict[str, Any]):
+        """Forward CSV profiling progress to on_planner_response consumers."""
+        message = (
+            f"Analyzed {progress['filename']} ({progress['completed']}/{progress['total']}, "
+            f"{progress['status']}, {progress['elapsed_seconds']}s)"
+        )
+        self.on_planner_response(message, PlannerResponseType.PROGRESS)
+
     def _save_generated_code(self, code: str) -> Path:
         """Save generated code to a Python file."""
         code_dir = Path("./storage/generated_code")
@@ -910,7 +989,8 @@ Provide the COMPLETE updated code.
             "max_iterations": self.max_coder_iterations,
             "generated_code": self.state.generated_code,
             "output_path": self.state.output_file_path,
-            "execution_result": self.state.code_execution_result
+            "execution_result": self.state.code_execution_result,
+            "execution_profile": self.state.execution_profile
         }
 
     def get_output_review_summary(self) -> Dict[str, Any]:
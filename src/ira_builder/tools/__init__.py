@@ -2,10 +2,16 @@
 
 from ira_builder.tools.csv_tools import (
     analyze_csv_structure,
+    analyze_csv_sample,
     get_csv_summary,
+    get_csv_first_look,
+    summarize_csv_samples,
+    summarize_csv_files,
     validate_column_references,
     get_column_data_preview,
     compare_csv_schemas,
+    discover_join_keys,
+    estimate_join_cardinality,
     detect_data_quality_issues,
 )
 from ira_builder.tools.validation_tools import (
@@ -18,10 +24,16 @@ from ira_builder.tools.validation_tools import (
 __all__ = [
     # CSV tools
     "analyze_csv_structure",
+    "analyze_csv_sample",
     "get_csv_summary",
+    "get_csv_first_look",
+    "summarize_csv_samples",
+    "summarize_csv_files",
     "validate_column_references",
     "get_column_data_preview",
     "compare_csv_schemas",
+    "discover_join_keys",
+    "estimate_join_cardinality",
     "detect_data_quality_issues",
     # Validation tools
     "validate_business_logic",
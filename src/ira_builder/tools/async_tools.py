@@ -0,0 +1,240 @@
+"""
+Async variants of the blocking CSV and code tools.
+
+The tools in ``csv_tools`` and ``code_executor_tools`` are synchronous pandas
+code that can run for seconds. Awaited directly from the agents they would
+freeze the event loop, and with it every other session the server is
+handling. Each ``<tool>_async`` function here runs its tool on a bounded pool
+instead:
+
+- ``thread`` (default): a shared thread pool. pandas releases the GIL for
+  most parsing and numeric work, so this keeps the loop responsive.
+- ``process``: a shared process pool, for tools that hold the GIL for long
+  (arguments and results must be picklable; calls passing callbacks, such as
+  progress callbacks, fall back to the thread pool).
+- ``inline``: run on the event loop, for tools known to be instant.
+
+The mode of each tool is set with ASYNC_TOOL_MODES, e.g.
+``"detect_data_quality_issues=process,validate_python_syntax=inline"``.
+The async functions keep the name, signature and docstring of their tool,
+so they can be registered as agent tools in place of the sync ones.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from ira_builder.tools import code_executor_tools, csv_tools
+from ira_builder.utils.config import get_config
+from ira_builder.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+TOOL_MODES = ("thread", "process", "inline")
+
+
+def parse_tool_modes(spec: str) -> Dict[str, str]:
+    """
+    Parse a "tool=mode,tool=mode" specification.
+
+    Args:
+        spec: Comma-separated tool=mode pairs (empty for none)
+
+    Returns:
+        Mapping of tool name to mode
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown mode
+    """
+    modes = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, mode = entry.partition("=")
+        mode = mode.strip()
+        if not sep or mode not in TOOL_MODES:
+            raise ValueError(f"Invalid tool mode '{entry}' (expected tool=thread|process|inline)")
+        modes[name.strip()] = mode
+    return modes
+
+
+class ToolDispatcher:
+    """
+    Runs blocking tool calls on bounded thread and process pools.
+
+    Both pools are created on first use and shared by every caller in the
+    process.
+
+    Attributes:
+        max_threads: Size of the thread pool
+        max_processes: Size of the process pool
+        modes: Mode per tool name; tools not listed use ``default_mode``
+        default_mode: Mode of unlisted tools
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 4,
+        max_processes: int = 2,
+        modes: Optional[Dict[str, str]] = None,
+        default_mode: str = "thread",
+    ):
+        if default_mode not in TOOL_MODES:
+            raise ValueError(f"Unknown tool mode: {default_mode}")
+
+        self.max_threads = max(1, max_threads)
+        self.max_processes = max(1, max_processes)
+        self.modes = dict(modes or {})
+        self.default_mode = default_mode
+
+        self._lock = threading.Lock()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def mode_for(self, name: str) -> str:
+        """Return the configured mode of a tool."""
+        return self.modes.get(name, self.default_mode)
+
+    def _executor(self, mode: str) -> Executor:
+        with self._lock:
+            if mode == "process":
+                if self._processes is None:
+                    # forkserver/spawn children are safe to start from a threaded server
+                    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                    self._processes = ProcessPoolExecutor(
+                        max_workers=self.max_processes,
+                        mp_context=multiprocessing.get_context(method),
+                    )
+                return self._processes
+
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.max_threads, thread_name_prefix="ira-tool"
+                )
+            return self._threads
+
+    async def run(self, func: Callable[..., T], *args: Any, mode: Optional[str] = None, **kwargs: Any) -> T:
+        """
+        Run a blocking function without blocking the event loop.
+
+        Args:
+            func: Function to call (module-level for process mode)
+            *args: Positional arguments
+            mode: Override of the function's configured mode
+            **kwargs: Keyword arguments
+
+        Returns:
+            The function's result (its exceptions propagate)
+        """
+        mode = mode or self.mode_for(func.__name__)
+        if mode == "inline":
+            return func(*args, **kwargs)
+        if mode == "process" and any(callable(value) for value in (*args, *kwargs.values())):
+            logger.debug(f"{func.__name__}: callbacks can't cross processes, using a thread")
+            mode = "thread"
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(mode), functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Shut down both pools (running calls finish first)."""
+        with self._lock:
+            pools, self._threads, self._processes = (self._threads, self._processes), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+
+# Global dispatcher instance
+_tool_dispatcher: Optional[ToolDispatcher] = None
+_tool_dispatcher_lock = threading.Lock()
+
+
+def get_tool_dispatcher() -> ToolDispatcher:
+    """
+    Get the process-wide tool dispatcher configured in settings.
+
+    Returns:
+        ToolDispatcher instance
+    """
+    global _tool_dispatcher
+    with _tool_dispatcher_lock:
+        if _tool_dispatcher is None:
+            config = get_config()
+            _tool_dispatcher = ToolDispatcher(
+                max_threads=config.async_tool_threads,
+                max_processes=config.async_tool_processes,
+                modes=parse_tool_modes(config.async_tool_modes),
+            )
+    return _tool_dispatcher
+
+
+def set_tool_dispatcher(dispatcher: Optional[ToolDispatcher]) -> None:
+    """
+    Replace the process-wide tool dispatcher.
+
+    Args:
+        dispatcher: ToolDispatcher to use, or None to re-create it from settings lazily
+    """
+    global _tool_dispatcher
+    with _tool_dispatcher_lock:
+        _tool_dispatcher = dispatcher
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run any blocking callable (e.g. a bound method) on the tool thread pool.
+
+    Args:
+        func: Callable to run
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        The callable's result
+    """
+    return await get_tool_dispatcher().run(func, *args, mode="thread", **kwargs)
+
+
+def async_tool(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """
+    Make an async variant of a blocking tool that runs on the tool dispatcher.
+
+    Args:
+        func: Module-level tool function
+
+    Returns:
+        Coroutine function with the tool's name, signature and docstring
+    """
+    @functools.wraps(func)
+    async def run_tool(*args: Any, **kwargs: Any) -> T:
+        return await get_tool_dispatcher().run(func, *args, **kwargs)
+
+    return run_tool
+
+
+# CSV tools
+analyze_csv_structure_async = async_tool(csv_tools.analyze_csv_structure)
+analyze_csv_sample_async = async_tool(csv_tools.analyze_csv_sample)
+get_csv_summary_async = async_tool(csv_tools.get_csv_summary)
+get_csv_first_look_async = async_tool(csv_tools.get_csv_first_look)
+summarize_csv_samples_async = async_tool(csv_tools.summarize_csv_samples)
+summarize_csv_files_async = async_tool(csv_tools.summarize_csv_files)
+validate_column_references_async = async_tool(csv_tools.validate_column_references)
+get_column_data_preview_async = async_tool(csv_tools.get_column_data_preview)
+compare_csv_schemas_async = async_tool(csv_tools.compare_csv_schemas)
+discover_join_keys_async = async_tool(csv_tools.discover_join_keys)
+estimate_join_cardinality_async = async_tool(csv_tools.estimate_join_cardinality)
+detect_data_quality_issues_async = async_tool(csv_tools.detect_data_quality_issues)
+
+# Code execution tools (execute_python_code is already async)
+validate_python_syntax_async = async_tool(code_executor_tools.validate_python_syntax)
+check_merge_cardinality_async = async_tool(code_executor_tools.check_merge_cardinality)
+check_code_performance_async = async_tool(code_executor_tools.check_code_performance)
+preview_dataframe_async = async_tool(code_executor_tools.preview_dataframe)
+validate_output_dataframe_async = async_tool(code_executor_tools.validate_output_dataframe)
+analyze_execution_error_async = async_tool(code_executor_tools.analyze_execution_error)
+get_dataframe_summary_async = async_tool(code_executor_tools.get_dataframe_summary)
@@ -6,18 +6,150 @@ to execute generated Python code safely with timeout, error handling,
 and result validation.
 """
 
+import ast
 import asyncio
+import atexit
+import contextlib
+import json
+import os
 import re
+import signal
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional
 import pandas as pd
 
 from ira_builder.executor import PythonScriptExecutor, CodeBlock
+from ira_builder.executor.interpreter_pool import POOL_SUPPORTED, InterpreterPool
+from ira_builder.executor.setup_cache import SetupCache
+from ira_builder.executor.venv_pool import VirtualEnvPool
+from ira_builder.executor.sidecar_harness import read_manifest
+from ira_builder.tools.columnar_cache import get_columnar_cache, load_csv
+from ira_builder.tools.csv_tools import estimate_join_cardinality
+from ira_builder.tools.execution_scheduler import (
+    DEFAULT_TENANT,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    get_execution_scheduler,
+)
+from ira_builder.tools.memory_admission import MB
+from ira_builder.tools.memory_estimator import estimate_execution_memory
+from ira_builder.tools.perf_lint import SEVERITIES, run_perf_rules
+from ira_builder.utils.config import get_config
 from ira_builder.utils.logger import get_logger
-from ira_builder.exceptions.errors import ValidationException
+from ira_builder.exceptions.errors import ExecutionException, ValidationException
 
 logger = get_logger(__name__)
 
+# Global interpreter pool instance
+_interpreter_pool: Optional[InterpreterPool] = None
+_interpreter_pool_lock = threading.Lock()
+
+# Global setup cache and virtual environment pool instances
+_setup_cache: Optional[SetupCache] = None
+_venv_pool: Optional[VirtualEnvPool] = None
+_setup_lock = threading.Lock()
+
+
+def get_interpreter_pool() -> Optional[InterpreterPool]:
+    """
+    Get the process-wide pool of warm interpreters configured in settings.
+
+    Returns:
+        InterpreterPool instance, or None if the pool is disabled or unsupported
+    """
+    global _interpreter_pool
+    config = get_config()
+    if config.interpreter_pool_size <= 0 or not POOL_SUPPORTED:
+        return None
+
+    with _interpreter_pool_lock:
+        if _interpreter_pool is None:
+            _interpreter_pool = InterpreterPool(
+                size=config.interpreter_pool_size,
+                max_runs=config.interpreter_pool_max_runs,
+                preload=[m.strip() for m in config.interpreter_pool_preload.split(",") if m.strip()],
+                input_cache_mb=config.interpreter_pool_input_cache_mb,
+                checkpoint_mb=config.interpreter_pool_checkpoint_mb if config.execution_checkpoints else 0,
+            )
+            atexit.register(_interpreter_pool.shutdown)
+            logger.info(f"Started interpreter pool with {config.interpreter_pool_size} worker(s)")
+    return _interpreter_pool
+
+
+def set_interpreter_pool(pool: Optional[InterpreterPool]) -> None:
+    """
+    Replace the process-wide interpreter pool.
+
+    Args:
+        pool: Pool to use, or None to re-create it from settings lazily
+    """
+    global _interpreter_pool
+    with _interpreter_pool_lock:
+        _interpreter_pool = pool
+
+
+def get_setup_cache() -> SetupCache:
+    """
+    Get the process-wide cache of executor function setups.
+
+    Returns:
+        SetupCache instance in the configured directory
+    """
+    global _setup_cache
+    with _setup_lock:
+        if _setup_cache is None:
+            _setup_cache = SetupCache(get_config().setup_cache_dir)
+    return _setup_cache
+
+
+def set_setup_cache(cache: Optional[SetupCache]) -> None:
+    """
+    Replace the process-wide setup cache.
+
+    Args:
+        cache: Cache to use, or None to re-create it from settings lazily
+    """
+    global _setup_cache
+    with _setup_lock:
+        _setup_cache = cache
+
+
+def get_venv_pool() -> Optional[VirtualEnvPool]:
+    """
+    Get the process-wide pool of virtual environments configured in settings.
+
+    Returns:
+        VirtualEnvPool instance (provisioned on first lease), or None if disabled
+    """
+    global _venv_pool
+    config = get_config()
+    if config.venv_pool_size <= 0:
+        return None
+
+    cache = get_setup_cache()
+    with _setup_lock:
+        if _venv_pool is None:
+            _venv_pool = VirtualEnvPool(
+                config.venv_pool_dir,
+                size=config.venv_pool_size,
+                packages=[p.strip() for p in config.venv_pool_packages.split(",") if p.strip()],
+                setup_cache=cache,
+            )
+    return _venv_pool
+
+
+def set_venv_pool(pool: Optional[VirtualEnvPool]) -> None:
+    """
+    Replace the process-wide virtual environment pool.
+
+    Args:
+        pool: Pool to use, or None to re-create it from settings lazily
+    """
+    global _venv_pool
+    with _setup_lock:
+        _venv_pool = pool
+
 
 def extract_code_from_markdown(text: str) -> str:
     """
@@ -82,11 +214,29 @@ def _looks_like_python(code: str) -> bool:
     return any(keyword in code for keyword in python_keywords)
 
 
+def _input_fingerprints(filepaths: List[str]) -> List[List[Any]]:
+    """Path, size and modification time of each input file that exists."""
+    fingerprints = []
+    for filepath in filepaths:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            continue
+        fingerprints.append([os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns])
+    return fingerprints
+
+
 async def execute_python_code(
     code: str,
     work_dir: str,
     timeout: int = 120,
-    auto_cleanup: bool = True
+    auto_cleanup: bool = True,
+    input_files: Optional[List[str]] = None,
+    output_file: Optional[str] = None,
+    output_callback: Optional[Callable[[str, str], Any]] = None,
+    tenant: str = DEFAULT_TENANT,
+    interactive: bool = False,
+    profile: bool = False
 ) -> Dict[str, Any]:
     """
     Execute Python code using PythonScriptExecutor.
@@ -99,14 +249,42 @@ async def execute_python_code(
         work_dir: Working directory for execution (where files will be saved)
         timeout: Execution timeout in seconds (default: 120)
         auto_cleanup: Whether to clean up temporary files (default: True)
+        input_files: Input CSVs the code reads; those with a ready columnar
+            sidecar are loaded from it when the code calls pd.read_csv, and
+            the run waits until their estimated load memory is free; while
+            they are unchanged, a retry with the same PART 1-2 resumes from
+            the state after PART 2 (see EXECUTION_CHECKPOINTS)
+        output_file: Output CSV the code writes; when it is saved with
+            ``to_csv(path, index=False)`` a result manifest is written next
+            to it, which the output validation tools read instead of the CSV
+        output_callback: Called with the stream ("stdout" or "stderr") and
+            each line the code prints, while it runs; may be async
+        tenant: Who the run is for (e.g. the workflow name); runs queued for
+            CPU slots or memory are admitted fairly across tenants
+        interactive: Whether a user is waiting for the run (a refinement);
+            interactive runs are admitted before first-pass ones
+        profile: Whether to run the code under a profiler (much slower);
+            defaults to EXECUTION_PROFILING
 
     Returns:
         Dictionary with:
             - status: "success" | "error" | "timeout" | "cancelled"
             - exit_code: int (0 = success, 124 = timeout, 125 = cancelled)
-            - output: stdout + stderr combined
+            - output: stdout + stderr combined, limited to the latest
+              EXECUTION_OUTPUT_MAX_CHARS characters
             - code_file: Path to executed file (for debugging)
+            - log_file: Path to the full output when it exceeded the limit
+            - resource_usage: wall_seconds, cpu_seconds, peak_rss_mb,
+              read_bytes and write_bytes of the run (None where unknown)
+            - profile: Hot spots of a profiled run: wall_seconds, the top
+              functions by self time, the script's lines by time, and
+              memory (peak_mb, peak_lines and retained allocation sites);
+              None if the run wasn't profiled
             - error_message: Detailed error message if status != "success"
+            - memory_estimate: Estimated peak memory of loading the inputs
+              (peak_mb and per-file details; see estimate_execution_memory)
+            - admission_wait_seconds: Time spent waiting for a CPU slot and
+              memory to start (see execution_scheduler)
 
     Example:
         >>> code = '''
@@ -124,17 +302,68 @@ async def execute_python_code(
     work_path = Path(work_dir)
     work_path.mkdir(parents=True, exist_ok=True)
 
-    # Create executor
-    executor = PythonScriptExecutor(
+    # Serve input CSVs from their columnar sidecars where one is ready
+    read_overrides = {}
+    cache = get_columnar_cache()
+    if input_files and cache is not None:
+        read_overrides = cache.read_overrides(input_files)
+        if read_overrides:
+            logger.debug(f"Reading {len(read_overrides)} input file(s) from columnar sidecars")
+
+    # Describe the output while the script still holds it in memory
+    output_manifests = []
+    if output_file and get_config().output_manifest_enabled:
+        output_manifests.append(output_file)
+
+    # Keep the state after PART 2 while the inputs are unchanged
+    checkpoint_key = None
+    if get_config().execution_checkpoints:
+        checkpoint_key = json.dumps(_input_fingerprints(input_files or []))
+
+    # Executor settings; created once the run is admitted and has its environment
+    executor_kwargs = dict(
         timeout=timeout,
         work_dir=work_path,
-        auto_cleanup=auto_cleanup
+        auto_cleanup=auto_cleanup,
+        read_overrides=read_overrides,
+        output_manifests=output_manifests,
+        interpreter_pool=get_interpreter_pool(),
+        checkpoint_key=checkpoint_key,
+        output_callback=output_callback,
+        max_output_chars=get_config().execution_output_max_chars,
+        log_dir=get_config().execution_logs_dir,
+        memory_limit_mb=get_config().execution_memory_limit_mb,
+        cpu_limit_seconds=get_config().execution_cpu_limit_seconds,
+        setup_cache=get_setup_cache(),
+        profile=profile or get_config().execution_profiling
     )
 
+    # Wait for a CPU slot and the memory needed to load the inputs
+    memory_estimate = estimate_execution_memory(input_files or [])
+    scheduler = get_execution_scheduler()
+    if scheduler is not None:
+        admit = scheduler.admit(
+            int(memory_estimate["peak_mb"] * MB),
+            timeout=get_config().execution_admission_timeout,
+            tenant=tenant,
+            priority=PRIORITY_INTERACTIVE if interactive else PRIORITY_BATCH,
+        )
+    else:
+        admit = contextlib.nullcontext(0.0)
+    memory_info = {"memory_estimate": memory_estimate, "admission_wait_seconds": 0.0}
+
     # Execute code
     try:
         code_block = CodeBlock(language="python", code=code)
-        result = await executor.execute_code_blocks([code_block])
+        async with admit as waited:
+            memory_info["admission_wait_seconds"] = round(waited, 2)
+            venv_pool = get_venv_pool()
+            if venv_pool is not None:
+                # Creating the environments takes a while the first time
+                await asyncio.to_thread(venv_pool.provision)
+            with venv_pool.lease() if venv_pool is not None else contextlib.nullcontext() as env:
+                executor = PythonScriptExecutor(**executor_kwargs, virtual_env_context=env)
+                result = await executor.execute_code_blocks([code_block])
 
         # Determine status based on exit code
         if result.exit_code == 0:
@@ -146,6 +375,9 @@ async def execute_python_code(
         elif result.exit_code == 125:
             status = "cancelled"
             error_message = "Execution was cancelled"
+        elif result.exit_code < 0:
+            status = "error"
+            error_message = _describe_signal(-result.exit_code)
         else:
             status = "error"
             error_message = _extract_error_from_output(result.output)
@@ -157,7 +389,11 @@ async def execute_python_code(
             "exit_code": result.exit_code,
             "output": result.output,
             "code_file": result.code_file,
-            "error_message": error_message
+            "log_file": result.log_file,
+            "resource_usage": result.resource_usage,
+            "profile": result.profile,
+            "error_message": error_message,
+            **memory_info,
         }
 
     except asyncio.TimeoutError:
@@ -167,7 +403,8 @@ async def execute_python_code(
             "exit_code": 124,
             "output": f"Execution timed out after {timeout} seconds",
             "code_file": None,
-            "error_message": f"Code execution exceeded timeout of {timeout} seconds"
+            "error_message": f"Code execution exceeded timeout of {timeout} seconds",
+            **memory_info,
         }
     except asyncio.CancelledError:
         logger.warning("Code execution was cancelled")
@@ -176,7 +413,18 @@ async def execute_python_code(
             "exit_code": 125,
             "output": "Execution was cancelled by user or system",
             "code_file": None,
-            "error_message": "Execution was cancelled"
+            "error_message": "Execution was cancelled",
+            **memory_info,
+        }
+    except ExecutionException as e:
+        logger.error(f"Execution not admitted: {e.message}")
+        return {
+            "status": "error",
+            "exit_code": 1,
+            "output": e.message,
+            "code_file": None,
+            "error_message": e.message,
+            **memory_info,
         }
     except Exception as e:
         logger.error(f"Code execution error: {str(e)}", exc_info=True)
@@ -185,10 +433,58 @@ async def execute_python_code(
             "exit_code": 1,
             "output": str(e),
             "code_file": None,
-            "error_message": f"Execution failed: {str(e)}"
+            "error_message": f"Execution failed: {str(e)}",
+            **memory_info,
         }
 
 
+async def stream_python_code(code: str, work_dir: str, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Execute Python code like execute_python_code, yielding its output as it runs.
+
+    Args:
+        code: Python code to execute
+        work_dir: Working directory for execution
+        **kwargs: Other arguments of execute_python_code (except output_callback)
+
+    Yields:
+        ``{"stream": "stdout" | "stderr", "line": str}`` for each line printed,
+        then ``{"result": ...}`` with the execute_python_code result
+
+    Example:
+        >>> async for event in stream_python_code(code, work_dir="./output"):
+        ...     if "line" in event:
+        ...         print(event["line"], end="")
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def enqueue(stream: str, line: str) -> None:
+        queue.put_nowait({"stream": stream, "line": line})
+
+    task = asyncio.create_task(execute_python_code(code, work_dir, output_callback=enqueue, **kwargs))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        while (event := await queue.get()) is not None:
+            yield event
+        yield {"result": task.result()}
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def _describe_signal(signum: int) -> str:
+    """Explain an execution killed by a signal."""
+    if signum == getattr(signal, "SIGXCPU", None):
+        return f"Execution exceeded its CPU time limit of {get_config().execution_cpu_limit_seconds} seconds"
+    try:
+        name = signal.Signals(signum).name
+    except ValueError:
+        name = f"signal {signum}"
+    if signum == signal.SIGKILL:
+        return f"Execution was killed ({name}), possibly for running out of memory"
+    return f"Execution was killed ({name})"
+
+
 def _extract_error_from_output(output: str) -> str:
     """
     Extract the most relevant error message from execution output.
@@ -278,6 +574,233 @@ def validate_python_syntax(code: str) -> Dict[str, Any]:
         }
 
 
+def check_code_performance(code: str, block_severity: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Find pandas performance anti-patterns in code without executing it.
+
+    Runs the rules registered in ``ira_builder.tools.perf_lint``: iterrows,
+    row-wise apply, pd.concat in loops, repeated file reads and copies of
+    copies.
+
+    Args:
+        code: Python code (syntax already validated)
+        block_severity: Lowest severity that makes the code invalid (default: PERF_LINT_BLOCK_SEVERITY)
+
+    Returns:
+        Dictionary with:
+            - valid: False if any finding is at or above block_severity
+            - findings: All findings with rule, severity, line, code,
+              description, recommendation and whether each is blocking,
+              ordered by line
+            - issues: Human-readable description of each blocking finding
+
+    Raises:
+        ValueError: If block_severity isn't high, medium or low
+
+    Example:
+        >>> result = check_code_performance(code)
+        >>> result["issues"]
+        ["Line 57 (apply_axis1): apply(axis=1) calls a Python function once per row ..."]
+    """
+    block_severity = block_severity or get_config().perf_lint_block_severity
+    if block_severity not in SEVERITIES:
+        raise ValueError(f"Unknown severity '{block_severity}' (expected one of {', '.join(SEVERITIES)})")
+    blocking = SEVERITIES[:SEVERITIES.index(block_severity) + 1]
+
+    findings = [{**f, "blocking": f["severity"] in blocking} for f in run_perf_rules(code)]
+    issues = [
+        f"Line {f['line']} ({f['rule']}): {f['description']}: `{f['code']}`. {f['recommendation']}"
+        for f in findings if f["blocking"]
+    ]
+
+    if findings:
+        logger.info(f"Performance check found {len(findings)} finding(s), {len(issues)} blocking")
+    return {"valid": not issues, "findings": findings, "issues": issues}
+
+
+def _single_key(node: Optional[ast.expr]) -> Optional[str]:
+    """Column name of a merge key argument, or None if it isn't one literal column."""
+    if isinstance(node, (ast.List, ast.Tuple)) and len(node.elts) == 1:
+        node = node.elts[0]
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+class _MergeFinder(ast.NodeVisitor):
+    """
+    Track which DataFrame variables come from which input CSV and collect merges.
+
+    A variable is tied to input file ``i`` when assigned ``csv_files[i]`` (or
+    the file's path), ``pd.read_csv`` of such a value, or an expression using
+    exactly one DataFrame already tied to a file (filters, copies, cleaning).
+    """
+
+    def __init__(self, csv_filepaths: List[str]):
+        self.paths = {str(Path(fp).absolute()): i for i, fp in enumerate(csv_filepaths)}
+        self.names = {Path(fp).name: i for i, fp in enumerate(csv_filepaths)}
+        self.path_vars: Dict[str, int] = {}
+        self.frame_vars: Dict[str, int] = {}
+        self.merges: List[Dict[str, Any]] = []
+
+    def _file_of_path(self, node: ast.expr) -> Optional[int]:
+        if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name)
+                and node.value.id == "csv_files" and isinstance(node.slice, ast.Constant)):
+            return node.slice.value if isinstance(node.slice.value, int) else None
+        if isinstance(node, ast.Name):
+            return self.path_vars.get(node.id)
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return self.paths.get(str(Path(node.value).absolute()), self.names.get(Path(node.value).name))
+        return None
+
+    def _file_of_frame(self, node: ast.expr) -> Optional[int]:
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "read_csv":
+            return self._file_of_path(node.args[0]) if node.args else None
+        if self._is_merge(node):
+            return None
+        files = {
+            self.frame_vars[child.id] for child in ast.walk(node)
+            if isinstance(child, ast.Name) and child.id in self.frame_vars
+        }
+        return files.pop() if len(files) == 1 else None
+
+    @staticmethod
+    def _is_merge(node: ast.expr) -> bool:
+        return isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "merge"
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.generic_visit(node)
+        for target in node.targets:
+            if not isinstance(target, ast.Name):
+                continue
+            self.path_vars.pop(target.id, None)
+            self.frame_vars.pop(target.id, None)
+            path_file = self._file_of_path(node.value)
+            if path_file is not None:
+                self.path_vars[target.id] = path_file
+                continue
+            frame_file = self._file_of_frame(node.value)
+            if frame_file is not None:
+                self.frame_vars[target.id] = frame_file
+
+    def visit_Call(self, node: ast.Call) -> None:
+        self.generic_visit(node)
+        if not self._is_merge(node):
+            return
+
+        args = list(node.args)
+        if isinstance(node.func.value, ast.Name) and node.func.value.id in ("pd", "pandas"):
+            frames = args[:2]
+        else:
+            frames = [node.func.value] + args[:1]
+        keywords = {kw.arg: kw.value for kw in node.keywords if kw.arg}
+        for name, position in (("left", 0), ("right", 1)):
+            if name in keywords and len(frames) == position:
+                frames.append(keywords[name])
+        if len(frames) < 2:
+            return
+
+        left_key = _single_key(keywords.get("left_on", keywords.get("on")))
+        right_key = _single_key(keywords.get("right_on", keywords.get("on")))
+        files = [self._file_of_frame(frame) for frame in frames[:2]]
+        if left_key and right_key and None not in files:
+            self.merges.append({
+                "line": node.lineno,
+                "left_file": files[0],
+                "left_column": left_key,
+                "right_file": files[1],
+                "right_column": right_key,
+            })
+
+
+def check_merge_cardinality(
+    code: str,
+    csv_filepaths: List[str],
+    max_expansion: Optional[float] = None,
+    max_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Flag merges in generated code whose output would explode, before running it.
+
+    Merges between DataFrames that can be traced back to input CSVs, on a
+    single literal key column per side, are estimated from the profiles'
+    key frequency sketches (see ``estimate_join_cardinality``). Merges that
+    can't be traced (derived frames, composite or computed keys) are skipped.
+
+    Args:
+        code: Generated Python code (syntax already validated)
+        csv_filepaths: Input CSV paths, in ``csv_files`` order
+        max_expansion: Maximum estimated rows over the larger input (default: JOIN_MAX_EXPANSION)
+        max_rows: Maximum estimated output rows (default: JOIN_MAX_ROWS)
+
+    Returns:
+        Dictionary with:
+            - valid: False if any merge exceeds a limit
+            - merges: Checked merges with line, files, columns, estimate and
+              whether each was flagged
+            - issues: Human-readable description of each flagged merge
+
+    Example:
+        >>> result = check_merge_cardinality(code, ["data/FBL3N.csv", "data/BSEG.csv"])
+        >>> result["issues"]
+        ["Line 42: merging FBL3N.csv['Account'] with BSEG.csv['Account'] ..."]
+    """
+    config = get_config()
+    max_expansion = max_expansion if max_expansion is not None else config.join_max_expansion
+    max_rows = max_rows if max_rows is not None else config.join_max_rows
+
+    finder = _MergeFinder(csv_filepaths)
+    finder.visit(ast.parse(code))
+
+    merges, issues = [], []
+    for merge in finder.merges:
+        try:
+            left_path = csv_filepaths[merge["left_file"]]
+            right_path = csv_filepaths[merge["right_file"]]
+            estimate = estimate_join_cardinality(
+                left_path, merge["left_column"], right_path, merge["right_column"]
+            )
+        except (IndexError, FileNotFoundError, ValidationException) as e:
+            logger.debug(f"Skipping merge check at line {merge['line']}: {str(e)}")
+            continue
+
+        merge = {**merge, "left_file": Path(left_path).name, "right_file": Path(right_path).name, **estimate}
+        merge["flagged"] = estimate["expansion"] > max_expansion or estimate["estimated_rows"] > max_rows
+        merges.append(merge)
+        if merge["flagged"]:
+            issues.append(
+                f"Line {merge['line']}: merging {merge['left_file']}['{merge['left_column']}'] with "
+                f"{merge['right_file']}['{merge['right_column']}'] is {estimate['relationship']} and "
+                f"would produce about {estimate['estimated_rows']:,} rows "
+                f"({estimate['expansion']}x the larger input; up to "
+                f"{estimate['left_keys']['max']:,} and {estimate['right_keys']['max']:,} rows per key)"
+            )
+
+    if issues:
+        logger.warning(f"Merge cardinality check flagged {len(issues)} merge(s)")
+    return {"valid": not issues, "merges": merges, "issues": issues}
+
+
+def _load_output_manifest(filepath: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the result manifest written with an output CSV, if still current.
+
+    Args:
+        filepath: Path to the output CSV
+
+    Returns:
+        Manifest dictionary (row_count, column_count, columns, dtypes,
+        missing_values, numerical_summary, head), or None if the CSV has to
+        be read instead
+    """
+    if not get_config().output_manifest_enabled:
+        return None
+    manifest = read_manifest(filepath)
+    if manifest is not None:
+        logger.debug(f"Using result manifest for {filepath}")
+    return manifest
+
+
 def preview_dataframe(filepath: str, rows: int = 20) -> str:
     """
     Generate markdown preview of CSV file.
@@ -304,8 +827,13 @@ def preview_dataframe(filepath: str, rows: int = 20) -> str:
     logger.debug(f"Generating preview for {filepath}")
 
     try:
-        df = pd.read_csv(filepath)
-        total_rows = len(df)
+        manifest = _load_output_manifest(filepath)
+        if manifest is not None and min(rows, manifest["row_count"]) <= len(manifest["head"]):
+            total_rows = manifest["row_count"]
+            df = pd.DataFrame(manifest["head"], columns=manifest["columns"])
+        else:
+            df = load_csv(filepath)
+            total_rows = len(df)
 
         # Generate markdown table
         preview_df = df.head(rows)
@@ -371,27 +899,32 @@ def validate_output_dataframe(filepath: str) -> Dict[str, Any]:
 
     # Try to read and validate the CSV
     try:
-        df = pd.read_csv(filepath)
+        manifest = _load_output_manifest(filepath)
+        if manifest is not None:
+            row_count, columns = manifest["row_count"], manifest["columns"]
+        else:
+            df = load_csv(filepath)
+            row_count, columns = len(df), df.columns.tolist()
 
         # Check if dataframe is empty
-        if len(df) == 0:
+        if row_count == 0:
             logger.warning(f"Output dataframe is empty: {filepath}")
             return {
                 "valid": False,
                 "error": "Output file is empty (0 rows)",
                 "row_count": 0,
-                "column_count": len(df.columns),
-                "columns": df.columns.tolist(),
+                "column_count": len(columns),
+                "columns": columns,
                 "file_size_mb": round(path.stat().st_size / (1024 * 1024), 2)
             }
 
-        logger.info(f"Output validated: {len(df)} rows, {len(df.columns)} columns")
+        logger.info(f"Output validated: {row_count} rows, {len(columns)} columns")
         return {
             "valid": True,
             "error": None,
-            "row_count": len(df),
-            "column_count": len(df.columns),
-            "columns": df.columns.tolist(),
+            "row_count": row_count,
+            "column_count": len(columns),
+            "columns": columns,
             "file_size_mb": round(path.stat().st_size / (1024 * 1024), 2)
         }
 
@@ -554,7 +1087,17 @@ def get_dataframe_summary(filepath: str) -> Dict[str, Any]:
     logger.debug(f"Generating summary for {filepath}")
 
     try:
-        df = pd.read_csv(filepath)
+        manifest = _load_output_manifest(filepath)
+        if manifest is not None:
+            summary = {
+                key: manifest[key]
+                for key in ("row_count", "column_count", "columns", "dtypes", "missing_values")
+            }
+            if manifest["numerical_summary"]:
+                summary["numerical_summary"] = manifest["numerical_summary"]
+            return summary
+
+        df = load_csv(filepath)
 
         # Basic info
         summary = {
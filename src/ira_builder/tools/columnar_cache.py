@@ -0,0 +1,451 @@
+"""
+Typed columnar sidecars for uploaded CSV files.
+
+Every consumer of an input CSV used to parse its text again: the csv tools,
+the output validators and, above all, the generated script on each coder
+iteration and refinement. This module converts each uploaded CSV once, in a
+background thread, into a typed columnar copy (a "sidecar") so that later
+loads are column reads instead of CSV parsing.
+
+Sidecars are written as Parquet when ``pyarrow`` is installed and as pandas
+pickles otherwise. They hold exactly what ``pd.read_csv(path,
+low_memory=False)`` returns and are keyed by the same content fingerprint as
+the profile store, so a changed source file simply stops matching its old
+sidecar; stale sidecars age out through LRU eviction.
+"""
+
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from ira_builder.tools.profile_store import compute_file_fingerprint
+from ira_builder.utils.config import get_config
+from ira_builder.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Sidecar file extension per storage format
+SIDECAR_EXTENSIONS = {"parquet": ".parquet", "pickle": ".pkl"}
+
+
+def _read_source(filepath: Union[str, Path], usecols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Parse the CSV itself, the way sidecars are built."""
+    return pd.read_csv(filepath, usecols=usecols, low_memory=False)
+
+
+class ColumnarCache:
+    """
+    Disk-backed LRU cache of typed columnar copies of CSV files.
+
+    Entries are named ``<fingerprint>.parquet`` (or ``.pkl``) and written
+    atomically, so concurrent processes sharing the directory never see a
+    partial sidecar. Like the profile store, recency is tracked through the
+    entry's modification time.
+
+    Attributes:
+        cache_dir: Directory holding the sidecars
+        max_entries: Maximum number of sidecars kept on disk
+        storage_format: Storage format used for new sidecars ("parquet" or "pickle")
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_entries: int = 32,
+        storage_format: str = "auto",
+    ):
+        """
+        Initialize the columnar cache.
+
+        Args:
+            cache_dir: Directory to keep sidecars in (created if missing)
+            max_entries: Maximum number of sidecars before LRU eviction (default: 32)
+            storage_format: "parquet", "pickle" or "auto" (Parquet when pyarrow is installed)
+
+        Raises:
+            ValueError: If max_entries is below 1 or the format is unknown
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if storage_format == "auto":
+            storage_format = "parquet" if PARQUET_AVAILABLE else "pickle"
+        if storage_format not in SIDECAR_EXTENSIONS:
+            raise ValueError(f"Unknown sidecar format: {storage_format}")
+        if storage_format == "parquet" and not PARQUET_AVAILABLE:
+            logger.warning("pyarrow is not installed, writing pickle sidecars instead")
+            storage_format = "pickle"
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.storage_format = storage_format
+
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._hits = 0
+        self._misses = 0
+        self._builds = 0
+
+    def lookup(
+        self,
+        filepath: Union[str, Path],
+        fingerprint: Optional[str] = None,
+    ) -> Optional[Path]:
+        """
+        Find the sidecar for the current content of a file.
+
+        Args:
+            filepath: Path to the source CSV
+            fingerprint: Precomputed fingerprint (computed if omitted)
+
+        Returns:
+            Path of the sidecar, or None if none was built for this content version
+        """
+        fingerprint = fingerprint or compute_file_fingerprint(filepath)
+        for ext in SIDECAR_EXTENSIONS.values():
+            sidecar = self.cache_dir / f"{fingerprint}{ext}"
+            if sidecar.exists():
+                try:
+                    os.utime(sidecar, None)
+                except OSError:
+                    pass
+                return sidecar
+        return None
+
+    def load(
+        self,
+        filepath: Union[str, Path],
+        usecols: Optional[Sequence[str]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load a CSV from its sidecar.
+
+        Args:
+            filepath: Path to the source CSV
+            usecols: Column names to load (default: all columns)
+
+        Returns:
+            The DataFrame, or None if no usable sidecar exists
+        """
+        try:
+            sidecar = self.lookup(filepath)
+        except OSError:
+            sidecar = None
+
+        if sidecar is not None:
+            try:
+                df = read_sidecar(sidecar, usecols)
+                self._record("_hits")
+                logger.debug(f"Loaded {Path(filepath).name} from columnar sidecar")
+                return df
+            except Exception as e:
+                logger.warning(f"Discarding unreadable sidecar {sidecar.name}: {str(e)}")
+                self._remove(sidecar)
+
+        self._record("_misses")
+        return None
+
+    def build(self, filepath: Union[str, Path]) -> Optional[Path]:
+        """
+        Convert a CSV into a sidecar, unless one already exists.
+
+        The file is re-fingerprinted after parsing; if it changed meanwhile
+        the sidecar is not written.
+
+        Args:
+            filepath: Path to the source CSV
+
+        Returns:
+            Path of the sidecar, or None if the file changed while converting
+        """
+        fingerprint = compute_file_fingerprint(filepath)
+        sidecar = self.lookup(filepath, fingerprint=fingerprint)
+        if sidecar is not None:
+            return sidecar
+
+        df = _read_source(filepath)
+        if compute_file_fingerprint(filepath) != fingerprint:
+            logger.warning(f"File changed while converting, not caching: {filepath}")
+            return None
+
+        sidecar = self._write(df, fingerprint)
+        self._record("_builds")
+        logger.info(f"Built columnar sidecar for {Path(filepath).name}: {sidecar.name}")
+
+        self._evict()
+        return sidecar
+
+    def build_async(self, filepath: Union[str, Path]) -> Future:
+        """
+        Build a sidecar in a background thread.
+
+        Concurrent requests for the same file share one build.
+
+        Args:
+            filepath: Path to the source CSV
+
+        Returns:
+            Future resolving to the sidecar path (or None)
+        """
+        key = str(Path(filepath).resolve())
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None and not pending.done():
+                return pending
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="columnar-cache"
+                )
+            future = self._executor.submit(self._build_logged, filepath)
+            self._pending[key] = future
+        return future
+
+    def _build_logged(self, filepath: Union[str, Path]) -> Optional[Path]:
+        try:
+            return self.build(filepath)
+        except Exception as e:
+            logger.warning(f"Could not build columnar sidecar for {filepath}: {str(e)}")
+            return None
+
+    def read_overrides(self, filepaths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Describe the ready sidecars of some files for the execution harness.
+
+        Files without a sidecar for their current content are left out, so
+        executed code reads them as CSV as usual.
+
+        Args:
+            filepaths: Source CSV paths
+
+        Returns:
+            Mapping of absolute CSV path to {"path", "format", "columns"}
+        """
+        overrides = {}
+        for filepath in filepaths:
+            try:
+                sidecar = self.lookup(filepath)
+                if sidecar is None:
+                    continue
+                columns = pd.read_csv(filepath, nrows=0).columns.tolist()
+            except (OSError, ValueError):
+                continue
+            overrides[str(Path(filepath).resolve())] = {
+                "path": str(sidecar.resolve()),
+                "format": _sidecar_format(sidecar),
+                "columns": columns,
+            }
+        return overrides
+
+    def invalidate(self, filepath: Union[str, Path]) -> bool:
+        """
+        Remove the sidecar for the current content of a file.
+
+        Args:
+            filepath: Path to the source CSV
+
+        Returns:
+            True if a sidecar was removed
+        """
+        sidecar = self.lookup(filepath)
+        return sidecar is not None and self._remove(sidecar)
+
+    def clear(self) -> None:
+        """Remove every sidecar."""
+        for sidecar in self._entries():
+            self._remove(sidecar)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss/build counters for this process and the current cache size.
+
+        Returns:
+            Dictionary with hits, misses, builds, entries and storage_format
+        """
+        with self._lock:
+            hits, misses, builds = self._hits, self._misses, self._builds
+        return {
+            "hits": hits,
+            "misses": misses,
+            "builds": builds,
+            "entries": len(self._entries()),
+            "max_entries": self.max_entries,
+            "storage_format": self.storage_format,
+            "cache_dir": str(self.cache_dir),
+        }
+
+    def _record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _write(self, df: pd.DataFrame, fingerprint: str) -> Path:
+        """Write a sidecar atomically, falling back to pickle if Parquet can't hold the frame."""
+        tmp_path = self.cache_dir / f".{fingerprint}.{uuid.uuid4().hex}.tmp"
+        try:
+            if self.storage_format == "parquet":
+                try:
+                    df.to_parquet(tmp_path, index=False)
+                    sidecar = self.cache_dir / f"{fingerprint}.parquet"
+                    os.replace(tmp_path, sidecar)
+                    return sidecar
+                except (TypeError, ValueError, ImportError) as e:
+                    logger.debug(f"Parquet can't store this frame, using pickle: {str(e)}")
+
+            df.to_pickle(tmp_path)
+            sidecar = self.cache_dir / f"{fingerprint}.pkl"
+            os.replace(tmp_path, sidecar)
+            return sidecar
+        finally:
+            self._remove(tmp_path)
+
+    def _entries(self) -> List[Path]:
+        return [
+            path for ext in SIDECAR_EXTENSIONS.values()
+            for path in self.cache_dir.glob(f"*{ext}")
+        ]
+
+    def _evict(self) -> None:
+        """Evict least recently used sidecars beyond ``max_entries``."""
+        entries = []
+        for sidecar in self._entries():
+            try:
+                entries.append((sidecar.stat().st_mtime, sidecar))
+            except FileNotFoundError:
+                continue
+
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+
+        entries.sort(key=lambda item: item[0])
+        for _, sidecar in entries[:overflow]:
+            if self._remove(sidecar):
+                logger.debug(f"Evicted columnar sidecar: {sidecar.name}")
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Failed to remove {path}: {str(e)}")
+            return False
+
+
+def _sidecar_format(sidecar: Path) -> str:
+    return "parquet" if sidecar.suffix == ".parquet" else "pickle"
+
+
+def read_sidecar(sidecar: Union[str, Path], usecols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read a sidecar file, optionally restricted to some columns.
+
+    Columns come back in file order, as ``pd.read_csv(usecols=...)`` returns them.
+
+    Args:
+        sidecar: Path to a .parquet or .pkl sidecar
+        usecols: Column names to load (default: all columns)
+
+    Returns:
+        The stored DataFrame
+    """
+    sidecar = Path(sidecar)
+    if _sidecar_format(sidecar) == "parquet":
+        df = pd.read_parquet(sidecar, columns=list(usecols) if usecols is not None else None)
+    else:
+        df = pd.read_pickle(sidecar)
+
+    if usecols is not None:
+        wanted = set(usecols)
+        df = df[[col for col in df.columns if col in wanted]]
+    return df
+
+
+def load_csv(filepath: Union[str, Path], usecols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Load a CSV, from its sidecar when one is ready for the current content.
+
+    Args:
+        filepath: Path to the CSV file
+        usecols: Column names to load (default: all columns)
+
+    Returns:
+        DataFrame equal to ``pd.read_csv(filepath, usecols=usecols, low_memory=False)``
+
+    Example:
+        >>> df = load_csv("data/FBL3N.csv", usecols=["Account", "Amount"])
+    """
+    cache = get_columnar_cache()
+    if cache is not None:
+        df = cache.load(filepath, usecols=usecols)
+        if df is not None:
+            return df
+    return _read_source(filepath, usecols=usecols)
+
+
+def prepare_sidecars(filepaths: List[str]) -> List[Future]:
+    """
+    Start background sidecar builds for uploaded CSV files.
+
+    Args:
+        filepaths: Source CSV paths
+
+    Returns:
+        One future per file (empty if the cache is disabled)
+    """
+    cache = get_columnar_cache()
+    if cache is None:
+        return []
+    return [cache.build_async(filepath) for filepath in filepaths]
+
+
+# Global cache instance
+_columnar_cache: Optional[ColumnarCache] = None
+_columnar_cache_lock = threading.Lock()
+
+
+def get_columnar_cache() -> Optional[ColumnarCache]:
+    """
+    Get the process-wide columnar cache configured in settings.
+
+    Returns:
+        ColumnarCache instance, or None if sidecars are disabled
+    """
+    global _columnar_cache
+    config = get_config()
+    if not config.columnar_cache_enabled:
+        return None
+
+    with _columnar_cache_lock:
+        if _columnar_cache is None:
+            _columnar_cache = ColumnarCache(
+                cache_dir=config.columnar_cache_dir,
+                max_entries=config.columnar_cache_max_entries,
+                storage_format=config.columnar_cache_format,
+            )
+    return _columnar_cache
+
+
+def set_columnar_cache(cache: Optional[ColumnarCache]) -> None:
+    """
+    Replace the process-wide columnar cache.
+
+    Args:
+        cache: ColumnarCache to use, or None to re-create it from settings lazily
+    """
+    global _columnar_cache
+    with _columnar_cache_lock:
+        _columnar_cache = cache
@@ -0,0 +1,954 @@
+"""
+Single-pass streaming CSV profiler.
+
+Reads a CSV in fixed-size chunks of raw strings and folds every chunk into
+mergeable per-column state (see ``ira_builder.tools.sketches``), so peak memory
+is bounded by the chunk size rather than the file size. The result has the
+same shape as the metadata documented on ``analyze_csv_structure``, with
+statistics that are exact for small files and approximate (quantiles, distinct
+counts, top values) once a column outgrows its sketch capacity.
+"""
+
+import io
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ira_builder.tools.date_formats import infer_date_format
+from ira_builder.tools.join_discovery import normalize_keys
+from ira_builder.tools.memory_estimator import estimate_load_memory
+from ira_builder.tools.number_formats import (
+    NumberFormat,
+    parse_formatted_numbers,
+    parse_number_text,
+)
+from ira_builder.tools.read_options import recommend_read_options
+from ira_builder.tools.sketches import (
+    DistinctCounter,
+    HeavyHitters,
+    KeySketch,
+    QuantileSketch,
+    RunningMoments,
+    hash_values,
+)
+from ira_builder.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rows per chunk when streaming a CSV
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Number of sample rows kept for the metadata
+SAMPLE_ROWS = 5
+
+# Distinct text values kept per column for date format inference, and the
+# most taken from any one chunk (so the sample spans several chunks)
+DATE_SAMPLE_VALUES = 200
+DATE_SAMPLE_PER_CHUNK = 50
+
+# Quantiles reported in the statistics (same as DataFrame.describe)
+QUANTILES = [0.25, 0.5, 0.75]
+
+# Bytes read per block by the row counter
+COUNT_BLOCK_BYTES = 8 * 1024 * 1024
+
+# Byte windows read at random offsets when sampling files too large to stream
+SAMPLE_WINDOWS = 64
+SAMPLE_WINDOW_BYTES = 256 * 1024
+
+# z-score of the confidence level reported for sampled profiles
+CONFIDENCE_LEVEL = 0.95
+_Z_SCORE = 1.96
+
+# Strings pandas parses as booleans
+_BOOL_VALUES = {
+    "True": True, "TRUE": True, "true": True,
+    "False": False, "FALSE": False, "false": False,
+}
+
+
+def _parse_floats(values: pd.Series) -> Optional[np.ndarray]:
+    """Parse raw strings as floats, or return None if any value isn't numeric."""
+    try:
+        array = values.to_numpy(dtype=object).astype(np.float64)
+    except (TypeError, ValueError):
+        return None
+    if np.isnan(array).any():
+        return None
+    return array
+
+
+def coerce_column(values: pd.Series, dtype: str) -> pd.Series:
+    """
+    Convert raw string values to the dtype inferred by the profiler.
+
+    Args:
+        values: Values read with ``dtype=str``
+        dtype: Inferred dtype name ("int64", "float64", "bool" or "object")
+
+    Returns:
+        Series with the values pandas would have produced for that column
+        (formatted numeric text is converted to numbers as well)
+    """
+    if dtype in ("int64", "float64"):
+        numbers = pd.to_numeric(values, errors="coerce").astype("float64")
+        # Formatted text such as "-2,17,00,102.39" or "1,500.00-"
+        unparsed = numbers.isna() & values.notna()
+        if unparsed.any():
+            numbers[unparsed] = parse_formatted_numbers(values[unparsed])
+        return numbers.astype(dtype)
+    if dtype == "bool":
+        return values.map(_BOOL_VALUES)
+    return values
+
+
+class ColumnProfile:
+    """
+    Mergeable profiling state for a single CSV column.
+
+    The column is treated as a numeric candidate until a non-numeric value is
+    seen; numeric state is only maintained while it remains one. Formatted
+    numeric text (grouped digits, trailing minus, currency markers - see
+    ``ira_builder.tools.number_formats``) counts as numeric; the formatting
+    seen is kept in ``number_format``; pandas loads such a column as text, so
+    its ``dtype`` is "object" while its statistics describe the parsed
+    numbers. Distinct counts are tracked on the raw
+    strings for every column; top values and a small sample of distinct
+    values (for date format inference) only while a column is textual, so a
+    column demoted from numeric late in the file has incomplete (inexact)
+    top values. Text and integer columns also keep a ``KeySketch`` of their
+    normalized values for join key discovery; it is dropped (None) once the
+    column holds non-integer numbers.
+
+    Attributes:
+        name: Column name
+        row_count: Number of rows seen (including missing values)
+        null_count: Number of missing values seen
+        value_chars: Total length of the non-missing raw values
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.row_count = 0
+        self.null_count = 0
+        self.value_chars = 0
+
+        self.is_numeric = True
+        self.is_integer = True
+        self.is_bool = True
+
+        self.moments = RunningMoments()
+        self.quantiles = QuantileSketch()
+        self.numeric_distinct = DistinctCounter()
+        self.number_format = NumberFormat()
+        self.distinct = DistinctCounter()
+        self.top_values = HeavyHitters()
+        self.top_values_complete = True
+        self.text_sample: List[str] = []
+        self.key_sketch: Optional[KeySketch] = KeySketch()
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Fold a chunk of raw string values into the column state.
+
+        Args:
+            values: Column values as read with ``dtype=str`` (NaN for missing)
+        """
+        null_mask = values.isna()
+        self.row_count += len(values)
+        self.null_count += int(null_mask.sum())
+
+        present = values[~null_mask]
+        if len(present) == 0:
+            return
+
+        counts = present.value_counts(sort=False)
+        self.value_chars += int(np.dot(counts.index.str.len().to_numpy(), counts.to_numpy()))
+        hashes = hash_values(counts.index.to_series())
+        self.distinct.update_hashes(hashes)
+
+        if self.is_bool and not present.isin(_BOOL_VALUES.keys()).all():
+            self.is_bool = False
+
+        if self.is_numeric and not self.is_bool:
+            array = _parse_floats(present)
+            chunk_is_integer = None
+            if array is None:
+                parsed = parse_number_text(present)
+                if parsed is not None:
+                    array, chunk_is_integer, chunk_format = parsed
+                    self.number_format.merge(chunk_format)
+
+            if array is None:
+                self._drop_numeric_state()
+                self._update_text(counts, hashes)
+                return
+
+            # Top values are only reported for text columns
+            self.top_values_complete = False
+
+            self.moments.update(array)
+            self.quantiles.update(array)
+            self.numeric_distinct.update_hashes(hash_values(pd.Series(pd.unique(array))))
+            if self.is_integer:
+                if chunk_is_integer is None:
+                    text = "".join(present.tolist())
+                    chunk_is_integer = not ("." in text or "e" in text or "E" in text)
+                self.is_integer = chunk_is_integer
+
+            if self.is_integer:
+                self._update_keys(counts, hashes)
+            else:
+                self.key_sketch = None
+        else:
+            if self.is_numeric:
+                self._drop_numeric_state()
+            self._update_text(counts, hashes)
+
+    def _update_text(self, counts: pd.Series, hashes: np.ndarray) -> None:
+        self.top_values.update_counts(counts)
+        self._update_keys(counts, hashes)
+        room = min(DATE_SAMPLE_VALUES - len(self.text_sample), DATE_SAMPLE_PER_CHUNK)
+        if room > 0:
+            self.text_sample.extend(counts.index[:room].tolist())
+
+    def _update_keys(self, counts: pd.Series, hashes: np.ndarray) -> None:
+        if self.key_sketch is None:
+            return
+        # Already normalized values hash the same as their raw strings
+        keys = normalize_keys(counts.index.to_series())
+        self.key_sketch.update_hashes(hashes if keys is None else hash_values(keys), counts.to_numpy())
+
+    def _drop_numeric_state(self) -> None:
+        self.is_numeric = False
+        self.is_integer = False
+        self.moments = RunningMoments()
+        self.quantiles = QuantileSketch()
+        self.numeric_distinct = DistinctCounter()
+        self.number_format = NumberFormat()
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """
+        Merge the state of the same column from another part of the data.
+
+        Args:
+            other: Profile of the same column over different rows
+        """
+        self.row_count += other.row_count
+        self.null_count += other.null_count
+        self.value_chars += other.value_chars
+        self.distinct.merge(other.distinct)
+        self.top_values.merge(other.top_values)
+        self.top_values_complete = self.top_values_complete and other.top_values_complete
+        self.text_sample = (self.text_sample + other.text_sample)[:DATE_SAMPLE_VALUES]
+        if self.key_sketch is not None and other.key_sketch is not None:
+            self.key_sketch.merge(other.key_sketch)
+        else:
+            self.key_sketch = None
+        self.is_bool = self.is_bool and other.is_bool
+
+        if self.is_numeric and other.is_numeric and not self.is_bool:
+            self.is_integer = self.is_integer and other.is_integer
+            self.moments.merge(other.moments)
+            self.quantiles.merge(other.quantiles)
+            self.numeric_distinct.merge(other.numeric_distinct)
+            self.number_format.merge(other.number_format)
+        elif self.is_numeric:
+            self._drop_numeric_state()
+
+    @property
+    def is_formatted_numeric(self) -> bool:
+        """True if the column holds numbers stored as formatted text (e.g. "-2,17,00,102.39")."""
+        return self.is_numeric and not self.is_bool and self.number_format.is_formatted
+
+    @property
+    def dtype(self) -> str:
+        """The dtype pandas would infer for this column."""
+        present = self.row_count - self.null_count
+        if present == 0:
+            return "float64"
+        if self.is_bool:
+            return "bool" if self.null_count == 0 else "object"
+        if self.is_formatted_numeric:
+            return "object"
+        if self.is_numeric:
+            return "int64" if self.is_integer and self.null_count == 0 else "float64"
+        return "object"
+
+    @property
+    def is_exact(self) -> bool:
+        """True if every statistic of this column is exact."""
+        if self.is_numeric:
+            return self.quantiles.is_exact and self.numeric_distinct.is_exact
+        return (
+            self.distinct.is_exact and self.top_values.error == 0 and self.top_values_complete
+        )
+
+    def unique_count(self) -> int:
+        """Number of distinct non-null values (of the raw text for formatted numbers)."""
+        if self.is_numeric and not self.is_bool and not self.number_format.is_formatted:
+            return self.numeric_distinct.count()
+        return self.distinct.count()
+
+    def date_format(self) -> Optional[Dict[str, Any]]:
+        """Inferred date format of a text column (see ``infer_date_format``), or None."""
+        if self.is_numeric or self.is_bool or not self.text_sample:
+            return None
+        return infer_date_format(pd.Series(self.text_sample, dtype=object))
+
+    def statistics(self) -> Dict[str, Any]:
+        """Summary statistics in the DataFrame.describe layout."""
+        if self.moments.count == 0:
+            nan = float("nan")
+            return {"count": 0, "mean": nan, "std": nan, "min": nan,
+                    "25%": nan, "50%": nan, "75%": nan, "max": nan}
+
+        q25, q50, q75 = self.quantiles.quantiles(QUANTILES)
+        return {
+            "count": int(self.moments.count),
+            "mean": round(self.moments.mean, 2),
+            "std": round(self.moments.std, 2),
+            "min": round(self.moments.min, 2),
+            "25%": round(q25, 2),
+            "50%": round(q50, 2),
+            "75%": round(q75, 2),
+            "max": round(self.moments.max, 2),
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize the column state to a JSON-friendly dictionary."""
+        return {
+            "name": self.name,
+            "row_count": self.row_count,
+            "null_count": self.null_count,
+            "value_chars": self.value_chars,
+            "is_numeric": self.is_numeric,
+            "is_integer": self.is_integer,
+            "is_bool": self.is_bool,
+            "moments": self.moments.to_dict(),
+            "quantiles": self.quantiles.to_dict(),
+            "numeric_distinct": self.numeric_distinct.to_dict(),
+            "number_format": self.number_format.to_dict(),
+            "distinct": self.distinct.to_dict(),
+            "top_values": self.top_values.to_dict(),
+            "top_values_complete": self.top_values_complete,
+            "text_sample": self.text_sample,
+            "key_sketch": self.key_sketch.to_dict() if self.key_sketch is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ColumnProfile":
+        """Restore a column state produced by ``to_state``."""
+        column = cls(state["name"])
+        column.row_count = state["row_count"]
+        column.null_count = state["null_count"]
+        column.value_chars = state.get("value_chars", 0)
+        column.is_numeric = state["is_numeric"]
+        column.is_integer = state["is_integer"]
+        column.is_bool = state["is_bool"]
+        column.moments = RunningMoments.from_dict(state["moments"])
+        column.quantiles = QuantileSketch.from_dict(state["quantiles"])
+        column.numeric_distinct = DistinctCounter.from_dict(state["numeric_distinct"])
+        if "number_format" in state:
+            column.number_format = NumberFormat.from_dict(state["number_format"])
+        column.distinct = DistinctCounter.from_dict(state["distinct"])
+        column.top_values = HeavyHitters.from_dict(state["top_values"])
+        column.top_values_complete = state.get("top_values_complete", True)
+        column.text_sample = state.get("text_sample", [])
+        if "key_sketch" in state:
+            column.key_sketch = KeySketch.from_dict(state["key_sketch"]) if state["key_sketch"] else None
+        return column
+
+
+class CSVProfileBuilder:
+    """
+    Accumulates a profile of a CSV file chunk by chunk.
+
+    Example:
+        >>> builder = CSVProfileBuilder()
+        >>> for chunk in pd.read_csv("data/sales.csv", dtype=str, chunksize=50_000):
+        ...     builder.update(chunk)
+        >>> metadata = builder.to_metadata("data/sales.csv")
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None):
+        self.columns: List[str] = list(columns or [])
+        self.column_profiles: Dict[str, ColumnProfile] = {
+            col: ColumnProfile(col) for col in self.columns
+        }
+        self.row_count = 0
+        self.chunk_count = 0
+        self.sample: Optional[pd.DataFrame] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold a chunk of rows into the profile.
+
+        Args:
+            chunk: DataFrame read with ``dtype=str``
+        """
+        if not self.columns:
+            self.columns = chunk.columns.tolist()
+            self.column_profiles = {col: ColumnProfile(col) for col in self.columns}
+
+        for col in self.columns:
+            self.column_profiles[col].update(chunk[col])
+
+        if self.sample is None or len(self.sample) < SAMPLE_ROWS:
+            head = chunk.head(SAMPLE_ROWS)
+            self.sample = head if self.sample is None else pd.concat([self.sample, head])
+            self.sample = self.sample.head(SAMPLE_ROWS)
+
+        self.row_count += len(chunk)
+        self.chunk_count += 1
+
+    def merge(self, other: "CSVProfileBuilder") -> None:
+        """
+        Merge a profile of rows that follow the rows of this profile.
+
+        Args:
+            other: Profile of later rows of a file with the same columns
+
+        Raises:
+            ValueError: If the column layouts differ
+        """
+        if self.columns and other.columns and self.columns != other.columns:
+            raise ValueError("Cannot merge profiles with different columns")
+        if not self.columns:
+            self.columns = list(other.columns)
+            self.column_profiles = {col: ColumnProfile(col) for col in self.columns}
+
+        for col in self.columns:
+            self.column_profiles[col].merge(other.column_profiles[col])
+
+        if other.sample is not None and (self.sample is None or len(self.sample) < SAMPLE_ROWS):
+            combined = other.sample if self.sample is None else pd.concat([self.sample, other.sample])
+            self.sample = combined.head(SAMPLE_ROWS)
+
+        self.row_count += other.row_count
+        self.chunk_count += other.chunk_count
+
+    @property
+    def is_exact(self) -> bool:
+        return all(profile.is_exact for profile in self.column_profiles.values())
+
+    def _typed_sample(self, dtypes: Dict[str, str]) -> List[Dict[str, Any]]:
+        if self.sample is None:
+            return []
+
+        sample = self.sample.copy()
+        for col, dtype in dtypes.items():
+            if dtype == "object" and self.column_profiles[col].is_bool:
+                dtype = "bool"
+            sample[col] = coerce_column(sample[col], dtype)
+        return sample.to_dict(orient="records")
+
+    def to_metadata(self, filepath: str) -> Dict[str, Any]:
+        """
+        Build the metadata dictionary consumed by the planner and coder.
+
+        Args:
+            filepath: Path of the profiled file
+
+        Returns:
+            Metadata dictionary in the format documented on analyze_csv_structure,
+            plus ``unique_counts`` for every column, ``numeric_formats`` for
+            numeric columns stored as formatted text, ``date_formats`` for
+            text columns holding dates, ``read_options`` (compact
+            ``pd.read_csv`` options, see ``recommend_read_options``),
+            ``value_lengths`` (mean length of text values),
+            ``memory_estimate`` (see ``estimate_load_memory``),
+            ``profile_info``, and ``key_sketches``
+            (value sketches for join discovery; stripped from the metadata
+            ``csv_tools`` returns to agents)
+        """
+        file_path = Path(filepath)
+        dtypes = {col: self.column_profiles[col].dtype for col in self.columns}
+
+        metadata = {
+            "filename": file_path.name,
+            "path": str(file_path.absolute()),
+            "columns": list(self.columns),
+            "dtypes": dtypes,
+            "row_count": self.row_count,
+            "column_count": len(self.columns),
+            "file_size_mb": round(file_path.stat().st_size / (1024 * 1024), 2),
+            "analyzed_at": datetime.now().isoformat(),
+        }
+
+        metadata["sample_data"] = self._typed_sample(dtypes)
+
+        missing = {
+            col: self.column_profiles[col].null_count
+            for col in self.columns if self.column_profiles[col].null_count > 0
+        }
+        metadata["missing_values"] = missing
+        metadata["missing_percentage"] = {
+            col: round((count / self.row_count) * 100, 2) for col, count in missing.items()
+        }
+
+        # Numeric columns stored as formatted text load as "object" and must
+        # be parsed before use; their statistics describe the parsed numbers
+        metadata["numeric_formats"] = {
+            col: {**profile.number_format.to_dict(), "description": profile.number_format.describe()}
+            for col, profile in self.column_profiles.items()
+            if profile.is_formatted_numeric
+        }
+
+        numerical_cols = [
+            col for col in self.columns
+            if dtypes[col] in ("int64", "float64") or col in metadata["numeric_formats"]
+        ]
+        metadata["statistics"] = {
+            col: self.column_profiles[col].statistics()
+            for col in numerical_cols if self.column_profiles[col].is_numeric
+        }
+
+        # Text columns holding dates, with the format to parse them with
+        metadata["date_formats"] = {}
+        for col in self.columns:
+            date_format = self.column_profiles[col].date_format()
+            if date_format is not None:
+                metadata["date_formats"][col] = date_format
+
+        categorical_cols = [
+            col for col in self.columns
+            if dtypes[col] == "object" and col not in metadata["numeric_formats"]
+        ]
+        metadata["categorical_info"] = {
+            col: {
+                "unique_count": self.column_profiles[col].unique_count(),
+                "top_values": dict(self.column_profiles[col].top_values.top(5)),
+            }
+            for col in categorical_cols
+        }
+
+        metadata["type_summary"] = {
+            "numerical": numerical_cols,
+            "categorical": [col for col in categorical_cols if col not in metadata["date_formats"]],
+            "datetime": list(metadata["date_formats"]),
+        }
+
+        metadata["unique_counts"] = {
+            col: self.column_profiles[col].unique_count() for col in self.columns
+        }
+        metadata["value_lengths"] = {
+            col: round(profile.value_chars / (profile.row_count - profile.null_count), 1)
+            for col, profile in self.column_profiles.items()
+            if dtypes[col] == "object" and profile.row_count > profile.null_count
+        }
+        metadata["memory_estimate"] = estimate_load_memory(metadata)
+        metadata["read_options"] = recommend_read_options(
+            metadata,
+            bool_columns=[col for col in self.columns if self.column_profiles[col].is_bool],
+        )
+        metadata["profile_info"] = {
+            "mode": "streaming",
+            "chunk_count": self.chunk_count,
+            "exact": self.is_exact,
+        }
+
+        # Candidate join keys: text and integer columns with values
+        metadata["key_sketches"] = {
+            col: profile.key_sketch.to_dict()
+            for col, profile in self.column_profiles.items()
+            if profile.key_sketch is not None and not profile.is_bool
+            and profile.row_count > profile.null_count
+        }
+        return metadata
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize the builder to a JSON-friendly dictionary."""
+        return {
+            "columns": list(self.columns),
+            "row_count": self.row_count,
+            "chunk_count": self.chunk_count,
+            "sample": self.sample.to_dict(orient="list") if self.sample is not None else None,
+            "column_profiles": [self.column_profiles[col].to_state() for col in self.columns],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "CSVProfileBuilder":
+        """Restore a builder produced by ``to_state``."""
+        builder = cls()
+        builder.columns = list(state["columns"])
+        builder.row_count = state["row_count"]
+        builder.chunk_count = state["chunk_count"]
+        if state["sample"] is not None:
+            builder.sample = pd.DataFrame(state["sample"], columns=builder.columns, dtype=object)
+        builder.column_profiles = {
+            column_state["name"]: ColumnProfile.from_state(column_state)
+            for column_state in state["column_profiles"]
+        }
+        return builder
+
+
+def profile_csv_streaming(
+    filepath: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Dict[str, Any]:
+    """
+    Profile a CSV file in a single pass with bounded memory.
+
+    Args:
+        filepath: Path to the CSV file
+        chunk_rows: Number of rows parsed per chunk (default: 50,000)
+
+    Returns:
+        Metadata dictionary in the format documented on analyze_csv_structure
+
+    Raises:
+        pandas.errors.EmptyDataError: If the file is empty
+        pandas.errors.ParserError: If the file is not valid CSV
+
+    Example:
+        >>> metadata = profile_csv_streaming("data/FBL3N.csv")
+        >>> metadata["profile_info"]["mode"]
+        'streaming'
+    """
+    return build_csv_profile(filepath, chunk_rows=chunk_rows).to_metadata(filepath)
+
+
+def build_csv_profile(
+    filepath: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    builder: Optional[CSVProfileBuilder] = None,
+    offset: int = 0,
+) -> CSVProfileBuilder:
+    """
+    Stream a CSV file, or the rows appended to it, into a profile builder.
+
+    With a ``builder`` holding the profile of the file's first ``offset``
+    bytes (which must end at a row boundary), only the bytes after ``offset``
+    are parsed, as header-less rows, and merged into it.
+
+    Args:
+        filepath: Path to the CSV file
+        chunk_rows: Number of rows parsed per chunk (default: 50,000)
+        builder: Profile of the first ``offset`` bytes, extended in place
+        offset: Byte offset where the rows still to profile start
+
+    Returns:
+        Builder holding the profile of the whole file
+
+    Raises:
+        pandas.errors.EmptyDataError: If the file is empty
+        pandas.errors.ParserError: If the file is not valid CSV
+    """
+    if builder is None:
+        builder = CSVProfileBuilder()
+        with pd.read_csv(filepath, dtype=str, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                builder.update(chunk)
+
+        if not builder.columns:
+            # Header-only file: no chunks were produced
+            builder = CSVProfileBuilder(pd.read_csv(filepath, nrows=0).columns.tolist())
+    elif offset < os.path.getsize(filepath):
+        appended = CSVProfileBuilder(builder.columns)
+        with open(filepath, "rb") as f:
+            f.seek(offset)
+            try:
+                with pd.read_csv(
+                    f, header=None, names=builder.columns, dtype=str,
+                    chunksize=chunk_rows, encoding="utf-8",
+                ) as reader:
+                    for chunk in reader:
+                        appended.update(chunk)
+            except pd.errors.EmptyDataError:
+                # Only blank lines were appended
+                pass
+        logger.debug(f"Profiled {appended.row_count} appended rows of {Path(filepath).name}")
+        builder.merge(appended)
+
+    logger.debug(
+        f"Streamed {builder.row_count} rows in {builder.chunk_count} chunks "
+        f"(exact={builder.is_exact})"
+    )
+    return builder
+
+
+def count_csv_rows(
+    filepath: str,
+    deadline: Optional[float] = None,
+    block_size: int = COUNT_BLOCK_BYTES,
+) -> Tuple[int, bool]:
+    """
+    Count the data rows of a CSV with a raw byte scan.
+
+    Newlines inside quoted fields and blank lines are not counted, matching
+    what ``pandas.read_csv`` would return. The scan never parses fields, so
+    it runs at close to disk speed.
+
+    Args:
+        filepath: Path to the CSV file
+        deadline: ``time.monotonic()`` value after which the scan stops and
+            extrapolates the count from the bytes read so far
+        block_size: Bytes read per block
+
+    Returns:
+        Tuple of (row count excluding the header, whether the count is exact)
+
+    Example:
+        >>> count_csv_rows("data/FBL3N.csv")
+        (261872, True)
+    """
+    size = os.path.getsize(filepath)
+    in_quotes = 0
+    last_byte = 10
+    prev_newline = -1
+    lines = 0
+    offset = 0
+    exact = True
+
+    with open(filepath, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+
+            data = np.frombuffer(block, dtype=np.uint8)
+            newlines = np.flatnonzero(data == 10)
+            quotes = np.flatnonzero(data == 34)
+            if in_quotes or len(quotes):
+                # A newline is inside a quoted field if an odd number of quotes precede it
+                parity = (np.searchsorted(quotes, newlines) + in_quotes) & 1
+                newlines = newlines[parity == 0]
+
+            if len(newlines):
+                ends = newlines + offset
+                starts = np.concatenate(([prev_newline + 1], ends[:-1] + 1))
+                lengths = ends - starts
+                before = np.where(
+                    newlines > 0, data[np.maximum(newlines - 1, 0)], last_byte
+                )
+                empty = (lengths == 0) | ((lengths == 1) & (before == 13))
+                lines += int(len(newlines) - np.count_nonzero(empty))
+                prev_newline = int(ends[-1])
+
+            in_quotes = (in_quotes + len(quotes)) & 1
+            last_byte = int(data[-1])
+            offset += len(data)
+
+            if deadline is not None and offset < size and time.monotonic() > deadline:
+                exact = False
+                break
+
+    if exact:
+        tail = offset - (prev_newline + 1)
+        if tail > 0 and not (tail == 1 and last_byte == 13):
+            lines += 1
+        return max(lines - 1, 0), True
+
+    estimated_lines = int(round(lines * size / offset)) if offset else 0
+    return max(estimated_lines - 1, 0), False
+
+
+def _read_window(
+    f: Any,
+    offset: int,
+    window_bytes: int,
+    columns: List[str],
+) -> Optional[pd.DataFrame]:
+    """
+    Parse the complete rows inside a byte window of an open CSV file.
+
+    The partial row at the start of the window is skipped. Windows that don't
+    parse (e.g. because they start inside a multi-line quoted field) are
+    discarded.
+    """
+    f.seek(offset)
+    buffer = f.read(window_bytes)
+    start = buffer.find(b"\n") + 1
+    end = buffer.rfind(b"\n") + 1
+    if start <= 0 or end <= start:
+        return None
+
+    try:
+        window = pd.read_csv(
+            io.BytesIO(buffer[start:end]), header=None, names=columns, dtype=str
+        )
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError):
+        return None
+    return window
+
+
+def profile_csv_sample(
+    filepath: str,
+    time_budget: float = 2.0,
+    sample_rows: int = 10_000,
+    chunk_rows: int = 10_000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Build an approximate "first look" profile of a CSV within a time budget.
+
+    Small files are streamed completely into a uniform reservoir sample
+    (priority sampling). When the file can't be read within a quarter of the
+    budget, rows are instead drawn from byte windows at stratified random
+    offsets across the whole file, and the row count comes from a byte scan
+    (extrapolated if the scan runs out of budget). Dtypes, statistics and top
+    values are computed on the sample; counts are scaled to the file's row
+    count and ``profile_info`` carries sample-size and confidence annotations.
+
+    Args:
+        filepath: Path to the CSV file
+        time_budget: Target wall-clock seconds for the whole profile
+        sample_rows: Reservoir size
+        chunk_rows: Rows parsed per chunk while streaming
+        seed: Random seed for the reservoir and window offsets
+
+    Returns:
+        Metadata dictionary in the format documented on analyze_csv_structure,
+        with ``profile_info["mode"] == "sample"``
+
+    Raises:
+        pandas.errors.EmptyDataError: If the file is empty
+        pandas.errors.ParserError: If the file is not valid CSV
+
+    Example:
+        >>> metadata = profile_csv_sample("data/FBL3N.csv", time_budget=1.0)
+        >>> metadata["profile_info"]["sample_rows"]
+        10000
+    """
+    started = time.monotonic()
+    rng = np.random.default_rng(seed)
+
+    reservoir: Optional[pd.DataFrame] = None
+    keys = np.empty(0, dtype=np.float64)
+    head: Optional[pd.DataFrame] = None
+    columns: List[str] = []
+    rows_scanned = 0
+    reached_end = True
+
+    def add_candidates(rows: pd.DataFrame) -> None:
+        nonlocal reservoir, keys
+        pool = rows if reservoir is None else pd.concat([reservoir, rows], ignore_index=True)
+        pool_keys = np.concatenate([keys, rng.random(len(rows))])
+        if len(pool) > sample_rows:
+            keep = np.argpartition(pool_keys, -sample_rows)[-sample_rows:]
+            pool, pool_keys = pool.iloc[keep].reset_index(drop=True), pool_keys[keep]
+        reservoir, keys = pool, pool_keys
+
+    # Phase 1: stream from the start; small files finish here
+    with pd.read_csv(filepath, dtype=str, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            if head is None:
+                head = chunk.head(SAMPLE_ROWS)
+                columns = chunk.columns.tolist()
+            add_candidates(chunk)
+            rows_scanned += len(chunk)
+
+            if time.monotonic() > started + time_budget / 4:
+                reached_end = False
+                break
+
+    if head is None:
+        builder = CSVProfileBuilder(pd.read_csv(filepath, nrows=0).columns.tolist())
+        metadata = builder.to_metadata(filepath)
+        _annotate_sample(metadata, builder, 0, True, 0)
+        metadata["profile_info"]["elapsed_seconds"] = round(time.monotonic() - started, 3)
+        return metadata
+
+    if reached_end:
+        row_count, row_count_exact = rows_scanned, True
+    else:
+        # Phase 2: replace the prefix sample with rows from across the file
+        reservoir, keys = None, np.empty(0, dtype=np.float64)
+        rows_scanned = 0
+        size = os.path.getsize(filepath)
+        offsets = ((np.arange(SAMPLE_WINDOWS) + rng.random(SAMPLE_WINDOWS)) * size / SAMPLE_WINDOWS)
+        with open(filepath, "rb") as f:
+            for offset in rng.permutation(offsets.astype(np.int64)):
+                window = _read_window(f, int(offset), SAMPLE_WINDOW_BYTES, columns)
+                if window is not None and len(window):
+                    add_candidates(window)
+                    rows_scanned += len(window)
+                if time.monotonic() > started + time_budget * 0.6:
+                    break
+
+        # Phase 3: exact row count with the remaining budget
+        row_count, row_count_exact = count_csv_rows(filepath, deadline=started + time_budget)
+        row_count = max(row_count, rows_scanned)
+
+    builder = CSVProfileBuilder()
+    builder.update(reservoir)
+    builder.sample = head
+
+    metadata = builder.to_metadata(filepath)
+    _annotate_sample(metadata, builder, row_count, row_count_exact, rows_scanned)
+    metadata["profile_info"]["elapsed_seconds"] = round(time.monotonic() - started, 3)
+
+    logger.debug(
+        f"Sampled {builder.row_count} of {row_count} rows in "
+        f"{metadata['profile_info']['elapsed_seconds']}s"
+    )
+    return metadata
+
+
+def _annotate_sample(
+    metadata: Dict[str, Any],
+    builder: CSVProfileBuilder,
+    row_count: int,
+    row_count_exact: bool,
+    rows_scanned: int,
+) -> None:
+    """Scale sample counts to the file and attach confidence annotations."""
+    sampled = builder.row_count
+    complete = row_count_exact and sampled == row_count
+    scale = row_count / sampled if sampled else 0.0
+
+    metadata["row_count"] = row_count
+    if not complete:
+        metadata["missing_values"] = {
+            col: int(round(count * scale)) for col, count in metadata["missing_values"].items()
+        }
+        for stats in metadata["statistics"].values():
+            stats["count"] = int(round(stats["count"] * scale))
+        for info in metadata["categorical_info"].values():
+            info["top_values"] = {
+                value: int(round(count * scale)) for value, count in info["top_values"].items()
+            }
+
+        # Estimate memory for the whole file, with distinct counts scaled up
+        # as far as the column's values allow (an upper bound)
+        unique_counts = {
+            col: max(min(int(round(count * scale)), row_count - metadata["missing_values"].get(col, 0)), 0)
+            for col, count in metadata["unique_counts"].items()
+        }
+        metadata["memory_estimate"] = estimate_load_memory({**metadata, "unique_counts": unique_counts})
+        metadata["read_options"] = recommend_read_options(
+            metadata,
+            bool_columns=[col for col in metadata["columns"] if builder.column_profiles[col].is_bool],
+            sampled=True,
+        )
+
+    if complete or sampled == 0:
+        missing_margin = 0.0
+        mean_margins = {col: 0.0 for col in metadata["statistics"]}
+    else:
+        missing_margin = round(float(100 * _Z_SCORE * 0.5 / np.sqrt(sampled)), 2)
+        mean_margins = {}
+        for col in metadata["statistics"]:
+            moments = builder.column_profiles[col].moments
+            mean_margins[col] = round(
+                float(_Z_SCORE * moments.std / np.sqrt(max(moments.count, 1))), 2
+            )
+
+    metadata["profile_info"] = {
+        "mode": "sample",
+        "exact": complete and builder.is_exact,
+        "sample_rows": sampled,
+        "rows_scanned": rows_scanned,
+        "row_count_exact": row_count_exact,
+        "coverage": round(rows_scanned / row_count, 4) if row_count else 1.0,
+        "confidence_level": CONFIDENCE_LEVEL,
+        "missing_pct_margin": missing_margin,
+        "mean_margins": mean_margins,
+        "unique_counts_from_sample": not complete,
+    }
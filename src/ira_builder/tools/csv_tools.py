@@ -5,13 +5,33 @@ This module provides tools for analyzing CSV files, extracting metadata,
 and generating summaries for the Planner Agent to understand data structure.
 """
 
+import functools
+import os
+import time
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import json
 
+from ira_builder.tools.csv_profiler import (
+    ColumnProfile,
+    CSVProfileBuilder,
+    build_csv_profile,
+    coerce_column,
+    profile_csv_sample,
+)
+from ira_builder.tools.columnar_cache import get_columnar_cache
+from ira_builder.tools.data_quality import run_quality_checks
+from ira_builder.tools.join_discovery import estimate_join, rank_join_candidates
+from ira_builder.tools.parallel_profile import run_per_file_in_processes
+from ira_builder.tools.profile_store import (
+    ProfileStore,
+    compute_file_fingerprint,
+    get_profile_store,
+)
+from ira_builder.utils.config import get_config
 from ira_builder.utils.logger import get_logger
 from ira_builder.exceptions.errors import ValidationException, StorageException
 
@@ -24,7 +44,11 @@ def analyze_csv_structure(filepath: str) -> Dict[str, Any]:
 
     This function reads a CSV file and extracts detailed information about its
     structure including columns, data types, row count, sample data, and
-    statistical summaries for numerical columns.
+    statistical summaries for numerical columns. The file is streamed in
+    chunks, so memory use stays bounded regardless of file size. Results are
+    cached in the profile store, so each content version of a file is only
+    parsed once, and a file that only had rows appended since it was last
+    profiled has just the appended rows parsed.
 
     Args:
         filepath: Absolute path to the CSV file to analyze
@@ -34,11 +58,20 @@ def analyze_csv_structure(filepath: str) -> Dict[str, Any]:
             - filename: Name of the file
             - path: Full path to the file
             - columns: List of column names
-            - dtypes: Dictionary mapping column names to data types
+            - dtypes: Dictionary mapping column names to the dtypes
+              ``pd.read_csv`` returns (numbers stored as formatted text are
+              "object")
             - row_count: Total number of rows
             - sample_data: First 5 rows as list of dictionaries
-            - statistics: Statistical summary for numerical columns
+            - statistics: Statistical summary for numerical columns,
+              including the parsed values of formatted numeric text
             - missing_values: Count of missing values per column
+            - unique_counts: Distinct non-null values per column
+            - numeric_formats: Formatting of numeric columns stored as text
+              (e.g. Indian digit grouping, trailing minus)
+            - date_formats: Inferred strptime format and confidence of text
+              columns holding dates
+            - profile_info: Profiling mode and whether statistics are exact
             - file_size_mb: File size in megabytes
             - analyzed_at: Timestamp of analysis
 
@@ -56,7 +89,21 @@ def analyze_csv_structure(filepath: str) -> Dict[str, Any]:
     """
     logger.info(f"Analyzing CSV structure: {filepath}")
 
-    # Validate file exists
+    file_path = _validate_csv_path(filepath)
+
+    # Reuse the stored profile for this content version when available
+    store = get_profile_store()
+    if store is None:
+        return _with_path(_profile_csv(filepath), file_path)
+
+    metadata = store.get_or_compute(filepath, functools.partial(_profile_csv, store=store))
+
+    # The same content may have been profiled under a different path
+    return _with_path(metadata, file_path)
+
+
+def _validate_csv_path(filepath: str) -> Path:
+    """Check that a path points to an existing CSV file."""
     file_path = Path(filepath)
     if not file_path.exists():
         raise FileNotFoundError(f"CSV file not found: {filepath}")
@@ -64,77 +111,44 @@ def analyze_csv_structure(filepath: str) -> Dict[str, Any]:
     if not file_path.suffix.lower() in ['.csv', '.txt']:
         raise ValidationException(f"File is not a CSV: {filepath}")
 
-    try:
-        # Read CSV file
-        df = pd.read_csv(filepath)
-        logger.debug(f"Successfully read CSV with {len(df)} rows and {len(df.columns)} columns")
-
-        # Basic metadata
-        metadata = {
-            "filename": file_path.name,
-            "path": str(file_path.absolute()),
-            "columns": df.columns.tolist(),
-            "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-            "row_count": len(df),
-            "column_count": len(df.columns),
-            "file_size_mb": round(file_path.stat().st_size / (1024 * 1024), 2),
-            "analyzed_at": datetime.now().isoformat(),
-        }
+    return file_path
 
-        # Sample data (first 5 rows)
-        metadata["sample_data"] = df.head(5).to_dict(orient="records")
 
-        # Missing values
-        missing = df.isnull().sum()
-        metadata["missing_values"] = {
-            col: int(count) for col, count in missing.items() if count > 0
-        }
-        metadata["missing_percentage"] = {
-            col: round((count / len(df)) * 100, 2)
-            for col, count in missing.items() if count > 0
-        }
+def _profile_csv(filepath: str, store: Optional[ProfileStore] = None) -> Dict[str, Any]:
+    """
+    Profile a CSV file, bypassing the stored profiles.
 
-        # Statistics for numerical columns
-        numerical_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        if numerical_cols:
-            stats_df = df[numerical_cols].describe()
-            metadata["statistics"] = {
-                col: {
-                    "count": int(stats_df[col]["count"]),
-                    "mean": round(float(stats_df[col]["mean"]), 2),
-                    "std": round(float(stats_df[col]["std"]), 2),
-                    "min": round(float(stats_df[col]["min"]), 2),
-                    "25%": round(float(stats_df[col]["25%"]), 2),
-                    "50%": round(float(stats_df[col]["50%"]), 2),
-                    "75%": round(float(stats_df[col]["75%"]), 2),
-                    "max": round(float(stats_df[col]["max"]), 2),
-                }
-                for col in numerical_cols
-            }
-        else:
-            metadata["statistics"] = {}
-
-        # Categorical columns info
-        categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-        if categorical_cols:
-            metadata["categorical_info"] = {
-                col: {
-                    "unique_count": int(df[col].nunique()),
-                    "top_values": df[col].value_counts().head(5).to_dict(),
-                }
-                for col in categorical_cols
-            }
-        else:
-            metadata["categorical_info"] = {}
+    If ``store`` holds the profiling state of an earlier version of the file
+    that this one extends, only the appended rows are parsed and merged into
+    it. The state of the new profile is stored in turn, for the next version.
 
-        # Data type summary
-        metadata["type_summary"] = {
-            "numerical": numerical_cols,
-            "categorical": categorical_cols,
-            "datetime": df.select_dtypes(include=["datetime64"]).columns.tolist(),
-        }
+    Args:
+        filepath: Path to the CSV file
+        store: Profile store keeping profiling states (default: profile in full)
+
+    Returns:
+        Metadata dictionary in the format documented on analyze_csv_structure
+    """
+    config = get_config()
+    if not config.profile_incremental:
+        store = None
+
+    try:
+        fingerprint = compute_file_fingerprint(filepath) if store is not None else None
+        size = os.path.getsize(filepath)
 
+        builder, reused_rows = None, 0
+        if store is not None:
+            builder, reused_rows = _extend_stored_profile(store, filepath, config.profile_chunk_rows)
+        if builder is None:
+            builder = build_csv_profile(filepath, chunk_rows=config.profile_chunk_rows)
+
+        metadata = builder.to_metadata(filepath)
+        metadata["profile_info"]["reused_rows"] = reused_rows
         logger.info(f"CSV analysis complete: {metadata['filename']}")
+
+        if store is not None:
+            _store_profile_state(store, filepath, builder, size, fingerprint)
         return metadata
 
     except pd.errors.EmptyDataError:
@@ -146,12 +160,112 @@ def analyze_csv_structure(filepath: str) -> Dict[str, Any]:
         raise StorageException(f"Failed to analyze CSV file: {str(e)}")
 
 
+def _extend_stored_profile(
+    store: ProfileStore, filepath: str, chunk_rows: int
+) -> Tuple[Optional[CSVProfileBuilder], int]:
+    """Profile only the rows appended since a stored version; (None, 0) if there is none."""
+    found = store.find_prefix_state(filepath)
+    if found is None:
+        return None, 0
+
+    state, offset = found
+    try:
+        builder = CSVProfileBuilder.from_state(state)
+        reused_rows = builder.row_count
+        builder = build_csv_profile(filepath, chunk_rows=chunk_rows, builder=builder, offset=offset)
+    except Exception as e:
+        logger.warning(f"Could not extend stored profile of {filepath}, profiling in full: {str(e)}")
+        return None, 0
+
+    logger.info(
+        f"Reused the profile of {reused_rows} rows of {Path(filepath).name}; "
+        f"parsed {builder.row_count - reused_rows} appended rows"
+    )
+    return builder, reused_rows
+
+
+def _store_profile_state(
+    store: ProfileStore,
+    filepath: str,
+    builder: CSVProfileBuilder,
+    size: int,
+    fingerprint: Optional[str],
+) -> None:
+    """Store a builder's state for later appends, if the file is unchanged and ends a row."""
+    if compute_file_fingerprint(filepath) != fingerprint:
+        return
+
+    with open(filepath, "rb") as f:
+        f.seek(max(size - 1, 0))
+        if f.read(1) != b"\n":
+            return
+
+    try:
+        store.put_state(filepath, builder.to_state(), size)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not store profile state for {filepath}: {str(e)}")
+
+
+def analyze_csv_sample(filepath: str, time_budget: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Get a fast, approximate profile of a CSV file within a time budget.
+
+    Returns the exact profile if it is already in the profile store; otherwise
+    profiles a random sample of rows (see ``profile_csv_sample``). Sampled
+    profiles are never written to the store.
+
+    Args:
+        filepath: Absolute path to the CSV file to analyze
+        time_budget: Seconds to spend (default: FAST_PROFILE_TIME_BUDGET)
+
+    Returns:
+        Metadata dictionary in the format documented on analyze_csv_structure;
+        ``profile_info`` describes the sample size and confidence margins
+
+    Raises:
+        FileNotFoundError: If the CSV file doesn't exist
+        ValidationException: If the file is not a valid CSV
+        StorageException: If there's an error reading the file
+
+    Example:
+        >>> metadata = analyze_csv_sample("data/FBL3N.csv", time_budget=1.0)
+        >>> metadata["profile_info"]["mode"]
+        'sample'
+    """
+    logger.info(f"Sampling CSV structure: {filepath}")
+
+    file_path = _validate_csv_path(filepath)
+    config = get_config()
+
+    store = get_profile_store()
+    if store is not None:
+        metadata = store.get(filepath)
+        if metadata is not None:
+            return _with_path(metadata, file_path)
+
+    try:
+        metadata = profile_csv_sample(
+            filepath,
+            time_budget=time_budget or config.fast_profile_time_budget,
+            sample_rows=config.fast_profile_sample_rows,
+        )
+        return _with_path(metadata, file_path)
+    except pd.errors.EmptyDataError:
+        raise ValidationException(f"CSV file is empty: {filepath}")
+    except pd.errors.ParserError as e:
+        raise ValidationException(f"Invalid CSV format: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error sampling CSV: {str(e)}")
+        raise StorageException(f"Failed to sample CSV file: {str(e)}")
+
+
 def get_csv_summary(filepaths: List[str]) -> str:
     """
     Generate a human-readable summary of one or more CSV files.
 
     This function creates a formatted text summary that the Planner Agent
-    can use to understand the available data sources.
+    can use to understand the available data sources. Files that aren't in
+    the profile store yet are profiled in parallel (see summarize_csv_files).
 
     Args:
         filepaths: List of absolute paths to CSV files
@@ -160,10 +274,6 @@ def get_csv_summary(filepaths: List[str]) -> str:
         Formatted string summary containing file information, column details,
         row counts, and data type information
 
-    Raises:
-        FileNotFoundError: If any file doesn't exist
-        ValidationException: If any file is not a valid CSV
-
     Example:
         >>> summary = get_csv_summary(["data/sales.csv", "data/products.csv"])
         >>> print(summary)
@@ -172,64 +282,294 @@ def get_csv_summary(filepaths: List[str]) -> str:
         Rows: 1,000 | Columns: 4 | Size: 0.15 MB
         ...
     """
+    return summarize_csv_files(filepaths)
+
+
+def summarize_csv_files(
+    filepaths: List[str],
+    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    max_workers: Optional[int] = None,
+    file_timeout: Optional[float] = None,
+) -> str:
+    """
+    Profile several CSV files, in parallel worker processes, and summarize them.
+
+    Stored profiles are used as-is. The remaining files are profiled in
+    worker processes when together they are larger than
+    CSV_SUMMARY_PARALLEL_MIN_MB (below that, starting the workers costs more
+    than it saves and they are profiled in-process, without a timeout).
+    Results are stored and formatted in the order of ``filepaths``, exactly
+    as get_csv_summary does sequentially.
+
+    Args:
+        filepaths: List of absolute paths to CSV files
+        progress_callback: Called as each file finishes with a dict holding
+            filepath, filename, status ("cached", "done", "error" or
+            "timeout"), completed, total and elapsed_seconds
+        max_workers: Concurrent worker processes (default: CSV_SUMMARY_WORKERS)
+        file_timeout: Seconds allowed per file (default: CSV_SUMMARY_FILE_TIMEOUT)
+
+    Returns:
+        Formatted string summary; files that failed or timed out get an error line
+
+    Example:
+        >>> summary = summarize_csv_files(
+        ...     ["data/FBL3N.csv", "data/BSEG.csv"],
+        ...     progress_callback=lambda p: print(p["filename"], p["status"]),
+        ... )
+    """
     logger.info(f"Generating CSV summary for {len(filepaths)} file(s)")
 
+    config = get_config()
+    # More workers than cores only adds contention
+    max_workers = min(max_workers or config.csv_summary_workers, os.cpu_count() or 1)
+    file_timeout = file_timeout if file_timeout is not None else config.csv_summary_file_timeout
+
+    unique_paths = list(dict.fromkeys(filepaths))
+    results: Dict[str, Any] = {}
+    completed = 0
+    started = time.monotonic()
+
+    def report(filepath: str, status: str) -> None:
+        nonlocal completed
+        completed += 1
+        if progress_callback is None:
+            return
+        try:
+            progress_callback({
+                "filepath": filepath,
+                "filename": Path(filepath).name,
+                "status": status,
+                "completed": completed,
+                "total": len(unique_paths),
+                "elapsed_seconds": round(time.monotonic() - started, 2),
+            })
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {str(e)}")
+
+    # Stored profiles and invalid paths are resolved without profiling
+    store = get_profile_store()
+    fingerprints: Dict[str, str] = {}
+    to_profile: List[str] = []
+    # Paths with the same content as a file already queued are profiled once
+    same_content: Dict[str, str] = {}
+    queued: Dict[str, str] = {}
+    for filepath in unique_paths:
+        try:
+            file_path = _validate_csv_path(filepath)
+            if store is not None:
+                fingerprint = fingerprints[filepath] = compute_file_fingerprint(filepath)
+                metadata = store.get(filepath, fingerprint=fingerprint)
+                if metadata is not None:
+                    results[filepath] = _with_path(metadata, file_path)
+                    report(filepath, "cached")
+                    continue
+                if fingerprint in queued:
+                    same_content[filepath] = queued[fingerprint]
+                    continue
+                queued[fingerprint] = filepath
+            to_profile.append(filepath)
+        except Exception as e:
+            results[filepath] = e
+            report(filepath, "error")
+
+    total_mb = sum(Path(fp).stat().st_size for fp in to_profile) / (1024 * 1024)
+    if len(to_profile) > 1 and max_workers > 1 and total_mb >= config.csv_summary_parallel_min_mb:
+        logger.info(
+            f"Profiling {len(to_profile)} files ({total_mb:.1f} MB) "
+            f"on {min(max_workers, len(to_profile))} worker processes"
+        )
+        outcomes = run_per_file_in_processes(
+            to_profile,
+            functools.partial(_profile_csv, store=store),
+            max_workers=max_workers,
+            timeout=file_timeout,
+            on_complete=lambda filepath, status, elapsed: report(filepath, status),
+            preload=[__name__],
+        )
+        for filepath, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                results[filepath] = outcome
+            else:
+                results[filepath] = _store_profile(filepath, outcome, fingerprints.get(filepath))
+    else:
+        for filepath in to_profile:
+            try:
+                results[filepath] = analyze_csv_structure(filepath)
+                report(filepath, "done")
+            except Exception as e:
+                results[filepath] = e
+                report(filepath, "error")
+
+    for filepath, original in same_content.items():
+        outcome = results[original]
+        results[filepath] = outcome if isinstance(outcome, Exception) else _with_path(dict(outcome), Path(filepath))
+        report(filepath, "cached")
+
     summaries = []
+    for filepath in filepaths:
+        outcome = results[filepath]
+        if isinstance(outcome, Exception):
+            logger.error(f"Error processing {filepath}: {str(outcome)}")
+            summaries.append(f"❌ Error analyzing {filepath}: {str(outcome)}")
+        else:
+            summaries.append(_format_csv_summary(outcome))
+
+    return "\n\n" + "=" * 80 + "\n\n".join(summaries)
+
+
+def _with_path(metadata: Dict[str, Any], file_path: Path) -> Dict[str, Any]:
+    """
+    Point a profile at the path it was requested for (content may be shared).
+
+    Also drops the join key sketches, which are only read by
+    discover_join_keys and would bloat the metadata agents see.
+    """
+    metadata.pop("key_sketches", None)
+    metadata["filename"] = file_path.name
+    metadata["path"] = str(file_path.absolute())
+    return metadata
+
+
+def _store_profile(filepath: str, metadata: Dict[str, Any], fingerprint: Optional[str]) -> Dict[str, Any]:
+    """Store a profile computed in a worker, unless the file changed meanwhile."""
+    store = get_profile_store()
+    if store is not None and fingerprint is not None:
+        if compute_file_fingerprint(filepath) == fingerprint:
+            try:
+                store.put(filepath, metadata, fingerprint=fingerprint)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Could not store profile for {filepath}: {str(e)}")
+        else:
+            logger.warning(f"File changed while profiling, not caching: {filepath}")
+    return metadata
+
+
+def get_csv_first_look(filepaths: List[str], time_budget: Optional[float] = None) -> str:
+    """
+    Generate a fast, approximate summary of one or more CSV files.
+
+    Same format as get_csv_summary, but built from sampled profiles (see
+    analyze_csv_sample) so it returns within roughly ``time_budget`` seconds
+    per file. Sampled files are marked as approximate in the summary.
+
+    Args:
+        filepaths: List of absolute paths to CSV files
+        time_budget: Seconds to spend per file (default: FAST_PROFILE_TIME_BUDGET)
+
+    Returns:
+        Formatted string summary
+
+    Example:
+        >>> summary = get_csv_first_look(["data/FBL3N.csv"], time_budget=1.0)
+    """
+    return summarize_csv_samples(filepaths, time_budget)[0]
+
+
+def summarize_csv_samples(
+    filepaths: List[str], time_budget: Optional[float] = None
+) -> Tuple[str, bool]:
+    """
+    Build the first-look summary of CSV files and tell whether any profile is sampled.
+
+    Args:
+        filepaths: List of absolute paths to CSV files
+        time_budget: Seconds to spend per file (default: FAST_PROFILE_TIME_BUDGET)
+
+    Returns:
+        Tuple of (summary as returned by get_csv_first_look, whether any
+        file's profile is approximate and worth replacing with the exact one)
+
+    Example:
+        >>> summary, approximate = summarize_csv_samples(["data/FBL3N.csv"])
+    """
+    logger.info(f"Generating first-look CSV summary for {len(filepaths)} file(s)")
+
+    summaries = []
+    approximate = False
 
     for filepath in filepaths:
         try:
-            metadata = analyze_csv_structure(filepath)
-
-            # Build formatted summary
-            summary_parts = [
-                f"📄 File: {metadata['filename']}",
-                f"   Path: {metadata['path']}",
-                f"   Rows: {metadata['row_count']:,} | Columns: {metadata['column_count']} | Size: {metadata['file_size_mb']} MB",
-                "",
-                "   Columns:",
-            ]
-
-            # Add column information with types
-            for col in metadata["columns"]:
-                dtype = metadata["dtypes"][col]
-                missing = metadata["missing_values"].get(col, 0)
-                missing_pct = metadata["missing_percentage"].get(col, 0)
-
-                col_info = f"      • {col} ({dtype})"
-                if missing > 0:
-                    col_info += f" - {missing:,} missing ({missing_pct}%)"
-                summary_parts.append(col_info)
-
-            # Add numerical statistics summary
-            if metadata["statistics"]:
-                summary_parts.append("")
-                summary_parts.append("   Numerical Columns Summary:")
-                for col, stats in metadata["statistics"].items():
-                    summary_parts.append(
-                        f"      • {col}: min={stats['min']}, max={stats['max']}, "
-                        f"mean={stats['mean']}, std={stats['std']}"
-                    )
-
-            # Add categorical info
-            if metadata["categorical_info"]:
-                summary_parts.append("")
-                summary_parts.append("   Categorical Columns:")
-                for col, info in metadata["categorical_info"].items():
-                    summary_parts.append(
-                        f"      • {col}: {info['unique_count']} unique values"
-                    )
-                    top_values = ", ".join(
-                        f"{k} ({v})" for k, v in list(info["top_values"].items())[:3]
-                    )
-                    summary_parts.append(f"        Top values: {top_values}")
-
-            summaries.append("\n".join(summary_parts))
+            metadata = analyze_csv_sample(filepath, time_budget=time_budget)
+            summaries.append(_format_csv_summary(metadata))
+            approximate = approximate or _is_approximate(metadata)
 
         except Exception as e:
             logger.error(f"Error processing {filepath}: {str(e)}")
             summaries.append(f"❌ Error analyzing {filepath}: {str(e)}")
 
-    return "\n\n" + "=" * 80 + "\n\n".join(summaries)
+    return "\n\n" + "=" * 80 + "\n\n".join(summaries), approximate
+
+
+def _is_approximate(metadata: Dict[str, Any]) -> bool:
+    """Whether a profile was computed from a sample of the file's rows."""
+    profile_info = metadata.get("profile_info", {})
+    return profile_info.get("mode") == "sample" and not profile_info.get("exact")
+
+
+def _format_csv_summary(metadata: Dict[str, Any]) -> str:
+    """Format a CSV profile as the human-readable summary used by the agents."""
+    # Build formatted summary
+    summary_parts = [
+        f"📄 File: {metadata['filename']}",
+        f"   Path: {metadata['path']}",
+        f"   Rows: {metadata['row_count']:,} | Columns: {metadata['column_count']} | Size: {metadata['file_size_mb']} MB",
+    ]
+
+    # Flag sampled profiles so the agent treats the numbers as estimates
+    profile_info = metadata.get("profile_info", {})
+    if _is_approximate(metadata):
+        row_note = "" if profile_info["row_count_exact"] else ", row count estimated"
+        summary_parts.append(
+            f"   Profile: APPROXIMATE - sampled {profile_info['sample_rows']:,} rows{row_note}; "
+            f"counts are scaled estimates (±{profile_info['missing_pct_margin']}% on missing "
+            f"rates at {int(profile_info['confidence_level'] * 100)}% confidence), "
+            f"unique counts are from the sample"
+        )
+
+    summary_parts.extend(["", "   Columns:"])
+
+    # Add column information with types
+    for col in metadata["columns"]:
+        dtype = metadata["dtypes"][col]
+        missing = metadata["missing_values"].get(col, 0)
+        missing_pct = metadata["missing_percentage"].get(col, 0)
+
+        col_info = f"      • {col} ({dtype})"
+        number_format = metadata.get("numeric_formats", {}).get(col)
+        if number_format:
+            col_info += f" [stored as text: {number_format['description']} - parse before arithmetic]"
+        date_format = metadata.get("date_formats", {}).get(col)
+        if date_format:
+            col_info += f" [dates, format {date_format['format']}, confidence {date_format['confidence']:.0%}]"
+        if missing > 0:
+            col_info += f" - {missing:,} missing ({missing_pct}%)"
+        summary_parts.append(col_info)
+
+    # Add numerical statistics summary
+    if metadata["statistics"]:
+        summary_parts.append("")
+        summary_parts.append("   Numerical Columns Summary:")
+        for col, stats in metadata["statistics"].items():
+            summary_parts.append(
+                f"      • {col}: min={stats['min']}, max={stats['max']}, "
+                f"mean={stats['mean']}, std={stats['std']}"
+            )
+
+    # Add categorical info
+    if metadata["categorical_info"]:
+        summary_parts.append("")
+        summary_parts.append("   Categorical Columns:")
+        for col, info in metadata["categorical_info"].items():
+            summary_parts.append(
+                f"      • {col}: {info['unique_count']} unique values"
+            )
+            top_values = ", ".join(
+                f"{k} ({v})" for k, v in list(info["top_values"].items())[:3]
+            )
+            summary_parts.append(f"        Top values: {top_values}")
+
+    return "\n".join(summary_parts)
 
 
 def validate_column_references(
@@ -306,7 +646,10 @@ def get_column_data_preview(
     Get preview of data from a specific column.
 
     Useful for the Planner Agent to show examples of data values
-    when asking clarifying questions.
+    when asking clarifying questions. Only the requested column is parsed,
+    samples stop reading as soon as enough values are found, and counts come
+    from the stored profile when the file has already been analyzed. When a
+    columnar sidecar exists the column is read from it instead of the CSV.
 
     Args:
         filepath: Path to CSV file
@@ -320,6 +663,8 @@ def get_column_data_preview(
             - samples: List of sample values
             - unique_count: Number of unique values
             - null_count: Number of missing values
+            - total_count: Number of rows
+            - stats_source: "profile_store", "columnar_sidecar" or "column_scan"
 
     Raises:
         ValidationException: If column doesn't exist
@@ -331,34 +676,136 @@ def get_column_data_preview(
     """
     logger.debug(f"Getting column preview: {column_name} from {filepath}")
 
-    df = pd.read_csv(filepath)
+    header = pd.read_csv(filepath, nrows=0).columns.tolist()
 
-    if column_name not in df.columns:
+    if column_name not in header:
         raise ValidationException(
             f"Column '{column_name}' not found in {Path(filepath).name}"
         )
 
-    column_data = df[column_name]
+    # Select by position: pandas renames duplicate headers ("Text.1"), which
+    # usecols can't match by name
+    column_index = header.index(column_name)
+    chunk_rows = get_config().profile_chunk_rows
+
+    stats = _stored_column_stats(filepath, column_name)
+    sidecar_column = _load_sidecar_column(filepath, column_name)
+    if sidecar_column is not None:
+        raw_samples = sidecar_column.dropna().head(num_samples)
+        if stats is None:
+            stats = {
+                "dtype": str(sidecar_column.dtype),
+                "unique_count": int(sidecar_column.nunique()),
+                "null_count": int(sidecar_column.isna().sum()),
+                "total_count": len(sidecar_column),
+                "source": "columnar_sidecar",
+            }
+    elif stats is None:
+        stats, raw_samples = _scan_column(filepath, column_index, num_samples, chunk_rows)
+    else:
+        raw_samples = _read_column_samples(filepath, column_index, num_samples)
 
-    # Get samples (drop NaN for cleaner display)
-    samples = column_data.dropna().head(num_samples).tolist()
+    # Sidecar values are already typed; raw CSV strings need converting
+    if sidecar_column is None:
+        raw_samples = coerce_column(raw_samples, stats["dtype"])
 
     # Convert numpy types to Python types for JSON serialization
     samples = [
-        item.item() if isinstance(item, (np.integer, np.floating)) else item
-        for item in samples
+        item.item() if isinstance(item, (np.integer, np.floating, np.bool_)) else item
+        for item in raw_samples.tolist()
     ]
 
     return {
         "column": column_name,
-        "dtype": str(column_data.dtype),
+        "dtype": stats["dtype"],
         "samples": samples,
-        "unique_count": int(column_data.nunique()),
-        "null_count": int(column_data.isnull().sum()),
-        "total_count": len(column_data),
+        "unique_count": stats["unique_count"],
+        "null_count": stats["null_count"],
+        "total_count": stats["total_count"],
+        "stats_source": stats["source"],
     }
 
 
+def _stored_column_stats(filepath: str, column_name: str) -> Optional[Dict[str, Any]]:
+    """Look up a column's dtype and counts in the stored profile, if any."""
+    store = get_profile_store()
+    if store is None:
+        return None
+
+    metadata = store.get(filepath)
+    if metadata is None or column_name not in metadata.get("unique_counts", {}):
+        return None
+
+    return {
+        "dtype": metadata["dtypes"][column_name],
+        "unique_count": metadata["unique_counts"][column_name],
+        "null_count": metadata["missing_values"].get(column_name, 0),
+        "total_count": metadata["row_count"],
+        "source": "profile_store",
+    }
+
+
+def _load_sidecar_column(filepath: str, column_name: str) -> Optional[pd.Series]:
+    """Read one typed column from the file's columnar sidecar, if it has one."""
+    cache = get_columnar_cache()
+    if cache is None:
+        return None
+
+    df = cache.load(filepath, usecols=[column_name])
+    if df is None:
+        return None
+    return df[column_name]
+
+
+def _read_column_samples(filepath: str, column_index: int, num_samples: int) -> pd.Series:
+    """Read the first non-null values of one column, stopping as soon as there are enough."""
+    samples = []
+    found = 0
+    chunk_rows = max(num_samples * 10, 1000)
+
+    with pd.read_csv(filepath, usecols=[column_index], dtype=str, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            values = chunk.iloc[:, 0].dropna()
+            samples.append(values.head(num_samples - found))
+            found += len(samples[-1])
+            if found >= num_samples:
+                break
+
+    if not samples:
+        return pd.Series([], dtype=object)
+    return pd.concat(samples, ignore_index=True)
+
+
+def _scan_column(
+    filepath: str,
+    column_index: int,
+    num_samples: int,
+    chunk_rows: int,
+) -> Tuple[Dict[str, Any], pd.Series]:
+    """Profile a single column in one streaming pass when no stored profile exists."""
+    profile = ColumnProfile(str(column_index))
+    samples = []
+    found = 0
+
+    with pd.read_csv(filepath, usecols=[column_index], dtype=str, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            values = chunk.iloc[:, 0]
+            profile.update(values)
+            if found < num_samples:
+                samples.append(values.dropna().head(num_samples - found))
+                found += len(samples[-1])
+
+    stats = {
+        "dtype": profile.dtype,
+        "unique_count": profile.unique_count(),
+        "null_count": profile.null_count,
+        "total_count": profile.row_count,
+        "source": "column_scan",
+    }
+    raw_samples = pd.concat(samples, ignore_index=True) if samples else pd.Series([], dtype=object)
+    return stats, raw_samples
+
+
 def compare_csv_schemas(filepaths: List[str]) -> Dict[str, Any]:
     """
     Compare schemas of multiple CSV files to identify common columns.
@@ -375,6 +822,8 @@ def compare_csv_schemas(filepaths: List[str]) -> Dict[str, Any]:
             - unique_columns: Columns unique to each file
             - schema_compatibility: Boolean indicating if files can be joined
             - suggested_join_keys: Potential columns for joining
+            - join_candidates: Column pairs whose values overlap, best first
+              (see discover_join_keys); these need not share a name
 
     Example:
         >>> result = compare_csv_schemas(["sales.csv", "products.csv"])
@@ -415,22 +864,127 @@ def compare_csv_schemas(filepaths: List[str]) -> Dict[str, Any]:
         if "id" in col.lower() or "key" in col.lower() or "code" in col.lower()
     ]
 
+    try:
+        join_candidates = discover_join_keys(filepaths)
+    except Exception as e:
+        logger.warning(f"Join key discovery failed: {str(e)}")
+        join_candidates = []
+
     return {
         "common_columns": sorted(list(common_columns)),
         "unique_columns": unique_columns,
-        "schema_compatibility": len(common_columns) > 0,
+        "schema_compatibility": len(common_columns) > 0 or len(join_candidates) > 0,
         "suggested_join_keys": suggested_join_keys,
+        "join_candidates": join_candidates,
         "file_column_counts": {
             filename: len(cols) for filename, cols in file_columns.items()
         },
     }
 
 
+def discover_join_keys(filepaths: List[str], max_results: int = 10) -> List[Dict[str, Any]]:
+    """
+    Find candidate join key pairs across CSV files from their values.
+
+    Uses the value sketches kept with each file's stored profile (files
+    without one are profiled first), so no file is re-read and no join is
+    run; see ``ira_builder.tools.join_discovery`` for the scoring.
+
+    Args:
+        filepaths: List of CSV file paths
+        max_results: Maximum number of pairs returned (default: 10)
+
+    Returns:
+        Candidate pairs, best first. Each holds from_file/from_column (the
+        referencing side), to_file/to_column (the looked-up side),
+        containment (share of from_column values found in to_column),
+        to_uniqueness, score and the distinct counts of both columns
+
+    Example:
+        >>> discover_join_keys(["data/FBL3N.csv", "data/vendor_master.csv"])[0]
+        {'from_file': 'FBL3N.csv', 'from_column': 'Supplier',
+         'to_file': 'vendor_master.csv', 'to_column': 'Vendor No',
+         'containment': 0.98, 'to_uniqueness': 1.0, 'score': 0.98, ...}
+    """
+    logger.info(f"Discovering join keys across {len(filepaths)} CSV files")
+
+    profiles = {}
+    for filepath in dict.fromkeys(filepaths):
+        _validate_csv_path(filepath)
+        profiles[Path(filepath).name] = _load_key_sketches(filepath)
+
+    return rank_join_candidates(profiles, max_results=max_results)
+
+
+def estimate_join_cardinality(
+    left_filepath: str,
+    left_column: str,
+    right_filepath: str,
+    right_column: str,
+) -> Dict[str, Any]:
+    """
+    Estimate the output size and key multiplicity of joining two CSV columns.
+
+    Computed from the key frequency sketches stored with each file's profile
+    (see ``KeySketch.join_size``), without reading or joining the data, so a
+    many-to-many merge that would exhaust memory or time can be spotted first.
+
+    Args:
+        left_filepath: Path of the left CSV file
+        left_column: Join column of the left file
+        right_filepath: Path of the right CSV file
+        right_column: Join column of the right file
+
+    Returns:
+        Dictionary with estimated_rows (inner join), exact, expansion,
+        relationship and left_keys / right_keys multiplicity (rows, distinct,
+        mean and max rows per key)
+
+    Raises:
+        ValidationException: If a column doesn't exist or can't be a join key
+
+    Example:
+        >>> estimate_join_cardinality("data/FBL3N.csv", "Supplier", "data/vendors.csv", "Vendor No")
+        {'estimated_rows': 261872, 'exact': False, 'expansion': 1.0,
+         'relationship': 'many-to-one', ...}
+    """
+    sides = []
+    for filepath, column in ((left_filepath, left_column), (right_filepath, right_column)):
+        _validate_csv_path(filepath)
+        metadata = _load_key_sketches(filepath)
+        if column not in metadata["columns"]:
+            raise ValidationException(f"Column '{column}' not found in {Path(filepath).name}")
+        if column not in metadata["key_sketches"]:
+            raise ValidationException(
+                f"Column '{column}' of {Path(filepath).name} can't be a join key "
+                f"(dtype {metadata['dtypes'][column]} or all values missing)"
+            )
+        sides.append(metadata)
+
+    return estimate_join(sides[0], left_column, sides[1], right_column)
+
+
+def _load_key_sketches(filepath: str) -> Dict[str, Any]:
+    """Get a file's full profile including key sketches, profiling it if needed."""
+    store = get_profile_store()
+    if store is None:
+        return _profile_csv(filepath)
+
+    fingerprint = compute_file_fingerprint(filepath)
+    metadata = store.get(filepath, fingerprint=fingerprint)
+    if metadata is None or "key_sketches" not in metadata:
+        # Profiles stored before key sketches existed are rebuilt once
+        metadata = _store_profile(filepath, _profile_csv(filepath, store), fingerprint)
+    return metadata
+
+
 def detect_data_quality_issues(filepath: str) -> Dict[str, Any]:
     """
     Detect potential data quality issues in a CSV file.
 
     Identifies common data quality problems that might affect analysis.
+    The file is read once in chunks, so this works on files larger than
+    memory (see ``ira_builder.tools.data_quality`` for the available checks).
 
     Args:
         filepath: Path to CSV file
@@ -439,7 +993,9 @@ def detect_data_quality_issues(filepath: str) -> Dict[str, Any]:
         Dictionary containing:
             - has_issues: Boolean indicating if issues were found
             - issues: List of detected issues with descriptions
-            - recommendations: Suggested fixes
+            - issue_count: Number of issues found
+            - summary: One-line summary
+            - timings_ms: Milliseconds spent scanning and in each check
 
     Example:
         >>> issues = detect_data_quality_issues("data/sales.csv")
@@ -448,74 +1004,4 @@ def detect_data_quality_issues(filepath: str) -> Dict[str, Any]:
     """
     logger.info(f"Detecting data quality issues in: {filepath}")
 
-    df = pd.read_csv(filepath)
-    issues = []
-
-    # Check for duplicate rows
-    duplicates = df.duplicated().sum()
-    if duplicates > 0:
-        issues.append({
-            "type": "duplicate_rows",
-            "severity": "medium",
-            "description": f"Found {duplicates} duplicate rows ({(duplicates/len(df)*100):.1f}%)",
-            "recommendation": "Consider removing duplicate rows before analysis",
-        })
-
-    # Check for columns with all missing values
-    for col in df.columns:
-        if df[col].isnull().all():
-            issues.append({
-                "type": "empty_column",
-                "severity": "high",
-                "column": col,
-                "description": f"Column '{col}' has all missing values",
-                "recommendation": f"Consider removing column '{col}' as it contains no data",
-            })
-
-    # Check for columns with high percentage of missing values
-    for col in df.columns:
-        missing_pct = (df[col].isnull().sum() / len(df)) * 100
-        if 50 < missing_pct < 100:  # Between 50% and 100%
-            issues.append({
-                "type": "high_missing_values",
-                "severity": "medium",
-                "column": col,
-                "description": f"Column '{col}' has {missing_pct:.1f}% missing values",
-                "recommendation": f"Consider handling missing values in '{col}' before analysis",
-            })
-
-    # Check for columns with only one unique value
-    for col in df.columns:
-        if df[col].nunique() == 1:
-            issues.append({
-                "type": "constant_column",
-                "severity": "low",
-                "column": col,
-                "description": f"Column '{col}' has only one unique value",
-                "recommendation": f"Column '{col}' may not be useful for analysis",
-            })
-
-    # Check for potential date columns that aren't parsed as dates
-    for col in df.select_dtypes(include=["object"]).columns:
-        sample = df[col].dropna().head(100)
-        if len(sample) > 0:
-            # Simple heuristic: check if values contain date-like patterns
-            date_like = sample.astype(str).str.contains(
-                r'\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}',
-                regex=True
-            ).sum()
-            if date_like > len(sample) * 0.5:  # More than 50% look like dates
-                issues.append({
-                    "type": "unparsed_dates",
-                    "severity": "low",
-                    "column": col,
-                    "description": f"Column '{col}' appears to contain dates but is stored as text",
-                    "recommendation": f"Consider parsing '{col}' as datetime for time-based analysis",
-                })
-
-    return {
-        "has_issues": len(issues) > 0,
-        "issue_count": len(issues),
-        "issues": issues,
-        "summary": f"Found {len(issues)} potential data quality issues",
-    }
+    return run_quality_checks(filepath)
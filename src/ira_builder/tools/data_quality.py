@@ -0,0 +1,322 @@
+"""
+Data quality engine for CSV files.
+
+A single streaming pass over the file collects everything the checks need:
+null counts, whether each column holds a single distinct value, a 64-bit hash
+of every row (for duplicate detection without holding rows in memory) and a
+sample of non-null values per column. Checks are plain functions registered
+with ``register_quality_check``; each receives the shared statistics and
+returns a list of issues.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ira_builder.tools.date_formats import infer_date_format
+from ira_builder.utils.config import get_config
+from ira_builder.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Non-null values kept per column for value-pattern checks
+SAMPLE_VALUES = 100
+
+# Missing percentage above which a column is reported
+HIGH_MISSING_PCT = 50
+
+# Multiplier used to combine per-column hashes into a row hash
+_ROW_HASH_PRIME = np.uint64(0x100000001B3)
+
+
+@dataclass
+class QualityStats:
+    """
+    Per-file statistics shared by all quality checks.
+
+    Attributes:
+        columns: Column names in file order
+        row_count: Number of data rows
+        null_counts: Missing values per column
+        constant_columns: Columns whose non-null values are all identical
+        duplicate_rows: Rows that repeat an earlier row exactly
+        samples: First non-null raw values of each column
+    """
+
+    columns: List[str]
+    row_count: int = 0
+    null_counts: Dict[str, int] = field(default_factory=dict)
+    constant_columns: List[str] = field(default_factory=list)
+    duplicate_rows: int = 0
+    samples: Dict[str, pd.Series] = field(default_factory=dict)
+
+
+QualityCheck = Callable[[QualityStats], List[Dict[str, Any]]]
+
+# Registered checks, run in registration order
+_QUALITY_CHECKS: Dict[str, QualityCheck] = {}
+
+
+def register_quality_check(name: str) -> Callable[[QualityCheck], QualityCheck]:
+    """
+    Register a data quality check.
+
+    Args:
+        name: Unique check name (used in timings and to select checks)
+
+    Returns:
+        Decorator registering the check function
+
+    Example:
+        >>> @register_quality_check("too_few_rows")
+        ... def check_too_few_rows(stats):
+        ...     if stats.row_count < 10:
+        ...         return [{"type": "too_few_rows", "severity": "low", ...}]
+        ...     return []
+    """
+    def decorator(check: QualityCheck) -> QualityCheck:
+        _QUALITY_CHECKS[name] = check
+        return check
+    return decorator
+
+
+def get_quality_checks() -> List[str]:
+    """Return the names of all registered checks."""
+    return list(_QUALITY_CHECKS)
+
+
+def collect_quality_stats(filepath: str, chunk_rows: Optional[int] = None) -> QualityStats:
+    """
+    Collect the statistics used by the quality checks in one streaming pass.
+
+    Args:
+        filepath: Path to the CSV file
+        chunk_rows: Rows parsed per chunk (default: PROFILE_CHUNK_ROWS)
+
+    Returns:
+        QualityStats for the file
+    """
+    chunk_rows = chunk_rows or get_config().profile_chunk_rows
+
+    columns: List[str] = []
+    null_counts: Optional[np.ndarray] = None
+    reference: Optional[np.ndarray] = None
+    has_reference: Optional[np.ndarray] = None
+    varying: Optional[np.ndarray] = None
+    row_hashes: List[np.ndarray] = []
+    samples: Dict[str, List[pd.Series]] = {}
+    sampled: Dict[str, int] = {}
+    row_count = 0
+
+    with pd.read_csv(filepath, dtype=str, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            if not columns:
+                columns = chunk.columns.tolist()
+                null_counts = np.zeros(len(columns), dtype=np.int64)
+                reference = np.zeros(len(columns), dtype=np.uint64)
+                has_reference = np.zeros(len(columns), dtype=bool)
+                varying = np.zeros(len(columns), dtype=bool)
+                samples = {col: [] for col in columns}
+                sampled = {col: 0 for col in columns}
+
+            present = chunk.notna().to_numpy()
+            null_counts += len(chunk) - present.sum(axis=0)
+
+            # Hash each column once; the hashes drive both the constant
+            # column check and the row hashes used for duplicate detection
+            rows = np.zeros(len(chunk), dtype=np.uint64)
+            for j, col in enumerate(columns):
+                hashes = pd.util.hash_array(chunk[col].to_numpy(dtype=object))
+                rows = (rows * _ROW_HASH_PRIME) ^ hashes
+
+                column_hashes = hashes[present[:, j]]
+                if len(column_hashes) == 0 or varying[j]:
+                    continue
+                if not has_reference[j]:
+                    reference[j] = column_hashes[0]
+                    has_reference[j] = True
+                varying[j] = bool((column_hashes != reference[j]).any())
+
+            row_hashes.append(rows)
+
+            for col in columns:
+                if sampled[col] < SAMPLE_VALUES:
+                    values = chunk[col].dropna().head(SAMPLE_VALUES - sampled[col])
+                    samples[col].append(values)
+                    sampled[col] += len(values)
+
+            row_count += len(chunk)
+
+    if not columns:
+        columns = pd.read_csv(filepath, nrows=0).columns.tolist()
+        return QualityStats(columns=columns, null_counts={col: 0 for col in columns})
+
+    hashes = np.concatenate(row_hashes)
+    duplicate_rows = int(len(hashes) - len(np.unique(hashes)))
+
+    return QualityStats(
+        columns=columns,
+        row_count=row_count,
+        null_counts={col: int(count) for col, count in zip(columns, null_counts)},
+        constant_columns=[
+            col for j, col in enumerate(columns)
+            if not varying[j] and null_counts[j] < row_count
+        ],
+        duplicate_rows=duplicate_rows,
+        samples={
+            col: pd.concat(parts, ignore_index=True) if parts else pd.Series([], dtype=object)
+            for col, parts in samples.items()
+        },
+    )
+
+
+def run_quality_checks(
+    filepath: str,
+    checks: Optional[List[str]] = None,
+    chunk_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run data quality checks on a CSV file.
+
+    Args:
+        filepath: Path to the CSV file
+        checks: Names of the checks to run (default: all registered checks)
+        chunk_rows: Rows parsed per chunk (default: PROFILE_CHUNK_ROWS)
+
+    Returns:
+        Dictionary containing:
+            - has_issues: Boolean indicating if issues were found
+            - issue_count: Number of issues
+            - issues: List of detected issues
+            - summary: One-line summary
+            - timings_ms: Milliseconds spent in the scan and in each check
+
+    Raises:
+        ValueError: If an unknown check name is requested
+    """
+    names = checks if checks is not None else get_quality_checks()
+    unknown = [name for name in names if name not in _QUALITY_CHECKS]
+    if unknown:
+        raise ValueError(f"Unknown quality checks: {', '.join(unknown)}")
+
+    timings: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    stats = collect_quality_stats(filepath, chunk_rows=chunk_rows)
+    timings["scan"] = round((time.perf_counter() - started) * 1000, 2)
+
+    issues: List[Dict[str, Any]] = []
+    for name in names:
+        started = time.perf_counter()
+        issues.extend(_QUALITY_CHECKS[name](stats))
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    logger.debug(f"Quality checks on {filepath} took {timings}")
+    return {
+        "has_issues": len(issues) > 0,
+        "issue_count": len(issues),
+        "issues": issues,
+        "summary": f"Found {len(issues)} potential data quality issues",
+        "timings_ms": timings,
+    }
+
+
+@register_quality_check("duplicate_rows")
+def check_duplicate_rows(stats: QualityStats) -> List[Dict[str, Any]]:
+    """Report rows that repeat an earlier row."""
+    if stats.duplicate_rows == 0:
+        return []
+    return [{
+        "type": "duplicate_rows",
+        "severity": "medium",
+        "description": (
+            f"Found {stats.duplicate_rows} duplicate rows "
+            f"({(stats.duplicate_rows / stats.row_count * 100):.1f}%)"
+        ),
+        "recommendation": "Consider removing duplicate rows before analysis",
+    }]
+
+
+@register_quality_check("empty_column")
+def check_empty_columns(stats: QualityStats) -> List[Dict[str, Any]]:
+    """Report columns without any values."""
+    return [
+        {
+            "type": "empty_column",
+            "severity": "high",
+            "column": col,
+            "description": f"Column '{col}' has all missing values",
+            "recommendation": f"Consider removing column '{col}' as it contains no data",
+        }
+        for col in stats.columns
+        if stats.null_counts[col] == stats.row_count
+    ]
+
+
+@register_quality_check("high_missing_values")
+def check_high_missing_values(stats: QualityStats) -> List[Dict[str, Any]]:
+    """Report columns that are mostly, but not entirely, missing."""
+    issues = []
+    for col in stats.columns:
+        if stats.row_count == 0:
+            break
+        missing_pct = (stats.null_counts[col] / stats.row_count) * 100
+        if HIGH_MISSING_PCT < missing_pct < 100:
+            issues.append({
+                "type": "high_missing_values",
+                "severity": "medium",
+                "column": col,
+                "description": f"Column '{col}' has {missing_pct:.1f}% missing values",
+                "recommendation": f"Consider handling missing values in '{col}' before analysis",
+            })
+    return issues
+
+
+@register_quality_check("constant_column")
+def check_constant_columns(stats: QualityStats) -> List[Dict[str, Any]]:
+    """Report columns with a single distinct value."""
+    return [
+        {
+            "type": "constant_column",
+            "severity": "low",
+            "column": col,
+            "description": f"Column '{col}' has only one unique value",
+            "recommendation": f"Column '{col}' may not be useful for analysis",
+        }
+        for col in stats.constant_columns
+    ]
+
+
+@register_quality_check("unparsed_dates")
+def check_unparsed_dates(stats: QualityStats) -> List[Dict[str, Any]]:
+    """Report text columns whose values look like dates."""
+    issues = []
+    for col in stats.columns:
+        sample = stats.samples.get(col)
+        if sample is None or len(sample) == 0:
+            continue
+        # Simple heuristic: check if values contain date-like patterns
+        date_like = sample.str.contains(
+            r'\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}',
+            regex=True
+        ).sum()
+        if date_like > len(sample) * 0.5:  # More than 50% look like dates
+            issue = {
+                "type": "unparsed_dates",
+                "severity": "low",
+                "column": col,
+                "description": f"Column '{col}' appears to contain dates but is stored as text",
+                "recommendation": f"Consider parsing '{col}' as datetime for time-based analysis",
+            }
+            date_format = infer_date_format(sample)
+            if date_format is not None:
+                issue["date_format"] = date_format["format"]
+                issue["recommendation"] = (
+                    f"Consider parsing '{col}' as datetime with format "
+                    f"'{date_format['format']}' for time-based analysis"
+                )
+            issues.append(issue)
+    return issues
@@ -0,0 +1,117 @@
+"""
+Inference of explicit date formats for text columns.
+
+pandas reads date columns of a CSV as text, and parsing them without a
+format ("31-03-2023", "03/31/2023 14:05") falls back to slow per-element
+inference - and silently guesses between day-first and month-first. The
+helpers here pick the strptime format that parses a sample of a column,
+with a confidence score, so generated code can parse the whole column with
+the fixed-format fast path: ``pd.to_datetime(values, format=fmt)``.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+# Date part layouts, in order of preference: when the day and month can't be
+# told apart (every day <= 12), day-first wins as in SAP and Indian exports
+DATE_LAYOUTS = [
+    "%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d", "%Y%m%d",
+    "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y",
+    "%d-%m-%y", "%d/%m/%y", "%d.%m.%y",
+    "%d-%b-%Y", "%d-%b-%y", "%d %b %Y", "%d %B %Y",
+    "%m/%d/%Y", "%m-%d-%Y", "%m/%d/%y",
+    "%b %d, %Y", "%B %d, %Y",
+]
+
+# Time parts accepted after the date (only tried when values contain ":")
+TIME_LAYOUTS = [" %H:%M:%S", " %H:%M", "T%H:%M:%S", " %I:%M:%S %p", " %I:%M %p"]
+
+# Share of sample values a format must parse to be reported
+MIN_PARSED_SHARE = 0.5
+
+# Values checked with every candidate before the full sample is parsed
+PROBE_VALUES = 20
+
+_DATE_LIKE = re.compile(
+    r"^\s*(?:\d{1,4}[-/. ](?:\d{1,2}|[A-Za-z]{3,9})[-/. ]\d{2,4}"
+    r"|[A-Za-z]{3,9} \d{1,2}, \d{4}"
+    r"|\d{8})(?:[ T]\d{1,2}:\d{2}.*)?\s*$"
+)
+
+
+def candidate_formats(values: pd.Series) -> List[str]:
+    """
+    List the formats worth trying on a sample of values.
+
+    Args:
+        values: Non-null raw string values
+
+    Returns:
+        strptime formats in order of preference
+    """
+    if values.str.contains(":", regex=False).any():
+        return [date + time for date in DATE_LAYOUTS for time in TIME_LAYOUTS]
+    return list(DATE_LAYOUTS)
+
+
+def infer_date_format(values: pd.Series) -> Optional[Dict[str, Any]]:
+    """
+    Infer the strptime format of a sample of date strings.
+
+    Each candidate format is tried on the sample with the fixed-format parser;
+    the one parsing the most values wins (ties go to the earlier, day-first
+    layout). The confidence is the share of values parsed, halved when a
+    different format parses as many values into different dates (all days
+    <= 12, so day-first vs month-first is a guess).
+
+    Args:
+        values: Raw string values of the column (may contain NaN)
+
+    Returns:
+        Dictionary with ``format``, ``confidence``, ``parsed_share``,
+        ``ambiguous`` and ``sample_size``, or None if the values don't look
+        like dates
+
+    Example:
+        >>> infer_date_format(pd.Series(["31-03-2023", "01-04-2023"]))["format"]
+        '%d-%m-%Y'
+    """
+    present = values.dropna().astype(str).str.strip()
+    present = present[present != ""]
+    if len(present) == 0:
+        return None
+    if present.str.match(_DATE_LIKE).mean() < MIN_PARSED_SHARE:
+        return None
+
+    probe = present.head(PROBE_VALUES)
+    best_format, best_parsed, best_share = None, None, 0.0
+    rival_dates = []
+    for fmt in candidate_formats(present):
+        if pd.to_datetime(probe, format=fmt, errors="coerce").notna().mean() < MIN_PARSED_SHARE:
+            continue
+        parsed = pd.to_datetime(present, format=fmt, errors="coerce")
+        share = float(parsed.notna().mean())
+        if share > best_share:
+            if best_parsed is not None:
+                rival_dates.append((best_share, best_parsed))
+            best_format, best_parsed, best_share = fmt, parsed, share
+        elif share > 0:
+            rival_dates.append((share, parsed))
+
+    if best_format is None or best_share < MIN_PARSED_SHARE:
+        return None
+
+    ambiguous = any(
+        share == best_share and not parsed.equals(best_parsed)
+        for share, parsed in rival_dates
+    )
+    confidence = best_share / 2 if ambiguous else best_share
+    return {
+        "format": best_format,
+        "confidence": round(confidence, 3),
+        "parsed_share": round(best_share, 3),
+        "ambiguous": ambiguous,
+        "sample_size": len(present),
+    }
@@ -0,0 +1,236 @@
+"""
+Process-wide scheduler for code executions.
+
+Memory admission (see ``memory_admission``) keeps concurrent executions
+within the memory budget, but ten workflows reaching the coding phase at
+once would still start ten pandas processes on a four-core host. The
+scheduler also caps the number of running executions at the CPU slots, and
+decides who goes next when slots or memory free up:
+
+1. Interactive runs (refinements a user is waiting for) before batch runs
+   (first-pass code generation)
+2. Among those, the tenant (workflow) with the fewest running executions,
+   then the one served least recently - so one workflow's retries can't
+   crowd out the others
+3. First come, first served
+
+The next execution in that order holds the others back until it fits, so a
+large one isn't starved by a stream of small ones.
+"""
+
+import asyncio
+import itertools
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from ira_builder.exceptions.errors import ExecutionException
+from ira_builder.tools.memory_admission import MB, MemoryAdmissionController, memory_budget_bytes
+from ira_builder.utils.config import get_config
+from ira_builder.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+DEFAULT_TENANT = "default"
+
+# Admission waits kept for the wait time metrics
+WAIT_HISTORY = 1000
+
+
+@dataclass(eq=False)
+class _Ticket:
+    """An execution waiting for admission."""
+
+    nbytes: int
+    tenant: str
+    priority: int
+    seq: int
+    enqueued: float
+
+
+class ExecutionScheduler(MemoryAdmissionController):
+    """
+    Admits executions within CPU slots and a memory budget, in fair order.
+
+    Attributes:
+        budget_bytes: Total memory reservable by concurrent executions
+        cpu_slots: Maximum number of concurrent executions
+        poll_interval: Seconds between admission checks while waiting
+    """
+
+    def __init__(self, budget_bytes: int, cpu_slots: int, poll_interval: float = 0.5):
+        super().__init__(budget_bytes, poll_interval)
+        if cpu_slots < 1:
+            raise ValueError("cpu_slots must be at least 1")
+
+        self.cpu_slots = cpu_slots
+
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._tenant_running: Counter = Counter()
+        self._tenant_last_start: Dict[str, float] = {}
+        self._waits: Deque[float] = deque(maxlen=WAIT_HISTORY)
+        self._admitted = 0
+        self._timed_out = 0
+
+    def _order(self, ticket: _Ticket) -> tuple:
+        return (
+            ticket.priority,
+            self._tenant_running[ticket.tenant],
+            self._tenant_last_start.get(ticket.tenant, 0.0),
+            ticket.seq,
+        )
+
+    def _try_admit(self, ticket: _Ticket) -> bool:
+        with self._lock:
+            if min(self._queue, key=self._order) is not ticket:
+                return False
+            if self._running >= self.cpu_slots or not self._fits(ticket.nbytes):
+                return False
+
+            self._queue.remove(ticket)
+            self._reserved += ticket.nbytes
+            self._running += 1
+            self._tenant_running[ticket.tenant] += 1
+            self._tenant_last_start[ticket.tenant] = time.monotonic()
+            self._admitted += 1
+            self._waits.append(time.monotonic() - ticket.enqueued)
+            return True
+
+    def _finish(self, ticket: _Ticket) -> None:
+        self._release(ticket.nbytes)
+        with self._lock:
+            self._tenant_running[ticket.tenant] -= 1
+            if self._tenant_running[ticket.tenant] <= 0:
+                del self._tenant_running[ticket.tenant]
+
+    @asynccontextmanager
+    async def admit(self, nbytes: int, timeout: Optional[float] = None, tenant: str = DEFAULT_TENANT,
+                    priority: int = PRIORITY_BATCH) -> AsyncIterator[float]:
+        """
+        Wait for an execution's turn and resources, and reserve them.
+
+        Args:
+            nbytes: Estimated peak memory of the execution
+            timeout: Maximum seconds to wait (default: no limit)
+            tenant: Who the execution runs for (e.g. the workflow), for fair queuing
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH
+
+        Yields:
+            Seconds spent waiting for admission
+
+        Raises:
+            ExecutionException: If the execution wasn't admitted within ``timeout``
+
+        Example:
+            >>> scheduler = get_execution_scheduler()
+            >>> async with scheduler.admit(450 * MB, tenant="Q4 Sales", priority=PRIORITY_INTERACTIVE):
+            ...     result = await executor.execute_code_blocks(blocks)
+        """
+        ticket = _Ticket(nbytes, tenant, priority, next(self._seq), time.monotonic())
+        with self._lock:
+            self._queue.append(ticket)
+        try:
+            while not self._try_admit(ticket):
+                waited = time.monotonic() - ticket.enqueued
+                if timeout is not None and waited >= timeout:
+                    with self._lock:
+                        self._timed_out += 1
+                    raise ExecutionException(
+                        f"Execution not started: waited {waited:.0f}s for a CPU slot and "
+                        f"~{nbytes / MB:.0f} MB of memory",
+                        details=self.stats(),
+                    )
+                await asyncio.sleep(self.poll_interval)
+        except BaseException:
+            with self._lock:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+            raise
+
+        waited = time.monotonic() - ticket.enqueued
+        if waited >= self.poll_interval:
+            logger.info(f"Execution for {tenant} admitted after waiting {waited:.1f}s")
+        try:
+            yield waited
+        finally:
+            self._finish(ticket)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the scheduler's state and wait time metrics.
+
+        Returns:
+            Dictionary with running, waiting (queue depth), reserved_mb,
+            budget_mb, cpu_slots, waiting_by_priority, waiting_by_tenant,
+            running_by_tenant, admitted, timed_out, oldest_wait_seconds and
+            wait_seconds (mean, p95 and max over recent admissions)
+        """
+        stats = super().stats()
+        with self._lock:
+            now = time.monotonic()
+            waits = sorted(self._waits)
+            stats.update({
+                "waiting": len(self._queue),
+                "cpu_slots": self.cpu_slots,
+                "waiting_by_priority": dict(Counter(_PRIORITY_NAMES[t.priority] for t in self._queue)),
+                "waiting_by_tenant": dict(Counter(t.tenant for t in self._queue)),
+                "running_by_tenant": dict(self._tenant_running),
+                "admitted": self._admitted,
+                "timed_out": self._timed_out,
+                "oldest_wait_seconds": round(max((now - t.enqueued for t in self._queue), default=0.0), 2),
+                "wait_seconds": {
+                    "mean": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                    "p95": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0,
+                    "max": round(waits[-1], 3) if waits else 0.0,
+                },
+            })
+        return stats
+
+
+# Global scheduler instance
+_execution_scheduler: Optional[ExecutionScheduler] = None
+_execution_scheduler_lock = threading.Lock()
+
+
+def get_execution_scheduler() -> Optional[ExecutionScheduler]:
+    """
+    Get the process-wide execution scheduler configured in settings.
+
+    Returns:
+        ExecutionScheduler instance, or None if admission control is disabled
+    """
+    global _execution_scheduler
+    config = get_config()
+    if not config.execution_admission_enabled:
+        return None
+
+    with _execution_scheduler_lock:
+        if _execution_scheduler is None:
+            budget_bytes = memory_budget_bytes()
+            if budget_bytes is None:
+                return None
+            cpu_slots = config.execution_cpu_slots if config.execution_cpu_slots > 0 else (os.cpu_count() or 1)
+            _execution_scheduler = ExecutionScheduler(budget_bytes, cpu_slots)
+    return _execution_scheduler
+
+
+def set_execution_scheduler(scheduler: Optional[ExecutionScheduler]) -> None:
+    """
+    Replace the process-wide execution scheduler.
+
+    Args:
+        scheduler: Scheduler to use, or None to re-create it from settings lazily
+    """
+    global _execution_scheduler
+    with _execution_scheduler_lock:
+        _execution_scheduler = scheduler
@@ -0,0 +1,193 @@
+"""
+Join key discovery from value-set sketches.
+
+Column names rarely line up across ERP extracts (FBL3N "Supplier" vs vendor
+master "Vendor No"), so candidate join keys are found from the values
+instead. The CSV profiler keeps a bottom-k MinHash sketch of the normalized
+values of every text and integer column (``KeySketch``), stored with the
+file profile. Ranking candidates then only compares sketches: an inverted
+index over the sketch hashes finds the column pairs sharing any value, and
+each pair is scored by how much of one column is contained in the other and
+how unique the other column is - no data is re-read and no join is run.
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ira_builder.tools.sketches import KeySketch
+
+# Share of a column's values that must occur in the other column
+MIN_CONTAINMENT = 0.5
+
+# Columns with fewer distinct values are never suggested as keys
+MIN_KEY_DISTINCT = 2
+
+# Leading zeros of a digit-only line
+_LEADING_ZEROS = re.compile(r"\n0+(?=\d+\n)")
+
+
+def normalize_keys(values: pd.Series) -> Optional[pd.Series]:
+    """
+    Normalize raw key values so equal keys written differently compare equal.
+
+    Surrounding whitespace is stripped, letters are uppercased and digit-only
+    values lose their leading zeros ("0000100234" and " 100234" both become
+    "100234"). The values are normalized as one newline-joined string, so the
+    work is a few C-level passes rather than per-value string operations.
+
+    Args:
+        values: Non-null raw string values
+
+    Returns:
+        Normalized values, or None if no value changed
+    """
+    raw = "\n".join(values.tolist())
+    joined = "\n" + "\n".join([value.strip() for value in values.tolist()]).upper() + "\n"
+    joined = _LEADING_ZEROS.sub("\n", joined)[1:-1]
+    if joined == raw:
+        return None
+
+    keys = joined.split("\n")
+    if len(keys) != len(values):
+        # Values with embedded newlines: normalize one by one
+        keys = values.str.strip().str.upper().str.replace(r"^0+(?=\d+$)", "", regex=True)
+    return pd.Series(keys, dtype=object)
+
+
+def rank_join_candidates(
+    profiles: Dict[str, Dict[str, Any]],
+    min_containment: float = MIN_CONTAINMENT,
+    max_results: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Rank candidate join key pairs across profiled files.
+
+    A pair (from_column -> to_column) is a candidate when most values of
+    ``from_column`` occur in ``to_column``. Its score is that containment
+    times the uniqueness of ``to_column`` (distinct values / non-null rows),
+    so lookups into a unique key of another file rank first.
+
+    Args:
+        profiles: Mapping of file name to profile metadata with ``key_sketches``
+        min_containment: Minimum containment for a pair to be reported
+        max_results: Maximum number of pairs returned
+
+    Returns:
+        Candidate pairs, best first, each with from_file, from_column,
+        to_file, to_column, containment, to_uniqueness, score and the distinct
+        counts of both columns
+
+    Example:
+        >>> rank_join_candidates({"FBL3N.csv": fbl3n, "vendors.csv": vendors})[0]
+        {'from_file': 'FBL3N.csv', 'from_column': 'Supplier', 'to_file': 'vendors.csv',
+         'to_column': 'Vendor No', 'containment': 0.98, 'to_uniqueness': 1.0, 'score': 0.98, ...}
+    """
+    columns: List[Tuple[str, str, KeySketch, int, float]] = []
+    for filename, metadata in profiles.items():
+        for col, sketch_state in metadata.get("key_sketches", {}).items():
+            distinct = metadata["unique_counts"].get(col, 0)
+            present = metadata["row_count"] - metadata["missing_values"].get(col, 0)
+            if distinct < MIN_KEY_DISTINCT or present <= 0:
+                continue
+            uniqueness = min(1.0, distinct / present)
+            columns.append((filename, col, KeySketch.from_dict(sketch_state), distinct, uniqueness))
+
+    # Only pairs of columns from different files that share a sketched value
+    index: Dict[int, List[int]] = defaultdict(list)
+    for i, (_, _, sketch, _, _) in enumerate(columns):
+        for value_hash in sketch.hashes.tolist():
+            index[value_hash].append(i)
+
+    pairs = set()
+    for members in index.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                i, j = members[a], members[b]
+                if columns[i][0] != columns[j][0]:
+                    pairs.add((i, j))
+
+    candidates = []
+    for i, j in pairs:
+        for source, target in ((i, j), (j, i)):
+            from_file, from_col, from_sketch, from_distinct, _ = columns[source]
+            to_file, to_col, to_sketch, to_distinct, to_uniqueness = columns[target]
+            containment = from_sketch.containment(to_sketch, from_distinct, to_distinct)
+            if containment < min_containment:
+                continue
+            candidates.append({
+                "from_file": from_file,
+                "from_column": from_col,
+                "to_file": to_file,
+                "to_column": to_col,
+                "containment": round(containment, 3),
+                "to_uniqueness": round(to_uniqueness, 3),
+                "score": round(containment * to_uniqueness, 3),
+                "from_distinct": from_distinct,
+                "to_distinct": to_distinct,
+            })
+
+    candidates.sort(key=lambda c: (-c["score"], -c["containment"], c["from_file"], c["from_column"]))
+    return candidates[:max_results]
+
+
+def _key_multiplicity(metadata: Dict[str, Any], column: str, sketch: KeySketch) -> Dict[str, Any]:
+    """Rows per distinct key: mean from the profile, max from the sketch and top values."""
+    distinct = max(metadata["unique_counts"].get(column, 0), 1)
+    present = metadata["row_count"] - metadata["missing_values"].get(column, 0)
+    top_values = metadata.get("categorical_info", {}).get(column, {}).get("top_values", {})
+    max_count = max([int(sketch.counts.max()) if len(sketch.counts) else 0, *top_values.values()])
+    return {
+        "rows": present,
+        "distinct": distinct,
+        "mean": round(present / distinct, 2),
+        "max": max_count,
+    }
+
+
+def estimate_join(
+    left: Dict[str, Any],
+    left_column: str,
+    right: Dict[str, Any],
+    right_column: str,
+) -> Dict[str, Any]:
+    """
+    Estimate the size of an inner join of two profiled columns.
+
+    Args:
+        left: Profile metadata of the left file, with ``key_sketches``
+        left_column: Join column of the left file
+        right: Profile metadata of the right file, with ``key_sketches``
+        right_column: Join column of the right file
+
+    Returns:
+        Dictionary with estimated_rows, exact, expansion (estimated rows over
+        the larger input), relationship ("one-to-one", "many-to-one",
+        "one-to-many" or "many-to-many") and the key multiplicity of each
+        side (rows, distinct, mean and max rows per key)
+
+    Raises:
+        KeyError: If a column has no key sketch (missing, float or boolean)
+    """
+    left_sketch = KeySketch.from_dict(left["key_sketches"][left_column])
+    right_sketch = KeySketch.from_dict(right["key_sketches"][right_column])
+
+    estimated_rows = left_sketch.join_size(right_sketch)
+    left_keys = _key_multiplicity(left, left_column, left_sketch)
+    right_keys = _key_multiplicity(right, right_column, right_sketch)
+    # Distinct counts are approximate past a few thousand values
+    relationship = "-to-".join(
+        "one" if keys["max"] <= 1 and keys["mean"] < 1.05 else "many"
+        for keys in (left_keys, right_keys)
+    )
+
+    return {
+        "estimated_rows": int(round(estimated_rows)),
+        "exact": left_sketch.is_exact and right_sketch.is_exact,
+        "expansion": round(estimated_rows / max(left["row_count"], right["row_count"], 1), 2),
+        "relationship": relationship,
+        "left_keys": left_keys,
+        "right_keys": right_keys,
+    }
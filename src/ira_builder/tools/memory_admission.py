@@ -0,0 +1,204 @@
+"""
+Memory admission control for code executions.
+
+Each generated script loads its inputs into memory, and several concurrent
+workflows on large extracts can exhaust the host's RAM - the OOM killer then
+takes all of them down. Before an execution starts it reserves its estimated
+peak memory (see ``memory_estimator``) with the process-wide execution
+scheduler (``execution_scheduler``, built on this controller), which admits it
+only while the reservations of running executions fit the memory budget
+and the host has that much memory available; otherwise the execution waits
+in line.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from ira_builder.exceptions.errors import ExecutionException
+from ira_builder.executor.interpreter_pool import POOL_SUPPORTED, memory_footprint_mb
+from ira_builder.utils.config import get_config
+from ira_builder.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+MB = 1024 * 1024
+
+# Share of the host's memory usable by executions when no budget is configured
+DEFAULT_BUDGET_SHARE = 0.8
+
+
+def _meminfo_bytes(field: str) -> Optional[int]:
+    """Read a field of /proc/meminfo (Linux), in bytes."""
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            name, _, value = line.partition(":")
+            if name == field:
+                return int(value.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def available_memory_bytes() -> Optional[int]:
+    """Memory the host can give to new processes, or None if unknown."""
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().available
+    return _meminfo_bytes("MemAvailable")
+
+
+def total_memory_bytes() -> Optional[int]:
+    """Physical memory of the host, or None if unknown."""
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().total
+    return _meminfo_bytes("MemTotal")
+
+
+class MemoryAdmissionController:
+    """
+    Admits executions while their estimated memory fits the budget.
+
+    An execution is admitted when the reservations of running executions
+    plus its own stay within ``budget_bytes`` and the host currently has its
+    estimate available. A lone execution is always admitted, so an estimate
+    larger than the budget can't block the queue forever.
+
+    Attributes:
+        budget_bytes: Total memory reservable by concurrent executions
+        poll_interval: Seconds between admission checks while waiting
+    """
+
+    def __init__(self, budget_bytes: int, poll_interval: float = 0.5):
+        if budget_bytes <= 0:
+            raise ValueError("budget_bytes must be positive")
+
+        self.budget_bytes = budget_bytes
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._reserved = 0
+        self._running = 0
+        self._waiting = 0
+
+    def _fits(self, nbytes: int) -> bool:
+        """Whether an execution needing ``nbytes`` fits now (called with the lock held)."""
+        if self._running > 0:
+            if self._reserved + nbytes > self.budget_bytes:
+                return False
+            available = available_memory_bytes()
+            if available is not None and nbytes > available:
+                return False
+        return True
+
+    def _try_reserve(self, nbytes: int) -> bool:
+        with self._lock:
+            if not self._fits(nbytes):
+                return False
+            self._reserved += nbytes
+            self._running += 1
+            return True
+
+    def _release(self, nbytes: int) -> None:
+        with self._lock:
+            self._reserved -= nbytes
+            self._running -= 1
+
+    @asynccontextmanager
+    async def admit(self, nbytes: int, timeout: Optional[float] = None) -> AsyncIterator[float]:
+        """
+        Wait until an execution needing ``nbytes`` can start, and reserve them.
+
+        Args:
+            nbytes: Estimated peak memory of the execution
+            timeout: Maximum seconds to wait (default: no limit)
+
+        Yields:
+            Seconds spent waiting for admission
+
+        Raises:
+            ExecutionException: If the execution wasn't admitted within ``timeout``
+
+        Example:
+            >>> controller = MemoryAdmissionController(budget_bytes=4096 * MB)
+            >>> async with controller.admit(450 * MB) as waited:
+            ...     result = await executor.execute_code_blocks(blocks)
+        """
+        started = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+        try:
+            while not self._try_reserve(nbytes):
+                waited = time.monotonic() - started
+                if timeout is not None and waited >= timeout:
+                    raise ExecutionException(
+                        f"Not enough memory to start execution: needs ~{nbytes / MB:.0f} MB, "
+                        f"waited {waited:.0f}s for running executions to finish",
+                        details=self.stats(),
+                    )
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        waited = time.monotonic() - started
+        if waited >= self.poll_interval:
+            logger.info(f"Execution admitted after waiting {waited:.1f}s for memory")
+        try:
+            yield waited
+        finally:
+            self._release(nbytes)
+
+    def stats(self) -> dict:
+        """
+        Get the current reservations.
+
+        Returns:
+            Dictionary with running, waiting, reserved_mb and budget_mb
+        """
+        with self._lock:
+            return {
+                "running": self._running,
+                "waiting": self._waiting,
+                "reserved_mb": round(self._reserved / MB, 1),
+                "budget_mb": round(self.budget_bytes / MB, 1),
+            }
+
+
+def pool_footprint_bytes() -> int:
+    """Memory the configured interpreter pool keeps resident between runs (0 if disabled)."""
+    config = get_config()
+    if config.interpreter_pool_size <= 0 or not POOL_SUPPORTED:
+        return 0
+    checkpoint_mb = config.interpreter_pool_checkpoint_mb if config.execution_checkpoints else 0
+    return int(memory_footprint_mb(
+        config.interpreter_pool_size, config.interpreter_pool_input_cache_mb, checkpoint_mb
+    ) * MB)
+
+
+def memory_budget_bytes() -> Optional[int]:
+    """
+    Memory budget of executions configured in settings.
+
+    Returns:
+        EXECUTION_MEMORY_BUDGET_MB in bytes, or when it is 0,
+        DEFAULT_BUDGET_SHARE of the host's memory less what the interpreter
+        pool keeps resident (at least a quarter of the share); None if the
+        host's memory is unknown
+    """
+    budget_bytes = get_config().execution_memory_budget_mb * MB
+    if budget_bytes <= 0:
+        total = total_memory_bytes()
+        if total is None:
+            return None
+        share = int(total * DEFAULT_BUDGET_SHARE)
+        budget_bytes = max(share - pool_footprint_bytes(), share // 4)
+    return budget_bytes
@@ -0,0 +1,247 @@
+"""
+Detection and parsing of formatted numeric text.
+
+ERP exports such as SAP FBL3N write amounts as display strings:
+"-2,17,00,102.39" (Indian lakh/crore grouping), "1,234,567.00" (Western
+grouping), "1,500.00-" (trailing minus), "(250.00)" or "₹ 1,200". pandas
+reads these columns as text. The helpers here recognize those formats with
+one vectorized regex pass per chunk and convert them to floats, so the
+profiler can treat the columns as numeric.
+
+European formats ("1.234,56") are deliberately not recognized: they can't be
+told apart from Western decimals with a thousands separator.
+"""
+
+import re
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Currency markers accepted before or after the number
+_CURRENCY = r"[₹$€£¥]|Rs\.?|INR|USD|EUR|GBP"
+
+# Integer part: Indian grouping (at least one two-digit group), Western
+# grouping with two or more thousands groups, a single thousands group (valid
+# in both systems), or plain digits
+_INDIAN_GROUPED = r"\d{1,2}(?:,\d{2})+,\d{3}"
+_WESTERN_GROUPED = r"\d{1,3}(?:,\d{3}){2,}"
+_SINGLE_GROUP = r"\d{1,3},\d{3}"
+
+NUMBER_TEXT_PATTERN = re.compile(
+    r"^\s*(?P<open>\()?\s*(?P<sign>[-+])?\s*"
+    rf"(?P<currency>{_CURRENCY})?\s*(?P<sign2>[-+])?\s*"
+    rf"(?P<integer>(?P<indian>{_INDIAN_GROUPED})|(?P<western>{_WESTERN_GROUPED})"
+    rf"|(?P<grouped>{_SINGLE_GROUP})|\d+)"
+    r"(?P<frac>\.\d*)?\s*"
+    rf"(?P<currency2>{_CURRENCY})?\s*(?P<trail>-)?\s*(?P<close>\))?\s*$"
+)
+
+# Plain signed numbers with optional grouping and trailing minus: the common
+# case, validated and converted without splitting values into regex groups
+_SIMPLE_NUMBER = rf"[-+]?(?:{_INDIAN_GROUPED}|{_WESTERN_GROUPED}|{_SINGLE_GROUP}|\d+)(?:\.\d*)?-?"
+_INVALID_SIMPLE_LINE = re.compile(rf"^(?!\s*{_SIMPLE_NUMBER}\s*$).*$", re.MULTILINE)
+_NON_SIMPLE_CHAR = re.compile(r"[^\d,.+\-\s]")
+
+# Values checked before a whole chunk is examined, so that text columns are
+# rejected cheaply
+PROBE_VALUES = 100
+
+
+def parse_number_text(values: pd.Series) -> Optional[Tuple[np.ndarray, bool, "NumberFormat"]]:
+    """
+    Parse a chunk of formatted numeric strings.
+
+    Args:
+        values: Non-null raw string values
+
+    Returns:
+        Tuple of (float values, whether every value is an integer, formatting
+        seen in the chunk), or None if any value is not a recognized number
+
+    Example:
+        >>> array, is_integer, number_format = parse_number_text(pd.Series(["-2,17,00,102.39", "1,500.00-"]))
+        >>> number_format.describe()
+        'Indian (lakh/crore) grouping, trailing minus'
+    """
+    if not values.head(PROBE_VALUES).str.match(NUMBER_TEXT_PATTERN).all():
+        return None
+
+    # One newline-separated string lets a single C-level regex scan check
+    # every value (newlines can't occur inside a value matching the pattern)
+    joined = "\n".join(values.tolist())
+    if _NON_SIMPLE_CHAR.search(joined) is not None:
+        parts = _extract_parts(values)
+        if parts is None:
+            return None
+        number_format = NumberFormat.from_parts(parts)
+        return parts_to_floats(parts), bool(parts["frac"].isna().all()), number_format
+
+    if _INVALID_SIMPLE_LINE.search(joined) is not None or "\n\n" in joined:
+        return None
+
+    number_format = NumberFormat()
+    number_format.digit_grouping = "," in joined
+    number_format.indian_grouping = re.search(r",\d{2},", joined) is not None
+    number_format.western_grouping = re.search(r",\d{3},", joined) is not None
+    number_format.trailing_minus = re.search(r"\d-\s*$", joined, re.MULTILINE) is not None
+
+    text = joined.replace(",", "").split("\n")
+    if not number_format.trailing_minus:
+        numbers = np.array(text, dtype=object).astype(np.float64)
+    else:
+        stripped = pd.Series(text).str.strip()
+        trailing_minus = stripped.str.endswith("-").to_numpy()
+        numbers = stripped.str.rstrip("-").to_numpy(dtype=object).astype(np.float64)
+        numbers = np.where(trailing_minus, -numbers, numbers)
+    return numbers, "." not in joined, number_format
+
+
+def _extract_parts(values: pd.Series) -> Optional[pd.DataFrame]:
+    """Split formatted numeric strings into their regex groups, or None if any doesn't match."""
+    parts = values.str.extract(NUMBER_TEXT_PATTERN)
+    if parts["integer"].isna().any():
+        return None
+
+    # Parentheses must be balanced
+    if (parts["open"].isna() != parts["close"].isna()).any():
+        return None
+    return parts
+
+
+def parts_to_floats(parts: pd.DataFrame) -> np.ndarray:
+    """
+    Convert the regex groups of formatted numbers to floats.
+
+    Args:
+        parts: Regex groups of formatted numbers
+
+    Returns:
+        Float array in the order of the parts
+    """
+    text = parts["integer"].str.replace(",", "", regex=False) + parts["frac"].fillna("")
+    numbers = text.to_numpy(dtype=object).astype(np.float64)
+
+    negative = (
+        (parts["sign"] == "-") | (parts["sign2"] == "-")
+        | parts["trail"].notna() | parts["open"].notna()
+    ).to_numpy()
+    return np.where(negative, -numbers, numbers)
+
+
+def parse_formatted_numbers(values: pd.Series) -> pd.Series:
+    """
+    Parse formatted numeric strings, leaving unrecognized values as NaN.
+
+    Args:
+        values: Raw string values (may contain NaN)
+
+    Returns:
+        Float Series aligned with ``values``
+
+    Example:
+        >>> parse_formatted_numbers(pd.Series(["-2,17,00,102.39", "1,500.00-", "n/a"])).tolist()
+        [-21700102.39, -1500.0, nan]
+    """
+    result = pd.Series(np.nan, index=values.index, dtype="float64")
+    present = values.dropna().astype(str)
+    if len(present) == 0:
+        return result
+
+    parts = present.str.extract(NUMBER_TEXT_PATTERN)
+    valid = parts["integer"].notna() & (parts["open"].isna() == parts["close"].isna())
+    if valid.any():
+        result[valid[valid].index] = parts_to_floats(parts[valid])
+    return result
+
+
+class NumberFormat:
+    """
+    Formatting features seen in a numeric text column.
+
+    Attributes:
+        digit_grouping: Values contain digit group separators
+        indian_grouping: Values use lakh/crore grouping ("2,17,00,102.39")
+        western_grouping: Values use thousands grouping ("1,234,567.00")
+        trailing_minus: Negative values are written as "1,500.00-"
+        parentheses: Negative values are written as "(1,500.00)"
+        currency: Currency markers seen
+    """
+
+    def __init__(self):
+        self.digit_grouping = False
+        self.indian_grouping = False
+        self.western_grouping = False
+        self.trailing_minus = False
+        self.parentheses = False
+        self.currency: set = set()
+
+    @property
+    def is_formatted(self) -> bool:
+        """True if any value needed more than a plain float conversion."""
+        return (
+            self.digit_grouping or self.trailing_minus or self.parentheses
+            or bool(self.currency)
+        )
+
+    @classmethod
+    def from_parts(cls, parts: pd.DataFrame) -> "NumberFormat":
+        """Record the features of values split into regex groups."""
+        number_format = cls()
+        number_format.digit_grouping = bool(parts["integer"].str.contains(",", regex=False).any())
+        number_format.indian_grouping = bool(parts["indian"].notna().any())
+        number_format.western_grouping = bool(parts["western"].notna().any())
+        number_format.trailing_minus = bool(parts["trail"].notna().any())
+        number_format.parentheses = bool(parts["open"].notna().any())
+        for col in ("currency", "currency2"):
+            number_format.currency.update(parts[col].dropna().unique().tolist())
+        return number_format
+
+    def merge(self, other: "NumberFormat") -> None:
+        """Combine the features seen in another part of the column."""
+        self.digit_grouping |= other.digit_grouping
+        self.indian_grouping |= other.indian_grouping
+        self.western_grouping |= other.western_grouping
+        self.trailing_minus |= other.trailing_minus
+        self.parentheses |= other.parentheses
+        self.currency |= other.currency
+
+    def describe(self) -> str:
+        """Short human-readable description, e.g. "Indian grouping, trailing minus"."""
+        features = []
+        if self.indian_grouping and self.western_grouping:
+            features.append("mixed Indian and thousands grouping")
+        elif self.indian_grouping:
+            features.append("Indian (lakh/crore) grouping")
+        elif self.western_grouping:
+            features.append("thousands grouping")
+        elif self.digit_grouping:
+            features.append("thousands separators")
+        if self.trailing_minus:
+            features.append("trailing minus")
+        if self.parentheses:
+            features.append("negatives in parentheses")
+        if self.currency:
+            features.append("currency " + "/".join(sorted(self.currency)))
+        return ", ".join(features)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "digit_grouping": self.digit_grouping,
+            "indian_grouping": self.indian_grouping,
+            "western_grouping": self.western_grouping,
+            "trailing_minus": self.trailing_minus,
+            "parentheses": self.parentheses,
+            "currency": sorted(self.currency),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NumberFormat":
+        number_format = cls()
+        number_format.digit_grouping = data["digit_grouping"]
+        number_format.indian_grouping = data["indian_grouping"]
+        number_format.western_grouping = data["western_grouping"]
+        number_format.trailing_minus = data["trailing_minus"]
+        number_format.parentheses = data["parentheses"]
+        number_format.currency = set(data["currency"])
+        return number_format
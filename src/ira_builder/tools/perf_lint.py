@@ -0,0 +1,308 @@
+"""
+Static performance checks for generated pandas code.
+
+Generated code runs on files of hundreds of thousands of rows, where a few
+patterns turn seconds into minutes: iterating rows with ``iterrows``,
+row-wise ``apply(axis=1)``, growing a DataFrame with ``pd.concat`` inside a
+loop, reading the same file more than once and copying copies of large
+frames. The checks find them in the code's AST before it runs.
+
+Rules are plain functions registered with ``register_perf_rule``; each
+receives a ``LintContext`` for the parsed code and returns a list of
+findings with the line, severity (high, medium or low), description and
+recommendation.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from ira_builder.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SEVERITIES = ("high", "medium", "low")
+
+_LOOPS = (ast.For, ast.AsyncFor, ast.While, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+
+# Functions that read a whole file into a DataFrame
+_READERS = {"read_csv", "read_excel", "read_parquet", "read_json", "read_table"}
+
+
+@dataclass
+class LintContext:
+    """
+    Parsed code shared by all performance rules.
+
+    Attributes:
+        tree: Module AST
+        lines: Source lines, for quoting findings
+        parents: Parent of each node
+        assignments: Variable name -> (line, assigned value) of each plain assignment, in line order
+    """
+
+    tree: ast.Module
+    lines: List[str]
+    parents: Dict[ast.AST, ast.AST] = field(default_factory=dict)
+    assignments: Dict[str, List[tuple]] = field(default_factory=dict)
+
+    @classmethod
+    def from_code(cls, code: str) -> "LintContext":
+        """Parse code (syntax already validated) and index it."""
+        context = cls(tree=ast.parse(code), lines=code.splitlines())
+        for node in ast.walk(context.tree):
+            for child in ast.iter_child_nodes(node):
+                context.parents[child] = node
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        context.assignments.setdefault(target.id, []).append((node.lineno, node.value))
+        for entries in context.assignments.values():
+            entries.sort(key=lambda entry: entry[0])
+        return context
+
+    def method_calls(self, *names: str) -> Iterator[ast.Call]:
+        """Calls of ``x.<name>(...)`` or ``<name>(...)`` for the given names, in line order."""
+        calls = [
+            node for node in ast.walk(self.tree)
+            if isinstance(node, ast.Call) and _call_name(node) in names
+        ]
+        return iter(sorted(calls, key=lambda node: (node.lineno, node.col_offset)))
+
+    def loops(self, node: ast.AST) -> List[ast.AST]:
+        """Loops and comprehensions enclosing a node, innermost first, within its function."""
+        loops = []
+        parent = self.parents.get(node)
+        while parent is not None and not isinstance(parent, _SCOPES):
+            if isinstance(parent, _LOOPS):
+                loops.append(parent)
+            parent = self.parents.get(parent)
+        return loops
+
+    def last_assignment(self, name: str, line: int) -> Optional[tuple]:
+        """The (line, value) of the last plain assignment to ``name`` before ``line``."""
+        previous = None
+        for entry in self.assignments.get(name, []):
+            if entry[0] >= line:
+                break
+            previous = entry
+        return previous
+
+    def finding(self, node: ast.AST, severity: str, description: str, recommendation: str) -> Dict[str, Any]:
+        """Build a finding at a node's line."""
+        line = getattr(node, "lineno", None)
+        code = self.lines[line - 1].strip() if line and line <= len(self.lines) else None
+        return {
+            "severity": severity,
+            "line": line,
+            "code": code,
+            "description": description,
+            "recommendation": recommendation,
+        }
+
+
+def _call_name(node: ast.Call) -> Optional[str]:
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    return None
+
+
+def _loop_names(loop: ast.AST) -> Set[str]:
+    """Names that change from one iteration of a loop to the next."""
+    names = set()
+    for node in ast.walk(loop):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.add(node.id)
+    return names
+
+
+PerfRule = Callable[[LintContext], List[Dict[str, Any]]]
+
+# Registered rules, run in registration order
+_PERF_RULES: Dict[str, PerfRule] = {}
+
+
+def register_perf_rule(name: str) -> Callable[[PerfRule], PerfRule]:
+    """
+    Register a performance rule.
+
+    Args:
+        name: Unique rule name (reported with its findings and used to select rules)
+
+    Returns:
+        Decorator registering the rule function
+
+    Example:
+        >>> @register_perf_rule("to_dict_records")
+        ... def check_to_dict_records(context):
+        ...     return [
+        ...         context.finding(call, "medium", "Converts the frame to a list of dicts", "...")
+        ...         for call in context.method_calls("to_dict")
+        ...     ]
+    """
+    def decorator(rule: PerfRule) -> PerfRule:
+        _PERF_RULES[name] = rule
+        return rule
+    return decorator
+
+
+def get_perf_rules() -> List[str]:
+    """Return the names of all registered rules."""
+    return list(_PERF_RULES)
+
+
+def run_perf_rules(code: str, rules: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Run performance rules on Python code.
+
+    Args:
+        code: Python code (syntax already validated)
+        rules: Names of the rules to run (default: all registered rules)
+
+    Returns:
+        Findings of all rules, each with rule, severity, line, code,
+        description and recommendation, ordered by line
+
+    Raises:
+        ValueError: If an unknown rule name is requested
+        SyntaxError: If the code doesn't parse
+    """
+    names = rules if rules is not None else get_perf_rules()
+    unknown = [name for name in names if name not in _PERF_RULES]
+    if unknown:
+        raise ValueError(f"Unknown performance rules: {', '.join(unknown)}")
+
+    context = LintContext.from_code(code)
+    findings: List[Dict[str, Any]] = []
+    for name in names:
+        for finding in _PERF_RULES[name](context):
+            findings.append({"rule": name, **finding})
+
+    findings.sort(key=lambda finding: (finding["line"] or 0, SEVERITIES.index(finding["severity"])))
+    logger.debug(f"Performance rules found {len(findings)} finding(s)")
+    return findings
+
+
+@register_perf_rule("iterrows")
+def check_iterrows(context: LintContext) -> List[Dict[str, Any]]:
+    """Report row iteration with iterrows."""
+    return [
+        context.finding(
+            call, "high",
+            "iterrows() builds a Series for every row; on large frames this takes minutes",
+            "Use vectorized column operations (arithmetic, np.where, .map, merge, groupby); "
+            "if a loop is unavoidable, iterate over itertuples()",
+        )
+        for call in context.method_calls("iterrows")
+        if isinstance(call.func, ast.Attribute)
+    ]
+
+
+@register_perf_rule("apply_axis1")
+def check_apply_axis1(context: LintContext) -> List[Dict[str, Any]]:
+    """Report row-wise apply."""
+    findings = []
+    for call in context.method_calls("apply"):
+        if not isinstance(call.func, ast.Attribute):
+            continue
+        axis = next((kw.value for kw in call.keywords if kw.arg == "axis"), None)
+        if axis is None and len(call.args) >= 2:
+            axis = call.args[1]
+        if isinstance(axis, ast.Constant) and axis.value in (1, "columns"):
+            findings.append(context.finding(
+                call, "high",
+                "apply(axis=1) calls a Python function once per row",
+                "Compute the result with vectorized column operations (np.where, np.select, "
+                "string accessors, arithmetic on whole columns)",
+            ))
+    return findings
+
+
+@register_perf_rule("concat_in_loop")
+def check_concat_in_loop(context: LintContext) -> List[Dict[str, Any]]:
+    """Report DataFrames grown with pd.concat inside a loop."""
+    return [
+        context.finding(
+            call, "high",
+            "pd.concat inside a loop copies all rows collected so far on every iteration",
+            "Collect the pieces in a list and call pd.concat once after the loop",
+        )
+        for call in context.method_calls("concat")
+        if context.loops(call)
+    ]
+
+
+@register_perf_rule("repeated_read")
+def check_repeated_read(context: LintContext) -> List[Dict[str, Any]]:
+    """Report files read more than once."""
+    findings = []
+    first_read: Dict[str, int] = {}
+    for call in context.method_calls(*_READERS):
+        source = call.args[0] if call.args else next(
+            (kw.value for kw in call.keywords if kw.arg in ("filepath_or_buffer", "io", "path")), None
+        )
+        if source is None:
+            continue
+
+        loops = context.loops(call)
+        source_names = {node.id for node in ast.walk(source) if isinstance(node, ast.Name)}
+        if loops and not source_names & set().union(*(_loop_names(loop) for loop in loops)):
+            findings.append(context.finding(
+                call, "high",
+                f"{_call_name(call)} of the same file runs on every iteration of the loop",
+                "Read the file once before the loop and reuse the DataFrame",
+            ))
+            continue
+
+        # Variables identify a file by their last assignment before the read
+        assigned_at = {}
+        for name in sorted(source_names):
+            assignment = context.last_assignment(name, call.lineno)
+            assigned_at[name] = assignment[0] if assignment is not None else None
+        key = ast.dump(source) + repr(assigned_at)
+        if key in first_read:
+            findings.append(context.finding(
+                call, "medium",
+                f"The file is read again (first read at line {first_read[key]})",
+                "Reuse the DataFrame from the first read (take a .copy() only if it is modified)",
+            ))
+        else:
+            first_read[key] = call.lineno
+    return findings
+
+
+@register_perf_rule("chained_copy")
+def check_chained_copy(context: LintContext) -> List[Dict[str, Any]]:
+    """Report copies of frames that are already copies, and copies on every loop iteration."""
+    findings = []
+    for call in context.method_calls("copy"):
+        if not isinstance(call.func, ast.Attribute):
+            continue
+        receiver = call.func.value
+
+        copied_copy = any(
+            isinstance(node, ast.Call) and _call_name(node) == "copy" for node in ast.walk(receiver)
+        )
+        if not copied_copy and isinstance(receiver, ast.Name):
+            assignment = context.last_assignment(receiver.id, call.lineno)
+            copied_copy = (
+                assignment is not None and isinstance(assignment[1], ast.Call)
+                and _call_name(assignment[1]) == "copy"
+            )
+
+        if copied_copy:
+            findings.append(context.finding(
+                call, "medium",
+                "Copies a DataFrame that is already a copy, doubling its memory for no benefit",
+                "Drop the extra .copy(); one copy per derived frame is enough",
+            ))
+        elif context.loops(call):
+            findings.append(context.finding(
+                call, "low",
+                ".copy() inside a loop copies the frame on every iteration",
+                "Copy once before the loop, or select only the rows and columns the iteration needs",
+            ))
+    return findings
@@ -0,0 +1,518 @@
+"""
+Persistent, content-addressed store for CSV profiles.
+
+Profiling a large CSV is the most expensive thing the planner and coder do
+before the LLM sees any data. This module keeps the result of
+``analyze_csv_structure`` on disk, keyed by a fingerprint of the file
+(size, modification time and a hash of sampled content blocks), so that each
+content version of a file is profiled once and the result is shared by every
+caller - planner tools, coder memory and other server processes pointing at
+the same store directory.
+
+Next to the profiles, the store keeps the mergeable profiling state of each
+profiled file version (see ``CSVProfileBuilder.to_state``), filed under the
+file's CSV header and named by the size and SHA-256 of the profiled bytes.
+When a file is re-uploaded with rows appended - a daily FBL3N extract - the
+state of its longest previously profiled byte prefix is found by hashing the
+new file's prefixes, and only the appended bytes need to be profiled.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ira_builder.utils.logger import get_logger
+from ira_builder.utils.config import get_config
+
+logger = get_logger(__name__)
+
+# Size of each content block hashed into the fingerprint
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+# Number of evenly spaced blocks (head, middle..., tail) hashed per file
+FINGERPRINT_BLOCK_COUNT = 4
+
+# Bytes read per step when hashing file prefixes
+PREFIX_HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Longest header line used to group profile states of the same extract
+MAX_HEADER_BYTES = 1024 * 1024
+
+
+def compute_file_fingerprint(filepath: Union[str, Path]) -> str:
+    """
+    Compute a cheap content fingerprint for a file.
+
+    The fingerprint combines the file size, the modification time and a
+    SHA-256 over a handful of evenly spaced content blocks. It never reads
+    more than ``FINGERPRINT_BLOCK_SIZE * FINGERPRINT_BLOCK_COUNT`` bytes, so it
+    is safe to call on multi-GB files.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        Hex digest identifying this content version of the file
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+
+    Example:
+        >>> fingerprint = compute_file_fingerprint("data/FBL3N.csv")
+        >>> len(fingerprint)
+        64
+    """
+    path = Path(filepath)
+    stat = path.stat()
+    size = stat.st_size
+
+    digest = hashlib.sha256()
+    digest.update(f"{size}:{stat.st_mtime_ns}".encode("utf-8"))
+
+    if size <= FINGERPRINT_BLOCK_SIZE * FINGERPRINT_BLOCK_COUNT:
+        offsets = [0]
+        block_size = size
+    else:
+        block_size = FINGERPRINT_BLOCK_SIZE
+        last_offset = size - block_size
+        offsets = [
+            (last_offset * i) // (FINGERPRINT_BLOCK_COUNT - 1)
+            for i in range(FINGERPRINT_BLOCK_COUNT)
+        ]
+
+    with path.open("rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            digest.update(f.read(block_size))
+
+    return digest.hexdigest()
+
+
+def hash_file_prefixes(filepath: Union[str, Path], sizes: List[int]) -> Dict[int, str]:
+    """
+    Compute the SHA-256 of several prefixes of a file in one sequential read.
+
+    Args:
+        filepath: Path to the file
+        sizes: Prefix lengths in bytes (lengths past the end of the file are skipped)
+
+    Returns:
+        Mapping of prefix length to hex digest
+    """
+    digests: Dict[int, str] = {}
+    digest = hashlib.sha256()
+    position = 0
+    with Path(filepath).open("rb") as f:
+        for size in sorted(set(sizes)):
+            while position < size:
+                block = f.read(min(PREFIX_HASH_BLOCK_SIZE, size - position))
+                if not block:
+                    return digests
+                digest.update(block)
+                position += len(block)
+            digests[size] = digest.copy().hexdigest()
+    return digests
+
+
+def _header_key(filepath: Union[str, Path]) -> Optional[str]:
+    """Hash of a CSV's header line, or None if it has none."""
+    with Path(filepath).open("rb") as f:
+        header = f.readline(MAX_HEADER_BYTES)
+    if not header.endswith(b"\n"):
+        return None
+    return hashlib.sha256(header).hexdigest()[:32]
+
+
+def _json_default(value: Any) -> Any:
+    """Convert numpy / pandas scalars that json can't serialize natively."""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class ProfileStore:
+    """
+    Disk-backed LRU store of CSV profiles keyed by file fingerprint.
+
+    Each entry is a JSON file named after the fingerprint. Writes are atomic
+    (write to a temporary file, then ``os.replace``) so concurrent processes
+    sharing the directory never observe a partial entry. Recency is tracked
+    through the entry's modification time, which is bumped on every hit, and
+    the least recently used entries are evicted once ``max_entries`` is
+    exceeded.
+
+    Attributes:
+        store_dir: Directory holding the profile entries
+        max_entries: Maximum number of entries kept on disk
+    """
+
+    def __init__(self, store_dir: Union[str, Path], max_entries: int = 256):
+        """
+        Initialize the profile store.
+
+        Args:
+            store_dir: Directory to keep profile entries in (created if missing)
+            max_entries: Maximum number of entries before LRU eviction (default: 256)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Picklable for worker processes; they keep their own counters
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _entry_path(self, fingerprint: str) -> Path:
+        return self.store_dir / f"{fingerprint}.json"
+
+    @property
+    def _states_dir(self) -> Path:
+        return self.store_dir / "states"
+
+    def _record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(
+        self,
+        filepath: Union[str, Path],
+        fingerprint: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up the stored profile for the current content of a file.
+
+        Args:
+            filepath: Path to the profiled file
+            fingerprint: Precomputed fingerprint (computed if omitted)
+
+        Returns:
+            The stored profile, or None if this content version was never profiled
+        """
+        fingerprint = fingerprint or compute_file_fingerprint(filepath)
+        entry_path = self._entry_path(fingerprint)
+
+        try:
+            with entry_path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._record("_misses")
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable profile entry {entry_path.name}: {str(e)}")
+            self._remove(entry_path)
+            self._record("_misses")
+            return None
+
+        # Bump recency for LRU eviction
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+
+        self._record("_hits")
+        logger.debug(f"Profile store hit for {Path(filepath).name}")
+        return entry["profile"]
+
+    def put(
+        self,
+        filepath: Union[str, Path],
+        profile: Dict[str, Any],
+        fingerprint: Optional[str] = None,
+    ) -> str:
+        """
+        Store a profile for the current content of a file.
+
+        Args:
+            filepath: Path to the profiled file
+            profile: Profile dictionary (must be JSON serializable)
+            fingerprint: Precomputed fingerprint (computed if omitted)
+
+        Returns:
+            The fingerprint the profile was stored under
+        """
+        fingerprint = fingerprint or compute_file_fingerprint(filepath)
+        entry = {
+            "fingerprint": fingerprint,
+            "source_path": str(Path(filepath).absolute()),
+            "stored_at": datetime.now().isoformat(),
+            "profile": profile,
+        }
+
+        entry_path = self._entry_path(fingerprint)
+        tmp_path = self.store_dir / f".{fingerprint}.{uuid.uuid4().hex}.tmp"
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(entry, f, default=_json_default)
+            os.replace(tmp_path, entry_path)
+        finally:
+            self._remove(tmp_path)
+
+        self._evict()
+        return fingerprint
+
+    def get_or_compute(
+        self,
+        filepath: Union[str, Path],
+        compute: Callable[[str], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Return the stored profile for a file, computing and storing it on a miss.
+
+        The file is re-fingerprinted after ``compute`` runs; if it changed while
+        being profiled the result is returned but not stored.
+
+        Args:
+            filepath: Path to the file
+            compute: Function producing the profile from the file path
+
+        Returns:
+            Profile dictionary
+        """
+        fingerprint = compute_file_fingerprint(filepath)
+        profile = self.get(filepath, fingerprint=fingerprint)
+        if profile is not None:
+            return profile
+
+        profile = compute(str(filepath))
+
+        if compute_file_fingerprint(filepath) == fingerprint:
+            try:
+                self.put(filepath, profile, fingerprint=fingerprint)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Could not store profile for {filepath}: {str(e)}")
+        else:
+            logger.warning(f"File changed while profiling, not caching: {filepath}")
+
+        return profile
+
+    def put_state(self, filepath: Union[str, Path], state: Dict[str, Any], size: int) -> bool:
+        """
+        Store the mergeable profiling state of the first ``size`` bytes of a file.
+
+        Args:
+            filepath: Path to the profiled file
+            state: Profile builder state (JSON serializable)
+            size: Number of bytes of the file the state covers (must end a row)
+
+        Returns:
+            True if the state was stored (files without a header line are skipped)
+        """
+        header_key = _header_key(filepath)
+        digest = hash_file_prefixes(filepath, [size]).get(size)
+        if header_key is None or digest is None:
+            return False
+
+        state_dir = self._states_dir / header_key
+        state_dir.mkdir(parents=True, exist_ok=True)
+        state_path = state_dir / f"{size}-{digest}.json"
+        tmp_path = state_dir / f".{size}-{digest}.{uuid.uuid4().hex}.tmp"
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(state, f, default=_json_default)
+            os.replace(tmp_path, state_path)
+        finally:
+            self._remove(tmp_path)
+
+        self._evict_paths(self._state_entries())
+        return True
+
+    def find_prefix_state(self, filepath: Union[str, Path]) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Find the stored state of the longest profiled prefix of a file.
+
+        A stored state matches when the file starts with exactly the bytes the
+        state was computed from - an earlier version of the file that has
+        since had rows appended (or been rewritten unchanged).
+
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            Tuple of (state, number of bytes it covers), or None if no stored
+            state matches
+        """
+        header_key = _header_key(filepath)
+        if header_key is None:
+            return None
+
+        file_size = Path(filepath).stat().st_size
+        candidates: Dict[int, List[Tuple[str, Path]]] = {}
+        for state_path in (self._states_dir / header_key).glob("*.json"):
+            size_text, _, digest = state_path.stem.partition("-")
+            if size_text.isdigit() and 0 < int(size_text) <= file_size:
+                candidates.setdefault(int(size_text), []).append((digest, state_path))
+        if not candidates:
+            return None
+
+        prefix_digests = hash_file_prefixes(filepath, list(candidates))
+        for size in sorted(candidates, reverse=True):
+            for digest, state_path in candidates[size]:
+                if prefix_digests.get(size) != digest:
+                    continue
+                try:
+                    with state_path.open("r", encoding="utf-8") as f:
+                        state = json.load(f)
+                    os.utime(state_path, None)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Discarding unreadable profile state {state_path.name}: {str(e)}")
+                    self._remove(state_path)
+                    continue
+                logger.debug(f"Found profile state of the first {size} bytes of {Path(filepath).name}")
+                return state, size
+        return None
+
+    def invalidate(self, filepath: Union[str, Path]) -> bool:
+        """
+        Remove the stored profile for the current content of a file.
+
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            True if an entry was removed
+        """
+        entry_path = self._entry_path(compute_file_fingerprint(filepath))
+        return self._remove(entry_path)
+
+    def clear(self) -> None:
+        """Remove every entry and profile state from the store."""
+        for entry_path in self._entries() + self._state_entries():
+            self._remove(entry_path)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for this process and the current store size.
+
+        Returns:
+            Dictionary with hits, misses, evictions, hit_rate and entries
+        """
+        with self._lock:
+            hits, misses, evictions = self._hits, self._misses, self._evictions
+
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries()),
+            "states": len(self._state_entries()),
+            "max_entries": self.max_entries,
+            "store_dir": str(self.store_dir),
+        }
+
+    def _entries(self) -> List[Path]:
+        return list(self.store_dir.glob("*.json"))
+
+    def _state_entries(self) -> List[Path]:
+        return list(self._states_dir.glob("*/*.json"))
+
+    def _evict(self) -> None:
+        """Evict least recently used entries beyond ``max_entries``."""
+        self._evict_paths(self._entries())
+
+    def _evict_paths(self, paths: List[Path]) -> None:
+        """Evict the least recently used of ``paths`` beyond ``max_entries``."""
+        entries = []
+        for entry_path in paths:
+            try:
+                entries.append((entry_path.stat().st_mtime, entry_path))
+            except FileNotFoundError:
+                # Evicted concurrently by another process
+                continue
+
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+
+        entries.sort(key=lambda item: item[0])
+        for _, entry_path in entries[:overflow]:
+            if self._remove(entry_path):
+                self._record("_evictions")
+                logger.debug(f"Evicted profile entry: {entry_path.name}")
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Failed to remove {path}: {str(e)}")
+            return False
+
+
+# Global store instance
+_profile_store: Optional[ProfileStore] = None
+_profile_store_lock = threading.Lock()
+
+
+def get_profile_store() -> Optional[ProfileStore]:
+    """
+    Get the process-wide profile store configured in settings.
+
+    Returns:
+        ProfileStore instance, or None if profile caching is disabled
+
+    Example:
+        >>> store = get_profile_store()
+        >>> store.stats()["hits"]
+        0
+    """
+    global _profile_store
+    config = get_config()
+    if not config.profile_store_enabled:
+        return None
+
+    with _profile_store_lock:
+        if _profile_store is None:
+            _profile_store = ProfileStore(
+                store_dir=config.profile_store_dir,
+                max_entries=config.profile_store_max_entries,
+            )
+    return _profile_store
+
+
+def set_profile_store(store: Optional[ProfileStore]) -> None:
+    """
+    Replace the process-wide profile store.
+
+    Mostly useful for tests and for servers that configure the store
+    explicitly at startup.
+
+    Args:
+        store: ProfileStore to use, or None to re-create it from settings lazily
+    """
+    global _profile_store
+    with _profile_store_lock:
+        _profile_store = store
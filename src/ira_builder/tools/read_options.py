@@ -0,0 +1,131 @@
+"""
+Recommended ``pd.read_csv`` options derived from a CSV profile.
+
+``pd.read_csv(path, low_memory=False)`` keeps every text column as Python
+string objects and every integer column as int64. For ERP extracts most
+text columns are low-cardinality codes ("Local Currency", "Document Type")
+whose object pointers and string copies dominate the DataFrame's memory.
+From the profile alone this module derives read options that load the same
+data more compactly:
+
+- ``dtype``: ``category`` for low-cardinality text columns and the smallest
+  integer type holding each null-free integer column
+- ``parse_dates`` / ``date_format``: date columns whose format was inferred
+  with high confidence, parsed at load time with the fixed-format parser
+- ``usecols``: the columns that hold any value, when some are entirely empty
+
+Float columns are never downcast: float32 can't hold ERP amounts exactly.
+Columns stored as formatted numeric text are left as text. A sampled
+profile only recommends ``parse_dates``: distinct counts, value ranges and
+empty columns seen in a sample don't hold for the rest of the file.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Text columns with at most this many distinct values are read as category...
+CATEGORY_MAX_UNIQUE = 1000
+
+# ...if their distinct values are at most this share of their values
+CATEGORY_MAX_UNIQUE_SHARE = 0.5
+
+# Minimum confidence of an inferred date format to parse the column at load time
+PARSE_DATES_MIN_CONFIDENCE = 0.9
+
+# Candidate integer types, smallest first
+_INT_TYPES = ("int8", "int16", "int32")
+
+
+def _smallest_int_type(minimum: float, maximum: float) -> Optional[str]:
+    """Smallest integer type holding [minimum, maximum] that is narrower than int64."""
+    for dtype in _INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= minimum and maximum <= info.max:
+            return dtype
+    return None
+
+
+def recommend_read_options(metadata: Dict[str, Any], bool_columns: List[str] = (),
+                           sampled: bool = False) -> Dict[str, Any]:
+    """
+    Derive compact ``pd.read_csv`` options from a file profile.
+
+    Args:
+        metadata: Profile metadata in the analyze_csv_structure format
+        bool_columns: Columns holding boolean text, left untouched
+        sampled: Whether the profile covers only a sample of the rows; no
+            ``dtype`` or ``usecols`` is then recommended
+
+    Returns:
+        Dictionary with ``dtype`` (column -> dtype), ``parse_dates`` (list of
+        columns), ``date_format`` (column -> strptime format) and ``usecols``
+        (list of columns, or None when every column holds values)
+
+    Example:
+        >>> options = recommend_read_options(analyze_csv_structure("data/FBL3N.csv"))
+        >>> options["dtype"]["Local Currency"]
+        'category'
+        >>> df = pd.read_csv("data/FBL3N.csv", low_memory=False, **options)
+    """
+    row_count = metadata["row_count"]
+    missing = metadata.get("missing_values", {})
+    formatted = metadata.get("numeric_formats", {})
+    date_formats = metadata.get("date_formats", {})
+    skipped = set(bool_columns) | set(formatted)
+
+    dtype: Dict[str, str] = {}
+    parse_dates: List[str] = []
+    date_format: Dict[str, str] = {}
+    for col in metadata["columns"]:
+        present = row_count - missing.get(col, 0)
+        if col in skipped or present <= 0:
+            continue
+
+        col_dtype = metadata["dtypes"][col]
+        if sampled and col not in date_formats:
+            continue
+        if col in date_formats:
+            inferred = date_formats[col]
+            if inferred["confidence"] >= PARSE_DATES_MIN_CONFIDENCE and not inferred["ambiguous"]:
+                parse_dates.append(col)
+                date_format[col] = inferred["format"]
+        elif col_dtype == "object":
+            unique = metadata["unique_counts"].get(col, present)
+            if unique <= CATEGORY_MAX_UNIQUE and unique <= present * CATEGORY_MAX_UNIQUE_SHARE:
+                dtype[col] = "category"
+        elif col_dtype == "int64" and col in metadata.get("statistics", {}):
+            stats = metadata["statistics"][col]
+            int_type = _smallest_int_type(stats["min"], stats["max"])
+            if int_type is not None:
+                dtype[col] = int_type
+
+    empty = [] if sampled else [col for col in metadata["columns"] if missing.get(col, 0) >= row_count > 0]
+    return {
+        "dtype": dtype,
+        "parse_dates": parse_dates,
+        "date_format": date_format,
+        "usecols": [col for col in metadata["columns"] if col not in empty] if empty else None,
+    }
+
+
+def format_read_call(path_variable: str, options: Dict[str, Any]) -> str:
+    """
+    Render recommended read options as a ``pd.read_csv`` call.
+
+    Args:
+        path_variable: Name of the variable holding the CSV path
+        options: Options from ``recommend_read_options``
+
+    Returns:
+        Python source of the call
+    """
+    arguments = [path_variable, "low_memory=False"]
+    if options.get("usecols"):
+        arguments.append(f"usecols={options['usecols']!r}")
+    if options.get("dtype"):
+        arguments.append(f"dtype={options['dtype']!r}")
+    if options.get("parse_dates"):
+        arguments.append(f"parse_dates={options['parse_dates']!r}")
+        arguments.append(f"date_format={options['date_format']!r}")
+    return f"pd.read_csv({', '.join(arguments)})"
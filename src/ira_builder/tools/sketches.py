@@ -0,0 +1,506 @@
+"""
+Mergeable streaming sketches used by the CSV profiler.
+
+Every sketch in this module can be updated chunk by chunk in bounded memory,
+merged with another sketch of the same kind (so partial profiles of different
+chunks, files or appended tails can be combined) and serialized to a
+JSON-friendly dictionary. While the data seen is small the sketches stay exact,
+so small files produce the same numbers as a full in-memory pandas analysis.
+"""
+
+import base64
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _encode_array(values: np.ndarray) -> str:
+    """Encode a numpy array as base64 text for JSON serialization."""
+    return base64.b64encode(np.ascontiguousarray(values).tobytes()).decode("ascii")
+
+
+def _decode_array(data: str, dtype: Any) -> np.ndarray:
+    """Decode an array produced by ``_encode_array``."""
+    return np.frombuffer(base64.b64decode(data), dtype=dtype).copy()
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """
+    Hash a Series of values to 64-bit integers.
+
+    Args:
+        values: Series of non-null values
+
+    Returns:
+        uint64 array with one hash per value
+    """
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+class RunningMoments:
+    """
+    Streaming count, mean, variance, min and max (Chan et al. parallel update).
+
+    Attributes:
+        count: Number of values seen
+        mean: Running mean
+        m2: Sum of squared deviations from the mean
+        min: Smallest value seen
+        max: Largest value seen
+    """
+
+    def __init__(self):
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.min: float = float("inf")
+        self.max: float = float("-inf")
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of finite float values."""
+        if len(values) == 0:
+            return
+        batch = RunningMoments()
+        batch.count = int(len(values))
+        batch.mean = float(np.mean(values))
+        batch.m2 = float(np.sum((values - batch.mean) ** 2))
+        batch.min = float(np.min(values))
+        batch.max = float(np.max(values))
+        self.merge(batch)
+
+    def merge(self, other: "RunningMoments") -> None:
+        """Merge another RunningMoments into this one."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / total
+        self.m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, matching pandas)."""
+        if self.count < 2:
+            return float("nan")
+        return float(np.sqrt(self.m2 / (self.count - 1)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2,
+                "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningMoments":
+        moments = cls()
+        moments.count = data["count"]
+        moments.mean = data["mean"]
+        moments.m2 = data["m2"]
+        moments.min = data["min"]
+        moments.max = data["max"]
+        return moments
+
+
+class QuantileSketch:
+    """
+    KLL-style mergeable quantile sketch.
+
+    Values are buffered in a hierarchy of compactors. Level ``h`` holds items
+    of weight ``2**h``; when a level exceeds ``k`` items it is sorted and every
+    other item is promoted to the next level. Until the first compaction the
+    sketch is exact and quantiles use linear interpolation like pandas.
+
+    Attributes:
+        k: Capacity of each compactor level
+        count: Number of values seen
+    """
+
+    def __init__(self, k: int = 2048, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self.levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def is_exact(self) -> bool:
+        """True while no compaction has happened."""
+        return len(self.levels) == 1
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of float values."""
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values.astype(np.float64)])
+        self.count += int(len(values))
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for height, items in enumerate(other.levels):
+            self.levels[height] = np.concatenate([self.levels[height], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        height = 0
+        while height < len(self.levels):
+            items = self.levels[height]
+            if len(items) > self.k:
+                items = np.sort(items)
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                even = items[: len(items) - len(keep)]
+                promoted = even[int(self._rng.integers(0, 2))::2]
+                self.levels[height] = keep
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                self.levels[height + 1] = np.concatenate([self.levels[height + 1], promoted])
+            height += 1
+
+    def quantiles(self, qs: List[float]) -> List[float]:
+        """
+        Estimate quantiles.
+
+        Args:
+            qs: Quantile fractions in [0, 1]
+
+        Returns:
+            Estimated value for each fraction (NaN when empty)
+        """
+        if self.count == 0:
+            return [float("nan")] * len(qs)
+        if self.is_exact:
+            return [float(v) for v in np.quantile(self.levels[0], qs)]
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(items), 2 ** height, dtype=np.float64)
+            for height, items in enumerate(self.levels)
+        ])
+        order = np.argsort(values, kind="mergesort")
+        values, weights = values[order], weights[order]
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+
+        results = []
+        for q in qs:
+            idx = int(np.searchsorted(cumulative, q * total, side="left"))
+            results.append(float(values[min(idx, len(values) - 1)]))
+        return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "count": self.count,
+            "levels": [_encode_array(items) for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(k=data["k"])
+        sketch.count = data["count"]
+        sketch.levels = [_decode_array(items, np.float64) for items in data["levels"]]
+        return sketch
+
+
+def _leading_zeros64(values: np.ndarray) -> np.ndarray:
+    """Count leading zero bits of uint64 values (64 for zero)."""
+    x = values.copy()
+    zeros = np.zeros(x.shape, dtype=np.uint64)
+    for bits in (32, 16, 8, 4, 2, 1):
+        mask = x < (np.uint64(1) << np.uint64(64 - bits))
+        zeros[mask] += np.uint64(bits)
+        x[mask] <<= np.uint64(bits)
+    zeros[x == 0] += np.uint64(1)
+    return zeros
+
+
+class DistinctCounter:
+    """
+    Distinct value counter: an exact hash set that degrades to HyperLogLog.
+
+    Up to ``exact_limit`` distinct hashes are kept in a sorted array, which
+    gives exact counts for low-cardinality columns. Beyond that the hashes are
+    folded into ``2**precision`` HyperLogLog registers (about 1.6% standard
+    error at the default precision).
+
+    Attributes:
+        precision: Number of index bits of the HyperLogLog registers
+        exact_limit: Number of distinct hashes tracked exactly
+    """
+
+    def __init__(self, precision: int = 12, exact_limit: int = 4096):
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self._exact: Optional[np.ndarray] = np.empty(0, dtype=np.uint64)
+        self._registers: Optional[np.ndarray] = None
+
+    @property
+    def is_exact(self) -> bool:
+        return self._registers is None
+
+    def update_hashes(self, hashes: np.ndarray) -> None:
+        """Add a batch of 64-bit hashes."""
+        if len(hashes) == 0:
+            return
+        if self._registers is None:
+            self._exact = np.union1d(self._exact, hashes)
+            if len(self._exact) > self.exact_limit:
+                self._registers = np.zeros(2 ** self.precision, dtype=np.uint8)
+                self._add_to_registers(self._exact)
+                self._exact = None
+        else:
+            self._add_to_registers(hashes)
+
+    def update(self, values: pd.Series) -> None:
+        """Add a batch of non-null values."""
+        self.update_hashes(hash_values(values))
+
+    def _add_to_registers(self, hashes: np.ndarray) -> None:
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        remainder = hashes << p
+        rank = np.minimum(_leading_zeros64(remainder) + np.uint64(1), np.uint64(64 - self.precision + 1))
+        np.maximum.at(self._registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: "DistinctCounter") -> None:
+        """Merge another counter with the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge DistinctCounters with different precision")
+        if other._registers is None:
+            self.update_hashes(other._exact)
+            return
+        if self._registers is None:
+            exact = self._exact
+            self._registers = other._registers.copy()
+            self._exact = None
+            self._add_to_registers(exact)
+        else:
+            np.maximum(self._registers, other._registers, out=self._registers)
+
+    def count(self) -> int:
+        """Return the (estimated) number of distinct values."""
+        if self._registers is None:
+            return int(len(self._exact))
+
+        m = float(len(self._registers))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.power(2.0, -self._registers.astype(np.float64))))
+        empty = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and empty > 0:
+            estimate = m * np.log(m / empty)
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "exact_limit": self.exact_limit,
+            "exact": _encode_array(self._exact) if self._registers is None else None,
+            "registers": _encode_array(self._registers) if self._registers is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DistinctCounter":
+        counter = cls(precision=data["precision"], exact_limit=data["exact_limit"])
+        if data["registers"] is not None:
+            counter._registers = _decode_array(data["registers"], np.uint8)
+            counter._exact = None
+        else:
+            counter._exact = _decode_array(data["exact"], np.uint64)
+        return counter
+
+
+class HeavyHitters:
+    """
+    Misra-Gries frequent items summary.
+
+    Keeps at most ``capacity`` counters. While fewer distinct values have been
+    seen the counts are exact; afterwards each reported count underestimates
+    the true frequency by at most ``error``.
+
+    Attributes:
+        capacity: Maximum number of tracked values
+        error: Upper bound on the undercount of any reported frequency
+    """
+
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self.error: int = 0
+        self._counts = pd.Series(dtype=np.int64)
+
+    def update_counts(self, counts: pd.Series) -> None:
+        """Add a batch of value counts (index = value, data = count)."""
+        if len(counts) == 0:
+            return
+        combined = self._counts.add(counts.astype(np.int64), fill_value=0).astype(np.int64)
+        if len(combined) > self.capacity:
+            threshold = int(combined.nlargest(self.capacity + 1).iloc[-1])
+            combined = combined - threshold
+            combined = combined[combined > 0]
+            self.error += threshold
+        self._counts = combined
+
+    def update(self, values: pd.Series) -> None:
+        """Add a batch of non-null values."""
+        self.update_counts(values.value_counts(sort=False))
+
+    def merge(self, other: "HeavyHitters") -> None:
+        """Merge another summary into this one."""
+        self.error += other.error
+        self.update_counts(other._counts)
+
+    def top(self, n: int = 5) -> List[Tuple[Any, int]]:
+        """Return the ``n`` most frequent values with their counts."""
+        if len(self._counts) == 0:
+            return []
+        top = self._counts.sort_values(ascending=False, kind="mergesort").head(n)
+        return [(value, int(count)) for value, count in top.items()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "error": self.error,
+            "values": [str(v) for v in self._counts.index],
+            "counts": [int(c) for c in self._counts.values],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HeavyHitters":
+        summary = cls(capacity=data["capacity"])
+        summary.error = data["error"]
+        summary._counts = pd.Series(data["counts"], index=data["values"], dtype=np.int64)
+        return summary
+
+
+class KeySketch:
+    """
+    Bottom-k MinHash sketch of a column's values, with their frequencies.
+
+    Keeps the ``k`` smallest distinct 64-bit hashes seen and the exact number
+    of rows holding each of them (a hash that falls out of the bottom k can
+    never return, so counts of retained hashes are complete). Two sketches
+    built with the same hash function estimate the Jaccard similarity of
+    their sets, and with the set sizes the share of one set contained in the
+    other - which is what identifies a foreign key / primary key pair. The
+    retained hashes form a coordinated sample of keys, so the frequencies
+    also estimate the row count of a join. While a set has fewer than ``k``
+    distinct values its sketch holds all of them and the estimates are exact.
+
+    Attributes:
+        k: Number of hashes kept
+        hashes: Retained hashes, sorted
+        counts: Rows holding each retained hash
+    """
+
+    def __init__(self, k: int = 256):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self.hashes) < self.k
+
+    def update_hashes(self, hashes: np.ndarray, counts: Optional[np.ndarray] = None) -> None:
+        """
+        Add a batch of 64-bit hashes.
+
+        Args:
+            hashes: Hashes (duplicates allowed)
+            counts: Rows per hash (default: one each)
+        """
+        if len(hashes) == 0:
+            return
+        counts = np.ones(len(hashes), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+        # Only hashes up to the k-th smallest can be retained
+        if len(self.hashes) >= self.k:
+            keep = hashes <= self.hashes[-1]
+        elif len(hashes) > self.k:
+            keep = hashes <= np.partition(hashes, self.k - 1)[self.k - 1]
+        else:
+            keep = slice(None)
+
+        combined, inverse = np.unique(np.concatenate([self.hashes, hashes[keep]]), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate([self.counts, counts[keep]]))
+        self.hashes = combined[:self.k]
+        self.counts = totals[:self.k].astype(np.int64)
+
+    def merge(self, other: "KeySketch") -> None:
+        """Merge a sketch of other rows, built with the same ``k``."""
+        if other.k != self.k:
+            raise ValueError("Cannot merge KeySketches of different sizes")
+        self.update_hashes(other.hashes, other.counts)
+
+    def jaccard(self, other: "KeySketch") -> float:
+        """Estimate the Jaccard similarity of the two value sets."""
+        k = min(self.k, other.k)
+        union = np.union1d(self.hashes, other.hashes)[:k]
+        if len(union) == 0:
+            return 0.0
+        shared = np.intersect1d(self.hashes, other.hashes, assume_unique=True)
+        return float(len(np.intersect1d(union, shared, assume_unique=True))) / len(union)
+
+    def containment(self, other: "KeySketch", count: int, other_count: int) -> float:
+        """
+        Estimate the share of this set's values that also occur in the other set.
+
+        Args:
+            other: Sketch of the other set
+            count: Distinct values in this set
+            other_count: Distinct values in the other set
+
+        Returns:
+            Estimated containment between 0 and 1
+        """
+        if count == 0:
+            return 0.0
+        jaccard = self.jaccard(other)
+        intersection = jaccard * (count + other_count) / (1 + jaccard)
+        return min(1.0, intersection / count)
+
+    def join_size(self, other: "KeySketch") -> float:
+        """
+        Estimate the rows of an inner join of the two columns.
+
+        Sums the products of the frequencies of shared keys in the bottom k
+        of the union, scaled by the share of the hash space that covers.
+        Exact when both sketches hold every value.
+
+        Args:
+            other: Sketch of the other column
+
+        Returns:
+            Estimated number of joined rows
+        """
+        shared, left, right = np.intersect1d(
+            self.hashes, other.hashes, assume_unique=True, return_indices=True
+        )
+        products = self.counts[left].astype(np.float64) * other.counts[right]
+        if self.is_exact and other.is_exact:
+            return float(products.sum())
+
+        threshold = np.union1d(self.hashes, other.hashes)[min(self.k, other.k) - 1]
+        sampled_share = (float(threshold) + 1.0) / 2.0 ** 64
+        return float(products[shared <= threshold].sum()) / sampled_share
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "hashes": _encode_array(self.hashes), "counts": _encode_array(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KeySketch":
+        sketch = cls(k=data["k"])
+        sketch.hashes = _decode_array(data["hashes"], np.uint64)
+        if "counts" in data:
+            sketch.counts = _decode_array(data["counts"], np.int64)
+        else:
+            sketch.counts = np.ones(len(sketch.hashes), dtype=np.int64)
+        return sketch
@@ -57,7 +57,53 @@ class Settings(BaseSettings):
     # Workflow
     max_questions: int = Field(default=10, alias="MAX_QUESTIONS")
     max_code_execution_time: int = Field(default=120, alias="MAX_CODE_EXECUTION_TIME")
+    execution_admission_enabled: bool = Field(default=True, alias="EXECUTION_ADMISSION_ENABLED")
+    execution_memory_budget_mb: int = Field(default=0, alias="EXECUTION_MEMORY_BUDGET_MB")
+    execution_admission_timeout: float = Field(default=600.0, alias="EXECUTION_ADMISSION_TIMEOUT")
+    execution_cpu_slots: int = Field(default=0, alias="EXECUTION_CPU_SLOTS")
+    output_manifest_enabled: bool = Field(default=True, alias="OUTPUT_MANIFEST_ENABLED")
+    interpreter_pool_size: int = Field(default=2, alias="INTERPRETER_POOL_SIZE")
+    interpreter_pool_max_runs: int = Field(default=20, alias="INTERPRETER_POOL_MAX_RUNS")
+    interpreter_pool_preload: str = Field(default="numpy,pandas", alias="INTERPRETER_POOL_PRELOAD")
+    interpreter_pool_input_cache_mb: int = Field(default=256, alias="INTERPRETER_POOL_INPUT_CACHE_MB")
+    interpreter_pool_checkpoint_mb: int = Field(default=512, alias="INTERPRETER_POOL_CHECKPOINT_MB")
+    execution_checkpoints: bool = Field(default=True, alias="EXECUTION_CHECKPOINTS")
+    execution_output_max_chars: int = Field(default=200_000, alias="EXECUTION_OUTPUT_MAX_CHARS")
+    execution_logs_dir: str = Field(default="./storage/execution_logs", alias="EXECUTION_LOGS_DIR")
+    execution_memory_limit_mb: int = Field(default=0, alias="EXECUTION_MEMORY_LIMIT_MB")
+    execution_cpu_limit_seconds: int = Field(default=0, alias="EXECUTION_CPU_LIMIT_SECONDS")
+    setup_cache_dir: str = Field(default="./storage/setup_cache", alias="SETUP_CACHE_DIR")
+    venv_pool_size: int = Field(default=0, alias="VENV_POOL_SIZE")
+    venv_pool_dir: str = Field(default="./storage/venvs", alias="VENV_POOL_DIR")
+    venv_pool_packages: str = Field(default="", alias="VENV_POOL_PACKAGES")
+    execution_profiling: bool = Field(default=False, alias="EXECUTION_PROFILING")
     max_file_size_mb: int = Field(default=100, alias="MAX_FILE_SIZE_MB")
+    join_check_enabled: bool = Field(default=True, alias="JOIN_CHECK_ENABLED")
+    join_max_expansion: float = Field(default=10.0, alias="JOIN_MAX_EXPANSION")
+    join_max_rows: int = Field(default=20_000_000, alias="JOIN_MAX_ROWS")
+    perf_lint_enabled: bool = Field(default=True, alias="PERF_LINT_ENABLED")
+    perf_lint_block_severity: str = Field(default="high", alias="PERF_LINT_BLOCK_SEVERITY")
+    async_tool_threads: int = Field(default=4, alias="ASYNC_TOOL_THREADS")
+    async_tool_processes: int = Field(default=2, alias="ASYNC_TOOL_PROCESSES")
+    async_tool_modes: str = Field(default="", alias="ASYNC_TOOL_MODES")
+
+    # CSV Profiling
+    profile_store_enabled: bool = Field(default=True, alias="PROFILE_STORE_ENABLED")
+    profile_store_dir: str = Field(default="./storage/profiles", alias="PROFILE_STORE_DIR")
+    profile_store_max_entries: int = Field(default=256, alias="PROFILE_STORE_MAX_ENTRIES")
+    profile_chunk_rows: int = Field(default=50_000, alias="PROFILE_CHUNK_ROWS")
+    profile_incremental: bool = Field(default=True, alias="PROFILE_INCREMENTAL")
+    fast_profile_time_budget: float = Field(default=2.0, alias="FAST_PROFILE_TIME_BUDGET")
+    fast_profile_sample_rows: int = Field(default=10_000, alias="FAST_PROFILE_SAMPLE_ROWS")
+    planner_fast_profile: bool = Field(default=True, alias="PLANNER_FAST_PROFILE")
+    planner_background_profile: bool = Field(default=True, alias="PLANNER_BACKGROUND_PROFILE")
+    columnar_cache_enabled: bool = Field(default=True, alias="COLUMNAR_CACHE_ENABLED")
+    columnar_cache_dir: str = Field(default="./storage/columnar", alias="COLUMNAR_CACHE_DIR")
+    columnar_cache_max_entries: int = Field(default=32, alias="COLUMNAR_CACHE_MAX_ENTRIES")
+    columnar_cache_format: str = Field(default="auto", alias="COLUMNAR_CACHE_FORMAT")
+    csv_summary_workers: int = Field(default=4, alias="CSV_SUMMARY_WORKERS")
+    csv_summary_file_timeout: float = Field(default=600.0, alias="CSV_SUMMARY_FILE_TIMEOUT")
+    csv_summary_parallel_min_mb: float = Field(default=16.0, alias="CSV_SUMMARY_PARALLEL_MIN_MB")
 
     # Observability
     enable_tracing: bool = Field(default=True, alias="ENABLE_TRACING")
@@ -14,6 +14,28 @@ src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
 
+@pytest.fixture(autouse=True)
+def isolated_profile_store(tmp_path):
+    """Keep cached CSV profiles out of the repository's storage directory."""
+    from ira_builder.tools.profile_store import ProfileStore, set_profile_store
+
+    store = ProfileStore(tmp_path / "profiles")
+    set_profile_store(store)
+    yield store
+    set_profile_store(None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_columnar_cache(tmp_path):
+    """Keep columnar sidecars out of the repository's storage directory."""
+    from ira_builder.tools.columnar_cache import ColumnarCache, set_columnar_cache
+
+    cache = ColumnarCache(tmp_path / "columnar")
+    set_columnar_cache(cache)
+    yield cache
+    set_columnar_cache(None)
+
+
 @pytest.fixture(scope="session")
 def fixtures_dir():
     """Path to test fixtures directory."""
@@ -0,0 +1,76 @@
+"""
+Unit tests for the async tool variants.
+
+Tests that blocking tools run off the event loop, keep their tool names, and
+run in the pool configured for them.
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from ira_builder.tools.async_tools import (
+    ToolDispatcher,
+    parse_tool_modes,
+    set_tool_dispatcher,
+    validate_python_syntax_async,
+)
+
+
+def _worker_info(callback=None):
+    """Report where a dispatched call ran."""
+    return os.getpid(), threading.current_thread().name
+
+
+@pytest.fixture
+def dispatcher():
+    """Install a dispatcher with _worker_info configured for the process pool."""
+    dispatcher = ToolDispatcher(max_threads=2, max_processes=1, modes={"_worker_info": "process"})
+    set_tool_dispatcher(dispatcher)
+    yield dispatcher
+    set_tool_dispatcher(None)
+    dispatcher.shutdown()
+
+
+class TestAsyncTools:
+    """Tests for the tool dispatcher and async tool variants."""
+
+    async def test_blocking_call_does_not_block_loop(self, dispatcher):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await dispatcher.run(time.sleep, 0.3)
+        task.cancel()
+
+        assert ticks >= 10
+
+    async def test_async_tool_keeps_name_and_result(self, dispatcher):
+        result = await validate_python_syntax_async("x = 1")
+
+        assert validate_python_syntax_async.__name__ == "validate_python_syntax"
+        assert result["valid"] is True
+
+    async def test_tool_modes(self, dispatcher):
+        pid, _ = await dispatcher.run(_worker_info)
+        assert pid != os.getpid()
+
+        # Callbacks can't be sent to a process, so the call falls back to a thread
+        pid, thread_name = await dispatcher.run(_worker_info, lambda progress: None)
+        assert pid == os.getpid()
+        assert thread_name.startswith("ira-tool")
+
+        assert parse_tool_modes(" summarize_csv_files=process, validate_python_syntax=inline ") == {
+            "summarize_csv_files": "process",
+            "validate_python_syntax": "inline",
+        }
+        with pytest.raises(ValueError):
+            parse_tool_modes("summarize_csv_files=gpu")
@@ -0,0 +1,206 @@
+"""
+Unit tests for the columnar sidecar cache.
+
+Tests that sidecars reproduce pandas' CSV parsing, follow source changes and
+are served transparently to executed code, and that executed code writes a
+manifest of its output.
+"""
+
+import asyncio
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ira_builder.executor.sidecar_harness import _apply_read_options, manifest_path, read_manifest
+from ira_builder.tools.code_executor_tools import (
+    execute_python_code,
+    get_dataframe_summary,
+    preview_dataframe,
+    validate_output_dataframe,
+)
+from ira_builder.tools.columnar_cache import load_csv, read_sidecar
+from ira_builder.tools.csv_profiler import profile_csv_streaming
+from ira_builder.tools.csv_tools import get_column_data_preview
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    """Write a small CSV with integer, float, text and sparse columns."""
+    rng = np.random.default_rng(11)
+    n = 200
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "amount": rng.normal(50, 10, n).round(2),
+        "vendor": rng.choice(["Acme", "Globex", "Initech"], n),
+        "note": np.where(rng.random(n) < 0.5, None, "checked"),
+    })
+    path = tmp_path / "input.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+class TestColumnarCache:
+    """Tests for building and loading sidecars."""
+
+    def test_sidecar_matches_read_csv(self, input_csv, isolated_columnar_cache):
+        """Test that a sidecar load equals parsing the CSV."""
+        sidecar = isolated_columnar_cache.build(input_csv)
+
+        expected = pd.read_csv(input_csv, low_memory=False)
+        pd.testing.assert_frame_equal(read_sidecar(sidecar), expected)
+        pd.testing.assert_frame_equal(
+            load_csv(input_csv, usecols=["vendor", "id"]),
+            expected[["id", "vendor"]],
+        )
+        assert isolated_columnar_cache.stats()["hits"] == 1
+
+    def test_source_change_invalidates_sidecar(self, input_csv, isolated_columnar_cache):
+        """Test that editing the CSV stops its old sidecar from being used."""
+        isolated_columnar_cache.build(input_csv)
+
+        input_csv.write_text("id,amount\n1,2.5\n")
+        os.utime(input_csv, ns=(0, 0))
+
+        assert isolated_columnar_cache.lookup(input_csv) is None
+        assert load_csv(input_csv).to_dict(orient="list") == {"id": [1], "amount": [2.5]}
+
+    def test_column_preview_uses_sidecar(self, input_csv, isolated_columnar_cache):
+        """Test that column previews read the typed column from the sidecar."""
+        isolated_columnar_cache.build(input_csv)
+
+        preview = get_column_data_preview(str(input_csv), "amount", num_samples=3)
+
+        assert preview["stats_source"] == "columnar_sidecar"
+        assert preview["dtype"] == "float64"
+        assert preview["total_count"] == 200
+        assert all(isinstance(value, float) for value in preview["samples"])
+
+    def test_build_async(self, input_csv, isolated_columnar_cache):
+        """Test that background builds are shared and produce a sidecar."""
+        first = isolated_columnar_cache.build_async(input_csv)
+        second = isolated_columnar_cache.build_async(input_csv)
+
+        sidecar = first.result(timeout=30)
+        assert second.result(timeout=30) == sidecar
+        assert isolated_columnar_cache.lookup(input_csv) == sidecar
+
+
+class TestSidecarExecution:
+    """Tests for serving sidecars to executed code."""
+
+    def test_executed_code_reads_sidecar(self, input_csv, isolated_columnar_cache, tmp_path):
+        """Test that pd.read_csv in executed code loads the registered sidecar."""
+        sidecar = isolated_columnar_cache.build(input_csv)
+        # Mark the sidecar so the test can tell which copy was read
+        marked = read_sidecar(sidecar).assign(vendor="from-sidecar")
+        if sidecar.suffix == ".parquet":
+            marked.to_parquet(sidecar, index=False)
+        else:
+            marked.to_pickle(sidecar)
+
+        code = (
+            "import pandas as pd\n"
+            f"df = pd.read_csv({str(input_csv)!r}, low_memory=False)\n"
+            "print(df['vendor'].iloc[0], len(df))\n"
+            f"raw = pd.read_csv({str(input_csv)!r}, nrows=1)\n"
+            "print(raw['vendor'].iloc[0] != 'from-sidecar')\n"
+        )
+        result = asyncio.run(execute_python_code(
+            code, work_dir=str(tmp_path / "run"), input_files=[str(input_csv)]
+        ))
+
+        assert result["status"] == "success", result["output"]
+        assert result["output"].split() == ["from-sidecar", "200", "True"]
+
+    def test_sidecar_applies_read_options(self, isolated_columnar_cache, tmp_path):
+        """Test that recommended read options applied to a sidecar match read_csv."""
+        path = tmp_path / "ledger.csv"
+        n = 300
+        pd.DataFrame({
+            "posting_key": np.arange(n) % 3 + 40,
+            "currency": np.where(np.arange(n) % 4 == 0, "USD", "INR"),
+            "posting_date": [f"{d % 28 + 1:02d}-03-2023" for d in range(n)],
+            "amount": np.arange(n) * 1.5,
+        }).to_csv(path, index=False)
+        sidecar = isolated_columnar_cache.build(path)
+        options = profile_csv_streaming(str(path))["read_options"]
+        kwargs = {key: options[key] for key in ("dtype", "parse_dates", "date_format")}
+
+        converted = _apply_read_options(pd, read_sidecar(sidecar), **kwargs)
+
+        assert converted is not None
+        pd.testing.assert_frame_equal(converted, pd.read_csv(path, low_memory=False, **kwargs))
+        # Conversions read_csv wouldn't make the same way fall back to parsing
+        assert _apply_read_options(pd, read_sidecar(sidecar), dtype={"amount": "category"}) is None
+
+    def test_tracebacks_hide_launcher_frames(self, input_csv, isolated_columnar_cache, tmp_path):
+        """Test that errors point at the script's own lines."""
+        isolated_columnar_cache.build(input_csv)
+        code = (
+            "import pandas as pd\n"
+            f"df = pd.read_csv({str(input_csv)!r})\n"
+            "df['missing']\n"
+        )
+        result = asyncio.run(execute_python_code(
+            code, work_dir=str(tmp_path / "run"), input_files=[str(input_csv)]
+        ))
+
+        assert result["status"] == "error"
+        assert "sidecar_harness" not in result["output"]
+        assert "line 3" in result["output"]
+        assert "KeyError" in result["output"]
+
+
+class TestOutputManifest:
+    """Tests for the result manifest written with the output CSV."""
+
+    def test_manifest_matches_csv(self, input_csv, tmp_path, monkeypatch):
+        """Test that the tools give the same answers from the manifest as from the CSV."""
+        output = tmp_path / "output.csv"
+        code = (
+            "import pandas as pd\n"
+            f"df = pd.read_csv({str(input_csv)!r})\n"
+            f"df.to_csv({str(output)!r}, index=False)\n"
+        )
+        result = asyncio.run(execute_python_code(
+            code, work_dir=str(tmp_path / "run"), output_file=str(output)
+        ))
+        assert result["status"] == "success", result["output"]
+        assert read_manifest(output)["row_count"] == 200
+
+        from_manifest = (
+            validate_output_dataframe(str(output)),
+            get_dataframe_summary(str(output)),
+            preview_dataframe(str(output), rows=5),
+        )
+        os.remove(manifest_path(output))
+        from_csv = (
+            validate_output_dataframe(str(output)),
+            get_dataframe_summary(str(output)),
+            preview_dataframe(str(output), rows=5),
+        )
+
+        assert from_manifest[0] == from_csv[0]
+        assert from_manifest[1]["dtypes"] == from_csv[1]["dtypes"]
+        assert from_manifest[1]["missing_values"] == from_csv[1]["missing_values"]
+        assert from_manifest[1]["numerical_summary"] == from_csv[1]["numerical_summary"]
+        assert from_manifest[2] == from_csv[2]
+
+    def test_stale_manifest_ignored(self, input_csv, tmp_path):
+        """Test that output written without a manifest invalidates the old one."""
+        output = tmp_path / "output.csv"
+        code = (
+            "import pandas as pd\n"
+            f"df = pd.read_csv({str(input_csv)!r})\n"
+            f"df.to_csv({str(output)!r}, index=False)\n"
+            f"df.head(3).to_csv({str(output)!r}, index=False, mode='a', header=False)\n"
+        )
+        result = asyncio.run(execute_python_code(
+            code, work_dir=str(tmp_path / "run"), output_file=str(output)
+        ))
+
+        assert result["status"] == "success", result["output"]
+        assert read_manifest(output) is None
+        assert validate_output_dataframe(str(output))["row_count"] == 203
@@ -0,0 +1,406 @@
+"""
+Unit tests for the streaming CSV profiler and its sketches.
+
+Tests that chunked profiling matches a full pandas analysis on small files,
+that sketches merge correctly and stay accurate past their exact capacity.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ira_builder.tools.csv_profiler import (
+    CSVProfileBuilder,
+    coerce_column,
+    count_csv_rows,
+    profile_csv_sample,
+    profile_csv_streaming,
+)
+from ira_builder.tools.csv_tools import (
+    analyze_csv_sample,
+    analyze_csv_structure,
+    get_csv_first_look,
+    summarize_csv_samples,
+)
+from ira_builder.tools.date_formats import infer_date_format
+from ira_builder.tools.number_formats import parse_formatted_numbers, parse_number_text
+from ira_builder.tools.sketches import (
+    DistinctCounter,
+    HeavyHitters,
+    QuantileSketch,
+    RunningMoments,
+    hash_values,
+)
+
+
+@pytest.fixture
+def mixed_csv(tmp_path):
+    """Write a CSV with integer, float, text, boolean and sparse columns."""
+    rng = np.random.default_rng(7)
+    n = 1000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "amount": rng.normal(100, 15, n).round(2),
+        "vendor": rng.choice(["Acme", "Globex", "Initech", "Umbrella"], n),
+        "active": rng.choice([True, False], n),
+        "discount": np.where(rng.random(n) < 0.3, np.nan, rng.random(n).round(3)),
+    })
+    path = tmp_path / "mixed.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+class TestSketches:
+    """Tests for the mergeable sketches."""
+
+    def test_running_moments_merge(self):
+        """Test that merged moments equal moments over all values."""
+        values = np.random.default_rng(0).normal(5, 2, 10_000)
+        left, right = RunningMoments(), RunningMoments()
+        left.update(values[:3000])
+        right.update(values[3000:])
+        left.merge(right)
+
+        assert left.count == len(values)
+        assert left.mean == pytest.approx(values.mean())
+        assert left.std == pytest.approx(values.std(ddof=1))
+
+    def test_quantile_sketch_accuracy(self):
+        """Test quantile accuracy after the sketch starts compacting."""
+        values = np.random.default_rng(1).uniform(0, 1000, 200_000)
+        sketch = QuantileSketch(k=512)
+        for chunk in np.array_split(values, 20):
+            sketch.update(chunk)
+
+        assert not sketch.is_exact
+        estimates = sketch.quantiles([0.25, 0.5, 0.75])
+        for estimate, expected in zip(estimates, np.quantile(values, [0.25, 0.5, 0.75])):
+            assert estimate == pytest.approx(expected, abs=20)
+
+    def test_distinct_counter_exact_then_approximate(self):
+        """Test exact counting under the limit and HLL accuracy above it."""
+        small = DistinctCounter()
+        small.update(pd.Series(["a", "b", "a", "c"]))
+        assert small.is_exact and small.count() == 3
+
+        left, right = DistinctCounter(), DistinctCounter()
+        left.update(pd.Series([f"v{i}" for i in range(30_000)]))
+        right.update(pd.Series([f"v{i}" for i in range(20_000, 50_000)]))
+        left.merge(right)
+
+        assert not left.is_exact
+        assert left.count() == pytest.approx(50_000, rel=0.05)
+
+    def test_heavy_hitters_keep_frequent_values(self):
+        """Test that frequent values survive capacity reductions."""
+        rng = np.random.default_rng(2)
+        values = pd.Series(np.concatenate([
+            np.repeat(["hot", "warm"], [5000, 3000]),
+            np.array([f"cold{i}" for i in rng.integers(0, 20_000, 20_000)]),
+        ]))
+        summary = HeavyHitters(capacity=64)
+        shuffled = values.sample(frac=1, random_state=3)
+        for start in range(0, len(shuffled), 2800):
+            summary.update(shuffled.iloc[start:start + 2800])
+
+        top = dict(summary.top(2))
+        assert list(top) == ["hot", "warm"]
+        assert 5000 - summary.error <= top["hot"] <= 5000
+
+    def test_hash_values_is_deterministic(self):
+        """Test that hashing is stable across calls."""
+        values = pd.Series(["x", "y"])
+        assert (hash_values(values) == hash_values(values.copy())).all()
+
+
+class TestStreamingProfiler:
+    """Tests for profile_csv_streaming."""
+
+    def test_matches_full_pandas_analysis(self, mixed_csv):
+        """Test that a chunked profile matches pandas on a small file."""
+        df = pd.read_csv(mixed_csv)
+        metadata = profile_csv_streaming(str(mixed_csv), chunk_rows=128)
+
+        assert metadata["row_count"] == len(df)
+        assert metadata["columns"] == df.columns.tolist()
+        assert metadata["dtypes"] == {col: str(dtype) for col, dtype in df.dtypes.items()}
+        assert metadata["missing_values"] == {"discount": int(df["discount"].isna().sum())}
+        assert metadata["profile_info"]["exact"] is True
+
+        described = df["amount"].describe()
+        stats = metadata["statistics"]["amount"]
+        for key in ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]:
+            assert stats[key] == pytest.approx(round(float(described[key]), 2))
+
+        vendor = metadata["categorical_info"]["vendor"]
+        assert vendor["unique_count"] == 4
+        assert vendor["top_values"] == df["vendor"].value_counts().head(5).to_dict()
+        assert metadata["unique_counts"]["id"] == len(df)
+
+    def test_sample_data_is_typed(self, mixed_csv):
+        """Test that sample rows use the inferred column types."""
+        metadata = profile_csv_streaming(str(mixed_csv))
+        expected = pd.read_csv(mixed_csv).head(5).to_dict(orient="records")
+
+        first = metadata["sample_data"][0]
+        assert len(metadata["sample_data"]) == 5
+        assert first["id"] == expected[0]["id"] and isinstance(first["id"], int)
+        assert first["active"] is expected[0]["active"]
+
+    def test_column_turning_textual_late(self, tmp_path):
+        """Test that a non-numeric value after the first chunk demotes the column."""
+        path = tmp_path / "late.csv"
+        path.write_text("code\n" + "\n".join(str(i) for i in range(300)) + "\nN/A-CODE\n")
+
+        metadata = profile_csv_streaming(str(path), chunk_rows=100)
+
+        assert metadata["dtypes"]["code"] == "object"
+        assert "code" not in metadata["statistics"]
+        assert metadata["categorical_info"]["code"]["unique_count"] == 301
+
+    def test_header_only_file(self, tmp_path):
+        """Test profiling a file with a header but no rows."""
+        path = tmp_path / "empty_rows.csv"
+        path.write_text("a,b\n")
+
+        metadata = profile_csv_streaming(str(path))
+
+        assert metadata["columns"] == ["a", "b"]
+        assert metadata["row_count"] == 0
+
+    def test_builder_state_round_trip(self, mixed_csv):
+        """Test that a serialized builder merges like the original."""
+        chunks = list(pd.read_csv(mixed_csv, dtype=str, chunksize=400))
+        head, tail = CSVProfileBuilder(), CSVProfileBuilder()
+        head.update(chunks[0])
+        for chunk in chunks[1:]:
+            tail.update(chunk)
+
+        restored = CSVProfileBuilder.from_state(head.to_state())
+        restored.merge(tail)
+        merged = restored.to_metadata(str(mixed_csv))
+        direct = profile_csv_streaming(str(mixed_csv), chunk_rows=400)
+
+        assert merged["row_count"] == direct["row_count"]
+        assert merged["statistics"] == direct["statistics"]
+        assert merged["unique_counts"] == direct["unique_counts"]
+
+
+class TestSampleProfile:
+    """Tests for the fast sampling profile mode."""
+
+    def test_count_rows_quote_and_blank_line_aware(self, tmp_path):
+        """Test that quoted newlines, blank lines and CRLF are handled like pandas."""
+        path = tmp_path / "quoted.csv"
+        path.write_bytes(
+            b'id,note\r\n1,"multi\r\nline"\r\n\r\n2,"say ""hi""\nthere"\r\n3,plain'
+        )
+
+        assert count_csv_rows(str(path), block_size=7) == (len(pd.read_csv(path)), True)
+
+    def test_count_rows_extrapolates_past_deadline(self, mixed_csv):
+        """Test that an expired deadline yields an estimated count."""
+        rows, exact = count_csv_rows(str(mixed_csv), deadline=0.0, block_size=4096)
+
+        assert exact is False
+        assert rows == pytest.approx(1000, rel=0.1)
+
+    def test_small_file_sample_is_complete(self, mixed_csv):
+        """Test that a file read completely within budget is not marked approximate."""
+        metadata = profile_csv_sample(str(mixed_csv), sample_rows=5000)
+
+        assert metadata["row_count"] == 1000
+        assert metadata["profile_info"]["mode"] == "sample"
+        assert metadata["profile_info"]["exact"] is True
+        assert metadata["profile_info"]["missing_pct_margin"] == 0.0
+
+    def test_budget_exceeded_uses_windows_across_file(self, mixed_csv):
+        """Test sampling with an exhausted budget still spans the file."""
+        metadata = profile_csv_sample(
+            str(mixed_csv), time_budget=0.0, sample_rows=50, chunk_rows=100
+        )
+        info = metadata["profile_info"]
+
+        assert metadata["row_count"] == 1000
+        assert info["row_count_exact"] is True
+        assert info["exact"] is False
+        assert 0 < info["sample_rows"] <= 50
+        assert info["missing_pct_margin"] > 0
+        assert set(info["mean_margins"]) == set(metadata["statistics"])
+        assert metadata["dtypes"]["vendor"] == "object"
+
+    def test_sampled_estimates_cover_file(self, tmp_path):
+        """Test that memory and read options of a sample hold for the whole file."""
+        rng = np.random.default_rng(3)
+        n = 20_000
+        rare = np.full(n, None, dtype=object)
+        rare[rng.choice(n, 5, replace=False)] = "x"
+        path = tmp_path / "ledger.csv"
+        pd.DataFrame({
+            "doc": np.arange(n),
+            "vendor": rng.choice([f"V{i}" for i in range(2000)], n),
+            "currency": rng.choice(["INR", "USD"], n),
+            "rare": rare,
+        }).to_csv(path, index=False)
+
+        metadata = profile_csv_sample(str(path), time_budget=0.0, sample_rows=200, chunk_rows=1000)
+        exact = profile_csv_streaming(str(path))
+
+        assert metadata["profile_info"]["exact"] is False
+        assert metadata["memory_estimate"]["frame_mb"] >= exact["memory_estimate"]["frame_mb"]
+        assert metadata["memory_estimate"]["peak_mb"] >= exact["memory_estimate"]["peak_mb"]
+        assert metadata["read_options"]["usecols"] is None
+        assert metadata["read_options"]["dtype"] == {}
+
+    def test_analyze_csv_sample_prefers_stored_exact_profile(self, mixed_csv):
+        """Test that an already stored exact profile is returned as-is."""
+        analyze_csv_structure(str(mixed_csv))
+
+        metadata = analyze_csv_sample(str(mixed_csv), time_budget=0.0)
+
+        assert metadata["profile_info"]["mode"] == "streaming"
+
+    def test_first_look_flags_approximate_profiles(self, mixed_csv, monkeypatch):
+        """Test that the first-look summary marks sampled numbers."""
+        from ira_builder.tools import csv_tools
+
+        def tiny_sample(filepath, time_budget, sample_rows):
+            return profile_csv_sample(filepath, time_budget=0.0, sample_rows=50, chunk_rows=100)
+
+        monkeypatch.setattr(csv_tools, "profile_csv_sample", tiny_sample)
+
+        summary = get_csv_first_look([str(mixed_csv)])
+
+        assert "Profile: APPROXIMATE" in summary
+        assert "Rows: 1,000" in summary
+        assert summarize_csv_samples([str(mixed_csv)]) == (summary, True)
+
+        # Once the exact profile is stored there is nothing to upgrade
+        analyze_csv_structure(str(mixed_csv))
+        assert summarize_csv_samples([str(mixed_csv)])[1] is False
+
+
+class TestNumberFormats:
+    """Tests for locale-formatted numeric text."""
+
+    def test_parse_grouping_and_negative_styles(self):
+        """Test Indian and Western grouping, trailing minus, parentheses and currency."""
+        values = pd.Series(["-2,17,00,102.39", "1,234,567.00", "1,500.00-", "(250.00)", "₹ 1,200", "3,450"])
+
+        numbers = parse_formatted_numbers(values)
+
+        assert numbers.tolist() == [-21700102.39, 1234567.0, -1500.0, -250.0, 1200.0, 3450.0]
+
+    def test_fast_path_reports_format(self):
+        """Test the plain-digit fast path and the features it records."""
+        array, is_integer, number_format = parse_number_text(pd.Series(["12,34,567", "8,900-"]))
+
+        assert array.tolist() == [1234567.0, -8900.0]
+        assert is_integer is True
+        assert number_format.describe() == "Indian (lakh/crore) grouping, trailing minus"
+
+    def test_rejects_text_and_european_decimals(self):
+        """Test that text and "1.234,56" style values are not numbers."""
+        assert parse_number_text(pd.Series(["1,200", "approx 5"])) is None
+        assert parse_number_text(pd.Series(["1.234,56"])) is None
+
+    def test_streamed_formatted_column_is_numeric(self, tmp_path):
+        """Test that a formatted amount column keeps its loaded dtype and gets numeric statistics."""
+        path = tmp_path / "fbl3n.csv"
+        rows = ["doc,amount"]
+        rows += [f'{i},"{i % 99 + 1},00,000.50"' for i in range(1, 150)]
+        rows += ['150,"7,500.00-"']
+        path.write_text("\n".join(rows) + "\n")
+
+        metadata = profile_csv_streaming(str(path), chunk_rows=40)
+
+        # pandas loads the column as text
+        assert metadata["dtypes"]["amount"] == "object"
+        assert str(pd.read_csv(path, low_memory=False)["amount"].dtype) == "object"
+        assert metadata["sample_data"][0]["amount"] == "2,00,000.50"
+        assert "amount" in metadata["type_summary"]["numerical"]
+        assert "amount" not in metadata["categorical_info"]
+        assert metadata["statistics"]["amount"]["min"] == -7500.0
+        assert metadata["statistics"]["amount"]["max"] == 9900000.5
+        formats = metadata["numeric_formats"]["amount"]
+        assert formats["indian_grouping"] is True
+        assert formats["trailing_minus"] is True
+        assert "doc" not in metadata["numeric_formats"]
+
+    def test_coerce_column_parses_formatted_values(self):
+        """Test that sample values of formatted columns are converted too."""
+        column = coerce_column(pd.Series(["1,500.00-", "2,17,00,102.39", None]), "float64")
+
+        assert column.tolist()[:2] == [-1500.0, 21700102.39]
+        assert np.isnan(column.iloc[2])
+
+
+class TestDateFormats:
+    """Tests for date format inference."""
+
+    def test_infers_day_first_and_month_first(self):
+        """Test that unambiguous values pick the matching layout."""
+        day_first = infer_date_format(pd.Series(["31-03-2023", "01-04-2023", None]))
+        month_first = infer_date_format(pd.Series(["12/31/2023 14:05", "01/15/2024 09:30"]))
+
+        assert day_first["format"] == "%d-%m-%Y"
+        assert day_first["confidence"] == 1.0
+        assert month_first["format"] == "%m/%d/%Y %H:%M"
+
+    def test_ambiguous_and_non_date_values(self):
+        """Test the day/month guess lowers confidence and text is rejected."""
+        ambiguous = infer_date_format(pd.Series(["01/02/2023", "03/04/2023"]))
+
+        assert ambiguous["format"] == "%d/%m/%Y"
+        assert ambiguous["ambiguous"] is True
+        assert ambiguous["confidence"] == 0.5
+        assert infer_date_format(pd.Series(["Vendor A", "Vendor B"])) is None
+
+    def test_streamed_date_column_in_metadata(self, tmp_path):
+        """Test that date columns are reported with their format across chunks."""
+        path = tmp_path / "postings.csv"
+        rows = ["doc,posted,vendor"]
+        rows += [f"{i},{i % 28 + 1:02d}.{i % 12 + 1:02d}.2023,V{i}" for i in range(300)]
+        path.write_text("\n".join(rows) + "\n")
+
+        metadata = profile_csv_streaming(str(path), chunk_rows=40)
+
+        assert metadata["dtypes"]["posted"] == "object"
+        assert metadata["date_formats"]["posted"]["format"] == "%d.%m.%Y"
+        assert metadata["date_formats"]["posted"]["sample_size"] == 200
+        assert set(metadata["date_formats"]) == {"posted"}
+        assert metadata["type_summary"]["datetime"] == ["posted"]
+
+
+class TestReadOptions:
+    """Tests for the read_csv options recommended from a profile."""
+
+    def test_recommended_options(self, tmp_path):
+        n = 400
+        path = tmp_path / "ledger.csv"
+        pd.DataFrame({
+            "Document Number": np.arange(n) + 5_000_000,
+            "Posting Key": np.arange(n) % 3 + 40,
+            "Local Currency": np.where(np.arange(n) % 4 == 0, "USD", "INR"),
+            "Posting Date": [f"{d % 28 + 1:02d}-03-2023" for d in range(n)],
+            "Amount": [f"{i * 1000:,}.50" for i in range(n)],
+            "Cleared": np.where(np.arange(n) % 2 == 0, "True", "False"),
+            "Text": [f"Invoice {i}" for i in range(n)],
+            "Asset": [None] * n,
+        }).to_csv(path, index=False)
+
+        options = profile_csv_streaming(str(path))["read_options"]
+
+        # Formatted amounts stay text, booleans and unique text are untouched
+        assert options["dtype"] == {
+            "Document Number": "int32",
+            "Posting Key": "int8",
+            "Local Currency": "category",
+        }
+        assert options["parse_dates"] == ["Posting Date"]
+        assert options["date_format"] == {"Posting Date": "%d-%m-%Y"}
+        assert "Asset" not in options["usecols"]
+
+        df = pd.read_csv(path, low_memory=False, **options)
+        assert len(df) == n
+        assert str(df["Posting Date"].dtype) == "datetime64[ns]"
@@ -216,6 +216,49 @@ class TestGetColumnDataPreview:
         assert isinstance(result["null_count"], int)
 
 
+class TestColumnPreviewProjection:
+    """Tests for column-projected reads in get_column_data_preview."""
+
+    @pytest.fixture
+    def ledger_csv(self, tmp_path):
+        path = tmp_path / "ledger.csv"
+        rows = ["doc,Text,amount,Text"]
+        rows += [f"{i},item {i % 7},{i * 1.5},{'' if i % 4 else 'note'}" for i in range(500)]
+        path.write_text("\n".join(rows) + "\n")
+        return path
+
+    def test_scan_without_stored_profile(self, ledger_csv):
+        """Test counts from a single-column scan when no profile is stored."""
+        result = get_column_data_preview(str(ledger_csv), "Text", num_samples=3)
+
+        assert result["stats_source"] == "column_scan"
+        assert result["samples"] == ["item 0", "item 1", "item 2"]
+        assert result["unique_count"] == 7
+        assert result["null_count"] == 0
+        assert result["total_count"] == 500
+
+    def test_counts_from_stored_profile(self, ledger_csv, monkeypatch):
+        """Test that counts come from the stored profile without a full scan."""
+        from ira_builder.tools import csv_tools
+
+        analyze_csv_structure(str(ledger_csv))
+        monkeypatch.setattr(csv_tools, "_scan_column", None)
+
+        result = get_column_data_preview(str(ledger_csv), "amount", num_samples=2)
+
+        assert result["stats_source"] == "profile_store"
+        assert result["dtype"] == "float64"
+        assert result["samples"] == [0.0, 1.5]
+        assert result["unique_count"] == 500
+
+    def test_duplicate_header_column(self, ledger_csv):
+        """Test previewing the second of two columns sharing a header."""
+        result = get_column_data_preview(str(ledger_csv), "Text.1", num_samples=2)
+
+        assert result["samples"] == ["note", "note"]
+        assert result["null_count"] == 375
+
+
 class TestCompareCSVSchemas:
     """Tests for compare_csv_schemas function."""
 
@@ -0,0 +1,88 @@
+"""
+Unit tests for the data quality engine.
+
+Tests the single-pass statistics, chunked duplicate detection and the
+pluggable check registry.
+"""
+
+import pytest
+
+from ira_builder.tools import data_quality
+from ira_builder.tools.data_quality import (
+    collect_quality_stats,
+    get_quality_checks,
+    register_quality_check,
+    run_quality_checks,
+)
+
+
+@pytest.fixture
+def messy_csv(tmp_path):
+    """Write a CSV with duplicates, empty, sparse, constant and date columns."""
+    rows = ["id,region,empty,sparse,posted"]
+    for i in range(38):
+        sparse = "x" if i % 5 == 0 else ""
+        rows.append(f"{i},EU,,{sparse},2024-01-{(i % 28) + 1:02d}")
+    # Repeat the first two data rows at the end of the file
+    rows += rows[1:3]
+    path = tmp_path / "messy.csv"
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+class TestCollectQualityStats:
+    """Tests for collect_quality_stats."""
+
+    def test_duplicates_across_chunks(self, messy_csv):
+        """Test that duplicate rows are found across chunk boundaries."""
+        stats = collect_quality_stats(str(messy_csv), chunk_rows=7)
+
+        assert stats.row_count == 40
+        assert stats.duplicate_rows == 2
+
+    def test_null_and_constant_columns(self, messy_csv):
+        """Test null counts and constant column detection."""
+        stats = collect_quality_stats(str(messy_csv), chunk_rows=7)
+
+        assert stats.null_counts["empty"] == 40
+        assert stats.null_counts["sparse"] == 31
+        # All-missing columns have no value at all, so they aren't constant
+        assert stats.constant_columns == ["region", "sparse"]
+
+
+class TestRunQualityChecks:
+    """Tests for run_quality_checks."""
+
+    def test_reports_issues_and_timings(self, messy_csv):
+        """Test the issues found and the per-check timings."""
+        result = run_quality_checks(str(messy_csv))
+
+        types = [(issue["type"], issue.get("column")) for issue in result["issues"]]
+        assert types == [
+            ("duplicate_rows", None),
+            ("empty_column", "empty"),
+            ("high_missing_values", "sparse"),
+            ("constant_column", "region"),
+            ("constant_column", "sparse"),
+            ("unparsed_dates", "posted"),
+        ]
+        assert set(result["timings_ms"]) == {"scan", *get_quality_checks()}
+        assert result["issues"][-1]["date_format"] == "%Y-%m-%d"
+
+    def test_custom_check_and_selection(self, messy_csv, monkeypatch):
+        """Test registering a check and running a subset of checks."""
+        monkeypatch.setattr(data_quality, "_QUALITY_CHECKS", dict(data_quality._QUALITY_CHECKS))
+
+        @register_quality_check("too_few_rows")
+        def check_too_few_rows(stats):
+            return [{"type": "too_few_rows", "severity": "low"}] if stats.row_count < 100 else []
+
+        result = run_quality_checks(str(messy_csv), checks=["too_few_rows"])
+
+        assert [issue["type"] for issue in result["issues"]] == ["too_few_rows"]
+        assert set(result["timings_ms"]) == {"scan", "too_few_rows"}
+
+    def test_unknown_check(self, messy_csv):
+        """Test that unknown check names are rejected."""
+        with pytest.raises(ValueError):
+            run_quality_checks(str(messy_csv), checks=["no_such_check"])
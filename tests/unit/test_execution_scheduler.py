@@ -0,0 +1,82 @@
+"""
+Unit tests for the execution scheduler.
+
+Tests that executions beyond the CPU slots wait, that waiting executions
+are admitted interactive first and fairly across tenants, and that the
+queue and wait time metrics are reported.
+"""
+
+import asyncio
+
+import pytest
+
+from ira_builder.exceptions.errors import ExecutionException
+from ira_builder.tools.execution_scheduler import PRIORITY_INTERACTIVE, ExecutionScheduler
+from ira_builder.tools.memory_admission import MB
+
+
+@pytest.fixture
+def scheduler():
+    """Single-slot scheduler with a 100 MB budget that polls quickly."""
+    return ExecutionScheduler(budget_bytes=100 * MB, cpu_slots=1, poll_interval=0.01)
+
+
+async def _hold(scheduler, order, name, hold=0.05, **kwargs):
+    async with scheduler.admit(10 * MB, **kwargs):
+        order.append(name)
+        await asyncio.sleep(hold)
+
+
+class TestExecutionScheduler:
+    """Tests for CPU slots and the order of admission."""
+
+    async def test_cpu_slots(self):
+        scheduler = ExecutionScheduler(budget_bytes=100 * MB, cpu_slots=2, poll_interval=0.01)
+        running, peak = 0, 0
+
+        async def run():
+            nonlocal running, peak
+            async with scheduler.admit(1 * MB):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.03)
+                running -= 1
+
+        await asyncio.gather(*(run() for _ in range(5)))
+
+        assert peak == 2
+        stats = scheduler.stats()
+        assert stats["admitted"] == 5 and stats["running"] == 0 and stats["waiting"] == 0
+        assert stats["wait_seconds"]["max"] >= 0.05
+
+    async def test_priority_and_fair_order(self, scheduler):
+        order = []
+        first = asyncio.ensure_future(_hold(scheduler, order, "a1", tenant="a"))
+        await asyncio.sleep(0.005)
+
+        # Tenant a queues three retries before b and c queue one run each
+        waiting = [
+            asyncio.ensure_future(_hold(scheduler, order, name, tenant=name[0]))
+            for name in ("a2", "a3", "b1", "c1")
+        ]
+        waiting.append(asyncio.ensure_future(
+            _hold(scheduler, order, "b-refine", tenant="b", priority=PRIORITY_INTERACTIVE)
+        ))
+        await asyncio.sleep(0.005)
+
+        stats = scheduler.stats()
+        assert stats["waiting"] == 5
+        assert stats["waiting_by_priority"] == {"batch": 4, "interactive": 1}
+        assert stats["waiting_by_tenant"] == {"a": 2, "b": 2, "c": 1}
+
+        await asyncio.gather(first, *waiting)
+        assert order == ["a1", "b-refine", "c1", "a2", "b1", "a3"]
+
+    async def test_timeout_leaves_queue(self, scheduler):
+        async with scheduler.admit(10 * MB):
+            with pytest.raises(ExecutionException):
+                async with scheduler.admit(10 * MB, timeout=0.05):
+                    pass
+
+        stats = scheduler.stats()
+        assert stats["timed_out"] == 1 and stats["waiting"] == 0
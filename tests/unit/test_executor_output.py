@@ -0,0 +1,154 @@
+"""
+Unit tests for streaming the output of executed code and its process tree.
+
+Tests that output lines reach the callback while the code runs, that the
+retained output is capped with the full output spilled to a log file, that
+partial output survives a timeout, and that the processes a script starts
+are killed with it while its resource usage is reported.
+"""
+
+import signal
+import time
+
+from ira_builder.executor import CodeBlock, PythonScriptExecutor
+from ira_builder.tools.code_executor_tools import stream_python_code
+
+
+async def _run(tmp_path, code, timeout=30, **kwargs):
+    executor = PythonScriptExecutor(timeout=timeout, work_dir=tmp_path / "work", **kwargs)
+    return await executor.execute_code_blocks([CodeBlock(language="python", code=code)])
+
+
+def _alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] not in ("Z", "X")
+    except FileNotFoundError:
+        return False
+
+
+class TestExecutorOutput:
+    """Tests for output streaming in PythonScriptExecutor."""
+
+    async def test_callback_receives_lines(self, tmp_path):
+        lines = []
+
+        async def collect(stream, line):
+            lines.append((stream, line))
+
+        code = "import sys\nprint('a')\nsys.stderr.write('warning\\n')\nprint('b', end='')\n"
+        result = await _run(tmp_path, code, output_callback=collect)
+
+        assert sorted(lines) == [("stderr", "warning\n"), ("stdout", "a\n"), ("stdout", "b")]
+        assert result.output == "warning\na\nb"
+        assert result.log_file is None
+
+    async def test_output_is_capped_and_spilled(self, tmp_path):
+        code = "for i in range(1000):\n    print(f'row {i:04d}')\n"
+        result = await _run(tmp_path, code, max_output_chars=100, log_dir=tmp_path / "logs")
+
+        lines = result.output.splitlines()
+        assert lines[0] == f"[... 989 earlier output lines omitted; full output: {result.log_file}]"
+        assert lines[1:] == [f"row {i:04d}" for i in range(989, 1000)]
+        with open(result.log_file) as f:
+            assert f.read().splitlines() == [f"row {i:04d}" for i in range(1000)]
+
+    async def test_long_line_is_capped(self, tmp_path):
+        code = "print('x' * 1_000_000 + 'end')\n"
+        result = await _run(tmp_path, code, max_output_chars=100, log_dir=tmp_path / "logs")
+
+        header, kept = result.output.split("\n", 1)
+        assert "characters of a long line omitted" in header and result.log_file in header
+        assert kept == "x" * 96 + "end\n"
+        with open(result.log_file) as f:
+            assert f.read() == "x" * 1_000_000 + "end\n"
+
+    async def test_carriage_return_ends_line(self, tmp_path):
+        lines = []
+
+        async def collect(stream, line):
+            lines.append(line)
+
+        code = (
+            "import sys\n"
+            "for i in range(3):\n"
+            "    sys.stdout.write(f'step {i}\\r')\n"
+            "    sys.stdout.flush()\n"
+            "print()\n"
+        )
+        result = await _run(tmp_path, code, output_callback=collect)
+
+        assert lines == ["step 0\n", "step 1\n", "step 2\n"]
+        assert result.output == "step 0\nstep 1\nstep 2\n"
+
+    async def test_timeout_keeps_partial_output(self, tmp_path):
+        code = "import time\nprint('started', flush=True)\ntime.sleep(30)\n"
+        result = await _run(tmp_path, code, timeout=2)
+
+        assert result.exit_code == 124
+        assert result.output == "started\n\nTimeout"
+
+    async def test_stream_python_code(self, tmp_path):
+        events = [event async for event in stream_python_code("print('hello')", str(tmp_path / "work"))]
+
+        assert events[0] == {"stream": "stdout", "line": "hello\n"}
+        assert events[-1]["result"]["status"] == "success"
+
+
+class TestProcessTree:
+    """Tests for process groups, limits and resource usage."""
+
+    async def test_timeout_kills_process_tree(self, tmp_path):
+        code = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            "print(child.pid, flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        result = await _run(tmp_path, code, timeout=2)
+
+        assert result.exit_code == 124
+        child = int(result.output.split()[0])
+        deadline = time.monotonic() + 5
+        while _alive(child) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not _alive(child)
+
+    async def test_leftover_processes_are_killed(self, tmp_path):
+        code = (
+            "import subprocess, sys\n"
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            "print('done')\n"
+        )
+        started = time.monotonic()
+        result = await _run(tmp_path, code, timeout=30)
+
+        assert result.exit_code == 0 and result.output == "done\n"
+        assert time.monotonic() - started < 10
+
+    async def test_resource_usage_and_cpu_limit(self, tmp_path):
+        code = (
+            "import time\n"
+            "data = bytearray(200 * 1024 * 1024)\n"
+            "end = time.process_time() + 0.6\n"
+            "while time.process_time() < end:\n"
+            "    pass\n"
+        )
+        usage = (await _run(tmp_path, code)).resource_usage
+
+        # Exact figures from wait4, including the last interval before the exit
+        assert usage["wall_seconds"] >= usage["cpu_seconds"] >= 0.6
+        assert usage["peak_rss_mb"] >= 150
+        assert usage["write_bytes"] >= 0
+
+        result = await _run(tmp_path, "while True:\n    pass\n", cpu_limit_seconds=1)
+        assert result.exit_code == -signal.SIGXCPU
+
+        # The limits hold from the script's first instruction
+        code = "import resource\nprint(resource.getrlimit(resource.RLIMIT_AS)[0] // 2**20)\n"
+        result = await _run(tmp_path, code, memory_limit_mb=4096)
+        assert result.exit_code == 0 and result.output == "4096\n"
+
+        executor = PythonScriptExecutor(timeout=30, work_dir=tmp_path / "work", memory_limit_mb=4096)
+        result = await executor.execute_code_blocks([CodeBlock(language="bash", code="ulimit -v\n")])
+        assert result.exit_code == 0 and result.output == f"{4096 * 1024}\n"
@@ -0,0 +1,196 @@
+"""
+Unit tests for the pool of warm interpreters.
+
+Tests that code blocks forked from pool workers give the same results as
+new interpreters, that workers are recycled and replaced, that retries get
+their inputs from the workers' cache or resume from PART 2 checkpoints, and
+that profiled runs report their hot spots.
+"""
+
+import signal
+
+import pandas as pd
+import pytest
+
+from ira_builder.executor import CodeBlock, PythonScriptExecutor
+from ira_builder.executor.interpreter_pool import POOL_SUPPORTED, InterpreterPool
+
+pytestmark = pytest.mark.skipif(not POOL_SUPPORTED, reason="interpreter pool needs os.fork")
+
+
+@pytest.fixture
+def pool():
+    """Start a single-worker pool that recycles its worker after two runs."""
+    pool = InterpreterPool(size=1, max_runs=2)
+    yield pool
+    pool.shutdown()
+
+
+async def _run(pool, tmp_path, code, timeout=30, checkpoint_key=None):
+    executor = PythonScriptExecutor(
+        timeout=timeout, work_dir=tmp_path, interpreter_pool=pool, checkpoint_key=checkpoint_key
+    )
+    return await executor.execute_code_blocks([CodeBlock(language="python", code=code)])
+
+
+def _parts(part2, part3):
+    """Build a script in the generated three-part layout."""
+    return (
+        "# PART 1: IMPORT LIBRARIES & FILE PATH VARIABLES\n"
+        "import pandas as pd\n"
+        "# PART 2: LOAD DATAFRAMES & IRA PREPROCESSING\n"
+        f"{part2}\n"
+        "# ============================================================================\n"
+        "# PART 3: BUSINESS LOGIC\n"
+        "# ============================================================================\n"
+        f"{part3}\n"
+    )
+
+
+class TestInterpreterPool:
+    """Tests for running code blocks in pooled interpreters."""
+
+    async def test_results_match_new_interpreter(self, pool, tmp_path):
+        code = (
+            "import os, sys\n"
+            "print(os.getcwd(), os.environ.get('IRA_POOL_TEST'))\n"
+            "sys.stderr.write('warning\\n')\n"
+            "sys.exit(3)\n"
+        )
+        pooled = await _run(pool, tmp_path, code)
+        fresh = await _run(None, tmp_path, code)
+
+        assert pooled.exit_code == fresh.exit_code == 3
+        assert pooled.output == fresh.output
+        assert pool.stats()["runs"] == 1
+
+    async def test_timeout_and_recycling(self, pool, tmp_path):
+        result = await _run(pool, tmp_path, "import time\ntime.sleep(30)", timeout=1)
+        assert result.exit_code == 124
+
+        # The worker survived the killed run; its second run recycles it
+        result = await _run(pool, tmp_path, "print('ok')")
+        assert result.exit_code == 0 and result.output.strip() == "ok"
+
+        stats = pool.stats()
+        assert stats["runs"] == 2
+        assert stats["recycled"] == 1
+        assert stats["idle"] == 1
+
+    async def test_resource_limits_and_usage(self, pool, tmp_path):
+        executor = PythonScriptExecutor(timeout=30, work_dir=tmp_path, interpreter_pool=pool, cpu_limit_seconds=1)
+        result = await executor.execute_code_blocks([CodeBlock(language="python", code="while True:\n    pass\n")])
+
+        assert result.exit_code == -signal.SIGXCPU
+        assert result.resource_usage["cpu_seconds"] >= 0.9
+        assert pool.stats()["runs"] == 1
+
+    async def test_checkpoint_size_limit(self, tmp_path):
+        """Test that a PART 1-2 state larger than checkpoint_mb is not kept."""
+        pool = InterpreterPool(size=1, max_runs=10, checkpoint_mb=8)
+        code = _parts("import numpy as np\nblob = np.ones(4 * 1024 * 1024)", "print(len(blob))")
+        try:
+            for _ in range(2):
+                result = await _run(pool, tmp_path, code, checkpoint_key="inputs")
+                assert result.output.strip() == str(4 * 1024 * 1024)
+            assert pool.stats()["resumed"] == 0
+        finally:
+            pool.shutdown()
+
+    async def test_profiled_run(self, pool, tmp_path):
+        code = _parts(
+            "df = pd.DataFrame({'a': range(1000)})",
+            "def double(values):\n"
+            "    return [v * 2 for v in values]\n"
+            "big = double(list(range(200000)))\n"
+            "print(len(big))",
+        )
+        for interpreter_pool in (pool, None):
+            executor = PythonScriptExecutor(
+                timeout=60, work_dir=tmp_path, interpreter_pool=interpreter_pool, checkpoint_key="wf", profile=True
+            )
+            result = await executor.execute_code_blocks([CodeBlock(language="python", code=code)])
+            assert result.exit_code == 0 and result.output.strip() == "200000"
+
+            profile = result.profile
+            assert profile["functions"][0]["file"].startswith(str(tmp_path))
+            assert {line["code"] for line in profile["lines"][:2]} == {
+                "return [v * 2 for v in values]", "big = double(list(range(200000)))"
+            }
+            assert profile["memory"]["peak_lines"][0]["peak_alloc_mb"] > 1
+            assert not list(tmp_path.glob("*.profile.json"))
+
+        # Profiled runs don't resume from checkpoints
+        assert pool.stats()["resumed"] == 0
+
+    async def test_crashed_worker_is_replaced(self, pool, tmp_path):
+        worker = pool._idle[0]
+        worker.process.kill()
+        worker.process.wait()
+
+        result = await _run(pool, tmp_path, "print('ok')")
+
+        assert result.exit_code == 0 and result.output.strip() == "ok"
+        assert pool.stats()["replaced"] == 1
+
+    async def test_input_cache(self, tmp_path):
+        """Test that retries get cached inputs, isolated from each other's changes."""
+        pool = InterpreterPool(size=1, max_runs=10, input_cache_mb=16)
+        path = tmp_path / "input.csv"
+        pd.DataFrame({"amount": [1, 2, 3], "vendor": ["a", "b", "c"]}).to_csv(path, index=False)
+        code = (
+            "import pandas as pd, sidecar_harness\n"
+            f"df = pd.read_csv({str(path)!r}, low_memory=False)\n"
+            f"again = pd.read_csv({str(path)!r}, low_memory=False)\n"
+            "df['amount'] *= 10\n"
+            "print(len(sidecar_harness.READ_CACHE), again['amount'].sum())\n"
+        )
+        try:
+            assert (await _run(pool, tmp_path, code)).output.split() == ["0", "6"]
+
+            # The worker doesn't parse the inputs again after a run; runs in
+            # another directory aren't announced them
+            other = tmp_path / "other"
+            other.mkdir()
+            probe = "import sidecar_harness\nprint(len(sidecar_harness.READ_CACHE))\n"
+            assert (await _run(pool, other, probe)).output.split() == ["0"]
+
+            outputs = [(await _run(pool, tmp_path, code)).output.split() for _ in range(2)]
+            assert outputs == [["1", "6"], ["1", "6"]]
+
+            # A changed file is read again
+            pd.DataFrame({"amount": [5], "vendor": ["d"]}).to_csv(path, index=False)
+            assert (await _run(pool, tmp_path, code)).output.split() == ["1", "5"]
+        finally:
+            pool.shutdown()
+
+    async def test_checkpointed_runs(self, pool, tmp_path):
+        """Test that retries with the same PART 1-2 only run PART 3."""
+        pool.max_runs = 10
+        part2 = (
+            "with open('part2_runs.txt', 'a') as f:\n"
+            "    f.write('x')\n"
+            "df = pd.DataFrame({'amount': [1, 2, 3]})\n"
+            "print('loaded')"
+        )
+        runs = [
+            await _run(pool, tmp_path, _parts(part2, part3), checkpoint_key="inputs")
+            for part3 in ("print(df['amount'].sum())", "df = df.head(1)\nprint(len(df))", "df['missing']")
+        ]
+        again = await _run(pool, tmp_path, _parts(part2, "print(len(df))"), checkpoint_key="inputs")
+
+        assert [run.output.split() for run in runs[:2]] == [["loaded", "6"], ["loaded", "1"]]
+        assert runs[2].exit_code == 1 and "line 11" in runs[2].output and "KeyError" in runs[2].output
+        assert again.output.split() == ["loaded", "3"]
+        assert (tmp_path / "part2_runs.txt").read_text() == "x"
+        assert pool.stats()["resumed"] == 3
+
+        # A changed PART 2 runs again; a failing one reports its own error
+        changed = await _run(pool, tmp_path, _parts(part2 + "\ndf['amount'] *= 2", "print(df['amount'].sum())"),
+                             checkpoint_key="inputs")
+        failed = await _run(pool, tmp_path, _parts("raise ValueError('bad input')", "print('unreachable')"),
+                            checkpoint_key="inputs")
+
+        assert changed.output.split() == ["loaded", "12"]
+        assert (tmp_path / "part2_runs.txt").read_text() == "xx"
+        assert failed.exit_code == 1 and "bad input" in failed.output and "unreachable" not in failed.output
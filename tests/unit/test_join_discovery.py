@@ -0,0 +1,140 @@
+"""
+Unit tests for join key discovery.
+
+Tests the bottom-k value sketches and the ranking of key pairs across files
+whose key columns have different names and formatting.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ira_builder.tools.code_executor_tools import check_merge_cardinality
+from ira_builder.tools.csv_tools import (
+    analyze_csv_structure,
+    compare_csv_schemas,
+    discover_join_keys,
+    estimate_join_cardinality,
+)
+from ira_builder.tools.join_discovery import normalize_keys
+from ira_builder.tools.sketches import KeySketch, hash_values
+
+
+@pytest.fixture
+def ledger_and_vendors(tmp_path):
+    """Write a ledger referencing vendors by zero-padded number, and a vendor master."""
+    ledger = tmp_path / "FBL3N.csv"
+    rows = ["Document Number,Supplier,Amount,Company Code"]
+    for i in range(600):
+        rows.append(f"{900000 + i},{(i % 150) + 100000:010d},{i * 1.5},1000")
+    ledger.write_text("\n".join(rows) + "\n")
+
+    vendors = tmp_path / "vendor_master.csv"
+    rows = ["Vendor No,Vendor Name,City"]
+    for i in range(200):
+        rows.append(f"{100000 + i},Vendor {i},City {i % 7}")
+    vendors.write_text("\n".join(rows) + "\n")
+    return str(ledger), str(vendors)
+
+
+class TestKeySketch:
+    """Tests for KeySketch."""
+
+    def test_exact_containment_for_small_sets(self):
+        """Test that sets smaller than k give exact containment."""
+        small, large = KeySketch(k=64), KeySketch(k=64)
+        small.update_hashes(hash_values(pd.Series([str(i) for i in range(20)])))
+        large.update_hashes(hash_values(pd.Series([str(i) for i in range(10, 50)])))
+
+        assert small.containment(large, 20, 40) == pytest.approx(0.5)
+
+    def test_estimated_containment_and_merge(self):
+        """Test the estimate past capacity and that merging equals one sketch."""
+        subset = hash_values(pd.Series([str(i) for i in range(2000)]))
+        superset = hash_values(pd.Series([str(i) for i in range(8000)]))
+        halves = KeySketch(), KeySketch()
+        halves[0].update_hashes(subset[:1000])
+        halves[1].update_hashes(subset[1000:])
+        halves[0].merge(halves[1])
+        whole = KeySketch()
+        whole.update_hashes(superset)
+
+        assert np.array_equal(halves[0].hashes, np.sort(subset)[:256])
+        assert halves[0].containment(whole, 2000, 8000) == pytest.approx(1.0, abs=0.15)
+
+    def test_normalize_keys(self):
+        """Test whitespace, case and leading-zero normalization."""
+        keys = normalize_keys(pd.Series(["0000100234", " v-12 ", "000", "0A1"]))
+
+        assert keys.tolist() == ["100234", "V-12", "0", "0A1"]
+        assert normalize_keys(pd.Series(["100234", "V-12"])) is None
+
+
+class TestDiscoverJoinKeys:
+    """Tests for discover_join_keys and compare_csv_schemas."""
+
+    def test_finds_differently_named_key(self, ledger_and_vendors):
+        """Test that Supplier -> Vendor No ranks first despite zero padding."""
+        candidates = discover_join_keys(list(ledger_and_vendors))
+
+        best = candidates[0]
+        assert (best["from_column"], best["to_column"]) == ("Supplier", "Vendor No")
+        assert best["containment"] == pytest.approx(1.0, abs=0.1)
+        assert best["to_uniqueness"] == 1.0
+        assert all(c["from_column"] != "Company Code" for c in candidates)
+
+    def test_compare_csv_schemas_reports_candidates(self, ledger_and_vendors):
+        """Test that schema comparison includes value-based candidates."""
+        result = compare_csv_schemas(list(ledger_and_vendors))
+
+        assert result["common_columns"] == []
+        assert result["schema_compatibility"] is True
+        assert result["join_candidates"][0]["to_column"] == "Vendor No"
+        assert "key_sketches" not in analyze_csv_structure(ledger_and_vendors[0])
+
+
+class TestJoinCardinality:
+    """Tests for join size estimates and the pre-execution merge check."""
+
+    def test_exact_estimate_for_small_files(self, ledger_and_vendors):
+        """Test a many-to-one estimate when every key is in the sketches."""
+        ledger, vendors = ledger_and_vendors
+
+        estimate = estimate_join_cardinality(ledger, "Supplier", vendors, "Vendor No")
+
+        assert estimate["exact"] is True
+        assert estimate["estimated_rows"] == 600
+        assert estimate["relationship"] == "many-to-one"
+        assert estimate["left_keys"]["max"] == 4
+
+    def test_estimated_many_to_many_join(self, tmp_path):
+        """Test the estimate of a join past the sketch capacity."""
+        left, right = tmp_path / "left.csv", tmp_path / "right.csv"
+        left.write_text("k\n" + "\n".join(str(i % 1000) for i in range(20000)) + "\n")
+        right.write_text("k\n" + "\n".join(str(i % 1000) for i in range(5000)) + "\n")
+
+        estimate = estimate_join_cardinality(str(left), "k", str(right), "k")
+
+        assert estimate["exact"] is False
+        assert estimate["estimated_rows"] == pytest.approx(100_000, rel=0.2)
+        assert estimate["relationship"] == "many-to-many"
+
+    def test_merge_check_flags_exploding_merge(self, ledger_and_vendors):
+        """Test that merges traced to input files are estimated and flagged."""
+        code = """
+import pandas as pd
+ledger_path = csv_files[0]
+df_ledger = pd.read_csv(ledger_path, low_memory=False)
+df_vendors = pd.read_csv(csv_files[1])
+df_open = df_ledger[df_ledger['Amount'] > 10].copy()
+lookup = df_open.merge(df_vendors, left_on='Supplier', right_on='Vendor No', how='left')
+pairs = pd.merge(df_ledger, df_ledger, on='Company Code')
+"""
+        result = check_merge_cardinality(code, list(ledger_and_vendors))
+
+        lookup, pairs = result["merges"]
+        assert (lookup["left_file"], lookup["right_column"], lookup["flagged"]) == ("FBL3N.csv", "Vendor No", False)
+        assert pairs["estimated_rows"] == 360_000
+        assert pairs["flagged"] is True
+        assert result["valid"] is False
+        assert result["issues"][0].startswith("Line 8:")
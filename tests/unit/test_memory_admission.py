@@ -0,0 +1,126 @@
+"""
+Unit tests for memory estimates and execution admission control.
+
+Tests the load memory estimate derived from CSV profiles and that
+executions beyond the memory budget wait for running ones to finish.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ira_builder.exceptions.errors import ExecutionException
+from ira_builder.tools.code_executor_tools import execute_python_code
+from ira_builder.tools.csv_tools import analyze_csv_structure
+from ira_builder.tools import memory_admission
+from ira_builder.tools.memory_admission import MB, MemoryAdmissionController, memory_budget_bytes
+from ira_builder.utils.config import get_config
+from ira_builder.tools.memory_estimator import estimate_execution_memory, estimate_load_memory
+
+
+@pytest.fixture
+def ledger_csv(tmp_path):
+    """Write a CSV with numeric, low- and high-cardinality text columns."""
+    n = 5000
+    path = tmp_path / "ledger.csv"
+    pd.DataFrame({
+        "amount": np.arange(n) * 1.25,
+        "currency": np.where(np.arange(n) % 3 == 0, "USD", "INR"),
+        "text": [f"Invoice number {i:08d}" for i in range(n)],
+    }).to_csv(path, index=False)
+    return path
+
+
+class TestMemoryEstimate:
+    """Tests for the load memory estimate."""
+
+    def test_estimate_from_profile(self, ledger_csv):
+        metadata = analyze_csv_structure(str(ledger_csv))
+        frame_mb = metadata["memory_estimate"]["frame_mb"]
+
+        # Between the frame without its strings and with every string counted
+        # separately (the parser shares the repeated currency codes)
+        df = pd.read_csv(ledger_csv, low_memory=False)
+        assert df.memory_usage().sum() / MB < frame_mb < df.memory_usage(deep=True).sum() / MB
+        assert metadata["value_lengths"]["text"] == 23.0
+
+        estimate = estimate_execution_memory([str(ledger_csv)])
+        assert estimate["files"]["ledger.csv"]["source"] == "profile"
+        assert estimate["peak_mb"] > metadata["memory_estimate"]["peak_mb"]
+
+    def test_formatted_amounts_count_as_text(self, tmp_path):
+        """Test that nearly all-distinct formatted amounts are charged as string objects."""
+        n = 20000
+        path = tmp_path / "fbl3n.csv"
+        pd.DataFrame({
+            "doc": np.arange(n) + 5_000_000,
+            "amount": [f"{i * 1737.31:,.2f}" + ("-" if i % 7 == 0 else "") for i in range(n)],
+        }).to_csv(path, index=False)
+
+        metadata = analyze_csv_structure(str(path))
+        frame_mb = metadata["memory_estimate"]["frame_mb"]
+
+        df = pd.read_csv(path, low_memory=False)
+        assert str(df["amount"].dtype) == "object"
+        assert abs(frame_mb - df.memory_usage(deep=True).sum() / MB) <= 0.1 * frame_mb
+
+        # Profiles stored before formatted numbers were reported as text
+        stale = {**metadata, "dtypes": {**metadata["dtypes"], "amount": "float64"}}
+        assert estimate_load_memory(stale)["frame_mb"] == frame_mb
+
+    def test_execution_result_reports_estimate(self, ledger_csv, tmp_path):
+        result = asyncio.run(execute_python_code(
+            "print('ok')", work_dir=str(tmp_path / "run"), input_files=[str(ledger_csv)]
+        ))
+
+        assert result["status"] == "success", result["output"]
+        assert result["memory_estimate"]["files"]["ledger.csv"]["source"] == "file_size"
+        assert result["admission_wait_seconds"] >= 0
+
+
+class TestMemoryAdmission:
+    """Tests for queueing executions by memory."""
+
+    async def test_execution_waits_for_memory(self):
+        controller = MemoryAdmissionController(budget_bytes=100 * MB, poll_interval=0.01)
+        order = []
+
+        async def run(name, nbytes, hold):
+            async with controller.admit(nbytes) as waited:
+                order.append((name, waited >= 0.05))
+                await asyncio.sleep(hold)
+
+        await asyncio.gather(run("first", 80 * MB, 0.1), run("second", 40 * MB, 0))
+
+        assert order == [("first", False), ("second", True)]
+        assert controller.stats()["reserved_mb"] == 0
+
+    def test_budget_leaves_out_interpreter_pool(self, monkeypatch):
+        monkeypatch.setattr(memory_admission, "total_memory_bytes", lambda: 10_000 * MB)
+        monkeypatch.setattr(memory_admission, "POOL_SUPPORTED", True)
+        config = get_config()
+        monkeypatch.setattr(config, "execution_memory_budget_mb", 0)
+        monkeypatch.setattr(config, "execution_checkpoints", True)
+        monkeypatch.setattr(config, "interpreter_pool_size", 2)
+        monkeypatch.setattr(config, "interpreter_pool_input_cache_mb", 256)
+        monkeypatch.setattr(config, "interpreter_pool_checkpoint_mb", 512)
+
+        # 80% of the host less two workers of 80 + 256 + 512 MB
+        assert memory_budget_bytes() == 8000 * MB - 1696 * MB
+
+        monkeypatch.setattr(config, "interpreter_pool_size", 0)
+        assert memory_budget_bytes() == 8000 * MB
+
+    async def test_admission_timeout(self):
+        controller = MemoryAdmissionController(budget_bytes=100 * MB, poll_interval=0.01)
+
+        async with controller.admit(80 * MB):
+            with pytest.raises(ExecutionException):
+                async with controller.admit(40 * MB, timeout=0.05):
+                    pass
+
+        # A lone execution is admitted even beyond the budget
+        async with controller.admit(500 * MB) as waited:
+            assert waited < 0.05
@@ -0,0 +1,105 @@
+"""
+Unit tests for parallel multi-file profiling.
+
+Tests the per-file process runner (results, errors and timeouts) and that
+parallel summaries match the sequential ones.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ira_builder.tools.csv_tools import summarize_csv_files
+from ira_builder.tools.parallel_profile import run_per_file_in_processes
+from ira_builder.utils.config import get_config
+
+
+def slow_if_named_slow(filepath):
+    """Sleep well past any test timeout for files named 'slow'."""
+    if os.path.basename(filepath) == "slow":
+        time.sleep(60)
+    return os.path.getsize(filepath)
+
+
+@pytest.fixture
+def csv_files(tmp_path):
+    """Write three small CSVs."""
+    rng = np.random.default_rng(5)
+    paths = []
+    for name in ["fbl3n", "vendors", "gl_master"]:
+        path = tmp_path / f"{name}.csv"
+        pd.DataFrame({
+            "key": np.arange(100),
+            "value": rng.normal(0, 1, 100).round(3),
+        }).to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+class TestRunPerFileInProcesses:
+    """Tests for run_per_file_in_processes."""
+
+    def test_results_and_errors(self, csv_files, tmp_path):
+        """Test that results and exceptions are returned per file."""
+        missing = str(tmp_path / "missing.csv")
+        completed = []
+
+        results = run_per_file_in_processes(
+            csv_files + [missing],
+            os.path.getsize,
+            max_workers=2,
+            on_complete=lambda filepath, status, elapsed: completed.append(status),
+        )
+
+        assert all(results[path] == os.path.getsize(path) for path in csv_files)
+        assert isinstance(results[missing], FileNotFoundError)
+        assert sorted(completed) == ["done", "done", "done", "error"]
+
+    def test_timeout_stops_only_the_slow_file(self, tmp_path):
+        """Test that a hung file times out while the others complete."""
+        fast, slow = tmp_path / "fast", tmp_path / "slow"
+        fast.write_text("x")
+        slow.write_text("y")
+
+        started = time.monotonic()
+        results = run_per_file_in_processes(
+            [str(slow), str(fast)], slow_if_named_slow, max_workers=2, timeout=8
+        )
+
+        assert results[str(fast)] == 1
+        assert isinstance(results[str(slow)], TimeoutError)
+        assert time.monotonic() - started < 40
+
+
+class TestSummarizeCsvFiles:
+    """Tests for summarize_csv_files."""
+
+    def test_parallel_summary_matches_sequential(self, csv_files, monkeypatch):
+        """Test that a parallel summary equals the cached one and reports progress."""
+        monkeypatch.setattr(get_config(), "csv_summary_parallel_min_mb", 0.0)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        progress = []
+
+        parallel = summarize_csv_files(csv_files, progress_callback=progress.append, max_workers=2)
+        cached = summarize_csv_files(csv_files, max_workers=1)
+
+        assert parallel == cached
+        assert parallel.count("📄 File:") == 3
+        assert sorted(p["completed"] for p in progress) == [1, 2, 3]
+        assert {p["status"] for p in progress} == {"done"}
+
+    def test_same_content_profiled_once(self, csv_files, tmp_path):
+        """Test that a copy of a file reuses the profile of the original."""
+        copy = tmp_path / "copy" / "fbl3n.csv"
+        copy.parent.mkdir()
+        copy.write_bytes(open(csv_files[0], "rb").read())
+        os.utime(copy, ns=(os.stat(csv_files[0]).st_atime_ns, os.stat(csv_files[0]).st_mtime_ns))
+        progress = []
+
+        summary = summarize_csv_files([csv_files[0], str(copy)], progress_callback=progress.append)
+
+        assert [p["status"] for p in progress] == ["done", "cached"]
+        assert f"Path: {copy}" in summary
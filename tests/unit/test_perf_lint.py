@@ -0,0 +1,108 @@
+"""
+Unit tests for the static performance checks of generated pandas code.
+
+Tests each built-in rule, the blocking severity of check_code_performance
+and the pluggable rule registry.
+"""
+
+import pytest
+
+from ira_builder.tools import perf_lint
+from ira_builder.tools.code_executor_tools import check_code_performance
+from ira_builder.tools.perf_lint import get_perf_rules, register_perf_rule, run_perf_rules
+
+SLOW_CODE = """import pandas as pd
+df = pd.read_csv(csv_files[0])
+ref = pd.read_csv(csv_files[0])
+out = pd.DataFrame()
+for _, row in df.iterrows():
+    out = pd.concat([out, row.to_frame().T])
+df["net"] = df.apply(lambda r: r["amount"] / 1.18, axis=1)
+clean = df.copy()
+final = clean.copy()
+for i in range(3):
+    lookup = pd.read_csv(csv_files[1])
+"""
+
+FAST_CODE = """import pandas as pd
+frames = []
+for path in csv_files:
+    frames.append(pd.read_csv(path))
+df = pd.concat(frames, ignore_index=True)
+df["net"] = df["amount"] / 1.18
+path = csv_files[0]
+first = pd.read_csv(path)
+path = csv_files[1]
+second = pd.read_csv(path)
+totals = df.groupby("region")["net"].apply(sum)
+clean = df.copy()
+"""
+
+
+class TestPerfRules:
+    """Tests for the built-in rules."""
+
+    def test_finds_anti_patterns(self):
+        findings = run_perf_rules(SLOW_CODE)
+
+        assert [(f["line"], f["rule"], f["severity"]) for f in findings] == [
+            (3, "repeated_read", "medium"),
+            (5, "iterrows", "high"),
+            (6, "concat_in_loop", "high"),
+            (7, "apply_axis1", "high"),
+            (9, "chained_copy", "medium"),
+            (11, "repeated_read", "high"),
+        ]
+        assert findings[1]["code"] == "for _, row in df.iterrows():"
+
+    def test_vectorized_code_is_clean(self):
+        assert run_perf_rules(FAST_CODE) == []
+
+
+class TestCheckCodePerformance:
+    """Tests for check_code_performance."""
+
+    def test_blocking_severity(self):
+        result = check_code_performance(SLOW_CODE, block_severity="high")
+
+        assert not result["valid"]
+        assert len(result["issues"]) == 4
+        assert result["issues"][0].startswith("Line 5 (iterrows): ")
+        assert [f["blocking"] for f in result["findings"]] == [False, True, True, True, False, True]
+
+        assert len(check_code_performance(SLOW_CODE, block_severity="medium")["issues"]) == 6
+        assert check_code_performance(FAST_CODE)["valid"]
+
+    def test_unknown_severity(self):
+        with pytest.raises(ValueError):
+            check_code_performance(SLOW_CODE, block_severity="critical")
+
+
+class TestPerfRuleRegistry:
+    """Tests for registering and selecting rules."""
+
+    def test_custom_rule_and_selection(self, monkeypatch):
+        """Test registering a rule and running a subset of rules."""
+        monkeypatch.setattr(perf_lint, "_PERF_RULES", dict(perf_lint._PERF_RULES))
+
+        @register_perf_rule("to_dict_records")
+        def check_to_dict_records(context):
+            return [
+                context.finding(call, "low", "Converts the frame to Python dicts", "Keep it a DataFrame")
+                for call in context.method_calls("to_dict")
+            ]
+
+        assert get_perf_rules()[-1] == "to_dict_records"
+        findings = run_perf_rules("records = df.to_dict('records')\n", rules=["to_dict_records"])
+        assert findings == [{
+            "rule": "to_dict_records",
+            "severity": "low",
+            "line": 1,
+            "code": "records = df.to_dict('records')",
+            "description": "Converts the frame to Python dicts",
+            "recommendation": "Keep it a DataFrame",
+        }]
+
+    def test_unknown_rule(self):
+        with pytest.raises(ValueError):
+            run_perf_rules(FAST_CODE, rules=["no_such_rule"])
@@ -0,0 +1,166 @@
+"""
+Unit tests for the persistent CSV profile store.
+
+Tests fingerprinting, cache hits/misses, LRU eviction and the integration
+with analyze_csv_structure.
+"""
+
+import os
+
+import pytest
+
+from ira_builder.tools import csv_tools
+from ira_builder.tools.csv_tools import analyze_csv_structure
+from ira_builder.tools.profile_store import ProfileStore, compute_file_fingerprint
+
+
+@pytest.fixture
+def small_csv(tmp_path):
+    """Write a small CSV file and return its path."""
+    path = tmp_path / "vendors.csv"
+    path.write_text("vendor_id,name,amount\n1,Acme,10.5\n2,Globex,20.0\n3,Acme,7.25\n")
+    return path
+
+
+class TestFingerprint:
+    """Tests for compute_file_fingerprint."""
+
+    def test_fingerprint_is_stable(self, small_csv):
+        """Test that an unchanged file keeps its fingerprint."""
+        assert compute_file_fingerprint(small_csv) == compute_file_fingerprint(small_csv)
+
+    def test_fingerprint_changes_with_content(self, small_csv):
+        """Test that modifying the file changes its fingerprint."""
+        before = compute_file_fingerprint(small_csv)
+        stat = small_csv.stat()
+
+        small_csv.write_text(small_csv.read_text().replace("Acme", "Acmf"))
+        os.utime(small_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert compute_file_fingerprint(small_csv) != before
+
+    def test_fingerprint_missing_file(self, tmp_path):
+        """Test that fingerprinting a missing file raises."""
+        with pytest.raises(FileNotFoundError):
+            compute_file_fingerprint(tmp_path / "missing.csv")
+
+
+class TestProfileStore:
+    """Tests for ProfileStore."""
+
+    def test_get_or_compute_computes_once(self, tmp_path, small_csv):
+        """Test that a profile is only computed once per content version."""
+        store = ProfileStore(tmp_path / "store")
+        calls = []
+
+        def compute(path):
+            calls.append(path)
+            return {"row_count": 3}
+
+        assert store.get_or_compute(small_csv, compute) == {"row_count": 3}
+        assert store.get_or_compute(small_csv, compute) == {"row_count": 3}
+        assert len(calls) == 1
+
+        stats = store.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_store_is_shared_between_instances(self, tmp_path, small_csv):
+        """Test that entries written by one store are visible to another."""
+        ProfileStore(tmp_path / "store").put(small_csv, {"row_count": 3})
+
+        assert ProfileStore(tmp_path / "store").get(small_csv) == {"row_count": 3}
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that least recently used entries are evicted."""
+        store = ProfileStore(tmp_path / "store", max_entries=2)
+        files = []
+        for i in range(3):
+            path = tmp_path / f"file_{i}.csv"
+            path.write_text(f"a\n{i}\n")
+            files.append(path)
+
+        store.put(files[0], {"id": 0})
+        store.put(files[1], {"id": 1})
+        # Age file_1 so it becomes the least recently used entry
+        entry_1 = store.store_dir / f"{compute_file_fingerprint(files[1])}.json"
+        os.utime(entry_1, (0, 0))
+        store.put(files[2], {"id": 2})
+
+        assert store.get(files[0]) == {"id": 0}
+        assert store.get(files[1]) is None
+        assert store.get(files[2]) == {"id": 2}
+        assert store.stats()["evictions"] == 1
+
+    def test_invalidate(self, tmp_path, small_csv):
+        """Test removing an entry."""
+        store = ProfileStore(tmp_path / "store")
+        store.put(small_csv, {"row_count": 3})
+
+        assert store.invalidate(small_csv) is True
+        assert store.get(small_csv) is None
+
+
+class TestAnalyzeCSVStructureCaching:
+    """Tests for the profile store integration in analyze_csv_structure."""
+
+    def test_second_analysis_is_served_from_store(
+        self, small_csv, isolated_profile_store, monkeypatch
+    ):
+        """Test that re-analyzing an unchanged file doesn't re-parse it."""
+        first = analyze_csv_structure(str(small_csv))
+
+        def fail(filepath):
+            raise AssertionError("CSV was parsed again")
+
+        monkeypatch.setattr(csv_tools, "_profile_csv", fail)
+        second = analyze_csv_structure(str(small_csv))
+
+        assert second["row_count"] == first["row_count"] == 3
+        assert second["columns"] == first["columns"]
+        assert isolated_profile_store.stats()["hits"] == 1
+
+    def test_cached_profile_reports_current_path(self, tmp_path, small_csv):
+        """Test that a copy with identical content reports its own path."""
+        analyze_csv_structure(str(small_csv))
+
+        copy_dir = tmp_path / "copy"
+        copy_dir.mkdir()
+        copy_path = copy_dir / small_csv.name
+        copy_path.write_bytes(small_csv.read_bytes())
+        stat = small_csv.stat()
+        os.utime(copy_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        result = analyze_csv_structure(str(copy_path))
+        assert result["path"] == str(copy_path.absolute())
+
+
+class TestIncrementalProfile:
+    """Tests for profiling only the rows appended to a profiled file."""
+
+    def test_appended_rows_merge_into_stored_state(self, small_csv, isolated_profile_store):
+        """Test that an extended file reuses the stored state and matches a full profile."""
+        analyze_csv_structure(str(small_csv))
+        with small_csv.open("a") as f:
+            f.write("4,Initech,1.5\n5,Globex,3.0\n")
+
+        extended = analyze_csv_structure(str(small_csv))
+        full = csv_tools.build_csv_profile(str(small_csv)).to_metadata(str(small_csv))
+
+        assert extended["profile_info"]["reused_rows"] == 3
+        assert extended["row_count"] == 5
+        for key in ("dtypes", "statistics", "unique_counts", "categorical_info"):
+            assert extended[key] == full[key]
+
+    def test_changed_prefix_profiles_in_full(self, small_csv, isolated_profile_store):
+        """Test that a file whose earlier rows changed is not merged into the old state."""
+        analyze_csv_structure(str(small_csv))
+        small_csv.write_text(
+            "vendor_id,name,amount\n1,Acme,99.0\n2,Globex,20.0\n3,Acme,7.25\n4,Initech,1.5\n"
+        )
+
+        result = analyze_csv_structure(str(small_csv))
+
+        assert result["profile_info"]["reused_rows"] == 0
+        assert result["statistics"]["amount"]["max"] == 99.0
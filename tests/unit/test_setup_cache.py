@@ -0,0 +1,79 @@
+"""
+Unit tests for the executor setup cache and the virtual environment pool.
+
+Tests that an identical function setup is skipped by later executors, and
+that provisioned environments are leased one executor at a time and reused
+across pools.
+"""
+
+import os
+
+from ira_builder.executor import CodeBlock, PythonScriptExecutor
+from ira_builder.executor.setup_cache import SetupCache
+from ira_builder.executor.venv_pool import VirtualEnvPool
+
+
+def add_tax(amount: float) -> float:
+    """Add 18% tax to an amount."""
+    return round(amount * 1.18, 2)
+
+
+def net_amount(amount: float) -> float:
+    """Remove 18% tax from an amount."""
+    return round(amount / 1.18, 2)
+
+
+class TestSetupCache:
+    """Tests for skipping completed function setups."""
+
+    async def test_identical_setup_is_skipped(self, tmp_path, monkeypatch):
+        runs = []
+        execute = PythonScriptExecutor._execute_code_dont_check_setup
+
+        async def counting(self, code_blocks, cancellation_token=None):
+            runs.append(code_blocks[0].code)
+            return await execute(self, code_blocks, cancellation_token)
+
+        monkeypatch.setattr(PythonScriptExecutor, "_execute_code_dont_check_setup", counting)
+        cache = SetupCache(tmp_path / "setup_cache")
+        block = CodeBlock(language="python", code="from functions import add_tax\nprint(add_tax(100))")
+
+        for _ in range(2):
+            executor = PythonScriptExecutor(work_dir=tmp_path / "work", functions=[add_tax], setup_cache=cache)
+            result = await executor.execute_code_blocks([block])
+            assert result.output.strip() == "118.0"
+
+        # The import check ran for the first executor only
+        assert len(runs) == 3
+
+        # Changed functions are set up again
+        executor = PythonScriptExecutor(
+            work_dir=tmp_path / "work", functions=[add_tax, net_amount], setup_cache=cache
+        )
+        await executor.execute_code_blocks([block])
+        assert len(runs) == 5
+
+
+class TestVirtualEnvPool:
+    """Tests for leasing pre-provisioned environments."""
+
+    async def test_lease_and_reuse(self, tmp_path):
+        pool = VirtualEnvPool(tmp_path / "venvs", size=1)
+        with pool.lease() as env:
+            assert env is not None
+            with pool.lease() as other:
+                assert other is None
+
+            executor = PythonScriptExecutor(work_dir=tmp_path / "work", virtual_env_context=env)
+            result = await executor.execute_code_blocks(
+                [CodeBlock(language="python", code="import sys\nprint(sys.prefix)")]
+            )
+            assert os.path.samefile(result.output.strip(), tmp_path / "venvs" / "env-0")
+
+        assert pool.stats() == {"idle": 1, "leased": 0, "leases": 1, "misses": 1}
+
+        # A new pool reuses the provisioned environment
+        marker = tmp_path / "venvs" / "env-0" / "ira-provisioned.json"
+        mtime = marker.stat().st_mtime_ns
+        VirtualEnvPool(tmp_path / "venvs", size=1).provision()
+        assert marker.stat().st_mtime_ns == mtime